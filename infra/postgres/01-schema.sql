@@ -55,6 +55,16 @@ CREATE TABLE IF NOT EXISTS files_enriched (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Content index: the first fully enriched object for each sha256, and the content-only
+-- enrichment modules that succeeded on it. Later files with the same bytes reuse those
+-- modules' results instead of re-running them (see file_enrichment/content_index.py).
+CREATE TABLE IF NOT EXISTS file_contents (
+    sha256 TEXT PRIMARY KEY,
+    object_id UUID NOT NULL REFERENCES files_enriched(object_id) ON DELETE CASCADE,
+    modules TEXT[] NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS enrichments (
     enrichment_id BIGSERIAL PRIMARY KEY,
     object_id UUID NOT NULL,
@@ -220,6 +230,12 @@ END $$;
 -- Create indexes if they don't exist
 CREATE INDEX IF NOT EXISTS idx_files_enriched_agent_id ON files_enriched(agent_id);
 CREATE INDEX IF NOT EXISTS idx_files_enriched_hashes ON files_enriched USING GIN (hashes);
+CREATE INDEX IF NOT EXISTS idx_file_contents_object_id ON file_contents(object_id);
+CREATE INDEX IF NOT EXISTS idx_enrichments_object_id ON enrichments(object_id);
+-- Transform objects can be shared between files with identical content (housekeeping checks before deleting)
+CREATE INDEX IF NOT EXISTS idx_transforms_transform_object_id ON transforms(transform_object_id);
+-- Looked up by object and type (document_conversion/transform_cache.py reuses transforms of identical content)
+CREATE INDEX IF NOT EXISTS idx_transforms_object_id_type ON transforms(object_id, type);
 CREATE INDEX IF NOT EXISTS idx_files_enriched_path_trgm ON files_enriched USING gist (path gist_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_findings_data_gin ON findings USING GIN (data);
 CREATE INDEX IF NOT EXISTS idx_files_view_history_username ON files_view_history(username);
@@ -233,6 +249,417 @@ CREATE INDEX IF NOT EXISTS idx_findings_created_at ON findings(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_findings_object_id ON findings(object_id);
 -- Composite index for finding triage history joins (finding_triage_histories with order_by timestamp)
 CREATE INDEX IF NOT EXISTS idx_findings_triage_history_composite ON findings_triage_history(finding_id, timestamp DESC);
+-- Source reports filter files by case-insensitive source (reporting_routes.py)
+CREATE INDEX IF NOT EXISTS idx_files_enriched_source_upper ON files_enriched(UPPER(source));
+
+
+-----------------------
+-- REPORT ROLLUPS
+-----------------------
+
+-- Per-source, per-day aggregates behind the /reports endpoints and PDFs (web_api/reporting_routes.py), kept
+--  current by the triggers below as files, findings and triage entries are written. The triggers only
+--  append to report_rollup_deltas; report_rollup_fold() sums those into report_rollups (see below).
+--  source is UPPER(files_enriched.source) ('' when unset), project is '' when unset and day is the UTC day of
+--  files_enriched.created_at. Findings count towards the source and day of the file they were found in.
+--  metric/key pairs:
+--      files / ''                      count, total_size, first_seen, last_seen of the files
+--      extension / <extension or ''>   files per extension
+--      findings / ''                   findings
+--      finding_severity / <level>      findings per severity level (see report_severity_level)
+--      finding_category / <category>   findings per category
+--      finding_origin / <origin_name>  findings per origin
+--      triage / <value or untriaged>   findings per latest triage value
+CREATE TABLE IF NOT EXISTS report_rollups (
+    source TEXT NOT NULL,
+    project TEXT NOT NULL,
+    day DATE NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    total_size BIGINT NOT NULL DEFAULT 0,
+    first_seen TIMESTAMP WITH TIME ZONE,
+    last_seen TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (source, day, metric, key, project)
+);
+-- Rows whose deltas net to zero, removed by report_rollup_fold()
+CREATE INDEX IF NOT EXISTS idx_report_rollups_emptied ON report_rollups (source) WHERE count <= 0;
+
+-- Deltas queued by the rollup triggers. Every write appends a row instead of updating the shared
+--  (source, day, metric, key) row, so concurrent ingest for one source doesn't serialize on its lock.
+--  Logged (not UNLOGGED) so a crash can't drop deltas and leave the rollups permanently off.
+CREATE TABLE IF NOT EXISTS report_rollup_deltas (
+    source TEXT NOT NULL,
+    project TEXT NOT NULL,
+    day DATE NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count BIGINT NOT NULL,
+    total_size BIGINT NOT NULL DEFAULT 0,
+    seen TIMESTAMP WITH TIME ZONE
+);
+
+CREATE OR REPLACE FUNCTION report_severity_level(severity INTEGER)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN severity >= 9 THEN 'critical'
+        WHEN severity >= 7 THEN 'high'
+        WHEN severity >= 4 THEN 'medium'
+        WHEN severity >= 2 THEN 'low'
+        ELSE 'informational'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Queues a (possibly negative) delta for one rollup row, applied by the next report_rollup_fold()
+CREATE OR REPLACE FUNCTION report_rollup_add(
+    p_source TEXT,
+    p_project TEXT,
+    p_day DATE,
+    p_metric TEXT,
+    p_key TEXT,
+    p_count BIGINT,
+    p_size BIGINT DEFAULT 0,
+    p_seen TIMESTAMP WITH TIME ZONE DEFAULT NULL
+)
+RETURNS VOID AS $$
+    INSERT INTO report_rollup_deltas (source, project, day, metric, key, count, total_size, seen)
+    VALUES (p_source, p_project, p_day, p_metric, p_key, p_count, p_size, p_seen);
+$$ LANGUAGE sql;
+
+-- Sums the committed deltas into report_rollups and removes rows that drop to zero. Run by housekeeping
+--  periodically and by the web API before every report, so reports see every committed write.
+CREATE OR REPLACE FUNCTION report_rollup_fold()
+RETURNS VOID AS $$
+BEGIN
+    -- One fold at a time; deltas committed meanwhile are left for the next one
+    PERFORM pg_advisory_xact_lock(hashtext('report_rollup_fold'));
+
+    WITH taken AS (
+        DELETE FROM report_rollup_deltas
+        RETURNING source, project, day, metric, key, count, total_size, seen
+    )
+    INSERT INTO report_rollups AS r (source, project, day, metric, key, count, total_size, first_seen, last_seen)
+    SELECT source, project, day, metric, key, SUM(count), SUM(total_size), MIN(seen), MAX(seen)
+    FROM taken
+    GROUP BY source, day, metric, key, project
+    ORDER BY source, day, metric, key, project
+    ON CONFLICT (source, day, metric, key, project) DO UPDATE SET
+        count = r.count + EXCLUDED.count,
+        total_size = r.total_size + EXCLUDED.total_size,
+        first_seen = LEAST(r.first_seen, EXCLUDED.first_seen),
+        last_seen = GREATEST(r.last_seen, EXCLUDED.last_seen);
+
+    DELETE FROM report_rollups WHERE count <= 0;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The rollup source, project and day a file (and its findings) count towards
+CREATE OR REPLACE FUNCTION report_rollup_file_key(
+    p_object_id UUID,
+    OUT source TEXT,
+    OUT project TEXT,
+    OUT day DATE
+) AS $$
+    SELECT UPPER(COALESCE(fe.source, '')), COALESCE(fe.project, ''), (fe.created_at AT TIME ZONE 'UTC')::date
+    FROM files_enriched fe
+    WHERE fe.object_id = p_object_id;
+$$ LANGUAGE sql STABLE;
+
+-- A file's rollup deltas (sign = 1 adds it, sign = -1 removes it)
+CREATE OR REPLACE FUNCTION report_rollup_file_deltas(f files_enriched, sign INTEGER)
+RETURNS TABLE (source TEXT, project TEXT, day DATE, metric TEXT, key TEXT, n BIGINT, size BIGINT, seen TIMESTAMP WITH TIME ZONE) AS $$
+    SELECT UPPER(COALESCE(f.source, '')), COALESCE(f.project, ''), (f.created_at AT TIME ZONE 'UTC')::date,
+           m.metric, m.key, sign::BIGINT, m.size, CASE WHEN sign > 0 AND m.metric = 'files' THEN f.created_at END
+    FROM (VALUES
+        ('files', '', sign * COALESCE(f.size, 0)::BIGINT),
+        ('extension', COALESCE(f.extension, ''), 0::BIGINT)
+    ) AS m(metric, key, size);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- The rollup keys a finding with these values counts towards
+CREATE OR REPLACE FUNCTION report_rollup_finding_keys(
+    p_severity INTEGER,
+    p_category TEXT,
+    p_origin_name TEXT,
+    p_triage TEXT
+)
+RETURNS TABLE (metric TEXT, key TEXT) AS $$
+    VALUES
+        ('findings', ''),
+        ('finding_severity', report_severity_level(p_severity)),
+        ('finding_category', p_category),
+        ('finding_origin', p_origin_name),
+        ('triage', COALESCE(p_triage, 'untriaged'));
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Findings' rollup deltas: one finding when p_finding_id is given, otherwise all of p_object_id's findings,
+--  grouped so a file with many findings costs one upsert per distinct key
+CREATE OR REPLACE FUNCTION report_rollup_finding_deltas(
+    p_source TEXT,
+    p_project TEXT,
+    p_day DATE,
+    p_object_id UUID,
+    p_finding_id BIGINT,
+    sign INTEGER
+)
+RETURNS TABLE (source TEXT, project TEXT, day DATE, metric TEXT, key TEXT, n BIGINT, size BIGINT, seen TIMESTAMP WITH TIME ZONE) AS $$
+    SELECT p_source, p_project, p_day, m.metric, m.key, sign * COUNT(*), 0::BIGINT, NULL::TIMESTAMP WITH TIME ZONE
+    FROM findings f
+    LEFT JOIN findings_triage_history fth ON fth.id = f.triage_id
+    CROSS JOIN LATERAL report_rollup_finding_keys(f.severity, f.category, f.origin_name, fth.value) AS m
+    WHERE f.object_id = p_object_id
+    AND (p_finding_id IS NULL OR f.finding_id = p_finding_id)
+    GROUP BY m.metric, m.key;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION report_rollup_apply_findings(
+    p_source TEXT,
+    p_project TEXT,
+    p_day DATE,
+    p_object_id UUID,
+    p_finding_id BIGINT,
+    sign INTEGER
+)
+RETURNS VOID AS $$
+DECLARE
+    rec RECORD;
+BEGIN
+    FOR rec IN
+        SELECT d.metric, d.key, d.n
+        FROM report_rollup_finding_deltas(p_source, p_project, p_day, p_object_id, p_finding_id, sign) d
+        ORDER BY d.metric, d.key
+    LOOP
+        PERFORM report_rollup_add(p_source, p_project, p_day, rec.metric, rec.key, rec.n);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fires AFTER INSERT/UPDATE and BEFORE DELETE, while the file's findings still exist
+CREATE OR REPLACE FUNCTION report_rollup_files_enriched()
+RETURNS TRIGGER AS $$
+DECLARE
+    old_key RECORD;
+    new_key RECORD;
+    moved BOOLEAN := FALSE;
+    rec RECORD;
+BEGIN
+    -- OLD is NULL on INSERT and NEW on DELETE; the deltas query below only uses the side that exists
+    SELECT UPPER(COALESCE(OLD.source, '')) AS source, COALESCE(OLD.project, '') AS project,
+           (OLD.created_at AT TIME ZONE 'UTC')::date AS day
+    INTO old_key;
+    SELECT UPPER(COALESCE(NEW.source, '')) AS source, COALESCE(NEW.project, '') AS project,
+           (NEW.created_at AT TIME ZONE 'UTC')::date AS day
+    INTO new_key;
+    IF TG_OP = 'UPDATE' THEN
+        -- Re-enrichment can change a file's source or project; its findings move with it
+        moved := (old_key.source, old_key.project, old_key.day) IS DISTINCT FROM (new_key.source, new_key.project, new_key.day);
+    END IF;
+
+    -- The old and new deltas are netted per row, so an update only queues deltas for the rows it changes
+    FOR rec IN
+        SELECT d.source, d.project, d.day, d.metric, d.key, SUM(d.n)::BIGINT AS n, SUM(d.size)::BIGINT AS size, MAX(d.seen) AS seen
+        FROM (
+            SELECT * FROM report_rollup_file_deltas(OLD, -1) WHERE TG_OP <> 'INSERT'
+            UNION ALL
+            SELECT * FROM report_rollup_file_deltas(NEW, 1) WHERE TG_OP <> 'DELETE'
+            UNION ALL
+            SELECT * FROM report_rollup_finding_deltas(old_key.source, old_key.project, old_key.day, OLD.object_id, NULL, -1)
+            WHERE TG_OP = 'DELETE' OR moved
+            UNION ALL
+            SELECT * FROM report_rollup_finding_deltas(new_key.source, new_key.project, new_key.day, NEW.object_id, NULL, 1)
+            WHERE moved
+        ) d
+        GROUP BY d.source, d.project, d.day, d.metric, d.key
+        HAVING SUM(d.n) <> 0 OR SUM(d.size) <> 0
+        ORDER BY d.source, d.project, d.day, d.metric, d.key
+    LOOP
+        PERFORM report_rollup_add(rec.source, rec.project, rec.day, rec.metric, rec.key, rec.n, rec.size, rec.seen);
+    END LOOP;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fires AFTER INSERT/UPDATE and BEFORE DELETE. When the delete cascades from files_enriched the file is
+--  already gone (and was removed from the rollups with its findings), so the key lookup finds nothing.
+CREATE OR REPLACE FUNCTION report_rollup_findings()
+RETURNS TRIGGER AS $$
+DECLARE
+    file_key RECORD;
+    rec RECORD;
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND (OLD.object_id, OLD.category, OLD.severity, OLD.origin_name)
+            IS NOT DISTINCT FROM (NEW.object_id, NEW.category, NEW.severity, NEW.origin_name) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        -- The row already holds the new values, so the old ones are taken out from OLD
+        FOR rec IN
+            SELECT d.source, d.project, d.day, d.metric, d.key, SUM(d.n)::BIGINT AS n
+            FROM (
+                SELECT k.source, k.project, k.day, m.metric, m.key, -1::BIGINT AS n
+                FROM report_rollup_file_key(OLD.object_id) k
+                CROSS JOIN LATERAL report_rollup_finding_keys(
+                    OLD.severity, OLD.category, OLD.origin_name,
+                    (SELECT value FROM findings_triage_history WHERE id = OLD.triage_id)
+                ) AS m
+                WHERE k.source IS NOT NULL
+                UNION ALL
+                SELECT fd.source, fd.project, fd.day, fd.metric, fd.key, fd.n
+                FROM report_rollup_file_key(NEW.object_id) k
+                CROSS JOIN LATERAL report_rollup_finding_deltas(
+                    k.source, k.project, k.day, NEW.object_id, NEW.finding_id, 1
+                ) AS fd
+                WHERE k.source IS NOT NULL
+            ) d
+            GROUP BY d.source, d.project, d.day, d.metric, d.key
+            HAVING SUM(d.n) <> 0
+            ORDER BY d.source, d.project, d.day, d.metric, d.key
+        LOOP
+            PERFORM report_rollup_add(rec.source, rec.project, rec.day, rec.metric, rec.key, rec.n);
+        END LOOP;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        SELECT * INTO file_key FROM report_rollup_file_key(OLD.object_id);
+        IF file_key.source IS NOT NULL THEN
+            PERFORM report_rollup_apply_findings(
+                file_key.source, file_key.project, file_key.day, OLD.object_id, OLD.finding_id, -1
+            );
+        END IF;
+        RETURN OLD;
+    END IF;
+
+    SELECT * INTO file_key FROM report_rollup_file_key(NEW.object_id);
+    IF file_key.source IS NOT NULL THEN
+        PERFORM report_rollup_apply_findings(file_key.source, file_key.project, file_key.day, NEW.object_id, NEW.finding_id, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Points findings.triage_id at the finding's latest triage entry and moves the finding between triage counts
+CREATE OR REPLACE FUNCTION report_rollup_findings_triage()
+RETURNS TRIGGER AS $$
+DECLARE
+    finding RECORD;
+    previous_value TEXT := 'untriaged';
+    previous_timestamp TIMESTAMP WITH TIME ZONE;
+    file_key RECORD;
+    rec RECORD;
+BEGIN
+    SELECT finding_id, object_id, triage_id INTO finding
+    FROM findings
+    WHERE finding_id = NEW.finding_id
+    FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    IF finding.triage_id IS NOT NULL THEN
+        SELECT value, timestamp INTO previous_value, previous_timestamp
+        FROM findings_triage_history
+        WHERE id = finding.triage_id;
+        IF previous_timestamp > NEW.timestamp THEN
+            -- Backdated entry; the latest triage value is unchanged
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    UPDATE findings SET triage_id = NEW.id WHERE finding_id = NEW.finding_id;
+
+    SELECT * INTO file_key FROM report_rollup_file_key(finding.object_id);
+    IF file_key.source IS NOT NULL AND previous_value IS DISTINCT FROM NEW.value THEN
+        FOR rec IN
+            SELECT t.key, t.n FROM (VALUES (previous_value, -1), (NEW.value, 1)) AS t(key, n) ORDER BY t.key
+        LOOP
+            PERFORM report_rollup_add(file_key.source, file_key.project, file_key.day, 'triage', rec.key, rec.n);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER report_rollup_files_enriched_write
+    AFTER INSERT OR UPDATE OF source, project, created_at, extension, size ON files_enriched
+    FOR EACH ROW
+    EXECUTE FUNCTION report_rollup_files_enriched();
+
+CREATE OR REPLACE TRIGGER report_rollup_files_enriched_delete
+    BEFORE DELETE ON files_enriched
+    FOR EACH ROW
+    EXECUTE FUNCTION report_rollup_files_enriched();
+
+CREATE OR REPLACE TRIGGER report_rollup_findings_write
+    AFTER INSERT OR UPDATE OF object_id, category, severity, origin_name ON findings
+    FOR EACH ROW
+    EXECUTE FUNCTION report_rollup_findings();
+
+CREATE OR REPLACE TRIGGER report_rollup_findings_delete
+    BEFORE DELETE ON findings
+    FOR EACH ROW
+    EXECUTE FUNCTION report_rollup_findings();
+
+CREATE OR REPLACE TRIGGER report_rollup_findings_triage_insert
+    AFTER INSERT ON findings_triage_history
+    FOR EACH ROW
+    EXECUTE FUNCTION report_rollup_findings_triage();
+
+-- Recomputes every rollup (and findings.triage_id) from the base tables
+CREATE OR REPLACE FUNCTION rebuild_report_rollups()
+RETURNS VOID AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('report_rollup_fold'));
+    -- Waits for writers that already queued deltas to commit, and holds off new ones until the rebuild
+    --  commits. The queued deltas are then all reflected in the base tables, so they are dropped.
+    LOCK TABLE report_rollup_deltas IN EXCLUSIVE MODE;
+    DELETE FROM report_rollup_deltas;
+    DELETE FROM report_rollups;
+
+    UPDATE findings f
+    SET triage_id = latest.id
+    FROM (
+        SELECT DISTINCT ON (finding_id) finding_id, id
+        FROM findings_triage_history
+        ORDER BY finding_id, timestamp DESC, id DESC
+    ) latest
+    WHERE f.finding_id = latest.finding_id AND f.triage_id IS DISTINCT FROM latest.id;
+
+    INSERT INTO report_rollups (source, project, day, metric, key, count, total_size, first_seen, last_seen)
+    SELECT UPPER(COALESCE(source, '')), COALESCE(project, ''), (created_at AT TIME ZONE 'UTC')::date,
+           'files', '', COUNT(*), COALESCE(SUM(size), 0), MIN(created_at), MAX(created_at)
+    FROM files_enriched
+    GROUP BY 1, 2, 3
+    UNION ALL
+    SELECT UPPER(COALESCE(source, '')), COALESCE(project, ''), (created_at AT TIME ZONE 'UTC')::date,
+           'extension', COALESCE(extension, ''), COUNT(*), 0, NULL, NULL
+    FROM files_enriched
+    GROUP BY 1, 2, 3, 5
+    UNION ALL
+    SELECT UPPER(COALESCE(fe.source, '')), COALESCE(fe.project, ''), (fe.created_at AT TIME ZONE 'UTC')::date,
+           m.metric, m.key, COUNT(*), 0, NULL, NULL
+    FROM findings f
+    JOIN files_enriched fe ON fe.object_id = f.object_id
+    LEFT JOIN findings_triage_history fth ON fth.id = f.triage_id
+    CROSS JOIN LATERAL (VALUES
+        ('findings', ''),
+        ('finding_severity', report_severity_level(f.severity)),
+        ('finding_category', f.category),
+        ('finding_origin', f.origin_name),
+        ('triage', COALESCE(fth.value, 'untriaged'))
+    ) AS m(metric, key)
+    GROUP BY 1, 2, 3, 4, 5;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Seed the rollups for databases that already hold files (a no-op on a fresh install)
+SELECT rebuild_report_rollups() WHERE NOT EXISTS (SELECT 1 FROM report_rollups);
 
 
 
@@ -348,6 +775,14 @@ CREATE TABLE IF NOT EXISTS yara_rules (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Serialized yara_x.Rules compiled from the enabled rules, keyed by a hash of those rules
+-- (see yara_manager.py), so replicas reloading the same rule set skip compiling it
+CREATE TABLE IF NOT EXISTS yara_compiled_rules (
+    rule_set_hash TEXT PRIMARY KEY,
+    compiled_rules BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 
 -----------------------
 -- Agent Prompts
@@ -593,6 +1028,61 @@ CREATE OR REPLACE TRIGGER update_file_listings_updated_at
     EXECUTE FUNCTION update_updated_at_column();
 
 
+-----------------------
+-- File linking placeholder notifications
+-----------------------
+
+-- Lets file_enrichment keep its in-memory placeholder index (file_linking.PlaceholderIndex) in sync
+--  when placeholder paths (containing '<...>') are added or resolved by another worker.
+--  Deletes are not announced: a stale index entry only costs a no-op UPDATE and is dropped on the next reload.
+CREATE OR REPLACE FUNCTION notify_file_linking_placeholder()
+RETURNS TRIGGER AS $$
+DECLARE
+    old_path TEXT;
+    new_path TEXT;
+    payload TEXT;
+BEGIN
+    IF TG_TABLE_NAME = 'file_listings' THEN
+        new_path := NEW.path;
+        IF TG_OP = 'UPDATE' THEN old_path := OLD.path; END IF;
+    ELSE
+        new_path := NEW.file_path_2;
+        IF TG_OP = 'UPDATE' THEN old_path := OLD.file_path_2; END IF;
+    END IF;
+
+    IF old_path IS NOT DISTINCT FROM new_path
+        OR (COALESCE(old_path, '') NOT LIKE '%<%' AND new_path NOT LIKE '%<%') THEN
+        RETURN NULL;
+    END IF;
+
+    payload := json_build_object(
+        'source', NEW.source,
+        'table', TG_TABLE_NAME,
+        'old_path', old_path,
+        'new_path', new_path
+    )::text;
+
+    -- NOTIFY payloads are limited to 8000 bytes; fall back to asking listeners to reload the source
+    IF octet_length(payload) > 7900 THEN
+        payload := json_build_object('source', NEW.source)::text;
+    END IF;
+
+    PERFORM pg_notify('nemesis_file_linking_placeholders', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER notify_file_listings_placeholder
+    AFTER INSERT OR UPDATE OF path ON file_listings
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_file_linking_placeholder();
+
+CREATE OR REPLACE TRIGGER notify_file_linkings_placeholder
+    AFTER INSERT OR UPDATE OF file_path_2 ON file_linkings
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_file_linking_placeholder();
+
+
 -----------------------
 -- Workflow tracking
 -----------------------
@@ -617,6 +1107,19 @@ CREATE INDEX IF NOT EXISTS idx_workflows_object_id_active ON workflows(object_id
 -- Partial index: only indexes non-scheduled workflows to minimize size and write overhead
 CREATE INDEX IF NOT EXISTS idx_workflows_purge_candidates ON workflows(status, is_purged, start_time) WHERE status != 'SCHEDULED';
 
+-- Incrementally maintained workflow metrics (common/workflows/metrics.py): per-status workflow counts and a
+-- log-bucketed runtime sketch, merged in periodically by each workflow service so /workflows/status
+-- reads one row instead of aggregating the workflows table. Starts empty alongside the (empty) workflows
+-- table; a reset reseeds it and bumps generation, so services drop deltas recorded under an older one.
+CREATE TABLE IF NOT EXISTS workflow_metrics (
+    name TEXT PRIMARY KEY,
+    status_counts JSONB NOT NULL DEFAULT '{}',
+    runtime_sketch JSONB NOT NULL DEFAULT '{}',
+    generation BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO workflow_metrics (name) VALUES ('workflows') ON CONFLICT (name) DO NOTHING;
+
 
 -----------------------
 -- DAPR State Store
@@ -841,6 +1344,16 @@ CREATE TABLE IF NOT EXISTS chromium.cookies (
     UNIQUE (source, username, browser, host_key, name, path)
 );
 
+-- Partial indexes for retroactive decryption (chromium.retry) of logins/cookies that are still encrypted
+CREATE INDEX IF NOT EXISTS idx_logins_undecrypted_masterkey_guid ON chromium.logins(masterkey_guid) WHERE is_decrypted = FALSE AND encryption_type = 'dpapi';
+CREATE INDEX IF NOT EXISTS idx_logins_undecrypted_source ON chromium.logins(source, id) WHERE is_decrypted = FALSE AND encryption_type IN ('key', 'abe');
+CREATE INDEX IF NOT EXISTS idx_cookies_undecrypted_masterkey_guid ON chromium.cookies(masterkey_guid) WHERE is_decrypted = FALSE AND encryption_type = 'dpapi';
+CREATE INDEX IF NOT EXISTS idx_cookies_undecrypted_source ON chromium.cookies(source, id) WHERE is_decrypted = FALSE AND encryption_type IN ('key', 'abe');
+
+-- Source reports count logins/cookies by case-insensitive source (reporting_routes.py)
+CREATE INDEX IF NOT EXISTS idx_logins_source_upper ON chromium.logins(UPPER(source));
+CREATE INDEX IF NOT EXISTS idx_cookies_source_upper ON chromium.cookies(UPPER(source));
+
 -- DPAPI tables
 CREATE SCHEMA dpapi;
 
@@ -1,30 +1,342 @@
 """Retry decryption logic for Chromium cookies and logins."""
 
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
 from uuid import UUID
 
 import asyncpg
 from common.logger import get_logger
-from nemesis_dpapi import Blob, DpapiManager, MasterKeyNotDecryptedError, MasterKeyNotFoundError
+from nemesis_dpapi import Blob, DpapiManager, MasterKey
 
-from .helpers import decrypt_chrome_string, get_state_key_bytes
+from .helpers import decrypt_chrome_string
 
 logger = get_logger(__name__)
 
+# Undecrypted rows fetched, decrypted and written back per round trip
+RETRY_PAGE_SIZE = 5000
+
+
+def _strip_cookie_value(value: bytes, encryption_type: str) -> bytes:
+    """Apply offset handling for decrypted cookie values."""
+    if encryption_type == "abe" and len(value) > 32:
+        return value[32:]
+    elif encryption_type == "key" and len(value) > 48:
+        return value[32:-16]
+    elif encryption_type == "key" and len(value) > 16:
+        return value[:-16]
+    return value
+
+
+def _strip_login_password(value: bytes, encryption_type: str) -> bytes:
+    """Apply offset handling for decrypted passwords (v20 passwords typically don't have an offset like cookies)."""
+    if encryption_type == "key" and len(value) > 32:
+        return value[32:-16]
+    elif encryption_type == "key" and len(value) > 16:
+        return value[:-16]
+    return value
+
+
+@dataclass(frozen=True)
+class _RetryTarget:
+    """A table of Chromium values that can be retroactively decrypted."""
+
+    table: str
+    enc_column: str
+    dec_column: str
+    item: str
+    strip_offsets: Callable[[bytes, str], bytes]
+    # Logins without a username/browser fall back to any decrypted state key for their source
+    source_fallback: bool
+
+
+COOKIES = _RetryTarget("chromium.cookies", "value_enc", "value_dec", "cookie", _strip_cookie_value, False)
+LOGINS = _RetryTarget(
+    "chromium.logins", "password_value_enc", "password_value_dec", "login", _strip_login_password, True
+)
+
+
+class StateKeyIndex:
+    """Decrypted Chromium state keys, loaded once per retry run and looked up in memory."""
+
+    def __init__(self, rows: list) -> None:
+        self._key_bytes: dict[tuple[int, str], bytes] = {}
+        self._by_owner: dict[tuple[str, str, str, str], int] = {}
+        self._by_source: dict[tuple[str, str], int] = {}
+        self._owners: set[tuple[str, str, str]] = set()
+
+        for row in rows:
+            for encryption_type, is_decrypted_col, column_name in (
+                ("key", "key_is_decrypted", "key_bytes_dec"),
+                ("abe", "app_bound_key_is_decrypted", "app_bound_key_dec"),
+            ):
+                if not (row[is_decrypted_col] and row[column_name]):
+                    continue
+                self._key_bytes[(row["id"], encryption_type)] = row[column_name]
+                self._by_owner.setdefault((row["source"], row["username"], row["browser"], encryption_type), row["id"])
+                self._by_source.setdefault((row["source"], encryption_type), row["id"])
+                if row["username"] and row["browser"]:
+                    self._owners.add((row["source"], row["username"], row["browser"]))
+
+    @classmethod
+    async def load(
+        cls, asyncpg_pool: asyncpg.Pool, masterkey_guid: UUID, state_key_ids: list[int] | None = None
+    ) -> "StateKeyIndex":
+        """Load the decrypted state keys protected by `masterkey_guid`, plus any in `state_key_ids`.
+
+        Keys decrypted earlier by other masterkeys already had their rows retried then, so leaving
+        them out keeps each retry proportional to what the new key can unlock.
+        """
+        async with asyncpg_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, source, username, browser,
+                       key_is_decrypted, key_bytes_dec, app_bound_key_is_decrypted, app_bound_key_dec
+                FROM chromium.state_keys
+                WHERE (key_is_decrypted = TRUE OR app_bound_key_is_decrypted = TRUE)
+                AND (
+                    key_masterkey_guid = $1::uuid
+                    OR app_bound_key_system_masterkey_guid = $1::uuid
+                    OR app_bound_key_user_masterkey_guid = $1::uuid
+                    OR id = ANY($2::int[])
+                )
+                ORDER BY id
+                """,
+                str(masterkey_guid),
+                state_key_ids or [],
+            )
+        return cls(rows)
+
+    @property
+    def sources(self) -> list[str]:
+        """Sources with at least one decrypted state key."""
+        return sorted({source for source, _ in self._by_source if source})
+
+    @property
+    def owners(self) -> list[tuple[str, str, str]]:
+        """(source, username, browser) of each state key with at least one decrypted key."""
+        return sorted(self._owners)
+
+    @property
+    def ids(self) -> list[int]:
+        """IDs of state keys with at least one decrypted key."""
+        return sorted({key_id for key_id, _ in self._key_bytes})
+
+    def candidates(
+        self,
+        source: str | None,
+        username: str | None,
+        browser: str | None,
+        state_key_id: int | None,
+        encryption_type: str,
+        source_fallback: bool,
+    ) -> list[tuple[int, bytes]]:
+        """Return the (state key id, key bytes) to try, in order, for rows with these attributes."""
+        key_ids = []
+        if state_key_id is not None:
+            key_ids.append(state_key_id)
+
+        if username and browser:
+            key_ids.append(self._by_owner.get((source, username, browser, encryption_type)))
+        elif source_fallback and source:
+            key_ids.append(self._by_source.get((source, encryption_type)))
+
+        candidates = []
+        for key_id in dict.fromkeys(key_ids):
+            key_bytes = self._key_bytes.get((key_id, encryption_type)) if key_id is not None else None
+            if key_bytes:
+                candidates.append((key_id, key_bytes))
+        return candidates
+
+
+def _decrypt_page(
+    rows: list,
+    target: _RetryTarget,
+    state_keys: StateKeyIndex,
+    masterkey: MasterKey | None,
+) -> tuple[list[tuple[int, str, int | None]], list[str]]:
+    """Decrypt a page of undecrypted rows, resolving state keys once per group of rows sharing them.
+
+    Runs in a worker thread (AES/DPAPI work).
+
+    Returns:
+        (id, decrypted value, state key id) for each decrypted row, and error messages
+    """
+    updates: list[tuple[int, str, int | None]] = []
+    errors: list[str] = []
+
+    groups: dict[tuple, list] = defaultdict(list)
+    for row in rows:
+        groups[(row["source"], row["username"], row["browser"], row["state_key_id"], row["encryption_type"])].append(
+            row
+        )
+
+    for (source, username, browser, state_key_id, encryption_type), group in groups.items():
+        try:
+            if encryption_type == "dpapi":
+                if masterkey is None:
+                    continue
+                for row in group:
+                    try:
+                        blob = Blob.from_bytes(row["value_enc"])
+                        if blob.masterkey_guid != masterkey.guid:
+                            continue
+                        value_dec = blob.decrypt(masterkey).decode("utf-8", errors="replace")
+                        if value_dec:
+                            updates.append((row["id"], value_dec, row["state_key_id"]))
+                    except Exception as e:
+                        logger.warning(f"Error decrypting {target.item} with DPAPI", row_id=row["id"], error=str(e))
+                continue
+
+            candidates = state_keys.candidates(
+                source, username, browser, state_key_id, encryption_type, target.source_fallback
+            )
+            for row in group:
+                for key_id, key_bytes in candidates:
+                    value_dec_bytes = decrypt_chrome_string(row["value_enc"], key_bytes, encryption_type)
+                    if value_dec_bytes:
+                        value_dec = target.strip_offsets(value_dec_bytes, encryption_type).decode(
+                            "utf-8", errors="replace"
+                        )
+                        if value_dec:
+                            updates.append((row["id"], value_dec, key_id))
+                        break
+
+        except Exception as e:
+            logger.warning(
+                f"Failed to retry decrypt {target.item}s",
+                source=source,
+                username=username,
+                browser=browser,
+                state_key_id=state_key_id,
+                error=str(e),
+            )
+            errors.append(f"Error processing {target.item}s for {source}/{username}/{browser}: {str(e)}")
+
+    return updates, errors
+
+
+async def _retry_decrypt_table(
+    target: _RetryTarget,
+    masterkey_guid: UUID,
+    masterkey: MasterKey | None,
+    state_keys: StateKeyIndex,
+    asyncpg_pool: asyncpg.Pool,
+) -> dict:
+    """Retry decrypting the undecrypted rows of one table that the available keys could decrypt.
+
+    Only DPAPI rows for this (decrypted) masterkey and key/abe rows that one of `state_keys` could
+    decrypt (linked to it, from its owner, or login fallbacks from its source) are read, a page at a
+    time, and each page is written back with a single UPDATE.
+
+    Returns:
+        Dict with {"attempted": int, "decrypted": int, "errors": list}
+    """
+    result = {"attempted": 0, "decrypted": 0, "errors": []}
+
+    dpapi_guid = str(masterkey_guid) if masterkey is not None else None
+    sources = state_keys.sources if target.source_fallback else []
+    owners = state_keys.owners
+    state_key_ids = state_keys.ids
+    if dpapi_guid is None and not state_key_ids:
+        return result
+
+    last_id = 0
+    while True:
+        async with asyncpg_pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT id, encryption_type, masterkey_guid, state_key_id,
+                       {target.enc_column} AS value_enc, source, username, browser
+                FROM {target.table}
+                WHERE is_decrypted = FALSE
+                AND id > $1
+                AND (
+                    (encryption_type = 'dpapi' AND masterkey_guid = $2::uuid)
+                    OR (
+                        encryption_type IN ('key', 'abe')
+                        AND (
+                            state_key_id = ANY($3::int[])
+                            OR (source, username, browser) IN (
+                                SELECT * FROM unnest($4::text[], $5::text[], $6::text[])
+                            )
+                            OR (
+                                source = ANY($7::text[])
+                                AND (COALESCE(username, '') = '' OR COALESCE(browser, '') = '')
+                            )
+                        )
+                    )
+                )
+                ORDER BY id
+                LIMIT $8
+                """,
+                last_id,
+                dpapi_guid,
+                state_key_ids,
+                [owner[0] for owner in owners],
+                [owner[1] for owner in owners],
+                [owner[2] for owner in owners],
+                sources,
+                RETRY_PAGE_SIZE,
+            )
+
+        if not rows:
+            break
+
+        last_id = rows[-1]["id"]
+        result["attempted"] += len(rows)
+
+        updates, errors = await asyncio.to_thread(_decrypt_page, rows, target, state_keys, masterkey)
+        result["errors"].extend(errors)
+
+        if updates:
+            async with asyncpg_pool.acquire() as conn:
+                await conn.execute(
+                    f"""
+                    UPDATE {target.table} AS t
+                    SET {target.dec_column} = v.value_dec, is_decrypted = TRUE, state_key_id = v.state_key_id
+                    FROM unnest($1::int[], $2::text[], $3::int[]) AS v(id, value_dec, state_key_id)
+                    WHERE t.id = v.id
+                    """,
+                    [update[0] for update in updates],
+                    [update[1] for update in updates],
+                    [update[2] for update in updates],
+                )
+            result["decrypted"] += len(updates)
+
+        if len(rows) < RETRY_PAGE_SIZE:
+            break
+
+    logger.debug(
+        f"Retried undecrypted {target.item}s",
+        masterkey_guid=masterkey_guid,
+        attempted=result["attempted"],
+        decrypted=result["decrypted"],
+    )
+    return result
+
 
 async def retry_decrypt_chromium_data(
-    masterkey_guid: UUID, dpapi_manager: DpapiManager, asyncpg_pool: asyncpg.Pool, masterkey_type: str | None = None
+    masterkey_guid: UUID,
+    dpapi_manager: DpapiManager,
+    asyncpg_pool: asyncpg.Pool,
+    masterkey_type: str | None = None,
+    state_key_ids: list[int] | None = None,
 ) -> dict:
     """Retry decrypting cookies and logins that failed to decrypt previously.
 
     When a new masterkey becomes available, this function:
     1. Retries DPAPI-encrypted cookies/logins that use this masterkey
-    2. Retries key/abe-encrypted cookies/logins (state keys may now be decrypted)
+    2. Retries key/abe-encrypted cookies/logins that the state keys protected by this masterkey
+       (now decrypted) can decrypt
 
     Args:
         masterkey_guid: The GUID of the newly available masterkey
         dpapi_manager: DpapiManager instance for decryption
         asyncpg_pool: Async Postgres connection pool
         masterkey_type: Optional masterkey type ('system', 'user', 'unknown')
+        state_key_ids: Other newly decrypted state keys to retry with (e.g. a submitted app-bound key)
 
     Returns:
         Dict with statistics: {
@@ -44,14 +356,19 @@ async def retry_decrypt_chromium_data(
     }
 
     try:
+        # Resolve the masterkey and the state keys it unlocked once for both tables
+        masterkeys = await dpapi_manager.get_masterkeys(guid=masterkey_guid)
+        masterkey = masterkeys[0] if masterkeys and masterkeys[0].is_decrypted else None
+        state_keys = await StateKeyIndex.load(asyncpg_pool, masterkey_guid, state_key_ids)
+
         # Retry cookies
-        cookies_result = await _retry_decrypt_cookies(masterkey_guid, dpapi_manager, asyncpg_pool)
+        cookies_result = await _retry_decrypt_table(COOKIES, masterkey_guid, masterkey, state_keys, asyncpg_pool)
         result["cookies_attempted"] = cookies_result["attempted"]
         result["cookies_decrypted"] = cookies_result["decrypted"]
         result["errors"].extend(cookies_result["errors"])
 
         # Retry logins
-        logins_result = await _retry_decrypt_logins(masterkey_guid, dpapi_manager, asyncpg_pool)
+        logins_result = await _retry_decrypt_table(LOGINS, masterkey_guid, masterkey, state_keys, asyncpg_pool)
         result["logins_attempted"] = logins_result["attempted"]
         result["logins_decrypted"] = logins_result["decrypted"]
         result["errors"].extend(logins_result["errors"])
@@ -72,370 +389,3 @@ async def retry_decrypt_chromium_data(
         result["errors"].append(error_msg)
 
     return result
-
-
-async def _retry_decrypt_cookies(masterkey_guid: UUID, dpapi_manager: DpapiManager, asyncpg_pool: asyncpg.Pool) -> dict:
-    """Retry decrypting cookies that previously failed.
-
-    Args:
-        masterkey_guid: The GUID of the newly available masterkey
-        dpapi_manager: DpapiManager instance for decryption
-        asyncpg_pool: Async Postgres connection pool
-
-    Returns:
-        Dict with {"attempted": int, "decrypted": int, "errors": list}
-    """
-    result = {"attempted": 0, "decrypted": 0, "errors": []}
-
-    # Find all undecrypted cookies
-    # For DPAPI: only those matching this masterkey
-    # For key/abe: all undecrypted (state keys may now be available)
-    async with asyncpg_pool.acquire() as conn:
-        cookies = await conn.fetch(
-            """
-            SELECT id, encryption_type, masterkey_guid, state_key_id,
-                   value_enc, source, username, browser
-            FROM chromium.cookies
-            WHERE is_decrypted = FALSE
-            AND (
-                (encryption_type = 'dpapi' AND masterkey_guid = $1)
-                OR encryption_type IN ('key', 'abe')
-            )
-            """,
-            str(masterkey_guid),
-        )
-
-    logger.debug(
-        "Found undecrypted cookies to retry",
-        masterkey_guid=masterkey_guid,
-        count=len(cookies),
-    )
-
-    for cookie in cookies:
-        result["attempted"] += 1
-        cookie_id = cookie["id"]
-        encryption_type = cookie["encryption_type"]
-        cookie_masterkey_guid = cookie["masterkey_guid"]
-        state_key_id = cookie["state_key_id"]
-        value_enc = cookie["value_enc"]
-        source = cookie["source"]
-        username = cookie["username"]
-        browser = cookie["browser"]
-
-        try:
-            value_dec = None
-            decrypted = False
-
-            # Try DPAPI decryption
-            if encryption_type == "dpapi" and cookie_masterkey_guid == str(masterkey_guid):
-                try:
-                    value_dec_bytes = await dpapi_manager.decrypt_blob(Blob.from_bytes(value_enc))
-                    if value_dec_bytes:
-                        value_dec = value_dec_bytes.decode("utf-8", errors="replace")
-                        decrypted = True
-                        logger.debug("Successfully decrypted cookie with DPAPI", cookie_id=cookie_id)
-                except (MasterKeyNotFoundError, MasterKeyNotDecryptedError):
-                    # Still not available
-                    pass
-                except Exception as e:
-                    logger.warning("Error decrypting cookie with DPAPI", cookie_id=cookie_id, error=str(e))
-
-            # Try state key decryption (key/abe)
-            elif encryption_type in ["key", "abe"]:
-                # Try with existing state_key_id if available
-                if state_key_id:
-                    state_key_bytes = await get_state_key_bytes(state_key_id, encryption_type, asyncpg_pool)
-                    if state_key_bytes:
-                        try:
-                            value_dec_bytes = decrypt_chrome_string(value_enc, state_key_bytes, encryption_type)
-                            if value_dec_bytes:
-                                # Apply offset handling for cookies
-                                if encryption_type == "abe" and len(value_dec_bytes) > 32:
-                                    value_dec_bytes = value_dec_bytes[32:]
-                                elif encryption_type == "key" and len(value_dec_bytes) > 48:
-                                    value_dec_bytes = value_dec_bytes[32:-16]
-                                elif encryption_type == "key" and len(value_dec_bytes) > 16:
-                                    value_dec_bytes = value_dec_bytes[:-16]
-
-                                value_dec = value_dec_bytes.decode("utf-8", errors="replace")
-                                decrypted = True
-                                logger.debug(
-                                    "Successfully decrypted cookie with state key",
-                                    cookie_id=cookie_id,
-                                    state_key_id=state_key_id,
-                                )
-                        except Exception as e:
-                            logger.debug(
-                                "Failed to decrypt cookie with state key",
-                                cookie_id=cookie_id,
-                                state_key_id=state_key_id,
-                                error=str(e),
-                            )
-
-                # If no state_key_id or decryption failed, try to find matching state key
-                if not decrypted and username and browser:
-                    try:
-                        async with asyncpg_pool.acquire() as conn:
-                            # Try to find a decrypted state key for this source/username/browser
-                            state_key_row = await conn.fetchrow(
-                                """
-                                SELECT id FROM chromium.state_keys
-                                WHERE source = $1 AND username = $2 AND browser = $3
-                                AND (
-                                    (key_is_decrypted = TRUE AND $4 = 'key')
-                                    OR (app_bound_key_is_decrypted = TRUE AND $5 = 'abe')
-                                )
-                                """,
-                                source,
-                                username,
-                                browser,
-                                encryption_type,
-                                encryption_type,
-                            )
-                            if state_key_row:
-                                new_state_key_id = state_key_row["id"]
-                                state_key_bytes = await get_state_key_bytes(
-                                    new_state_key_id, encryption_type, asyncpg_pool
-                                )
-                                if state_key_bytes:
-                                    try:
-                                        value_dec_bytes = decrypt_chrome_string(
-                                            value_enc, state_key_bytes, encryption_type
-                                        )
-                                        if value_dec_bytes:
-                                            # Apply offset handling
-                                            if encryption_type == "abe" and len(value_dec_bytes) > 32:
-                                                value_dec_bytes = value_dec_bytes[32:]
-                                            elif encryption_type == "key" and len(value_dec_bytes) > 48:
-                                                value_dec_bytes = value_dec_bytes[32:-16]
-                                            elif encryption_type == "key" and len(value_dec_bytes) > 16:
-                                                value_dec_bytes = value_dec_bytes[:-16]
-
-                                            value_dec = value_dec_bytes.decode("utf-8", errors="replace")
-                                            decrypted = True
-                                            state_key_id = new_state_key_id
-                                            logger.debug(
-                                                "Successfully decrypted cookie with newly found state key",
-                                                cookie_id=cookie_id,
-                                                state_key_id=new_state_key_id,
-                                            )
-                                    except Exception as e:
-                                        logger.debug(
-                                            "Failed to decrypt cookie with newly found state key",
-                                            cookie_id=cookie_id,
-                                            error=str(e),
-                                        )
-                    except Exception as e:
-                        logger.debug("Error looking up state key for cookie", cookie_id=cookie_id, error=str(e))
-
-            # Update database if decrypted
-            if decrypted and value_dec:
-                async with asyncpg_pool.acquire() as conn:
-                    await conn.execute(
-                        """
-                        UPDATE chromium.cookies
-                        SET value_dec = $1, is_decrypted = TRUE, state_key_id = $2
-                        WHERE id = $3
-                        """,
-                        value_dec,
-                        state_key_id,
-                        cookie_id,
-                    )
-                result["decrypted"] += 1
-
-        except Exception as e:
-            error_msg = f"Error processing cookie {cookie_id}: {str(e)}"
-            logger.warning("Failed to retry decrypt cookie", cookie_id=cookie_id, error=str(e))
-            result["errors"].append(error_msg)
-
-    return result
-
-
-async def _retry_decrypt_logins(masterkey_guid: UUID, dpapi_manager: DpapiManager, asyncpg_pool: asyncpg.Pool) -> dict:
-    """Retry decrypting logins that previously failed.
-
-    Args:
-        masterkey_guid: The GUID of the newly available masterkey
-        dpapi_manager: DpapiManager instance for decryption
-        asyncpg_pool: Async Postgres connection pool
-
-    Returns:
-        Dict with {"attempted": int, "decrypted": int, "errors": list}
-    """
-    result = {"attempted": 0, "decrypted": 0, "errors": []}
-
-    # Find all undecrypted logins
-    async with asyncpg_pool.acquire() as conn:
-        logins = await conn.fetch(
-            """
-            SELECT id, encryption_type, masterkey_guid, state_key_id,
-                   password_value_enc, source, username, browser
-            FROM chromium.logins
-            WHERE is_decrypted = FALSE
-            AND (
-                (encryption_type = 'dpapi' AND masterkey_guid = $1)
-                OR encryption_type IN ('key', 'abe')
-            )
-            """,
-            str(masterkey_guid),
-        )
-
-    logger.debug(
-        "Found undecrypted logins to retry",
-        masterkey_guid=masterkey_guid,
-        count=len(logins),
-    )
-
-    for login in logins:
-        result["attempted"] += 1
-        login_id = login["id"]
-        encryption_type = login["encryption_type"]
-        login_masterkey_guid = login["masterkey_guid"]
-        state_key_id = login["state_key_id"]
-        password_value_enc = login["password_value_enc"]
-        source = login["source"]
-        username = login["username"]
-        browser = login["browser"]
-
-        try:
-            password_dec = None
-            decrypted = False
-
-            # Try DPAPI decryption
-            if encryption_type == "dpapi" and login_masterkey_guid == str(masterkey_guid):
-                try:
-                    password_dec_bytes = await dpapi_manager.decrypt_blob(Blob.from_bytes(password_value_enc))
-                    if password_dec_bytes:
-                        password_dec = password_dec_bytes.decode("utf-8", errors="replace")
-                        decrypted = True
-                        logger.debug("Successfully decrypted login with DPAPI", login_id=login_id)
-                except (MasterKeyNotFoundError, MasterKeyNotDecryptedError):
-                    # Still not available
-                    pass
-                except Exception as e:
-                    logger.warning("Error decrypting login with DPAPI", login_id=login_id, error=str(e))
-
-            # Try state key decryption (key/abe)
-            elif encryption_type in ["key", "abe"]:
-                # Try with existing state_key_id if available
-                if state_key_id:
-                    state_key_bytes = await get_state_key_bytes(state_key_id, encryption_type, asyncpg_pool)
-                    if state_key_bytes:
-                        try:
-                            password_dec_bytes = decrypt_chrome_string(
-                                password_value_enc, state_key_bytes, encryption_type
-                            )
-                            if password_dec_bytes:
-                                # Apply offset handling for passwords
-                                if encryption_type == "key" and len(password_dec_bytes) > 32:
-                                    password_dec_bytes = password_dec_bytes[32:-16]
-                                elif encryption_type == "key" and len(password_dec_bytes) > 16:
-                                    password_dec_bytes = password_dec_bytes[:-16]
-                                # v20 passwords typically don't have offset like cookies
-
-                                password_dec = password_dec_bytes.decode("utf-8", errors="replace")
-                                decrypted = True
-                                logger.debug(
-                                    "Successfully decrypted login with state key",
-                                    login_id=login_id,
-                                    state_key_id=state_key_id,
-                                )
-                        except Exception as e:
-                            logger.debug(
-                                "Failed to decrypt login with state key",
-                                login_id=login_id,
-                                state_key_id=state_key_id,
-                                error=str(e),
-                            )
-
-                # If no state_key_id or decryption failed, try to find matching state key
-                if not decrypted and source:
-                    try:
-                        async with asyncpg_pool.acquire() as conn:
-                            if username and browser:
-                                # Try to find a decrypted state key for this source/username/browser
-                                state_key_row = await conn.fetchrow(
-                                    """
-                                    SELECT id FROM chromium.state_keys
-                                    WHERE source = $1 AND username = $2 AND browser = $3
-                                    AND (
-                                        (key_is_decrypted = TRUE AND $4 = 'key')
-                                        OR (app_bound_key_is_decrypted = TRUE AND $5 = 'abe')
-                                    )
-                                    """,
-                                    source,
-                                    username,
-                                    browser,
-                                    encryption_type,
-                                    encryption_type,
-                                )
-                            else:
-                                # if no username/password, just restrict to SOURCE
-                                state_key_row = await conn.fetchrow(
-                                    """
-                                    SELECT id FROM chromium.state_keys
-                                    WHERE source = $1
-                                    AND (
-                                        (key_is_decrypted = TRUE AND $2 = 'key')
-                                        OR (app_bound_key_is_decrypted = TRUE AND $3 = 'abe')
-                                    )
-                                    """,
-                                    source,
-                                    encryption_type,
-                                    encryption_type,
-                                )
-                            if state_key_row:
-                                new_state_key_id = state_key_row["id"]
-                                state_key_bytes = await get_state_key_bytes(
-                                    new_state_key_id, encryption_type, asyncpg_pool
-                                )
-                                if state_key_bytes:
-                                    try:
-                                        password_dec_bytes = decrypt_chrome_string(
-                                            password_value_enc, state_key_bytes, encryption_type
-                                        )
-                                        if password_dec_bytes:
-                                            # Apply offset handling
-                                            if encryption_type == "key" and len(password_dec_bytes) > 32:
-                                                password_dec_bytes = password_dec_bytes[32:-16]
-                                            elif encryption_type == "key" and len(password_dec_bytes) > 16:
-                                                password_dec_bytes = password_dec_bytes[:-16]
-
-                                            password_dec = password_dec_bytes.decode("utf-8", errors="replace")
-                                            decrypted = True
-                                            state_key_id = new_state_key_id
-                                            logger.debug(
-                                                "Successfully decrypted login with newly found state key",
-                                                login_id=login_id,
-                                                state_key_id=new_state_key_id,
-                                            )
-                                    except Exception as e:
-                                        logger.debug(
-                                            "Failed to decrypt login with newly found state key",
-                                            login_id=login_id,
-                                            error=str(e),
-                                        )
-                    except Exception as e:
-                        logger.debug("Error looking up state key for login", login_id=login_id, error=str(e))
-
-            # Update database if decrypted
-            if decrypted and password_dec:
-                async with asyncpg_pool.acquire() as conn:
-                    await conn.execute(
-                        """
-                        UPDATE chromium.logins
-                        SET password_value_dec = $1, is_decrypted = TRUE, state_key_id = $2
-                        WHERE id = $3
-                        """,
-                        password_dec,
-                        state_key_id,
-                        login_id,
-                    )
-                result["decrypted"] += 1
-
-        except Exception as e:
-            error_msg = f"Error processing login {login_id}: {str(e)}"
-            logger.warning("Failed to retry decrypt login", login_id=login_id, error=str(e))
-            result["errors"].append(error_msg)
-
-    return result
@@ -0,0 +1,119 @@
+"""Tests for retroactive Chromium decryption helpers."""
+
+import os
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from chromium.retry import COOKIES, LOGINS, StateKeyIndex, _decrypt_page, _retry_decrypt_table
+from Crypto.Cipher import AES
+
+KEY = os.urandom(32)
+
+
+def state_key_row(key_id, source, username, browser, abe_key=KEY):
+    return {
+        "id": key_id,
+        "source": source,
+        "username": username,
+        "browser": browser,
+        "key_is_decrypted": False,
+        "key_bytes_dec": None,
+        "app_bound_key_is_decrypted": abe_key is not None,
+        "app_bound_key_dec": abe_key,
+    }
+
+
+def encrypt_v20(plaintext: bytes, key: bytes = KEY) -> bytes:
+    iv = os.urandom(12)
+    ciphertext, tag = AES.new(key, AES.MODE_GCM, iv).encrypt_and_digest(plaintext)
+    return b"v20" + iv + ciphertext + tag
+
+
+def value_row(row_id, value_enc, source="host", username="alice", browser="chrome", state_key_id=None):
+    return {
+        "id": row_id,
+        "encryption_type": "abe",
+        "masterkey_guid": None,
+        "state_key_id": state_key_id,
+        "value_enc": value_enc,
+        "source": source,
+        "username": username,
+        "browser": browser,
+    }
+
+
+def test_state_key_index_candidates():
+    index = StateKeyIndex([state_key_row(1, "host", "alice", "chrome"), state_key_row(2, "host", "bob", "edge", None)])
+
+    assert index.sources == ["host"]
+    assert index.owners == [("host", "alice", "chrome")]
+    assert index.ids == [1]
+    assert index.candidates("host", "alice", "chrome", None, "abe", False) == [(1, KEY)]
+    assert index.candidates("host", "alice", "chrome", 1, "abe", False) == [(1, KEY)]
+    assert index.candidates("host", "bob", "edge", None, "abe", False) == []
+    assert index.candidates("host", None, None, None, "abe", False) == []
+    assert index.candidates("host", None, None, None, "abe", True) == [(1, KEY)]
+    assert index.candidates("host", "alice", "chrome", None, "key", False) == []
+
+
+def test_decrypt_page_groups_rows_and_strips_offsets():
+    index = StateKeyIndex([state_key_row(1, "host", "alice", "chrome")])
+    rows = [
+        value_row(10, encrypt_v20(b"\x00" * 32 + b"cookie-a")),
+        value_row(11, encrypt_v20(b"\x00" * 32 + b"cookie-b")),
+        value_row(12, encrypt_v20(b"\x00" * 32 + b"other", key=os.urandom(32))),
+        value_row(13, encrypt_v20(b"\x00" * 32 + b"nokey"), username="bob"),
+    ]
+
+    updates, errors = _decrypt_page(rows, COOKIES, index, masterkey=None)
+
+    assert updates == [(10, "cookie-a", 1), (11, "cookie-b", 1)]
+    assert errors == []
+
+
+def test_decrypt_page_logins_fall_back_to_source_key():
+    index = StateKeyIndex([state_key_row(1, "host", "alice", "chrome")])
+    rows = [value_row(20, encrypt_v20(b"hunter2"), username=None, browser=None)]
+
+    assert _decrypt_page(rows, LOGINS, index, masterkey=None) == ([(20, "hunter2", 1)], [])
+    assert _decrypt_page(rows, COOKIES, index, masterkey=None) == ([], [])
+
+
+class FakePool:
+    def __init__(self):
+        self.fetches = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    async def fetch(self, query, *args):
+        self.fetches.append(args)
+        return []
+
+
+@pytest.mark.asyncio
+async def test_retry_only_selects_rows_the_new_state_keys_can_decrypt():
+    index = StateKeyIndex([state_key_row(1, "host", "alice", "chrome"), state_key_row(2, "other", "bob", "edge")])
+    pool = FakePool()
+
+    await _retry_decrypt_table(COOKIES, uuid4(), None, index, pool)
+    await _retry_decrypt_table(LOGINS, uuid4(), None, index, pool)
+
+    (_, _, cookie_ids, *cookie_owners, cookie_sources, _), (_, _, _, _, _, _, login_sources, _) = pool.fetches
+    assert cookie_ids == [1, 2]
+    assert cookie_owners == [["host", "other"], ["alice", "bob"], ["chrome", "edge"]]
+    # Only logins fall back to any key from their source
+    assert cookie_sources == []
+    assert login_sources == ["host", "other"]
+
+
+@pytest.mark.asyncio
+async def test_retry_without_new_keys_reads_nothing():
+    pool = FakePool()
+
+    result = await _retry_decrypt_table(COOKIES, uuid4(), None, StateKeyIndex([]), pool)
+
+    assert result == {"attempted": 0, "decrypted": 0, "errors": []}
+    assert pool.fetches == []
@@ -0,0 +1,254 @@
+"""Node-local, size-bounded cache of downloaded storage objects.
+
+A single ``LocalFileCache`` is shared by every ``StorageS3`` instance in a process so that an
+object is pulled from S3 once and then served from local disk to every activity and enrichment
+module that asks for it. Entries are evicted least-recently-used once the cache exceeds its byte
+budget, but never while a reader still holds a handle to them (entries are refcounted).
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    path: str
+    size: int = 0
+    refcount: int = 0
+    ready: threading.Event = field(default_factory=threading.Event)
+    error: BaseException | None = None
+    evict_on_release: bool = False
+
+
+class CachedFile:
+    """Read-only handle to a cached object.
+
+    Mirrors the parts of ``tempfile.NamedTemporaryFile`` that callers of ``StorageS3.download()``
+    rely on: ``.name`` is the local path, the handle is a context manager, and file methods such as
+    ``read()``/``seek()`` are delegated to a binary file opened on first use. Closing the handle
+    releases the reader's reference on the cache entry.
+    """
+
+    def __init__(self, cache: "LocalFileCache", key: str, path: str) -> None:
+        self.name = path
+        self._cache = cache
+        self._key = key
+        self._file = None
+        self._closed = False
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if self._file is None:
+            self._file = open(self.name, "rb")
+        return getattr(self._file, attr)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._cache.release(self._key)
+
+    def __enter__(self) -> "CachedFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class LocalFileCache:
+    """LRU, refcounted, byte-bounded cache of files on local disk.
+
+    Args:
+        cache_dir: Directory the cached files are written to (created if missing). It must belong to
+            this cache alone: files left in it by a previous run are deleted on startup, since they
+            can't be mapped back to their keys and would otherwise never be evicted.
+        max_bytes: Soft upper bound on the total size of cached files. Entries that are in use are
+            never evicted, so the cache may temporarily exceed this while readers hold handles.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._remove_stale_files()
+
+    def _remove_stale_files(self) -> None:
+        removed = removed_bytes = 0
+        with os.scandir(self.cache_dir) as entries:
+            for dir_entry in entries:
+                if not dir_entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    size = dir_entry.stat(follow_symlinks=False).st_size
+                    os.remove(dir_entry.path)
+                except FileNotFoundError:
+                    continue
+                except OSError:
+                    logger.warning("Failed to remove stale cached file", path=dir_entry.path)
+                    continue
+                removed += 1
+                removed_bytes += size
+
+        if removed:
+            logger.info("Removed stale cached files", cache_dir=self.cache_dir, files=removed, bytes=removed_bytes)
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key.replace("/", "_"))
+
+    def open(self, key: str, fetch: Callable[[str], None]) -> CachedFile:
+        """Return a handle to the cached file for `key`, calling `fetch(path)` to populate it on a miss.
+
+        Concurrent callers asking for the same key while it is being fetched wait for the first
+        fetch to finish instead of downloading the object again.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refcount += 1
+                self._entries.move_to_end(key)
+                owner = False
+                self.hits += 1
+            else:
+                entry = _CacheEntry(path=self._path_for(key), refcount=1)
+                self._entries[key] = entry
+                owner = True
+                self.misses += 1
+
+        if owner:
+            self._populate(key, entry, fetch)
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                self.release(key)
+                raise entry.error
+
+        return CachedFile(self, key, entry.path)
+
+    def _populate(self, key: str, entry: _CacheEntry, fetch: Callable[[str], None]) -> None:
+        # download to a unique partial path so a crashed fetch never leaves a truncated entry behind
+        partial_path = f"{entry.path}.{uuid.uuid4().hex}.part"
+        try:
+            fetch(partial_path)
+            os.replace(partial_path, entry.path)
+            entry.size = os.path.getsize(entry.path)
+        except BaseException as e:
+            entry.error = e
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            entry.ready.set()
+            raise
+
+        with self._lock:
+            self.total_bytes += entry.size
+            if entry.size > self.max_bytes:
+                # larger than the whole budget - serve it to current readers, but don't retain it
+                entry.evict_on_release = True
+            self._evict_locked()
+        entry.ready.set()
+
+    def release(self, key: str) -> None:
+        """Drop a reader's reference to `key`, deleting the entry if it was marked for eviction."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount = max(entry.refcount - 1, 0)
+            if entry.refcount == 0 and entry.evict_on_release:
+                self._remove_locked(key, entry)
+            else:
+                self._evict_locked()
+
+    def evict(self, key: str) -> None:
+        """Remove `key` from the cache now, or as soon as its last reader releases it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if entry.refcount == 0 and entry.ready.is_set():
+                self._remove_locked(key, entry)
+            else:
+                entry.evict_on_release = True
+
+    def _evict_locked(self) -> None:
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key, entry in list(self._entries.items()):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if entry.refcount == 0 and entry.ready.is_set():
+                self._remove_locked(key, entry)
+
+    def _remove_locked(self, key: str, entry: _CacheEntry) -> None:
+        del self._entries[key]
+        self.total_bytes -= entry.size
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning("Failed to remove cached file", key=key, path=entry.path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "in_use": sum(1 for e in self._entries.values() if e.refcount > 0),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_file_cache: LocalFileCache | None = None
+
+
+def configure_file_cache(cache_dir: str, max_bytes: int) -> LocalFileCache | None:
+    """Enable the process-wide file cache used by ``StorageS3.download()``.
+
+    A `max_bytes` of 0 (or less) disables caching.
+    """
+    global _file_cache
+    if max_bytes <= 0:
+        _file_cache = None
+    else:
+        _file_cache = LocalFileCache(cache_dir, max_bytes)
+        logger.info("Local file cache enabled", cache_dir=cache_dir, max_bytes=max_bytes)
+    return _file_cache
+
+
+def get_file_cache() -> LocalFileCache | None:
+    """Return the process-wide file cache, or None if caching is not enabled."""
+    return _file_cache
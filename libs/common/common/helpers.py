@@ -2,33 +2,94 @@ import hashlib
 import io
 import posixpath
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import BinaryIO
 
+HASH_FUNCS = {"md5": hashlib.md5, "sha1": hashlib.sha1, "sha256": hashlib.sha256}
 
-def calculate_file_hash(file_path: str, hash_type: str) -> str:
+# Files at least this large have their digests updated concurrently. hashlib releases the GIL while
+#   hashing buffers, so each digest gets its own core; below this the thread handoff isn't worth it.
+PARALLEL_HASH_MIN_SIZE = 8 * 1024 * 1024
+
+_hash_executor: ThreadPoolExecutor | None = None
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=len(HASH_FUNCS), thread_name_prefix="file-hash")
+    return _hash_executor
+
+
+def calculate_file_hashes(
+    file_path: str,
+    hash_types: tuple[str, ...] = ("md5", "sha1", "sha256"),
+    header_size: int = 0,
+    chunk_size: int = 1024 * 1024,
+) -> tuple[dict[str, str], bytes]:
     """
-    Calculate the hash of a file using the specified algorithm.
+    Calculate several hashes of a file in a single pass, optionally returning its leading bytes.
+
+    The file is read once into a reusable buffer and every digest is fed from the same chunk, so
+    the cost is one sequential read regardless of how many hash types are requested.
 
     Args:
         file_path (str): Path to the file
-        hash_type (str): Type of hash to calculate ('md5', 'sha1', or 'sha256')
+        hash_types (tuple[str, ...]): Hash types to calculate ('md5', 'sha1', and/or 'sha256')
+        header_size (int): Number of leading bytes of the file to return alongside the hashes
+        chunk_size (int): Read buffer size in bytes
 
     Returns:
-        str: Hexadecimal string of the calculated hash
+        tuple[dict[str, str], bytes]: Hash type -> hexadecimal digest, and the first `header_size` bytes
     """
-    hash_funcs = {"md5": hashlib.md5, "sha1": hashlib.sha1, "sha256": hashlib.sha256}
+    hashers = []
+    for hash_type in hash_types:
+        hash_func = HASH_FUNCS.get(hash_type.lower())
+        if not hash_func:
+            raise ValueError(f"Unsupported hash type: {hash_type}")
+        hashers.append(hash_func())
 
-    hash_func = hash_funcs.get(hash_type.lower())
-    if not hash_func:
-        raise ValueError(f"Unsupported hash type: {hash_type}")
+    header = bytearray()
+    buffer = bytearray(max(chunk_size, header_size))
+    view = memoryview(buffer)
 
-    hasher = hash_func()
     with open(file_path, "rb") as f:
-        # Read the file in chunks to handle large files efficiently
-        for chunk in iter(lambda: f.read(4096), b""):
-            hasher.update(chunk)
+        f.seek(0, io.SEEK_END)
+        parallel = len(hashers) > 1 and f.tell() >= PARALLEL_HASH_MIN_SIZE
+        f.seek(0)
+
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            chunk = view[:n]
+
+            if len(header) < header_size:
+                header += chunk[: header_size - len(header)]
+
+            if parallel:
+                # wait for every digest before the buffer is reused for the next read
+                list(_get_hash_executor().map(lambda hasher, data=chunk: hasher.update(data), hashers))
+            else:
+                for hasher in hashers:
+                    hasher.update(chunk)
+
+    return {hash_type: hasher.hexdigest() for hash_type, hasher in zip(hash_types, hashers, strict=True)}, bytes(header)
+
+
+def calculate_file_hash(file_path: str, hash_type: str) -> str:
+    """
+    Calculate the hash of a file using the specified algorithm.
+
+    Args:
+        file_path (str): Path to the file
+        hash_type (str): Type of hash to calculate ('md5', 'sha1', or 'sha256')
 
-    return hasher.hexdigest()
+    Returns:
+        str: Hexadecimal string of the calculated hash
+    """
+    hashes, _ = calculate_file_hashes(file_path, (hash_type,))
+    return hashes[hash_type]
 
 
 def can_convert_to_pdf(file_path: str) -> bool:
@@ -43,10 +104,9 @@ def can_convert_to_pdf(file_path: str) -> bool:
     return re.match(path_regex, file_path, re.IGNORECASE) is not None
 
 
-def is_container(mime_type: str) -> bool:
-    """Returns true if the mime type is a container we can currently extract."""
-
-    supported_mime_types = {
+# Mime types of containers we can currently extract
+CONTAINER_MIME_TYPES = frozenset(
+    {
         "application/zip",  # .zip
         "application/x-7z-compressed",  # .7z
         "application/x-rar",  # .rar
@@ -60,8 +120,12 @@ def is_container(mime_type: str) -> bool:
         # 'application/x-debian-package',
         # 'application/x-rpm'
     }
+)
+
 
-    return mime_type in supported_mime_types
+def is_container(mime_type: str) -> bool:
+    """Returns true if the mime type is a container we can currently extract."""
+    return mime_type in CONTAINER_MIME_TYPES
 
 
 def is_text_file(file_path: str, sample_size: int = 1024):
@@ -2,17 +2,23 @@ import os
 import tempfile
 import uuid
 from io import BytesIO
+from typing import BinaryIO
 
 from dapr.clients import DaprClient
 from fastapi import UploadFile
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 from urllib3 import PoolManager, Retry
 
+from .file_cache import CachedFile, get_file_cache
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Multipart part size for streams of unknown length (S3's minimum is 5 MiB)
+UNKNOWN_LENGTH_PART_SIZE = 16 * 1024 * 1024
+
 
 class StorageS3:
     def __init__(
@@ -43,7 +49,25 @@ class StorageS3:
         # the bucket name must be lowercase
         self.bucket_name = bucket_name.lower()
 
-    def download(self, file_uuid: str, delete: bool = True) -> tempfile._TemporaryFileWrapper:
+    def download(self, file_uuid: str, delete: bool = True) -> tempfile._TemporaryFileWrapper | CachedFile:
+        """Download an object to local disk.
+
+        If the process-wide file cache is enabled (see ``common.file_cache.configure_file_cache``) and
+        `delete` is True, the object is served from the cache and only fetched from S3 on a miss. The
+        returned handle is read-only in that case; callers that need to modify or keep the file should
+        pass delete=False to get a private copy.
+        """
+        file_cache = get_file_cache()
+        if file_cache is not None and delete:
+            try:
+                return file_cache.open(
+                    f"{self.bucket_name}/{file_uuid}",
+                    lambda path: self._fetch_to_path(file_uuid, path),
+                )
+            except Exception:
+                logger.exception(file_uuid=file_uuid, bucket_name=self.bucket_name)
+                raise
+
         try:
             temp_file = tempfile.NamedTemporaryFile(dir=self.data_download_dir, delete=delete)
 
@@ -66,6 +90,16 @@ class StorageS3:
             logger.exception(file_uuid=file_uuid, bucket_name=self.bucket_name)
             raise
 
+    def _fetch_to_path(self, file_uuid: str, dest_path: str) -> None:
+        logger.debug("Downloading from storage into file cache", file_uuid=file_uuid, dest_path=dest_path)
+        self.minio_client.fget_object(self.bucket_name, file_uuid, dest_path)
+
+    def evict_cached(self, file_uuid: str) -> None:
+        """Drop an object from the local file cache (no-op if caching is disabled)."""
+        file_cache = get_file_cache()
+        if file_cache is not None:
+            file_cache.evict(f"{self.bucket_name}/{file_uuid}")
+
     def download_bytes(self, file_uuid: str, offset: int = 0, length: int = 0) -> bytes:
         try:
             logger.debug("Starting file download from storage", file_uuid=file_uuid)
@@ -194,6 +228,28 @@ class StorageS3:
             logger.exception(file_path=file_path, bucket_name=self.bucket_name)
             raise
 
+    def upload_stream(self, data: BinaryIO, length: int = -1) -> str:
+        """Upload a readable binary stream.
+
+        Streams larger than one part are sent as a multipart upload with parallel part uploads,
+        so callers never need to write the data to a local file first. Pass a length of -1 when
+        the size is not known up front; the stream is then read in UNKNOWN_LENGTH_PART_SIZE parts.
+        """
+        try:
+            logger.debug(f"Uploading {length} byte stream to storage")
+            file_uuid = f"{uuid.uuid4()}"
+            self.minio_client.put_object(
+                bucket_name=self.bucket_name,
+                object_name=file_uuid,
+                data=data,
+                length=length,
+                part_size=0 if length >= 0 else UNKNOWN_LENGTH_PART_SIZE,
+            )
+            return file_uuid
+        except Exception:
+            logger.exception(bucket_name=self.bucket_name)
+            raise
+
     def upload(self, data: bytes) -> str:
         try:
             logger.debug(f"Uploading {len(data)} bytes to storage")
@@ -229,17 +285,35 @@ class StorageS3:
     def delete_objects(self, object_ids: list[str]) -> int:
         """Delete multiple objects from S3 storage.
 
+        Uses multi-object delete requests (up to 1000 keys per request) rather than one request per object.
+
         Args:
             object_ids (List[str]): List of object IDs to delete
 
         Returns:
             int: Count of successfully deleted objects
         """
-        success_count = 0
-        for object_id in object_ids:
-            if self.delete_object(object_id):
-                success_count += 1
-        return success_count
+        if not object_ids:
+            return 0
+
+        try:
+            # remove_objects is lazy and only reports the keys that failed to delete
+            errors = list(
+                self.minio_client.remove_objects(
+                    self.bucket_name, (DeleteObject(object_id) for object_id in object_ids)
+                )
+            )
+        except Exception:
+            logger.exception(message="Failed to delete objects from storage", count=len(object_ids))
+            return 0
+
+        for error in errors:
+            logger.warning(
+                "Failed to delete object from storage", object_id=error.name, code=error.code, error=error.message
+            )
+
+        logger.debug("Deleted objects from storage", count=len(object_ids) - len(errors), bucket=self.bucket_name)
+        return len(object_ids) - len(errors)
 
     def delete_all_files(self) -> bool:
         """
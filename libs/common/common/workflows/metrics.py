@@ -0,0 +1,301 @@
+"""Incrementally maintained workflow metrics.
+
+Every service that runs workflows keeps in-memory deltas of the per-status workflow counts and a
+runtime latency sketch as `WorkflowTrackingService` moves workflows between states, and periodically
+merges them into the single `workflow_metrics` row. Readers (the `/workflows/status` endpoint) then
+load one row instead of aggregating the whole `workflows` table.
+
+The row is created empty by the schema and re-seeded from the `workflows` table only by
+`reseed_workflow_metrics()` (on reset), never while flushing. Each reseed bumps the row's `generation`.
+Every workflow write reads the generation in the same statement (`METRICS_GENERATION_SQL`), and a delta
+is only merged into the row of the generation it was recorded under. Deltas already counted by a reseed,
+or made stale by a reset, are held in other processes until their next flush. Those processes drop them
+instead of counting them twice.
+"""
+
+import asyncio
+import json
+import math
+import threading
+from collections import Counter
+
+import asyncpg
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+METRICS_ROW = "workflows"
+DEFAULT_FLUSH_INTERVAL = 5
+
+# Runtimes at or below this many seconds share the first bucket
+SKETCH_MIN_VALUE = 0.001
+# Bucket width ratio; a value is reported within about 1% of its true value
+SKETCH_GAMMA = 1.02
+
+# Arbitrary key for the advisory lock serializing flushes and reseeds from all services
+_FLUSH_LOCK_KEY = 0x5746_4D45
+
+# Appended to the RETURNING clause of every workflows write, so the write reports the metrics generation it
+# will be counted under
+METRICS_GENERATION_SQL = f"COALESCE((SELECT generation FROM workflow_metrics WHERE name = '{METRICS_ROW}'), 0)"
+
+
+class LatencySketch:
+    """Log-bucketed latency histogram (HDR/DDSketch style).
+
+    Values fall into buckets whose bounds grow by a factor of SKETCH_GAMMA, so quantiles have a bounded
+    relative error, memory depends only on the range of values seen, and sketches merge by adding
+    bucket counts.
+    """
+
+    def __init__(self):
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    @staticmethod
+    def bucket_index(value: float) -> int:
+        if value <= SKETCH_MIN_VALUE:
+            return 0
+        return math.floor(math.log(value / SKETCH_MIN_VALUE) / math.log(SKETCH_GAMMA))
+
+    def add(self, value: float) -> None:
+        self.buckets[self.bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate the q-quantile (0 <= q <= 1) of the values added."""
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Geometric midpoint of the bucket, clamped to the observed range
+                value = SKETCH_MIN_VALUE * SKETCH_GAMMA ** (index + 0.5) if index else SKETCH_MIN_VALUE
+                if self.min is not None and self.max is not None:
+                    value = min(max(value, self.min), self.max)
+                return value
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "LatencySketch":
+        sketch = cls()
+        if data:
+            sketch.buckets = Counter({int(index): count for index, count in data.get("buckets", {}).items()})
+            sketch.count = data.get("count", 0)
+            sketch.total = data.get("sum", 0.0)
+            sketch.min = data.get("min")
+            sketch.max = data.get("max")
+        return sketch
+
+
+class WorkflowMetrics:
+    """Pending workflow metric deltas for this process, merged into Postgres by `flush()`."""
+
+    def __init__(self, pool: asyncpg.Pool, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        # generation -> (status deltas, runtimes) recorded under it
+        self._pending: dict[int, tuple[Counter[str], LatencySketch]] = {}
+
+    def _pending_for(self, generation: int) -> tuple[Counter[str], LatencySketch]:
+        if generation not in self._pending:
+            self._pending[generation] = (Counter(), LatencySketch())
+        return self._pending[generation]
+
+    def record_transition(self, old_status: str | None, new_status: str, generation: int) -> None:
+        """Record a workflow moving from `old_status` (None for a new workflow) to `new_status`.
+
+        `generation` is the metrics generation returned by the write that made the transition.
+        """
+        if old_status == new_status:
+            return
+        with self._lock:
+            status_deltas, _ = self._pending_for(generation)
+            if old_status is not None:
+                status_deltas[old_status] -= 1
+            status_deltas[new_status] += 1
+
+    def record_runtime(self, runtime_seconds: float, generation: int) -> None:
+        with self._lock:
+            _, runtimes = self._pending_for(generation)
+            runtimes.add(runtime_seconds)
+
+    def _take_pending(self) -> dict[int, tuple[Counter[str], LatencySketch]]:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        return pending
+
+    def _restore_pending(self, pending: dict[int, tuple[Counter[str], LatencySketch]]) -> None:
+        with self._lock:
+            for generation, (status_deltas, runtimes) in pending.items():
+                current_deltas, current_runtimes = self._pending_for(generation)
+                current_deltas.update(status_deltas)
+                current_runtimes.merge(runtimes)
+
+    async def flush(self) -> None:
+        """Merge pending deltas recorded under the row's current generation into the persisted metrics."""
+        pending = self._take_pending()
+        if not pending:
+            return
+
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("SELECT pg_advisory_xact_lock($1)", _FLUSH_LOCK_KEY)
+                    row = await conn.fetchrow(
+                        "SELECT status_counts, runtime_sketch, generation FROM workflow_metrics WHERE name = $1",
+                        METRICS_ROW,
+                    )
+                    # A missing row reads as generation 0 in METRICS_GENERATION_SQL too
+                    generation = row["generation"] if row is not None else 0
+
+                    stale = [g for g in pending if g != generation]
+                    if stale:
+                        # Recorded before a reseed that already counted (or reset) them
+                        logger.info("Dropping workflow metric deltas from an older generation", generations=stale)
+                    if generation not in pending:
+                        return
+                    status_deltas, runtimes = pending[generation]
+
+                    if row is None:
+                        status_counts, sketch = Counter(), LatencySketch()
+                    else:
+                        status_counts = Counter(json.loads(row["status_counts"]))
+                        sketch = LatencySketch.from_dict(json.loads(row["runtime_sketch"]))
+                    status_counts.update(status_deltas)
+                    sketch.merge(runtimes)
+
+                    await conn.execute(
+                        """
+                        INSERT INTO workflow_metrics (name, status_counts, runtime_sketch, updated_at)
+                        VALUES ($1, $2, $3, CURRENT_TIMESTAMP)
+                        ON CONFLICT (name) DO UPDATE
+                        SET status_counts = EXCLUDED.status_counts,
+                            runtime_sketch = EXCLUDED.runtime_sketch,
+                            updated_at = EXCLUDED.updated_at
+                        """,
+                        METRICS_ROW,
+                        json.dumps({status: count for status, count in status_counts.items() if count}),
+                        json.dumps(sketch.to_dict()),
+                    )
+        except Exception:
+            self._restore_pending(pending)
+            raise
+
+    async def run(self) -> None:
+        """Flush pending deltas every `flush_interval` seconds until cancelled, then flush once more."""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception:
+                    logger.exception(message="Error flushing workflow metrics")
+        finally:
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception(message="Error flushing workflow metrics on shutdown")
+
+
+async def reseed_workflow_metrics(conn: asyncpg.Connection) -> Counter[str]:
+    """Rebuild the metrics row from the workflows table and start a new generation.
+
+    Must run inside a transaction. Callers that also modify workflows in that transaction (e.g. a reset)
+    should take the same `EXCLUSIVE` lock on workflows first, before their own writes.
+
+    The lock waits for in-flight workflow writes to commit and holds off new ones until this
+    transaction commits. So every write either is counted by the seed and returns the old generation, or
+    is not counted and returns the new one.
+
+    Returns:
+        The seeded status counts
+    """
+    await conn.execute("LOCK TABLE workflows IN EXCLUSIVE MODE")
+    await conn.execute("SELECT pg_advisory_xact_lock($1)", _FLUSH_LOCK_KEY)
+    status_counts, sketch = await seed_from_workflows(conn)
+    await conn.execute(
+        """
+        INSERT INTO workflow_metrics (name, status_counts, runtime_sketch, generation, updated_at)
+        VALUES ($1, $2, $3, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT (name) DO UPDATE
+        SET status_counts = EXCLUDED.status_counts,
+            runtime_sketch = EXCLUDED.runtime_sketch,
+            generation = workflow_metrics.generation + 1,
+            updated_at = EXCLUDED.updated_at
+        """,
+        METRICS_ROW,
+        json.dumps({status: count for status, count in status_counts.items() if count}),
+        json.dumps(sketch.to_dict()),
+    )
+    logger.info("Reseeded workflow metrics from workflows table", status_counts=dict(status_counts))
+    return status_counts
+
+
+async def seed_from_workflows(conn: asyncpg.Connection) -> tuple[Counter[str], LatencySketch]:
+    """Build the status counts and runtime sketch from the workflows table (a one-off full scan)."""
+    status_counts = Counter(
+        {
+            row["status"]: row["count"]
+            for row in await conn.fetch("SELECT status, COUNT(*) AS count FROM workflows GROUP BY status")
+        }
+    )
+
+    rows = await conn.fetch(
+        """
+        SELECT
+            CASE WHEN runtime_seconds <= $1 THEN 0
+                 ELSE floor(ln(runtime_seconds / $1) / ln($2))::int END AS bucket,
+            COUNT(*) AS count, SUM(runtime_seconds) AS total,
+            MIN(runtime_seconds) AS min, MAX(runtime_seconds) AS max
+        FROM workflows
+        WHERE runtime_seconds IS NOT NULL
+        GROUP BY bucket
+        """,
+        SKETCH_MIN_VALUE,
+        SKETCH_GAMMA,
+    )
+    sketch = LatencySketch()
+    for row in rows:
+        bucket = LatencySketch()
+        bucket.buckets[row["bucket"]] = row["count"]
+        bucket.count = row["count"]
+        bucket.total = float(row["total"])
+        bucket.min = float(row["min"])
+        bucket.max = float(row["max"])
+        sketch.merge(bucket)
+
+    return status_counts, sketch
@@ -5,6 +5,7 @@ from uuid import uuid4
 
 import asyncpg
 from common.logger import get_logger
+from common.workflows.metrics import METRICS_GENERATION_SQL, WorkflowMetrics
 
 logger = get_logger(__name__)
 
@@ -22,17 +23,19 @@ class WorkflowStatus(StrEnum):
 class WorkflowTrackingService:
     """Service for tracking workflow lifecycle states in the database."""
 
-    def __init__(self, name: str, pool: asyncpg.Pool, workflow_client):
+    def __init__(self, name: str, pool: asyncpg.Pool, workflow_client, metrics: WorkflowMetrics | None = None):
         """Initialize the workflow tracking service.
 
         Args:
             name: Name prefix for workflow instance IDs
             pool: asyncpg connection pool for database operations
             workflow_client: Dapr workflow client for monitoring workflow states
+            metrics: Workflow metrics updated on every state transition (the caller runs its flush loop)
         """
         self._name = name
         self.pool = pool
         self.workflow_client = workflow_client
+        self.metrics = metrics if metrics is not None else WorkflowMetrics(pool)
 
     def _create_instance_id(self, object_id: str) -> str:
         """Create a workflow instance ID.
@@ -60,10 +63,11 @@ class WorkflowTrackingService:
 
         try:
             async with self.pool.acquire() as conn:
-                await conn.execute(
-                    """
+                generation = await conn.fetchval(
+                    f"""
                     INSERT INTO workflows (wf_id, object_id, filename, status, start_time)
                     VALUES ($1, $2, $3, $4, $5)
+                    RETURNING {METRICS_GENERATION_SQL}
                     """,
                     instance_id,
                     object_id,
@@ -71,6 +75,7 @@ class WorkflowTrackingService:
                     WorkflowStatus.SCHEDULED,
                     datetime.now(UTC),
                 )
+            self.metrics.record_transition(None, WorkflowStatus.SCHEDULED, generation)
 
             logger.debug(
                 "Started tracking workflow",
@@ -105,14 +110,18 @@ class WorkflowTrackingService:
         """
         try:
             async with self.pool.acquire() as conn:
+                # Both updates return the previous status (and the metrics generation) so the metrics can move
+                # the workflow between counts
                 if error_message:
                     # Update with error message appended to enrichments_failure
-                    await conn.execute(
-                        """
-                        UPDATE workflows
+                    old = await conn.fetchrow(
+                        f"""
+                        UPDATE workflows w
                         SET status = $1,
-                            enrichments_failure = array_append(enrichments_failure, $2)
-                        WHERE wf_id = $3
+                            enrichments_failure = array_append(w.enrichments_failure, $2)
+                        FROM (SELECT wf_id, status FROM workflows WHERE wf_id = $3 FOR UPDATE) AS old
+                        WHERE w.wf_id = old.wf_id
+                        RETURNING old.status, {METRICS_GENERATION_SQL} AS generation
                         """,
                         status,
                         error_message[:100],  # Truncate long error messages
@@ -120,16 +129,21 @@ class WorkflowTrackingService:
                     )
                 else:
                     # Update without modifying enrichments_failure
-                    await conn.execute(
-                        """
-                        UPDATE workflows
+                    old = await conn.fetchrow(
+                        f"""
+                        UPDATE workflows w
                         SET status = $1
-                        WHERE wf_id = $2
+                        FROM (SELECT wf_id, status FROM workflows WHERE wf_id = $2 FOR UPDATE) AS old
+                        WHERE w.wf_id = old.wf_id
+                        RETURNING old.status, {METRICS_GENERATION_SQL} AS generation
                         """,
                         status,
                         instance_id,
                     )
 
+            if old is not None:
+                self.metrics.record_transition(old["status"], status, old["generation"])
+
             logger.debug(
                 "Updated workflow status",
                 instance_id=instance_id,
@@ -343,18 +357,24 @@ class WorkflowTrackingService:
                 runtime_seconds = (end_time - start_time).total_seconds()
 
                 # Update status to COMPLETED and set runtime_seconds
-                await conn.execute(
-                    """
-                    UPDATE workflows
+                old = await conn.fetchrow(
+                    f"""
+                    UPDATE workflows w
                     SET status = $1,
                         runtime_seconds = $2
-                    WHERE wf_id = $3
+                    FROM (SELECT wf_id, status FROM workflows WHERE wf_id = $3 FOR UPDATE) AS old
+                    WHERE w.wf_id = old.wf_id
+                    RETURNING old.status, {METRICS_GENERATION_SQL} AS generation
                     """,
                     WorkflowStatus.COMPLETED,
                     runtime_seconds,
                     instance_id,
                 )
 
+            if old is not None and old["status"] != WorkflowStatus.COMPLETED:
+                self.metrics.record_transition(old["status"], WorkflowStatus.COMPLETED, old["generation"])
+                self.metrics.record_runtime(runtime_seconds, old["generation"])
+
             logger.info(
                 "Finalized workflow as completed",
                 instance_id=instance_id,
@@ -11,6 +11,7 @@ import asyncpg
 import dapr.ext.workflow as wf
 import grpc
 from common.logger import get_logger
+from common.workflows.metrics import METRICS_GENERATION_SQL, WorkflowMetrics
 from dapr.ext.workflow.workflow_state import WorkflowStatus as DaprWorkflowStatus
 
 logger = get_logger(__name__)
@@ -28,6 +29,7 @@ class WorkflowPurger:
         max_execution_time: int = 300,
         batch_size=50,
         interval_seconds=5,
+        metrics: WorkflowMetrics | None = None,
     ):
         """Initialize the workflow purger.
 
@@ -36,6 +38,7 @@ class WorkflowPurger:
             db_pool: asyncpg connection pool for database operations
             workflow_client: Dapr workflow client for querying and purging workflows
             max_execution_time: Maximum time (in seconds) until a workflow is considered timed out (default: 300)
+            metrics: Workflow metrics to record timed-out workflows in
         """
         self._workflow_name = workflow_name
         self._db_pool = db_pool
@@ -44,6 +47,7 @@ class WorkflowPurger:
         self._max_execution_time = max_execution_time
         self._batch_size = batch_size
         self._interval_seconds = interval_seconds
+        self._metrics = metrics
 
     async def _handle_running_workflow(self, wf_id: str) -> tuple[bool, str | None]:
         """Check if a running workflow has timed out and terminate it if so.
@@ -97,17 +101,22 @@ class WorkflowPurger:
 
             # Update database status to TIMEOUT
             async with self._db_pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    UPDATE workflows
+                old = await conn.fetchrow(
+                    f"""
+                    UPDATE workflows w
                     SET status = 'TIMEOUT',
-                        enrichments_failure = array_append(enrichments_failure, $2)
-                    WHERE wf_id = $1
+                        enrichments_failure = array_append(w.enrichments_failure, $2)
+                    FROM (SELECT wf_id, status FROM workflows WHERE wf_id = $1 FOR UPDATE) AS old
+                    WHERE w.wf_id = old.wf_id
+                    RETURNING old.status, {METRICS_GENERATION_SQL} AS generation
                     """,
                     wf_id,
                     f"Workflow exceeded max execution time ({runtime_seconds:.2f}s > {self._max_execution_time}s)",
                 )
 
+            if self._metrics is not None and old is not None:
+                self._metrics.record_transition(old["status"], "TIMEOUT", old["generation"])
+
             logger.info(
                 "Marked timed-out workflow as TIMEOUT in database",
                 wf_id=wf_id,
@@ -0,0 +1,134 @@
+"""Tests for common.file_cache - the node-local download cache shared by StorageS3 instances."""
+
+import os
+import threading
+
+import pytest
+from common.file_cache import LocalFileCache
+
+
+def make_fetch(content: bytes, calls: list):
+    def fetch(path: str) -> None:
+        calls.append(path)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    return fetch
+
+
+class TestLocalFileCache:
+    def test_miss_then_hit_fetches_once(self, tmp_path):
+        cache = LocalFileCache(str(tmp_path), max_bytes=1024)
+        calls = []
+
+        with cache.open("files/a", make_fetch(b"hello", calls)) as f1:
+            assert f1.read() == b"hello"
+        with cache.open("files/a", make_fetch(b"other", calls)) as f2:
+            with open(f2.name, "rb") as raw:
+                assert raw.read() == b"hello"
+
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_skips_entries_in_use(self, tmp_path):
+        cache = LocalFileCache(str(tmp_path), max_bytes=10)
+        calls = []
+
+        held = cache.open("a", make_fetch(b"x" * 6, calls))
+        with cache.open("b", make_fetch(b"y" * 6, calls)):
+            pass
+
+        # "a" is least recently used but still held, so "b" is the one evicted
+        assert os.path.exists(held.name)
+        assert cache.stats()["entries"] == 1
+        held.close()
+
+        with cache.open("b", make_fetch(b"y" * 6, calls)):
+            pass
+        assert len(calls) == 3
+        assert not os.path.exists(held.name)
+        assert cache.stats()["total_bytes"] == 6
+
+    def test_oversized_entry_is_not_retained(self, tmp_path):
+        cache = LocalFileCache(str(tmp_path), max_bytes=4)
+        calls = []
+
+        with cache.open("big", make_fetch(b"z" * 16, calls)) as f:
+            path = f.name
+            assert os.path.getsize(path) == 16
+
+        assert not os.path.exists(path)
+        assert cache.stats()["entries"] == 0
+
+    def test_evict_waits_for_last_reader(self, tmp_path):
+        cache = LocalFileCache(str(tmp_path), max_bytes=1024)
+        calls = []
+
+        first = cache.open("a", make_fetch(b"data", calls))
+        second = cache.open("a", make_fetch(b"data", calls))
+        cache.evict("a")
+
+        first.close()
+        assert os.path.exists(second.name)
+        second.close()
+        assert not os.path.exists(second.name)
+        assert cache.stats()["entries"] == 0
+
+    def test_failed_fetch_is_not_cached(self, tmp_path):
+        cache = LocalFileCache(str(tmp_path), max_bytes=1024)
+
+        def failing_fetch(path: str) -> None:
+            with open(path, "wb") as f:
+                f.write(b"partial")
+            raise ConnectionError("S3 unavailable")
+
+        with pytest.raises(ConnectionError):
+            cache.open("a", failing_fetch)
+
+        assert os.listdir(tmp_path) == []
+        calls = []
+        with cache.open("a", make_fetch(b"ok", calls)) as f:
+            assert f.read() == b"ok"
+        assert len(calls) == 1
+
+    def test_concurrent_readers_share_one_fetch(self, tmp_path):
+        cache = LocalFileCache(str(tmp_path), max_bytes=1024)
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch(path: str) -> None:
+            calls.append(path)
+            started.set()
+            release.wait(timeout=5)
+            with open(path, "wb") as f:
+                f.write(b"shared")
+
+        results = []
+
+        def reader():
+            with cache.open("a", slow_fetch) as f:
+                results.append(f.read())
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        threads[0].start()
+        started.wait(timeout=5)
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert len(calls) == 1
+        assert results == [b"shared"] * 4
+
+    def test_files_from_a_previous_run_are_removed(self, tmp_path):
+        (tmp_path / "files_old").write_bytes(b"stale")
+        (tmp_path / "files_old.0123.part").write_bytes(b"partial")
+        (tmp_path / "subdir").mkdir()
+
+        cache = LocalFileCache(str(tmp_path), max_bytes=1024)
+
+        assert os.listdir(tmp_path) == ["subdir"]
+        assert cache.stats()["total_bytes"] == 0
@@ -1,6 +1,10 @@
 """Tests for chromium.local_state module."""
 
-from common.helpers import get_drive_from_path
+import hashlib
+
+import pytest
+from common import helpers
+from common.helpers import calculate_file_hash, calculate_file_hashes, get_drive_from_path
 
 
 class TestGetDriveFromPath:
@@ -122,3 +126,61 @@ class TestGetDriveFromPath:
         assert (
             get_drive_from_path("/E/Users/test/AppData/Local/BraveSoftware/Brave-Browser/User Data/Local State") is None
         )  # Without colon should fail
+
+
+class TestCalculateFileHashes:
+    """Test suite for the single-pass calculate_file_hashes function."""
+
+    @pytest.mark.parametrize("size", [0, 1, 4096, 1024 * 1024 + 7])
+    def test_matches_hashlib(self, tmp_path, size):
+        """Every digest matches hashlib over the whole content, across chunk boundaries."""
+        data = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+
+        hashes, header = calculate_file_hashes(str(path), header_size=100, chunk_size=4096)
+
+        assert hashes == {
+            "md5": hashlib.md5(data).hexdigest(),
+            "sha1": hashlib.sha1(data).hexdigest(),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+        assert header == data[:100]
+
+    def test_parallel_path_matches_hashlib(self, tmp_path, monkeypatch):
+        """Digests computed on the thread pool are identical to the sequential ones."""
+        monkeypatch.setattr(helpers, "PARALLEL_HASH_MIN_SIZE", 1)
+        data = b"nemesis" * 100000
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+
+        hashes, _ = calculate_file_hashes(str(path), ("sha256", "md5"), chunk_size=1000)
+
+        assert hashes == {"sha256": hashlib.sha256(data).hexdigest(), "md5": hashlib.md5(data).hexdigest()}
+
+    def test_header_larger_than_chunk(self, tmp_path):
+        """The header is returned in full even when it is larger than the read chunk size."""
+        data = b"A" * 10000
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+
+        _, header = calculate_file_hashes(str(path), ("md5",), header_size=5000, chunk_size=1024)
+
+        assert header == data[:5000]
+
+    def test_unsupported_hash_type(self, tmp_path):
+        """Unknown hash types raise ValueError, as calculate_file_hash always has."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"x")
+
+        with pytest.raises(ValueError):
+            calculate_file_hashes(str(path), ("crc32",))
+        with pytest.raises(ValueError):
+            calculate_file_hash(str(path), "crc32")
+
+    def test_calculate_file_hash_single(self, tmp_path):
+        """calculate_file_hash still returns a single hex digest."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"hello")
+
+        assert calculate_file_hash(str(path), "sha1") == hashlib.sha1(b"hello").hexdigest()
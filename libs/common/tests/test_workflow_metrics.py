@@ -0,0 +1,165 @@
+"""Tests for common.workflows.metrics - incrementally maintained workflow counts and runtime sketch."""
+
+import json
+import random
+from contextlib import asynccontextmanager
+
+import pytest
+from common.workflows.metrics import LatencySketch, WorkflowMetrics, reseed_workflow_metrics
+
+
+class TestLatencySketch:
+    def test_quantiles_are_within_relative_error(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(1, 1.5) for _ in range(20000)]
+        sketch = LatencySketch()
+        for value in values:
+            sketch.add(value)
+
+        values.sort()
+        for q in (0.5, 0.9, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+        assert sketch.min == values[0]
+        assert sketch.max == values[-1]
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+    def test_merge_and_round_trip(self):
+        a, b = LatencySketch(), LatencySketch()
+        for value in (0.0005, 1.0, 2.0):
+            a.add(value)
+        for value in (3.0, 400.0):
+            b.add(value)
+
+        a.merge(LatencySketch.from_dict(json.loads(json.dumps(b.to_dict()))))
+
+        assert a.count == 5
+        assert a.min == 0.0005
+        assert a.max == 400.0
+        assert a.quantile(0.5) == pytest.approx(2.0, rel=0.01)
+
+    def test_empty_sketch(self):
+        sketch = LatencySketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.mean is None
+
+
+class FakeConnection:
+    def __init__(self, db: "FakePool"):
+        self.db = db
+
+    async def execute(self, query: str, *args):
+        if query.lstrip().startswith("INSERT INTO workflow_metrics"):
+            if self.db.fail:
+                raise ConnectionError("db down")
+            generation = self.db.row["generation"] if self.db.row else 0
+            if "generation + 1" in query:
+                generation = generation + 1 if self.db.row else 1
+            self.db.row = {"status_counts": args[1], "runtime_sketch": args[2], "generation": generation}
+
+    async def fetchrow(self, query: str, *args):
+        return self.db.row
+
+    async def fetch(self, query: str, *args):
+        if "GROUP BY status" in query:
+            return [{"status": "COMPLETED", "count": 10}, {"status": "RUNNING", "count": 2}]
+        return [{"bucket": LatencySketch.bucket_index(5.0), "count": 10, "total": 50.0, "min": 5.0, "max": 5.0}]
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakePool:
+    def __init__(self, row: dict | None = None):
+        self.row = row
+        self.fail = False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+    def counts(self) -> dict:
+        return json.loads(self.row["status_counts"])
+
+
+def metrics_row(status_counts: dict, generation: int = 0) -> dict:
+    return {"status_counts": json.dumps(status_counts), "runtime_sketch": "{}", "generation": generation}
+
+
+@pytest.mark.asyncio
+async def test_flush_never_seeds_a_missing_row():
+    pool = FakePool()
+    metrics = WorkflowMetrics(pool)
+    metrics.record_transition(None, "SCHEDULED", 0)
+
+    await metrics.flush()
+
+    assert pool.counts() == {"SCHEDULED": 1}
+    assert pool.row["generation"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reseed_starts_a_new_generation():
+    pool = FakePool(metrics_row({"RUNNING": 5}, generation=3))
+
+    async with pool.acquire() as conn:
+        await reseed_workflow_metrics(conn)
+
+    assert pool.counts() == {"COMPLETED": 10, "RUNNING": 2}
+    assert pool.row["generation"] == 4
+    assert LatencySketch.from_dict(json.loads(pool.row["runtime_sketch"])).count == 10
+
+
+@pytest.mark.asyncio
+async def test_deltas_from_before_a_reseed_are_dropped():
+    """Another process's deltas already counted by a reseed must not be merged again."""
+    pool = FakePool(metrics_row({"RUNNING": 2}))
+    metrics = WorkflowMetrics(pool)
+    metrics.record_transition("RUNNING", "COMPLETED", 0)  # counted by the reseed below
+    metrics.record_runtime(5.0, 0)
+
+    async with pool.acquire() as conn:
+        await reseed_workflow_metrics(conn)
+    metrics.record_transition("RUNNING", "COMPLETED", 1)  # committed after the reseed
+    await metrics.flush()
+
+    assert pool.counts() == {"COMPLETED": 11, "RUNNING": 1}
+    assert LatencySketch.from_dict(json.loads(pool.row["runtime_sketch"])).count == 10
+
+    # Dropped for good, not held back for a later flush
+    await metrics.flush()
+    assert pool.counts() == {"COMPLETED": 11, "RUNNING": 1}
+
+
+@pytest.mark.asyncio
+async def test_flush_merges_transitions_and_runtimes():
+    pool = FakePool(metrics_row({"COMPLETED": 10, "RUNNING": 2}))
+    metrics = WorkflowMetrics(pool)
+
+    metrics.record_transition(None, "SCHEDULED", 0)
+    metrics.record_transition("SCHEDULED", "RUNNING", 0)
+    metrics.record_transition("RUNNING", "COMPLETED", 0)
+    metrics.record_runtime(3.5, 0)
+    metrics.record_transition("RUNNING", "TIMEOUT", 0)
+    await metrics.flush()
+
+    assert pool.counts() == {"COMPLETED": 11, "RUNNING": 1, "TIMEOUT": 1}
+    sketch = LatencySketch.from_dict(json.loads(pool.row["runtime_sketch"]))
+    assert sketch.count == 1
+    assert sketch.max == 3.5
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_pending_deltas():
+    pool = FakePool(metrics_row({"RUNNING": 1}))
+    metrics = WorkflowMetrics(pool)
+    metrics.record_transition("RUNNING", "COMPLETED", 0)
+
+    pool.fail = True
+    with pytest.raises(ConnectionError):
+        await metrics.flush()
+
+    pool.fail = False
+    await metrics.flush()
+    assert pool.counts() == {"COMPLETED": 1}
@@ -127,7 +127,7 @@ rule CCache_File {
         except (OSError, ValueError):
             return True
 
-    def _analyze_ccache_file(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze ccache file and extract credential information."""
         result = EnrichmentResult(module_name=self.name, dependencies=self.dependencies)
         transforms = []
@@ -327,10 +327,10 @@ rule CCache_File {
             file_enriched = await get_file_enriched_async(object_id, self.asyncpg_pool)
 
             if file_path:
-                return self._analyze_ccache_file(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_ccache_file(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error in ccache analyzer")
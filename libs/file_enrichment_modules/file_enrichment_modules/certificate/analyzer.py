@@ -11,7 +11,7 @@ from cryptography import x509
 from cryptography.exceptions import UnsupportedAlgorithm
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.serialization import pkcs12
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -28,6 +28,10 @@ class CertificateAnalyzer(EnrichmentModule):
 
         # Valid certificate file extensions
         self.valid_extensions = {".pem", ".crt", ".cer", ".der", ".p7b", ".p7c", ".pfx", ".p12"}
+        self.triggers = ModuleTriggers(
+            extensions=tuple(self.valid_extensions),
+            magic_substrings=("certificate", "pkcs", "x.509", "pem"),
+        )
 
         # Common passwords to try for encrypted certificates/keys
         self.common_passwords = [
@@ -487,7 +491,7 @@ class CertificateAnalyzer(EnrichmentModule):
 
         return self._parse_certificate_data(data, file_extension)
 
-    def _analyze_certificate(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze certificate file and generate enrichment result."""
         enrichment_result = EnrichmentResult(module_name=self.name, dependencies=self.dependencies)
 
@@ -531,10 +535,10 @@ class CertificateAnalyzer(EnrichmentModule):
             file_enriched = await get_file_enriched_async(object_id, self.asyncpg_pool)
 
             if file_path:
-                return self._analyze_certificate(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_certificate(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing certificate file", file_object_id=object_id)
@@ -9,7 +9,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -21,6 +21,9 @@ class ChromeHistoryParser(EnrichmentModule):
     def __init__(self):
         self.storage = StorageMinio()
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(
+            magic_substrings=("sqlite 3.x database",), is_plaintext=False, needs_should_process=True
+        )
         self.asyncpg_pool = None  # type: ignore
 
         # Yara rule to check for Chrome History tables
@@ -13,7 +13,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 if TYPE_CHECKING:
     from nemesis_dpapi import DpapiManager
@@ -30,6 +30,9 @@ class ChromeLoginsParser(EnrichmentModule):
 
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(
+            magic_substrings=("sqlite 3.x database",), is_plaintext=False, needs_should_process=True
+        )
 
         self.dpapi_manager: DpapiManager = None  # type: ignore
         self.loop: asyncio.AbstractEventLoop = None  # type: ignore
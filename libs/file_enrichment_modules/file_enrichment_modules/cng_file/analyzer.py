@@ -19,7 +19,7 @@ from file_enrichment_modules.cng_file.cng_parser import (
     extract_final_key_material,
     parse_cng_stream,
 )
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from nemesis_dpapi import Blob, BlobDecryptionError, DpapiManager, MasterKeyNotDecryptedError, MasterKeyNotFoundError
 
 if TYPE_CHECKING:
@@ -41,6 +41,7 @@ class CngFileAnalyzer(EnrichmentModule):
         self.dpapi_manager: DpapiManager = None  # type: ignore
         self.loop: asyncio.AbstractEventLoop = None  # type: ignore
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(max_size=10000, needs_should_process=True)
         self.asyncpg_pool: asyncpg.Pool | None = None  # Connection pool for database operations
 
         # Yara rule to identify CNG files
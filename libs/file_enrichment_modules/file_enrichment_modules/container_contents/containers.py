@@ -1,14 +1,17 @@
 # src/workflow/containers.py
+import asyncio
+import gzip
 import json
 import os
-import pathlib
-import shutil
+import posixpath
 import struct
 import tarfile
-import uuid
+import tempfile
 import zipfile
 import zlib
+from collections.abc import Callable, Iterator
 from io import SEEK_END
+from typing import BinaryIO
 
 import py7zr
 from common.logger import get_logger
@@ -18,6 +21,16 @@ from dapr.aio.clients import DaprClient
 
 logger = get_logger(__name__)
 
+# Safety limits applied while reading archive members
+MAX_ARCHIVE_MEMBERS = 10000
+MAX_EXTRACTED_SIZE = 2_147_483_648  # 2GB
+
+# Members are buffered in memory up to this size, then spill to a temporary file
+MEMBER_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+MEMBER_COPY_CHUNK_SIZE = 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
 
 class FileNotSupportedException(Exception):
     """Raised when a file is not supported"""
@@ -67,7 +80,7 @@ def estimate_container_size(path: str) -> int:
         elif py7zr.is_7zfile(path):
             with py7zr.SevenZipFile(path) as f:
                 return f.archiveinfo().uncompressed  # pyright: ignore[reportReturnType]
-        elif tarfile.is_tarfile(path):
+        elif tarfile.is_tarfile(path) or is_gzip_file(path):
             return estimate_uncompressed_gz_size(path)
         else:
             # File is not a supported archive format
@@ -77,6 +90,15 @@ def estimate_container_size(path: str) -> int:
         return -1
 
 
+def is_gzip_file(path: str) -> bool:
+    """Returns True if the file starts with the gzip magic bytes."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(2) == GZIP_MAGIC
+    except OSError:
+        return False
+
+
 def estimate_uncompressed_gz_size(filename) -> int:
     """Estimates a gzip uncompressed size.
 
@@ -122,167 +144,162 @@ def estimate_uncompressed_gz_size(filename) -> int:
         return -1
 
 
-def safe_extract_archive(path: str, extract_dir: str) -> bool:
-    """
-    Safely extracts an archive file with additional security measures
-
-    Args:
-        path: Path to the archive file
-        extract_dir: Directory to extract to
-
-    Returns:
-        bool: True if extraction was successful, False otherwise
-    """
-    max_files = 10000  # Adjust based on your requirements
-    max_total_size = 2_147_483_648  # 2GB example
-
-    try:
-        if zipfile.is_zipfile(path):
-            with zipfile.ZipFile(path) as zf:
-                # Check number of files
-                if len(zf.namelist()) > max_files:
-                    logger.warning(f"Too many files in archive ({len(zf.namelist())}), possible zip bomb")
-                    return False
-
-                # Filter out unsafe paths
-                safe_members = []
-                for member in zf.infolist():
-                    if member.filename.startswith("/") or ".." in member.filename:
-                        logger.warning(f"Unsafe path in archive: {member.filename}")
-                        continue
-
-                    # Check for extremely long filenames
-                    if len(os.path.basename(member.filename)) > 255:
-                        logger.warning(f"Filename too long, may be malicious: {member.filename}")
-                        continue
-
-                    safe_members.append(member)
-
-                # Extract only safe members
-                total_extracted = 0
-                for member in safe_members:
-                    if total_extracted > max_total_size:
-                        logger.warning("Max extraction size exceeded, possible zip bomb")
-                        return False
-
-                    extract_path = os.path.join(extract_dir, member.filename)
-                    if not is_safe_path(extract_dir, extract_path):
-                        logger.warning(f"Path traversal attempt detected: {member.filename}")
-                        continue
-
-                    zf.extract(member, extract_dir)
-                    total_extracted += member.file_size
-
-            return True
-
-        elif py7zr.is_7zfile(path):
-            with py7zr.SevenZipFile(path) as sz:
-                # Get the list of files
-                file_list = sz.getnames()
-
-                # Check number of files
-                if len(file_list) > max_files:
-                    logger.warning(f"Too many files in archive ({len(file_list)}), possible archive bomb")
-                    return False
-
-                # Filter out unsafe paths
-                safe_members = []
-                for filename in file_list:
-                    if filename.startswith("/") or ".." in filename:
-                        logger.warning(f"Unsafe path in archive: {filename}")
-                        continue
-
-                    # Check for extremely long filenames
-                    if len(os.path.basename(filename)) > 255:
-                        logger.warning(f"Filename too long, may be malicious: {filename}")
-                        continue
-
-                    safe_members.append(filename)
-
-                # Extract only safe members if supported by library
-                sz.extract(path=extract_dir, targets=safe_members)
-
-            # Verify all extracted paths for safety after extraction
-            for root, dirs, files in os.walk(extract_dir):
-                for item in dirs + files:
-                    item_path = os.path.join(root, item)
-                    if not is_safe_path(extract_dir, item_path):
-                        logger.warning(f"Unsafe path found after extraction: {item_path}")
-                        shutil.rmtree(extract_dir, ignore_errors=True)
-                        return False
-
-            return True
-
-        elif tarfile.is_tarfile(path):
-            with tarfile.open(path) as tf:
-                # Check number of files
-                members = tf.getmembers()
-                if len(members) > max_files:
-                    logger.warning(f"Too many files in archive ({len(members)}), possible archive bomb")
-                    return False
-
-                # Filter out unsafe members
-                safe_members = []
-                for member in members:
-                    # Check for absolute paths and path traversal
-                    if member.name.startswith("/") or ".." in member.name:
-                        logger.warning(f"Unsafe path in archive: {member.name}")
-                        continue
-
-                    # Check for long filenames
-                    if len(os.path.basename(member.name)) > 255:
-                        logger.warning(f"Filename too long, may be malicious: {member.name}")
-                        continue
+def is_safe_member_name(name: str) -> bool:
+    """Returns True if an archive member name stays inside the archive when joined to a base path."""
+    if not name or name.startswith("/") or ".." in name:
+        logger.warning(f"Unsafe path in archive: {name}")
+        return False
 
-                    # Check for dangerous file types (symlinks, devices, etc.)
-                    if member.type not in (tarfile.REGTYPE, tarfile.DIRTYPE):
-                        logger.warning(f"Unsafe file type in archive: {member.name}, type {member.type}")
-                        continue
+    # Check for extremely long filenames
+    if len(posixpath.basename(name)) > 255:
+        logger.warning(f"Filename too long, may be malicious: {name}")
+        return False
 
-                    # Check final path after extraction
-                    extract_path = os.path.join(extract_dir, member.name)
-                    if not is_safe_path(extract_dir, extract_path):
-                        logger.warning(f"Path traversal attempt detected: {member.name}")
-                        continue
+    return True
 
-                    safe_members.append(member)
 
-                # Extract only safe members
-                total_extracted = 0
-                for member in safe_members:
-                    if member.type == tarfile.REGTYPE:  # Regular file
-                        if total_extracted > max_total_size:
-                            logger.warning("Max extraction size exceeded, possible archive bomb")
-                            return False
-                        total_extracted += member.size
+def gzip_member_name(archive_path: str) -> str:
+    """Name used for the single member of a bare (non-tar) gzip file."""
+    base_name = os.path.basename(archive_path.replace("\\", "/"))
+    stem, ext = os.path.splitext(base_name)
+    if ext.lower() in (".gz", ".gzip") and stem:
+        return stem
+    return f"{base_name}.decompressed"
 
-                    tf.extract(member, extract_dir)
 
-            return True
-        else:
-            raise FileNotSupportedException("File is not a supported archive format")
+def spool_member(member: BinaryIO, size_budget: int) -> tuple[BinaryIO, int]:
+    """Copy an open archive member into a spooled temporary file, enforcing the remaining size budget.
 
-    except Exception:
-        logger.exception(message="Error in safe_extract_archive")
-        return False
+    Returns:
+        The rewound spooled file (owned by the caller) and the number of bytes copied
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_MAX_MEMORY)
+    copied = 0
+    try:
+        while chunk := member.read(MEMBER_COPY_CHUNK_SIZE):
+            copied += len(chunk)
+            if copied > size_budget:
+                raise ArchiveExtractionError("Max extraction size exceeded, possible archive bomb")
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool, copied  # pyright: ignore[reportReturnType]
+
+
+def iter_archive_members(
+    path: str,
+    gzip_name: str = "",
+    accept: Callable[[str], bool] | None = None,
+) -> Iterator[tuple[str, BinaryIO, int]]:
+    """Stream the regular-file members of a zip/7z/tar/gzip archive without extracting it to a directory.
+
+    Each yielded member is (name inside the archive, readable file, size). The file is owned by the
+    consumer and stays valid after the generator advances, so members can be uploaded while the next
+    ones are read. Members are read sequentially from the archive handle, so the generator must not be
+    advanced concurrently.
 
+    Args:
+        path: Path to the archive file
+        gzip_name: Member name to use for a bare gzip file
+        accept: Optional filter on member names, applied before a member is read
 
-def extract_archive(path: str) -> str:
-    """
-    Extracts an archive file to a temporary directory and returns the
-    temporary directory name
+    Raises:
+        FileNotSupportedException: If the file is not a supported archive format
+        ArchiveExtractionError: If a safety limit is exceeded
     """
-    # Create temporary directory
-    tmp_dir = f"/tmp/{uuid.uuid4()}"
-    os.makedirs(tmp_dir, exist_ok=True)
-
-    # Extract using safe extraction
-    if not safe_extract_archive(path, tmp_dir):
-        if os.path.exists(tmp_dir):
-            shutil.rmtree(tmp_dir, ignore_errors=True)
-        raise ArchiveExtractionError("Failed to safely extract archive")
+    budget = MAX_EXTRACTED_SIZE
+
+    def wanted(name: str) -> bool:
+        return is_safe_member_name(name) and (accept is None or accept(name))
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            infos = zf.infolist()
+            if len(infos) > MAX_ARCHIVE_MEMBERS:
+                raise ArchiveExtractionError(f"Too many files in archive ({len(infos)}), possible zip bomb")
+
+            for info in infos:
+                if info.is_dir() or info.file_size <= 0 or not wanted(info.filename):
+                    continue
+                with zf.open(info) as member:
+                    spool, size = spool_member(member, budget)
+                budget -= size
+                yield info.filename, spool, size
+
+    elif py7zr.is_7zfile(path):
+        with py7zr.SevenZipFile(path) as sz:
+            entries = sz.list()
+            if len(entries) > MAX_ARCHIVE_MEMBERS:
+                raise ArchiveExtractionError(f"Too many files in archive ({len(entries)}), possible archive bomb")
+            targets = [
+                entry.filename
+                for entry in entries
+                if not entry.is_directory and (entry.uncompressed or 0) > 0 and wanted(entry.filename)
+            ]
+            if sum(entry.uncompressed or 0 for entry in entries if entry.filename in targets) > budget:
+                raise ArchiveExtractionError("Max extraction size exceeded, possible archive bomb")
+
+            # py7zr (<1.0) has no per-member streaming API, so the selected members are decompressed in a
+            # single pass into scratch space and each one is released as soon as it has been handed over
+            with tempfile.TemporaryDirectory() as scratch_dir:
+                if targets:
+                    sz.extract(path=scratch_dir, targets=targets)
+
+                for name in targets:
+                    member_path = os.path.join(scratch_dir, name)
+                    if (
+                        not is_safe_path(scratch_dir, member_path)
+                        or os.path.islink(member_path)
+                        or not os.path.isfile(member_path)
+                    ):
+                        logger.warning(f"Unsafe path found after extraction: {name}")
+                        continue
+                    member = open(member_path, "rb")  # owned by the consumer
+                    os.unlink(member_path)
+                    yield name, member, os.fstat(member.fileno()).st_size
+
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as tf:
+            # Iterating reads headers as it goes, so members are read front to back in one pass
+            for count, member in enumerate(tf):
+                if count >= MAX_ARCHIVE_MEMBERS:
+                    raise ArchiveExtractionError(
+                        f"Too many files in archive (>{MAX_ARCHIVE_MEMBERS}), possible archive bomb"
+                    )
 
-    return tmp_dir
+                if member.isdir():
+                    continue
+                if not member.isreg():
+                    # Symlinks, devices, etc.
+                    logger.warning(f"Unsafe file type in archive: {member.name}, type {member.type}")
+                    continue
+                if member.size <= 0 or not wanted(member.name):
+                    continue
+
+                fileobj = tf.extractfile(member)
+                if fileobj is None:
+                    continue
+                with fileobj:
+                    spool, size = spool_member(fileobj, budget)
+                budget -= size
+                yield member.name, spool, size
+
+    elif is_gzip_file(path):
+        name = gzip_name or gzip_member_name(path)
+        if not wanted(name):
+            return
+        with gzip.open(path, "rb") as gz:
+            spool, size = spool_member(gz, budget)  # pyright: ignore[reportArgumentType]
+        if size <= 0:
+            spool.close()
+            return
+        yield name, spool, size
+
+    else:
+        raise FileNotSupportedException("File is not a supported archive format")
 
 
 class ContainerExtractor:
@@ -292,6 +309,8 @@ class ContainerExtractor:
         dapr_client: DaprClient,
         extracted_archive_size_limit: int = 1_073_741_824,  # 1GB default
         allowed_extensions: set | None = None,  # Optional whitelist of allowed file extensions
+        upload_concurrency: int = 8,
+        publish_batch_size: int = 100,
     ):
         """Initialize the ContainerProcessor with its dependencies.
 
@@ -300,11 +319,15 @@ class ContainerExtractor:
             dapr_client: Dapr client for message publishing
             extracted_archive_size_limit: Maximum size in bytes for extracted archives
             allowed_extensions: Set of allowed file extensions (e.g., {'.txt', '.pdf'})
+            upload_concurrency: Maximum number of extracted members being uploaded at once
+            publish_batch_size: Number of new_file messages published together
         """
         self.storage = storage
         self.dapr_client = dapr_client
         self.extracted_archive_size_limit = extracted_archive_size_limit
         self.allowed_extensions = allowed_extensions
+        self.upload_concurrency = upload_concurrency
+        self.publish_batch_size = publish_batch_size
 
     def should_extract_archive(self, archive_size):
         """Check if archive should be extracted based on size."""
@@ -314,41 +337,28 @@ class ContainerExtractor:
 
         return archive_size < self.extracted_archive_size_limit
 
-    def extract_archive(self, temp_file, file_enriched):
-        """Extract the archive and handle extraction errors."""
-        try:
-            return extract_archive(temp_file.name)
-        except FileNotSupportedException:
-            logger.warning(
-                "File is not a supported archive format",
-                path=file_enriched.path,
-                file_path_on_disk=temp_file.name,
-            )
-        except ArchiveExtractionError:
+    def should_extract_member(self, member_name: str, file_enriched: FileEnriched) -> bool:
+        """Check a member name against the extension whitelist (if one is configured)."""
+        if not self.allowed_extensions:
+            return True
+
+        file_ext = os.path.splitext(member_name)[1].lower()
+        if file_ext not in self.allowed_extensions:
             logger.warning(
-                "Failed to safely extract archive",
-                path=file_enriched.path,
-                file_path_on_disk=temp_file.name,
+                f"File has disallowed extension: {file_ext}",
+                member_name=member_name,
+                archive_file_path=file_enriched.path,
             )
-        except RuntimeError as e:
-            if "encrypted, password required for extraction" in str(e):
-                logger.info("Archive is encrypted", path=file_enriched.path, file_path_on_disk=temp_file.name)
-            else:
-                logger.exception(
-                    message="RuntimeError extracting archive",
-                    path=file_enriched.path,
-                    file_path_on_disk=temp_file.name,
-                )
-        return None
+            return False
+        return True
 
-    def get_real_path(self, extracted_path, tmp_dir, file_enriched):
-        """Calculate the real path for the extracted file with sanitization."""
-        # Get the relative path from the extraction directory
+    def get_real_path(self, member_name, file_enriched):
+        """Calculate the real path for an archive member with sanitization."""
         try:
-            rel_path = os.path.relpath(extracted_path, tmp_dir)
+            rel_path = posixpath.normpath(member_name.replace("\\", "/"))
 
             # Reject paths that try to go up the directory tree
-            if rel_path.startswith(".."):
+            if rel_path.startswith("..") or rel_path.startswith("/"):
                 logger.warning(f"Rejecting suspicious relative path: {rel_path}", archive_file_path=file_enriched.path)
                 return None
 
@@ -364,7 +374,7 @@ class ContainerExtractor:
         except Exception:
             logger.exception(
                 message="Error calculating real path",
-                extracted_path=extracted_path,
+                member_name=member_name,
                 archive_file_path=file_enriched.path,
             )
             return None
@@ -379,58 +389,44 @@ class ContainerExtractor:
             data_content_type="application/json",
         )
 
-    async def process_extracted_file(self, extracted_file_path, tmp_dir, file_enriched):
-        """Process a single extracted file with security checks."""
-        try:
-            # Skip if not a file or empty
-            if not os.path.isfile(extracted_file_path) or os.path.getsize(extracted_file_path) <= 0:
-                return False
-
-            # Verify path is safe
-            if not is_safe_path(tmp_dir, extracted_file_path):
-                logger.warning(
-                    f"Possible path traversal attempt: {extracted_file_path}", archive_file_path=file_enriched.path
-                )
-                return False
-
-            # Check for symbolic links
-            if os.path.islink(extracted_file_path):
-                link_target = os.path.realpath(extracted_file_path)
-                if not is_safe_path(tmp_dir, link_target):
-                    logger.warning(
-                        f"Potentially unsafe symbolic link: {extracted_file_path} -> {link_target}",
-                        archive_file_path=file_enriched.path,
-                    )
-                    return False
+    async def publish_file_messages(self, file_messages: list[File], file_enriched: FileEnriched) -> int:
+        """Publish a batch of file messages concurrently, returning how many were published."""
+        results = await asyncio.gather(
+            *(self.publish_file_message(file_message) for file_message in file_messages), return_exceptions=True
+        )
 
-            # Check filename length
-            if len(os.path.basename(extracted_file_path)) > 255:
-                logger.warning(
-                    f"Filename too long, may be malicious: {extracted_file_path}", archive_file_path=file_enriched.path
+        published = 0
+        for file_message, result in zip(file_messages, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Error publishing extracted file",
+                    path=file_message.path,
+                    archive_file_path=file_enriched.path,
+                    error=str(result),
                 )
-                return False
+            else:
+                published += 1
 
-            # Check file extension if whitelist is provided
-            if self.allowed_extensions:
-                file_ext = os.path.splitext(extracted_file_path)[1].lower()
-                if file_ext not in self.allowed_extensions:
-                    logger.warning(
-                        f"File has disallowed extension: {file_ext}",
-                        extracted_file_path=extracted_file_path,
-                        archive_file_path=file_enriched.path,
-                    )
-                    return False
+        if published:
+            logger.info(
+                f"Submitted {published} extracted files to Nemesis",
+                originating_object_id=file_enriched.object_id,
+            )
+        return published
 
-            # Calculate the real path
-            real_path = self.get_real_path(extracted_file_path, tmp_dir, file_enriched)
-            if not real_path:
-                return False
+    async def upload_member(
+        self, member_name: str, member: BinaryIO, size: int, file_enriched: FileEnriched
+    ) -> File | None:
+        """Upload one extracted member and build its new_file message (the member file is closed afterwards)."""
+        try:
+            with member:
+                real_path = self.get_real_path(member_name, file_enriched)
+                if not real_path:
+                    return None
 
-            # Process the file
-            object_id = self.storage.upload_file(extracted_file_path)
-            nesting_level = (file_enriched.nesting_level or 0) + 1
+                object_id = await asyncio.to_thread(self.storage.upload_stream, member, size)
 
-            file_message = File(
+            return File(
                 object_id=str(object_id),
                 agent_id=file_enriched.agent_id,
                 source=file_enriched.source,
@@ -439,28 +435,100 @@ class ContainerExtractor:
                 expiration=file_enriched.expiration,
                 path=real_path,
                 originating_object_id=file_enriched.object_id,
-                nesting_level=nesting_level,
+                nesting_level=(file_enriched.nesting_level or 0) + 1,
             )
-
-            await self.publish_file_message(file_message)
-
-            logger.info(
-                f"Submitted extracted file '{real_path}' to Nemesis",
-                originating_object_id=file_enriched.object_id,
-            )
-            return True
-
         except Exception:
             logger.exception(
-                message="process_archive error",
-                extracted_file_path=extracted_file_path,
+                message="Error uploading extracted file",
+                member_name=member_name,
                 archive_file_path=file_enriched.path,
             )
+            return None
 
-        return False
+    def log_extraction_error(self, error: Exception, archive_path: str, file_enriched: FileEnriched) -> None:
+        """Log why reading an archive stopped."""
+        if isinstance(error, FileNotSupportedException):
+            logger.warning(
+                "File is not a supported archive format", path=file_enriched.path, file_path_on_disk=archive_path
+            )
+        elif isinstance(error, ArchiveExtractionError):
+            logger.warning(
+                f"Failed to safely extract archive: {error}", path=file_enriched.path, file_path_on_disk=archive_path
+            )
+        elif isinstance(error, RuntimeError) and "encrypted, password required for extraction" in str(error):
+            logger.info("Archive is encrypted", path=file_enriched.path, file_path_on_disk=archive_path)
+        else:
+            logger.exception(
+                message="Error extracting archive",
+                path=file_enriched.path,
+                file_path_on_disk=archive_path,
+            )
+
+    async def extract_members(self, archive_path: str, file_enriched: FileEnriched) -> int:
+        """Stream members out of an archive, uploading them concurrently and publishing them in batches.
+
+        Members are read one at a time in a worker thread; at most `upload_concurrency` of them are
+        buffered or uploading at once.
+
+        Returns:
+            Number of extracted files submitted to Nemesis
+        """
+        members = iter_archive_members(
+            archive_path,
+            gzip_name=gzip_member_name(file_enriched.path),
+            accept=lambda name: self.should_extract_member(name, file_enriched),
+        )
+        upload_slots = asyncio.Semaphore(self.upload_concurrency)
+        uploads: set[asyncio.Task] = set()
+        pending: list[File] = []
+        processed_files = 0
+
+        async def upload(member: tuple[str, BinaryIO, int]) -> None:
+            try:
+                file_message = await self.upload_member(*member, file_enriched)
+                if file_message is not None:
+                    pending.append(file_message)
+            finally:
+                upload_slots.release()
+
+        try:
+            while True:
+                await upload_slots.acquire()
+                try:
+                    member = await asyncio.to_thread(next, members, None)
+                except Exception as e:
+                    upload_slots.release()
+                    self.log_extraction_error(e, archive_path, file_enriched)
+                    break
+
+                if member is None:
+                    upload_slots.release()
+                    break
+
+                task = asyncio.create_task(upload(member))
+                task.add_done_callback(uploads.discard)
+                uploads.add(task)
+
+                while len(pending) >= self.publish_batch_size:
+                    batch = pending[: self.publish_batch_size]
+                    del pending[: self.publish_batch_size]
+                    processed_files += await self.publish_file_messages(batch, file_enriched)
+
+            if uploads:
+                await asyncio.gather(*uploads)
+            while pending:
+                batch = pending[: self.publish_batch_size]
+                del pending[: self.publish_batch_size]
+                processed_files += await self.publish_file_messages(batch, file_enriched)
+        finally:
+            for task in uploads:
+                task.cancel()
+            await asyncio.to_thread(members.close)
+
+        return processed_files
 
     async def extract(self, file_enriched: FileEnriched):
-        """Process a container file and extract its contents."""
+        """Process a container file and submit its contents."""
         try:
             with self.storage.download(file_enriched.object_id) as temp_file:
                 archive_size = estimate_container_size(temp_file.name)
@@ -471,35 +539,13 @@ class ContainerExtractor:
                     )
                     return
 
-                tmp_dir = self.extract_archive(temp_file, file_enriched)
-                if not tmp_dir:
-                    return
+                processed_files = await self.extract_members(temp_file.name, file_enriched)
 
-                try:
-                    processed_files = 0
-                    max_files_to_process = 10000  # Safety limit
-
-                    # Use a safer method to walk the directory
-                    for extracted_file_path in pathlib.Path(tmp_dir).glob("**/*"):
-                        if processed_files >= max_files_to_process:
-                            logger.warning(
-                                f"Reached maximum number of files to process ({max_files_to_process})",
-                                archive_file_path=file_enriched.path,
-                            )
-                            break
-
-                        if await self.process_extracted_file(str(extracted_file_path), tmp_dir, file_enriched):
-                            processed_files += 1
-
-                    logger.info(
-                        "Files processed from archive",
-                        archive_file_path=file_enriched.path,
-                        processed_files=processed_files,
-                    )
-                finally:
-                    # Clean up the extracted directory
-                    if os.path.exists(tmp_dir):
-                        shutil.rmtree(tmp_dir, ignore_errors=True)
+                logger.info(
+                    "Files processed from archive",
+                    archive_file_path=file_enriched.path,
+                    processed_files=processed_files,
+                )
 
         except Exception:
             logger.exception("Error processing container", file_enriched=file_enriched)
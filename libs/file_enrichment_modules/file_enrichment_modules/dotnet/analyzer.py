@@ -1,4 +1,5 @@
 # enrichment_modules/dotnet_analyzer/analyzer.py
+import asyncio
 import hashlib
 import json
 from pathlib import Path
@@ -10,7 +11,7 @@ from common.queues import DOTNET_INPUT_TOPIC, DOTNET_PUBSUB
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
 from dapr.aio.clients import DaprClient
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -116,6 +117,7 @@ class DotNetAnalyzer(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(magic_substrings=("mono/.net assembly",))
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if this module should run."""
@@ -145,10 +147,10 @@ class DotNetAnalyzer(EnrichmentModule):
 
             # Get results from local parsing
             if file_path:
-                enrichment.results = {"parsed": parse_dotnet_assembly(file_path)}
+                enrichment.results = {"parsed": await asyncio.to_thread(parse_dotnet_assembly, file_path)}
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    enrichment.results = {"parsed": parse_dotnet_assembly(temp_file.name)}
+                    enrichment.results = {"parsed": await asyncio.to_thread(parse_dotnet_assembly, temp_file.name)}
 
             return enrichment
 
@@ -8,7 +8,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from file_linking.helpers import add_file_linking
 from nemesis_dpapi import DpapiManager, MasterKey, MasterKeyFile, MasterKeyType
 from nemesis_dpapi.exceptions import WriteOnceViolationError
@@ -37,6 +37,7 @@ class DPAPIMasterkeyAnalyzer(EnrichmentModule):
 
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(max_size=2048, is_plaintext=False, needs_should_process=True)
 
         # GUID regex pattern
         self.guid_pattern = re.compile(
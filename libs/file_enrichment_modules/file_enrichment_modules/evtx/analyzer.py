@@ -7,6 +7,7 @@ Parses EVTX files and extracts:
 - Child files: PowerShell 4104 script blocks resubmitted into the pipeline for further enrichment
 """
 
+import asyncio
 import csv
 import hashlib
 import json
@@ -97,6 +98,30 @@ MAX_EVENTS_PER_ID = 50
 # Number of days back from the most recent event to include in the power timeline
 POWER_TIMELINE_DAYS = 15
 
+# Rust worker threads the parser uses to parse chunks of the file (0 lets the library use every core)
+EVTX_PARSER_THREADS = int(os.getenv("EVTX_PARSER_THREADS", "0"))
+
+# Event IDs whose EventData is collected below; other records only feed the counters and unique values
+DETAILED_EVENT_IDS = frozenset(
+    {
+        *("4624", "4625", "4648", "4688", "4776", "4768", "4769", "1102"),
+        *("4720", "4722", "4724", "4726", "4738", "4728", "4729", "4732", "4733"),
+        *("1", "12", "13", "42", "6008", "7045", "106", "140", "141", "4104"),
+    }
+)
+
+# EventData fields holding accounts and hosts, gathered from every record
+ACCOUNT_FIELDS = ("SubjectUserName", "TargetUserName")
+ADDRESS_FIELDS = ("IpAddress", "Workstation", "WorkstationName")
+
+# Patterns reading System fields (and the fields above) straight from a record's JSON, so records that
+# don't need their EventData aren't deserialized. EventID is either a number or {"#attributes": ..., "#text": N}
+_JSON_VALUE = r'("(?:[^"\\]|\\.)*"|[^\s,{}\[\]]+)'
+_EVENT_ID_RE = re.compile(r'"EventID":\s*(?:\{(?:[^{}]|\{[^{}]*\})*?"#text":\s*)?"?(\d+)')
+_SYSTEM_TIME_RE = re.compile(r'"SystemTime":\s*"([^"]*)"')
+_COMPUTER_RE = re.compile(r'"Computer":\s*' + _JSON_VALUE)
+_IDENTITY_FIELD_RE = re.compile(r'"(' + "|".join(ACCOUNT_FIELDS + ADDRESS_FIELDS) + r')":\s*' + _JSON_VALUE)
+
 # Noise user/SID filter for scheduled task user contexts and service accounts
 _NOISE_USER_CONTEXT_RE = re.compile(
     r"^(SYSTEM|LOCAL SERVICE|NETWORK SERVICE|UMFD-\d+|DWM-\d+|ANONYMOUS LOGON)$",
@@ -136,6 +161,68 @@ def _safe_str(val) -> str:
     return str(val).strip()
 
 
+def _json_value(literal: str):
+    try:
+        return json.loads(literal)
+    except ValueError:
+        return literal
+
+
+class _EventStats:
+    """Event counts, time range and unique accounts/computers/IPs across every record.
+
+    Memory grows with the number of distinct values, not with the number of records.
+    """
+
+    def __init__(self):
+        self.event_counts: dict[str, int] = defaultdict(int)
+        self.first_timestamp: str | None = None
+        self.last_timestamp: str | None = None
+        self.unique_accounts: set[str] = set()
+        self.unique_computers: set[str] = set()
+        self.unique_ips: set[str] = set()
+
+    def add(self, eid: str, timestamp: str | None, computer: str, edata: dict) -> None:
+        self.event_counts[eid] += 1
+        if timestamp:
+            # ISO 8601 timestamps in the same format order as strings
+            if self.first_timestamp is None or timestamp < self.first_timestamp:
+                self.first_timestamp = timestamp
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+        if computer:
+            self.unique_computers.add(computer)
+
+        # Collect subject/target usernames and IPs where present
+        for field in ACCOUNT_FIELDS:
+            val = _safe_str(edata.get(field, ""))
+            if val and val not in ("-", "SYSTEM", "LOCAL SERVICE", "NETWORK SERVICE"):
+                if not val.endswith("$"):  # Skip machine accounts
+                    self.unique_accounts.add(val)
+
+        for field in ADDRESS_FIELDS:
+            val = _safe_str(edata.get(field, ""))
+            if val and val not in ("-", "::1", "127.0.0.1"):
+                self.unique_ips.add(val)
+
+    def add_record_text(self, eid: str, data: str) -> None:
+        """Count a record from its JSON text without deserializing it."""
+        time_match = _SYSTEM_TIME_RE.search(data)
+        computer_match = _COMPUTER_RE.search(data)
+
+        edata = {}
+        event_data_start = data.find('"EventData"')
+        if event_data_start != -1:
+            edata = {match[1]: _json_value(match[2]) for match in _IDENTITY_FIELD_RE.finditer(data, event_data_start)}
+
+        self.add(
+            eid,
+            time_match[1] if time_match else None,
+            _safe_str(_json_value(computer_match[1])) if computer_match else "",
+            edata,
+        )
+
+
 def _is_noise_user(user: str, sid: str = "") -> bool:
     """Return True if the user/SID should be filtered out as noise (system accounts)."""
     if sid and sid in _NOISE_SIDS:
@@ -184,15 +271,15 @@ class EVTXAnalyzer(EnrichmentModule):
             return False
 
     def _parse_evtx(self, file_path: str) -> dict:
-        """Stream-parse the EVTX file and collect high-value events."""
-        parser = evtx_lib.PyEvtxParser(file_path)
+        """Stream-parse the EVTX file and collect high-value events.
+
+        Records are parsed on the library's worker threads. Only records with an event ID in
+        `DETAILED_EVENT_IDS` are deserialized; the rest are counted straight from their JSON text.
+        """
+        parser = evtx_lib.PyEvtxParser(file_path, number_of_threads=EVTX_PARSER_THREADS)
 
         # Structures we'll build up
-        event_counts: dict[str, int] = defaultdict(int)
-        timestamps: list[str] = []
-        unique_accounts: set[str] = set()
-        unique_computers: set[str] = set()
-        unique_ips: set[str] = set()
+        stats = _EventStats()
 
         # Per-category collected events
         logon_events: list[dict] = []
@@ -213,6 +300,11 @@ class EVTXAnalyzer(EnrichmentModule):
 
         for record in parser.records_json():
             try:
+                eid_match = _EVENT_ID_RE.search(record["data"])
+                if eid_match and eid_match[1] not in DETAILED_EVENT_IDS:
+                    stats.add_record_text(eid_match[1], record["data"])
+                    continue
+
                 data = json.loads(record["data"])
                 event = data.get("Event", {})
                 sys = event.get("System", {})
@@ -220,25 +312,7 @@ class EVTXAnalyzer(EnrichmentModule):
 
                 eid = _normalize_event_id(sys.get("EventID", ""))
                 timestamp = _get_system_time(sys)
-                computer = _safe_str(sys.get("Computer", ""))
-
-                event_counts[eid] += 1
-                if timestamp:
-                    timestamps.append(timestamp)
-                if computer:
-                    unique_computers.add(computer)
-
-                # Collect subject/target usernames and IPs where present
-                for field in ("SubjectUserName", "TargetUserName"):
-                    val = _safe_str(edata.get(field, ""))
-                    if val and val not in ("-", "SYSTEM", "LOCAL SERVICE", "NETWORK SERVICE"):
-                        if not val.endswith("$"):  # Skip machine accounts
-                            unique_accounts.add(val)
-
-                for field in ("IpAddress", "Workstation", "WorkstationName"):
-                    val = _safe_str(edata.get(field, ""))
-                    if val and val not in ("-", "::1", "127.0.0.1"):
-                        unique_ips.add(val)
+                stats.add(eid, timestamp, _safe_str(sys.get("Computer", "")), edata)
 
                 # --- Per-event-ID processing ---
 
@@ -441,11 +515,12 @@ class EVTXAnalyzer(EnrichmentModule):
                 continue
 
         return {
-            "event_counts": dict(event_counts),
-            "timestamps": sorted(timestamps),
-            "unique_accounts": list(unique_accounts),
-            "unique_computers": list(unique_computers),
-            "unique_ips": list(unique_ips),
+            "event_counts": dict(stats.event_counts),
+            "first_timestamp": stats.first_timestamp,
+            "last_timestamp": stats.last_timestamp,
+            "unique_accounts": list(stats.unique_accounts),
+            "unique_computers": list(stats.unique_computers),
+            "unique_ips": list(stats.unique_ips),
             "logon_events": logon_events,
             "explicit_logon_events": explicit_logon_events,
             "process_creation_events": process_creation_events,
@@ -490,9 +565,8 @@ class EVTXAnalyzer(EnrichmentModule):
 
     def _build_summary_markdown(self, file_name: str, parsed: dict, script_blocks_extracted: int = 0) -> str:
         """Build a human-readable markdown summary of the EVTX analysis."""
-        timestamps = parsed["timestamps"]
-        first_ts = timestamps[0] if timestamps else "unknown"
-        last_ts = timestamps[-1] if timestamps else "unknown"
+        first_ts = parsed["first_timestamp"] or "unknown"
+        last_ts = parsed["last_timestamp"] or "unknown"
 
         event_counts = parsed["event_counts"]
         total_events = sum(event_counts.values())
@@ -595,7 +669,7 @@ class EVTXAnalyzer(EnrichmentModule):
         # --- System: Power/Boot/Shutdown Timeline ---
         if parsed.get("power_events"):
             # Only show events within the last POWER_TIMELINE_DAYS days of the log
-            ref_ts = timestamps[-1] if timestamps else None
+            ref_ts = parsed["last_timestamp"]
             if ref_ts:
                 try:
                     ref_dt = datetime.fromisoformat(ref_ts.replace("Z", "+00:00"))
@@ -725,7 +799,8 @@ class EVTXAnalyzer(EnrichmentModule):
         result = EnrichmentResult(module_name=self.name, dependencies=self.dependencies)
 
         try:
-            parsed = self._parse_evtx(file_path)
+            # Off the event loop, as multi-GB logs take minutes to parse
+            parsed = await asyncio.to_thread(self._parse_evtx, file_path)
         except Exception:
             logger.exception(message="Failed to parse EVTX file", file_name=file_enriched.file_name)
             return None
@@ -738,8 +813,8 @@ class EVTXAnalyzer(EnrichmentModule):
             "total_events": sum(parsed["event_counts"].values()),
             "event_counts": parsed["event_counts"],
             "time_range": {
-                "first": parsed["timestamps"][0] if parsed["timestamps"] else None,
-                "last": parsed["timestamps"][-1] if parsed["timestamps"] else None,
+                "first": parsed["first_timestamp"],
+                "last": parsed["last_timestamp"],
             },
             "unique_accounts": parsed["unique_accounts"],
             "unique_computers": parsed["unique_computers"],
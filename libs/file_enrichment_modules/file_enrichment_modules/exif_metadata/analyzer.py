@@ -7,7 +7,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from PIL import Image
 from PIL.ExifTags import GPSTAGS, TAGS
 
@@ -233,6 +233,7 @@ def format_exif_display(exif_data):
 class ExifMetadataExtractor(EnrichmentModule):
     name: str = "exif_metadata"
     dependencies: list[str] = []
+    content_only: bool = True
 
     def __init__(self):
         self.storage = StorageMinio()
@@ -240,6 +241,7 @@ class ExifMetadataExtractor(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(extensions=tuple(SUPPORTED_EXTENSIONS), needs_should_process=True)
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if this module should run."""
@@ -254,7 +256,7 @@ class ExifMetadataExtractor(EnrichmentModule):
         magic_lower = file_enriched.magic_type.lower()
         return any(fmt in magic_lower for fmt in ["jpeg", "tiff", "image"])
 
-    def _analyze_exif(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze EXIF metadata and generate enrichment result.
 
         Args:
@@ -320,10 +322,10 @@ class ExifMetadataExtractor(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_exif(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_exif(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing file", file_object_id=object_id)
@@ -1,7 +1,7 @@
 from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin
 from common.state_helpers import get_file_enriched_async
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -12,6 +12,7 @@ class FilenameScanner(EnrichmentModule):
 
     def __init__(self):
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers()  # every file
 
         self.asyncpg_pool = None  # type: ignore
 
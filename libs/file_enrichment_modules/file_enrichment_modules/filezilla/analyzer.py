@@ -9,7 +9,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -24,6 +24,11 @@ class FileZillaParser(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(
+            path_globs=("sitemanager.xml", "recentservers.xml", "filezilla.xml", "*filezilla*"),
+            is_plaintext=True,
+            needs_should_process=True,
+        )
 
         self.size_limit = 50000000  # only check the first 50 megs, for efficiency
 
@@ -234,7 +239,7 @@ rule Detect_FileZilla_Config {
                 return True
         return False
 
-    def _analyze_filezilla(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze FileZilla configuration file and generate enrichment result.
 
         Args:
@@ -353,10 +358,10 @@ rule Detect_FileZilla_Config {
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_filezilla(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_filezilla(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing FileZilla configuration file")
@@ -8,7 +8,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -27,6 +27,7 @@ class GitCredentialsParser(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(path_globs=(".git-credentials", ".gitcredentials"), is_plaintext=True)
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if this module should run based on file type."""
@@ -78,7 +79,7 @@ class GitCredentialsParser(EnrichmentModule):
 
         return summary
 
-    def _analyze_gitcredentials(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze Git credentials file and generate enrichment result.
 
         Args:
@@ -169,10 +170,10 @@ class GitCredentialsParser(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_gitcredentials(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_gitcredentials(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing Git credentials file")
@@ -9,7 +9,7 @@ from common.models import EnrichmentResult, FileObject, Finding, FindingCategory
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
 from file_enrichment_modules.kdbx.keepass2john import process_database
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -229,6 +229,7 @@ def parse_variant_dictionary(data: bytes) -> dict[str, Any]:
 class KDBXAnalyzer(EnrichmentModule):
     name: str = "kdbx_analyzer"
     dependencies: list[str] = []
+    content_only: bool = True
 
     def __init__(self):
         self.storage = StorageMinio()
@@ -236,6 +237,7 @@ class KDBXAnalyzer(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(magic_substrings=("keepass",), needs_should_process=True)
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         # Get the current file_enriched from the database backend
@@ -246,7 +248,7 @@ class KDBXAnalyzer(EnrichmentModule):
         else:
             return False
 
-    def _analyze_kdbx(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze KDBX file and generate enrichment result.
 
         Args:
@@ -336,10 +338,10 @@ class KDBXAnalyzer(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_kdbx(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as file:
-                    return self._analyze_kdbx(file.name, file_enriched)
+                    return self.analyze(file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing KDBX file")
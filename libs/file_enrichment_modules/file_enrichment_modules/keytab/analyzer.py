@@ -221,7 +221,7 @@ rule Keytab_File
         """Parse a keytab file and extract key information."""
         return self._parse_keytab_manual(file_data)
 
-    def _analyze_keytab_file(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze keytab file and generate enrichment result.
 
         Args:
@@ -415,10 +415,10 @@ rule Keytab_File
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_keytab_file(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_keytab_file(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error in keytab analyzer")
@@ -9,7 +9,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -26,6 +26,7 @@ class KubeconfigParser(EnrichmentModule):
         self.workflows = ["default"]
 
         self.size_limit = 1000000  # 1 MB limit - skip larger files
+        self.triggers = ModuleTriggers(is_plaintext=True, max_size=self.size_limit, needs_should_process=True)
 
         # YARA rule to detect Kubernetes configuration files
         self.yara_rule = yara_x.compile("""
@@ -400,7 +401,7 @@ rule Detect_Kubeconfig {
 
         return summary
 
-    def _analyze_kubeconfig(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze kubeconfig file and generate enrichment result.
 
         Args:
@@ -614,10 +615,10 @@ rule Detect_Kubeconfig {
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_kubeconfig(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_kubeconfig(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing kubeconfig file")
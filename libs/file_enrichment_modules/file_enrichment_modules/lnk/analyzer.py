@@ -10,7 +10,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -76,6 +76,7 @@ def convert_datetime(obj):
 class LnkParser(EnrichmentModule):
     name: str = "lnk_parser"
     dependencies: list[str] = []
+    content_only: bool = True
 
     def __init__(self):
         self.storage = StorageMinio()
@@ -83,13 +84,14 @@ class LnkParser(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(magic_substrings=("ms windows shortcut",))
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if this module should run."""
         file_enriched = await get_file_enriched_async(object_id, self.asyncpg_pool)
         return "ms windows shortcut" in file_enriched.magic_type.lower()
 
-    def _analyze_lnk(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze LNK file and generate enrichment result.
 
         Args:
@@ -147,10 +149,10 @@ class LnkParser(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_lnk(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_lnk(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing file", file_object_id=object_id)
@@ -9,7 +9,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from nemesis_dpapi import DpapiManager, MasterKey, MasterKeyType
 from pypykatz.pypykatz import pypykatz
 
@@ -60,6 +60,7 @@ class LsassDumpParser(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(magic_substrings=("mini dump crash report",))
         self.dpapi_manager: DpapiManager = None  # type: ignore
         self.loop: asyncio.AbstractEventLoop = None  # type: ignore
         self.size_limit = 1024 * 1024 * 100  # 100 MB size limit for LSASS dumps
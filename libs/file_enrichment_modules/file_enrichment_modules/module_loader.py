@@ -1,13 +1,19 @@
 import asyncio
+import fnmatch
 import importlib.util
+import re
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
 import asyncpg
 from common.logger import get_logger
 from common.models import EnrichmentResult
 
+if TYPE_CHECKING:
+    from common.models import FileEnriched
+
 logger = get_logger(__name__)
 
 
@@ -15,7 +21,14 @@ logger = get_logger(__name__)
 class EnrichmentModule(Protocol):
     """Protocol defining the interface for enrichment modules.
 
-    All enrichment modules must implement this protocol with async methods.
+    All enrichment modules must implement this protocol with async methods. Modules may also expose
+    an optional `triggers: ModuleTriggers` attribute to be selected through the TriggerIndex, and
+    `content_only = True` if their results depend only on the file's bytes (not its path, source or
+    external state), which lets files with identical content reuse the stored results.
+
+    Modules whose work after loading the file's metadata is synchronous should also expose
+    `analyze(file_path, file_enriched) -> EnrichmentResult | None`. The enrichment service then runs
+    it on a shared thread pool instead of awaiting `process()` on the event loop.
     """
 
     name: str
@@ -47,6 +60,120 @@ class EnrichmentModule(Protocol):
         ...
 
 
+@dataclass(frozen=True)
+class ModuleTriggers:
+    """Declarative description of the files an enrichment module applies to.
+
+    Modules can expose an instance of this as a `triggers` attribute so the ModuleLoader can
+    select them from a precompiled index instead of awaiting `should_process()` for every file.
+
+    A file is a candidate if it matches ANY of the positive criteria (mime type, magic substring,
+    extension, path glob) - or if none are given, every file is - AND it satisfies the constraints
+    (`max_size`, `is_plaintext`). All string comparisons are case-insensitive.
+
+    Attributes:
+        mime_types: Exact mime types (e.g. "text/xml")
+        magic_substrings: Substrings of the libmagic description (e.g. "pdf document")
+        extensions: File extensions including the dot (e.g. ".evtx")
+        path_globs: fnmatch globs checked against both the file name and the full path
+        max_size: Largest file size (in bytes) the module accepts
+        is_plaintext: If set, the file's is_plaintext flag must equal this
+        needs_should_process: If True the triggers only narrow the candidates, and
+            `should_process()` is still called for the ones that match (e.g. for YARA checks)
+    """
+
+    mime_types: tuple[str, ...] = ()
+    magic_substrings: tuple[str, ...] = ()
+    extensions: tuple[str, ...] = ()
+    path_globs: tuple[str, ...] = ()
+    max_size: int | None = None
+    is_plaintext: bool | None = None
+    needs_should_process: bool = False
+
+    @property
+    def matches_all(self) -> bool:
+        return not (self.mime_types or self.magic_substrings or self.extensions or self.path_globs)
+
+    def accepts(self, file_enriched: "FileEnriched") -> bool:
+        """Check the non-indexed constraints (size/plaintext) for a candidate file."""
+        if self.max_size is not None and file_enriched.size > self.max_size:
+            return False
+        if self.is_plaintext is not None and file_enriched.is_plaintext != self.is_plaintext:
+            return False
+        return True
+
+
+class TriggerIndex:
+    """Index over the `triggers` of loaded modules, used to resolve candidate modules for a file in one lookup.
+
+    Modules without a `triggers` attribute are always returned as needing `should_process()`.
+    """
+
+    def __init__(self, modules: dict[str, EnrichmentModule]):
+        self.triggers: dict[str, ModuleTriggers] = {}
+        self.untriggered: set[str] = set()
+        self.match_all: set[str] = set()
+        self.by_mime_type: dict[str, set[str]] = {}
+        self.by_extension: dict[str, set[str]] = {}
+        self.magic_substrings: list[tuple[str, str]] = []
+        self.path_patterns: list[tuple[re.Pattern, str]] = []
+
+        for name, module in modules.items():
+            triggers = getattr(module, "triggers", None)
+            if not isinstance(triggers, ModuleTriggers):
+                self.untriggered.add(name)
+                continue
+
+            self.triggers[name] = triggers
+            if triggers.matches_all:
+                self.match_all.add(name)
+            for mime_type in triggers.mime_types:
+                self.by_mime_type.setdefault(mime_type.lower(), set()).add(name)
+            for extension in triggers.extensions:
+                self.by_extension.setdefault(extension.lower(), set()).add(name)
+            for substring in triggers.magic_substrings:
+                self.magic_substrings.append((substring.lower(), name))
+            if triggers.path_globs:
+                # one alternation per module so each file name/path is matched once per module
+                pattern = "|".join(fnmatch.translate(glob.lower()) for glob in triggers.path_globs)
+                self.path_patterns.append((re.compile(pattern), name))
+
+    def resolve(self, file_enriched: "FileEnriched") -> tuple[set[str], set[str]]:
+        """Resolve the modules that apply to a file.
+
+        Returns:
+            (selected, needs_check): modules whose triggers fully decide that they apply, and modules
+            whose `should_process()` must still be awaited
+        """
+        mime_type = (file_enriched.mime_type or "").lower()
+        magic_type = (file_enriched.magic_type or "").lower()
+        extension = (file_enriched.extension or "").lower()
+        file_name = (file_enriched.file_name or "").lower()
+        path = (file_enriched.path or "").lower()
+
+        candidates = set(self.match_all)
+        candidates.update(self.by_mime_type.get(mime_type, ()))
+        if extension:
+            candidates.update(self.by_extension.get(extension, ()))
+        candidates.update(name for substring, name in self.magic_substrings if substring in magic_type)
+        candidates.update(
+            name for pattern, name in self.path_patterns if pattern.match(file_name) or pattern.match(path)
+        )
+
+        selected = set()
+        needs_check = set(self.untriggered)
+        for name in candidates:
+            triggers = self.triggers[name]
+            if not triggers.accepts(file_enriched):
+                continue
+            if triggers.needs_should_process:
+                needs_check.add(name)
+            else:
+                selected.add(name)
+
+        return selected, needs_check
+
+
 class ModuleLoader:
     def __init__(self, modules_dir: str | None = None):
         if modules_dir is None:
@@ -54,6 +181,7 @@ class ModuleLoader:
         else:
             self.modules_dir = Path(modules_dir)
         self.modules: dict[str, EnrichmentModule] = {}
+        self.trigger_index = TriggerIndex({})
 
     async def _install_module_deps(self, module_path: Path):
         """Install module dependencies using uv if pyproject.toml exists."""
@@ -129,3 +257,15 @@ class ModuleLoader:
             await self._load_module(module_dir)
 
         logger.info(f"Loaded {len(self.modules)} modules successfully")
+
+        self.build_trigger_index()
+
+    def build_trigger_index(self) -> TriggerIndex:
+        """Compile the declared triggers of all loaded modules into a TriggerIndex."""
+        self.trigger_index = TriggerIndex(self.modules)
+        logger.info(
+            "Compiled module trigger index",
+            indexed_modules=len(self.trigger_index.triggers),
+            should_process_modules=len(self.trigger_index.untriggered),
+        )
+        return self.trigger_index
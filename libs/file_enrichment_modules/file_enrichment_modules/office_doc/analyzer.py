@@ -11,7 +11,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from file_enrichment_modules.office_doc.office2john import extract_file_encryption_hash
 from oletools.olevba import VBA_Parser
 
@@ -325,6 +325,7 @@ def parse_office_new_file(file_path: str) -> dict[str, Any]:
 class OfficeAnalyzer(EnrichmentModule):
     name: str = "office_analyzer"
     dependencies: list[str] = []
+    content_only: bool = True
 
     def __init__(self):
         self.storage = StorageMinio()
@@ -332,6 +333,10 @@ class OfficeAnalyzer(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(
+            extensions=(".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx"),
+            magic_substrings=("word", "excel", "powerpoint", "composite document"),
+        )
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if this module should run based on file extension and type."""
@@ -351,7 +356,7 @@ class OfficeAnalyzer(EnrichmentModule):
         should_run = has_valid_extension or is_office_type
         return should_run
 
-    def _analyze_office_document(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze Office document and generate enrichment result.
 
         Args:
@@ -434,10 +439,10 @@ class OfficeAnalyzer(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_office_document(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as file:
-                    return self._analyze_office_document(file.name, file_enriched)
+                    return self.analyze(file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing Office file")
@@ -7,7 +7,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -15,6 +15,7 @@ logger = get_logger(__name__)
 class ParquetFileParser(EnrichmentModule):
     name: str = "parquet_file_parser"
     dependencies: list[str] = []
+    content_only: bool = True
 
     def __init__(self):
         self.storage = StorageMinio()
@@ -23,6 +24,7 @@ class ParquetFileParser(EnrichmentModule):
 
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(magic_substrings=("apache parquet",))
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if this module should run."""
@@ -38,7 +40,7 @@ class ParquetFileParser(EnrichmentModule):
             schema_info.append({"name": field.name, "type": str(field.type), "nullable": field.nullable})
         return schema_info
 
-    def _analyze_parquet(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze Parquet file and generate enrichment result.
 
         Args:
@@ -65,10 +67,9 @@ class ParquetFileParser(EnrichmentModule):
             # Generate summary report
             report_lines = []
 
-            # File summary
+            # File summary (no file name: the report is shared by files with identical content)
             report_lines.append("# Parquet File Summary")
-            report_lines.append(f"\nFile name: {file_enriched.file_name}")
-            report_lines.append(f"Total rows: {num_rows}")
+            report_lines.append(f"\nTotal rows: {num_rows}")
             report_lines.append(f"Row groups: {num_row_groups}")
 
             # Schema information
@@ -190,10 +191,10 @@ class ParquetFileParser(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_parquet(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_parquet(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing Parquet file")
@@ -8,7 +8,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from file_enrichment_modules.pdf.pdf2john import PdfParser
 
 logger = get_logger(__name__)
@@ -545,6 +545,7 @@ def parse_pdf_file(file_path: str) -> dict[str, Any]:
 class PDFAnalyzer(EnrichmentModule):
     name: str = "pdf_analyzer"
     dependencies: list[str] = []
+    content_only: bool = True
 
     def __init__(self):
         self.storage = StorageMinio()
@@ -552,13 +553,14 @@ class PDFAnalyzer(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(magic_substrings=("pdf document",))
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         # Get the current file_enriched from the database backend
         file_enriched = await get_file_enriched_async(object_id, self.asyncpg_pool)
         return "pdf document" in file_enriched.magic_type.lower()
 
-    def _analyze_pdf(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze PDF file and generate enrichment result.
 
         Args:
@@ -623,10 +625,10 @@ The document is encrypted. Attempt to crack it using the following hash:
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_pdf(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as file:
-                    return self._analyze_pdf(file.name, file_enriched)
+                    return self.analyze(file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing PDF file")
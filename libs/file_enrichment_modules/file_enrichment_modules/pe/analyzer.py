@@ -1,5 +1,6 @@
 # pyright: reportAttributeAccessIssue=false, reportCallIssue=false
 # enrichment_modules/pe_analyzer/analzyer.py
+import asyncio
 import os
 import shutil
 import tempfile
@@ -626,13 +627,13 @@ rule python_packed_executable
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                result = self._analyze_pe(file_path, file_enriched)
+                result = await asyncio.to_thread(self._analyze_pe, file_path, file_enriched)
                 # Check for Python packing and unpack
                 result = await self._try_python_unpack(file_path, file_enriched, result)
                 return result
             else:
                 with self.storage.download(file_enriched.object_id) as file:
-                    result = self._analyze_pe(file.name, file_enriched)
+                    result = await asyncio.to_thread(self._analyze_pe, file.name, file_enriched)
                     # Check for Python packing and unpack
                     result = await self._try_python_unpack(file.name, file_enriched, result)
                     return result
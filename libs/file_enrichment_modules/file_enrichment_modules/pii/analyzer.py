@@ -1,15 +1,16 @@
 # enrichment_modules/pii/analyzer.py
 import os
+import shutil
 import tempfile
-import threading
-from pathlib import Path
+from contextlib import ExitStack, aclosing
+from typing import TextIO
 
 from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
-from presidio_analyzer import AnalyzerEngine
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
+from file_enrichment_modules.pii.chunked_engine import ChunkedPIIEngine
 
 logger = get_logger(__name__)
 
@@ -31,30 +32,42 @@ PII_DETECTION_THRESHOLD = float(os.getenv("PII_DETECTION_THRESHOLD", "0.7"))
 # Enable/disable PII detection (must be explicitly enabled)
 ENABLE_PII_DETECTION = os.getenv("ENABLE_PII_DETECTION", "False").lower() == "true"
 
+# Worker processes running Presidio, each with its own loaded engine
+PII_WORKERS = int(os.getenv("PII_WORKERS", "2"))
+
+# Characters analyzed per window, and characters shared between neighbouring windows so matches spanning
+#   a window boundary are still found
+PII_CHUNK_SIZE = int(os.getenv("PII_CHUNK_SIZE", "500000"))
+PII_CHUNK_OVERLAP = int(os.getenv("PII_CHUNK_OVERLAP", "1000"))
+
+# Only analyze this many leading characters of a file (0 analyzes the whole file)
+PII_SIZE_LIMIT = int(os.getenv("PII_SIZE_LIMIT", "0"))
+
+# Matches kept per PII type in the finding and results; every match is still counted and listed in the
+#   displayable transform
+PII_MAX_SAMPLE_MATCHES = int(os.getenv("PII_MAX_SAMPLE_MATCHES", "100"))
+
 
 class PIIAnalyzer(EnrichmentModule):
     name: str = "pii_analyzer"
     dependencies: list[str] = []
-    _thread_local = threading.local()
 
     def __init__(self):
         self.storage = StorageMinio()
 
         self.asyncpg_pool = None  # type: ignore
-        self.size_limit = 10_000_000  # 10MB size limit
+        self.size_limit = PII_SIZE_LIMIT
+        self.max_sample_matches = PII_MAX_SAMPLE_MATCHES
+        self.engine = ChunkedPIIEngine(
+            entities=SUPPORTED_PII_ENTITIES,
+            threshold=PII_DETECTION_THRESHOLD,
+            workers=PII_WORKERS,
+            chunk_size=PII_CHUNK_SIZE,
+            overlap=PII_CHUNK_OVERLAP,
+        )
         # the workflows this module should automatically run in
         self.workflows = ["default"]
-
-    def _get_analyzer(self) -> AnalyzerEngine:
-        """Get or create thread-local AnalyzerEngine instance."""
-        if not hasattr(self._thread_local, "analyzer"):
-            self._thread_local.analyzer = AnalyzerEngine()
-        return self._thread_local.analyzer
-
-    def _clear_analyzer(self):
-        """Clear the thread-local analyzer if it exists."""
-        if hasattr(self._thread_local, "analyzer"):
-            delattr(self._thread_local, "analyzer")
+        self.triggers = ModuleTriggers(is_plaintext=True, needs_should_process=True)
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if file should be processed based on plaintext detection.
@@ -73,20 +86,14 @@ class PIIAnalyzer(EnrichmentModule):
         file_enriched = await get_file_enriched_async(object_id, self.asyncpg_pool)
 
         if file_enriched.is_plaintext:
-            if file_enriched.size > self.size_limit:
+            if self.size_limit and file_enriched.size > self.size_limit:
                 logger.warning(
-                    f"[pii_analyzer] file {file_enriched.path} ({file_enriched.object_id} / {file_enriched.size} bytes) exceeds the size limit of {self.size_limit} bytes, only analyzing the first {self.size_limit} bytes"
+                    f"[pii_analyzer] file {file_enriched.path} ({file_enriched.object_id} / {file_enriched.size} bytes) exceeds the size limit of {self.size_limit} characters, only analyzing the first {self.size_limit} characters"
                 )
             return True
 
         return False
 
-    def _get_match_context(self, content: str, offset: int, length: int, context_size: int = 50) -> str:
-        """Get surrounding context for a match position."""
-        start = max(0, offset - context_size)
-        end = min(len(content), offset + length + context_size)
-        return content[start:end]
-
     def _categorize_match(self, entity_type: str) -> str:
         """Categorize the type of PII based on Presidio entity type.
 
@@ -98,12 +105,12 @@ class PIIAnalyzer(EnrichmentModule):
         """
         return PII_ENTITY_CONFIG.get(entity_type, entity_type)
 
-    def _create_finding_summary(self, findings_by_type: dict[str, list[dict]]) -> str:
+    def _create_finding_summary(self, counts: dict[str, int], samples: dict[str, list[dict]]) -> str:
         """Create a markdown summary of PII findings."""
         summary = "# Detected PII\n\n"
         summary += "## Executive Summary\n\n"
 
-        total_findings = sum(len(matches) for matches in findings_by_type.values())
+        total_findings = sum(counts.values())
         summary += f"Total PII instances detected: {total_findings}\n\n"
 
         # Add table header
@@ -111,15 +118,16 @@ class PIIAnalyzer(EnrichmentModule):
         summary += "| Type | Instances |\n"
         summary += "|------|----------:|\n"
 
-        for pii_type, matches in findings_by_type.items():
-            summary += f"| {pii_type} | {len(matches)} |\n"
+        for pii_type, count in counts.items():
+            summary += f"| {pii_type} | {count} |\n"
 
         summary += "\n## Detailed Findings\n\n"
 
-        for pii_type, matches in findings_by_type.items():
+        for pii_type, count in counts.items():
             summary += f"### {pii_type}\n"
-            summary += f"Total instances found: {len(matches)}\n\n"
+            summary += f"Total instances found: {count}\n\n"
 
+            matches = samples[pii_type]
             if matches:
                 summary += "| Location | Context |\n"
                 summary += "|----------|----------|\n"
@@ -133,9 +141,14 @@ class PIIAnalyzer(EnrichmentModule):
 
         return summary
 
-    def _analyze_pii(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    async def _analyze_pii(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze file for PII using Presidio and generate enrichment result.
 
+        The file is streamed through the chunked engine's worker processes, so the whole file is analyzed
+        (up to `size_limit` characters, when set) without being loaded into memory at once. Only per-type
+        counts and the first `max_sample_matches` matches of each type are kept in memory; the full list of
+        values for the displayable transform is spooled to a temporary file per type.
+
         Args:
             file_path: Path to the file to analyze for PII
             file_enriched: File enrichment data
@@ -145,98 +158,73 @@ class PIIAnalyzer(EnrichmentModule):
         """
         enrichment_result = EnrichmentResult(module_name=self.name, dependencies=self.dependencies)
 
-        analyzer = self._get_analyzer()
-
         try:
-            # Read file with size limit
-            content = Path(file_path).read_text(encoding="utf-8")
-
-            # Truncate content if it exceeds size limit
-            if len(content.encode("utf-8")) > self.size_limit:
-                # Find a safe truncation point (approximate character position)
-                approx_chars = int(self.size_limit * len(content) / len(content.encode("utf-8")))
-                content = content[:approx_chars]
-
-            # Analyze with Presidio
-            results = analyzer.analyze(text=content, entities=SUPPORTED_PII_ENTITIES, language="en")
-
-            # Filter by threshold and organize by type
-            findings_by_type = {}
-
-            for result in results:
-                # Filter by confidence threshold
-                if result.score < PII_DETECTION_THRESHOLD:
-                    continue
-
-                pii_type = self._categorize_match(result.entity_type)
-
-                if pii_type not in findings_by_type:
-                    findings_by_type[pii_type] = []
-
-                # Extract the matched value and context
-                value = content[result.start : result.end]
-                length = result.end - result.start
-                context = self._get_match_context(content, result.start, length)
-
-                findings_by_type[pii_type].append(
-                    {
-                        "value": value,
-                        "context": context,
-                        "offset": result.start,
-                        "length": length,
-                        "score": result.score,
-                        "entity_type": result.entity_type,
-                    }
-                )
-
-            if findings_by_type:
-                # Create finding summary
-                summary_markdown = self._create_finding_summary(findings_by_type)
-
-                # Create display data
-                display_data = FileObject(type="finding_summary", metadata={"summary": summary_markdown})
-
-                # Create finding
-                finding = Finding(
-                    category=FindingCategory.PII,
-                    finding_name="pii_detected",
-                    origin_type=FindingOrigin.ENRICHMENT_MODULE,
-                    origin_name=self.name,
-                    object_id=file_enriched.object_id,
-                    severity=4,
-                    raw_data={"findings": findings_by_type},
-                    data=[display_data],
-                )
-
-                enrichment_result.findings = [finding]
-                enrichment_result.results = {"pii_detected": findings_by_type}
-
-                # Create a displayable version of the results
-                with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8") as tmp_display_file:
-                    display = "PII Analysis Results\n==================\n\n"
-                    for pii_type, matches in findings_by_type.items():
-                        display += f"{pii_type}:\n"
-                        display += f"  Total instances: {len(matches)}\n"
-                        display += "  Found Values:\n"
-                        for match in matches:
-                            display += f"    - Offset {match['offset']}: {match['value']}\n"
-                        display += "\n"
-
-                    tmp_display_file.write(display)
-                    tmp_display_file.flush()
-
-                    object_id = self.storage.upload_file(tmp_display_file.name)
-
-                    displayable_parsed = Transform(
-                        type="displayable_parsed",
-                        object_id=f"{object_id}",
-                        metadata={
-                            "file_name": f"{file_enriched.file_name}_pii_analysis.txt",
-                            "display_type_in_dashboard": "monaco",
-                            "default_display": True,
-                        },
+            with ExitStack() as stack:
+                # Organize by type
+                counts: dict[str, int] = {}
+                samples: dict[str, list[dict]] = {}
+                value_files: dict[str, TextIO] = {}
+                async with aclosing(self.engine.analyze_file(file_path, limit=self.size_limit)) as matches:
+                    async for match in matches:
+                        pii_type = self._categorize_match(match["entity_type"])
+                        if pii_type not in counts:
+                            counts[pii_type] = 0
+                            samples[pii_type] = []
+                            value_files[pii_type] = stack.enter_context(
+                                tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+                            )
+
+                        counts[pii_type] += 1
+                        if len(samples[pii_type]) < self.max_sample_matches:
+                            samples[pii_type].append(match)
+                        value_files[pii_type].write(f"    - Offset {match['offset']}: {match['value']}\n")
+
+                if counts:
+                    # Create finding summary
+                    summary_markdown = self._create_finding_summary(counts, samples)
+
+                    # Create display data
+                    display_data = FileObject(type="finding_summary", metadata={"summary": summary_markdown})
+
+                    # Create finding
+                    finding = Finding(
+                        category=FindingCategory.PII,
+                        finding_name="pii_detected",
+                        origin_type=FindingOrigin.ENRICHMENT_MODULE,
+                        origin_name=self.name,
+                        object_id=file_enriched.object_id,
+                        severity=4,
+                        raw_data={"findings": samples, "counts": counts},
+                        data=[display_data],
                     )
-                    enrichment_result.transforms = [displayable_parsed]
+
+                    enrichment_result.findings = [finding]
+                    enrichment_result.results = {"pii_detected": samples, "counts": counts}
+
+                    # Create a displayable version of the results, listing every match
+                    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8") as tmp_display_file:
+                        tmp_display_file.write("PII Analysis Results\n==================\n\n")
+                        for pii_type, count in counts.items():
+                            tmp_display_file.write(f"{pii_type}:\n")
+                            tmp_display_file.write(f"  Total instances: {count}\n")
+                            tmp_display_file.write("  Found Values:\n")
+                            value_files[pii_type].seek(0)
+                            shutil.copyfileobj(value_files[pii_type], tmp_display_file)
+                            tmp_display_file.write("\n")
+                        tmp_display_file.flush()
+
+                        object_id = self.storage.upload_file(tmp_display_file.name)
+
+                        displayable_parsed = Transform(
+                            type="displayable_parsed",
+                            object_id=f"{object_id}",
+                            metadata={
+                                "file_name": f"{file_enriched.file_name}_pii_analysis.txt",
+                                "display_type_in_dashboard": "monaco",
+                                "default_display": True,
+                            },
+                        )
+                        enrichment_result.transforms = [displayable_parsed]
 
             return enrichment_result
 
@@ -259,10 +247,10 @@ class PIIAnalyzer(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_pii(file_path, file_enriched)
+                return await self._analyze_pii(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_pii(temp_file.name, file_enriched)
+                    return await self._analyze_pii(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing file for PII detection")
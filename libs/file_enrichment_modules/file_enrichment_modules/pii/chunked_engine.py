@@ -0,0 +1,163 @@
+# enrichment_modules/pii/chunked_engine.py
+"""Chunked Presidio analysis of text files across worker processes.
+
+Files are streamed through in overlapping windows and matches are yielded as their windows finish, so memory
+stays bounded and the whole file is covered.
+Each worker process keeps one warm `AnalyzerEngine` (loading the spaCy model takes seconds).
+"""
+
+import asyncio
+import multiprocessing
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from presidio_analyzer import AnalyzerEngine
+
+# Characters of surrounding text kept with each match
+MATCH_CONTEXT_SIZE = 50
+
+_worker_analyzer: "AnalyzerEngine | None" = None
+
+
+def _init_worker() -> None:
+    # Imported here since only the worker processes need Presidio (and its spaCy model) loaded
+    from presidio_analyzer import AnalyzerEngine
+
+    global _worker_analyzer
+    _worker_analyzer = AnalyzerEngine()
+
+
+def get_match_context(content: str, offset: int, length: int, context_size: int = MATCH_CONTEXT_SIZE) -> str:
+    """Get surrounding context for a match position."""
+    start = max(0, offset - context_size)
+    end = min(len(content), offset + length + context_size)
+    return content[start:end]
+
+
+def iter_windows(f: TextIO, chunk_size: int, overlap: int, limit: int = 0) -> Iterator[tuple[str, int, int, int]]:
+    """Split a text stream into overlapping windows.
+
+    Consecutive windows share `overlap` characters and split ownership of that overlap in half, so every
+    match start position belongs to exactly one window, and a match shorter than half the overlap is whole
+    in the window that owns it.
+
+    Args:
+        f: Text stream to read
+        chunk_size: New characters read per window
+        overlap: Characters carried over from the previous window
+        limit: Stop after reading this many characters (0 reads everything)
+
+    Yields:
+        (window text, window start offset, owned start offset, owned end offset) in characters
+    """
+    remaining = limit or -1
+
+    def read_chunk() -> str:
+        nonlocal remaining
+        if remaining == 0:
+            return ""
+        chunk = f.read(chunk_size if remaining < 0 else min(chunk_size, remaining))
+        if remaining > 0:
+            remaining -= len(chunk)
+        return chunk
+
+    tail, window_start, owned_start = "", 0, 0
+    chunk = read_chunk()
+    while chunk:
+        next_chunk = read_chunk()
+        text = tail + chunk
+        window_end = window_start + len(text)
+        if not next_chunk:
+            yield text, window_start, owned_start, window_end
+            return
+
+        tail = text[max(len(text) - overlap, 0) :]
+        boundary = window_end - len(tail) + len(tail) // 2
+        yield text, window_start, owned_start, boundary
+        window_start, owned_start = window_end - len(tail), boundary
+        chunk = next_chunk
+
+
+def analyze_window(
+    text: str, window_start: int, owned_start: int, owned_end: int, entities: list[str], threshold: float
+) -> list[dict]:
+    """Run Presidio over one window, keeping confident matches that start in [owned_start, owned_end).
+
+    Runs in a worker process. Offsets in the returned matches are relative to the start of the file.
+    """
+    assert _worker_analyzer is not None, "worker analyzer must be initialized"
+
+    matches = []
+    for result in _worker_analyzer.analyze(text=text, entities=entities, language="en"):
+        offset = window_start + result.start
+        if result.score < threshold or not owned_start <= offset < owned_end:
+            continue
+
+        length = result.end - result.start
+        matches.append(
+            {
+                "value": text[result.start : result.end],
+                "context": get_match_context(text, result.start, length),
+                "offset": offset,
+                "length": length,
+                "score": result.score,
+                "entity_type": result.entity_type,
+            }
+        )
+    return sorted(matches, key=lambda match: match["offset"])
+
+
+class ChunkedPIIEngine:
+    """Streams text files through Presidio analyzers running in a pool of worker processes."""
+
+    def __init__(self, entities: list[str], threshold: float, workers: int, chunk_size: int, overlap: int):
+        self.entities = entities
+        self.threshold = threshold
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned rather than forked: the parent process runs threads (Dapr, asyncpg) that don't survive a fork
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def analyze_file(self, file_path: str, limit: int = 0) -> AsyncIterator[dict]:
+        """Yield the PII found in a UTF-8 text file, in file order.
+
+        At most two windows per worker are in flight and each window's matches are yielded as soon as it is
+        done, so neither the file nor its matches are held in memory at once. Close the iterator (e.g. with
+        `contextlib.aclosing`) when not exhausting it, so windows still in flight are cancelled.
+
+        Args:
+            file_path: Path to the file to analyze
+            limit: Only analyze this many leading characters (0 analyzes the whole file)
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        pending: deque[asyncio.Future[list[dict]]] = deque()
+        try:
+            with open(file_path, encoding="utf-8", errors="replace") as f:
+                for window in iter_windows(f, self.chunk_size, self.overlap, limit):
+                    pending.append(
+                        loop.run_in_executor(executor, analyze_window, *window, self.entities, self.threshold)
+                    )
+                    if len(pending) >= 2 * self.workers:
+                        for match in await pending.popleft():
+                            yield match
+            while pending:
+                for match in await pending.popleft():
+                    yield match
+        finally:
+            for future in pending:
+                future.cancel()
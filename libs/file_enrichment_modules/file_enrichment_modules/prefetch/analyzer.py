@@ -133,7 +133,7 @@ rule Windows_Prefetch_File
         finally:
             pf.close()
 
-    def _analyze_prefetch_file(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze prefetch file and generate enrichment result."""
         result = EnrichmentResult(module_name=self.name, dependencies=self.dependencies)
 
@@ -223,10 +223,10 @@ rule Windows_Prefetch_File
             file_enriched = await get_file_enriched_async(object_id, self.asyncpg_pool)
 
             if file_path:
-                return self._analyze_prefetch_file(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(object_id) as temp_file:
-                    return self._analyze_prefetch_file(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error in prefetch analyzer")
@@ -9,7 +9,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -28,6 +28,7 @@ class PuttyParser(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(extensions=(".reg",), is_plaintext=True, needs_should_process=True)
 
         self.size_limit = 50_000_000  # 50MB size limit
 
@@ -126,7 +127,7 @@ rule has_putty_reg
 
         return summary
 
-    def _analyze_putty_registry(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze Putty registry file and generate enrichment result.
 
         Args:
@@ -218,10 +219,10 @@ rule has_putty_reg
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_putty_registry(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_putty_registry(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing Putty registry file")
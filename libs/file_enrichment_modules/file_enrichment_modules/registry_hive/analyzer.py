@@ -13,7 +13,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from file_linking.helpers import add_file_linking
 from nemesis_dpapi import DpapiSystemCredential
 from pypykatz.registry.offline_parser import OffineRegistry as OfflineRegistry
@@ -85,6 +85,9 @@ class RegistryHiveAnalyzer(EnrichmentModule):
 
         self.asyncpg_pool = None  # type: ignore
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(
+            magic_substrings=("registry file", "registry hive"), is_plaintext=False, needs_should_process=True
+        )
         self.dpapi_manager: DpapiManager = None  # type: ignore
         self.asyncpg_pool: asyncpg.Pool | None = None  # type: ignore
 
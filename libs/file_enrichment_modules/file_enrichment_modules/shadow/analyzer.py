@@ -8,7 +8,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -23,6 +23,7 @@ class ShadowParser(EnrichmentModule):
         self.asyncpg_pool = None  # type: ignore
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(is_plaintext=True, needs_should_process=True)
 
         # Yara rule to detect shadow files
         self.yara_rule = yara_x.compile("""
@@ -133,7 +134,7 @@ rule shadow_file
 
         return summary
 
-    def _analyze_shadow(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze shadow file and generate enrichment result.
 
         Args:
@@ -234,10 +235,10 @@ rule shadow_file
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_shadow(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_shadow(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing shadow file")
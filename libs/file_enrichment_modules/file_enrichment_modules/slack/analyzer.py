@@ -9,7 +9,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -25,6 +25,7 @@ class SlackRootStateParser(EnrichmentModule):
 
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(path_globs=("root-state.json",), needs_should_process=True)
 
         self.size_limit = 50_000_000  # 50MB size limit
 
@@ -88,7 +89,7 @@ rule Detect_Slack_RootState {
                 return ""
         return ""
 
-    def _analyze_slack_root_state(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze Slack root-state.json file and generate enrichment result.
 
         Args:
@@ -238,10 +239,10 @@ rule Detect_Slack_RootState {
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_slack_root_state(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_slack_root_state(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing Slack root-state.json file")
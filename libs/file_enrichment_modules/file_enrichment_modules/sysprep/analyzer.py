@@ -8,7 +8,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -28,6 +28,7 @@ class SysprepParser(EnrichmentModule):
 
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(path_globs=("sysprep.inf",), is_plaintext=True, needs_should_process=True)
 
         self.size_limit = 5_000_000  # 5MB size limit
 
@@ -158,7 +159,7 @@ rule Windows_Unattended_Answer_File {
         # Return True if any credential is present and not a placeholder
         return any(cred for cred in credentials if cred and not is_placeholder(cred))
 
-    def _analyze_sysprep(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze sysprep config file and generate enrichment result.
 
         Args:
@@ -256,10 +257,10 @@ rule Windows_Unattended_Answer_File {
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_sysprep(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_sysprep(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing sysprep config file")
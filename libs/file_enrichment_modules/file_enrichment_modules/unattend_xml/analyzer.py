@@ -9,7 +9,7 @@ from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin, Transform
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -29,6 +29,7 @@ class UnattendParser(EnrichmentModule):
 
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(mime_types=("text/xml",), is_plaintext=True, needs_should_process=True)
 
         self.size_limit = 1_000_000  # 1MB size limit
 
@@ -150,7 +151,7 @@ rule Detect_Windows_Unattend_XML {
 
         return summary
 
-    def _analyze_unattend_xml(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze unattend.xml file and generate enrichment result.
 
         Args:
@@ -286,10 +287,10 @@ rule Detect_Windows_Unattend_XML {
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_unattend_xml(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_unattend_xml(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing unattend.xml file")
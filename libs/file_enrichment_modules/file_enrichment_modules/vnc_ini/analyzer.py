@@ -8,7 +8,7 @@ from common.models import EnrichmentResult, FileObject, Finding, FindingCategory
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
 from Crypto.Cipher import DES
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 
 logger = get_logger(__name__)
 
@@ -31,6 +31,7 @@ class VncParser(EnrichmentModule):
 
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers(extensions=(".ini",), needs_should_process=True)
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Determine if this module should run based on file type."""
@@ -104,7 +105,7 @@ class VncParser(EnrichmentModule):
 
         return config
 
-    def _analyze_vnc_config(self, file_path: str, file_enriched) -> EnrichmentResult | None:
+    def analyze(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze VNC config file and generate enrichment result.
 
         Args:
@@ -209,10 +210,10 @@ class VncParser(EnrichmentModule):
 
             # Use provided file_path if available, otherwise download
             if file_path:
-                return self._analyze_vnc_config(file_path, file_enriched)
+                return self.analyze(file_path, file_enriched)
             else:
                 with self.storage.download(file_enriched.object_id) as temp_file:
-                    return self._analyze_vnc_config(temp_file.name, file_enriched)
+                    return self.analyze(temp_file.name, file_enriched)
 
         except Exception:
             logger.exception(message="Error processing VNC config file")
@@ -1,15 +1,23 @@
+import asyncio
 import base64
 import binascii
+import contextlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from common.logger import get_logger
 from common.models import EnrichmentResult, FileObject, Finding, FindingCategory, FindingOrigin
 from common.state_helpers import get_file_enriched_async
 from common.storage import StorageMinio
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, ModuleTriggers
 from file_enrichment_modules.yara.yara_manager import YaraRuleManager
 
 logger = get_logger(__name__)
 
+# Threads running Yara scans (and building their results) for this process
+YARA_SCAN_WORKERS = int(os.getenv("YARA_SCAN_WORKERS", "2"))
+
 
 def yara_match_to_markdown(match):
     markdown = [
@@ -51,6 +59,46 @@ def format_hex_like_xxd(data):
     return " ".join(hex_str[i : i + 8] for i in range(0, len(hex_str), 8))
 
 
+def _map_file(f) -> mmap.mmap | contextlib.nullcontext[bytes]:
+    """Read-only map of an open file (empty files can't be mapped)."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return contextlib.nullcontext(b"")
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def string_match_instance(file_data, offset: int, length: int, is_plaintext: bool) -> dict:
+    """Describe one pattern match, including the matched bytes unless the match is 1000 bytes or longer."""
+    string_match_instance = {
+        "offset": offset,
+        "length": length,
+    }
+    if length >= 1000:
+        return string_match_instance
+
+    matched_data = file_data[offset : offset + length]
+
+    # Always include base64 representation for compatibility
+    string_match_instance["matched_data_b64"] = base64.b64encode(matched_data).decode("utf-8")
+
+    # Format differently based on file type
+    if is_plaintext:
+        try:
+            # Try to decode as UTF-8
+            string_match_instance["matched_data_text"] = matched_data.decode("utf-8")
+        except UnicodeDecodeError:
+            try:
+                # Fallback to a more lenient encoding
+                string_match_instance["matched_data_text"] = matched_data.decode("unicode_escape")
+            except Exception:
+                # If both decodings fail, use hex format
+                string_match_instance["matched_data_hex"] = format_hex_like_xxd(matched_data)
+    else:
+        # Binary file - format as hex
+        string_match_instance["matched_data_hex"] = format_hex_like_xxd(matched_data)
+
+    return string_match_instance
+
+
 class YaraScanner(EnrichmentModule):
     name: str = "yara_scanner"
     dependencies: list[str] = []
@@ -60,8 +108,10 @@ class YaraScanner(EnrichmentModule):
 
         self.asyncpg_pool = None  # type: ignore
         self.rule_manager = YaraRuleManager()
+        self._scan_executor = ThreadPoolExecutor(max_workers=YARA_SCAN_WORKERS, thread_name_prefix="yara-scan")
         # the workflows this module should automatically run in
         self.workflows = ["default"]
+        self.triggers = ModuleTriggers()  # every file
 
     async def should_process(self, object_id: str, file_path: str | None = None) -> bool:
         """Always returns True as Yara scanning should run on all files."""
@@ -70,6 +120,9 @@ class YaraScanner(EnrichmentModule):
     async def _analyze_yara(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         """Analyze file using Yara rules and generate enrichment result.
 
+        The scan and match extraction run on the module's scan threads, so a slow scan of a large file
+        doesn't block the event loop (and every other workflow in the process).
+
         Args:
             file_path: Path to the file to analyze with Yara
             file_enriched: File enrichment data
@@ -77,74 +130,47 @@ class YaraScanner(EnrichmentModule):
         Returns:
             EnrichmentResult or None if analysis fails
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._scan_executor, self._scan_file, file_path, file_enriched)
+
+    def _scan_file(self, file_path: str, file_enriched) -> EnrichmentResult | None:
         # Get scan results
         scan_results = self.rule_manager.match(file_path)
+        if not scan_results:
+            return None
 
         enrichment_result = EnrichmentResult(module_name=self.name)
+        is_plaintext = bool(getattr(file_enriched, "is_plaintext", False))
 
         yara_matches = []
-        for rule in scan_results:
-            rule_text = await self.rule_manager.get_rule_content(rule.identifier)
-            yara_match = {"rule_name": rule.identifier, "rule_string_matches": [], "rule_text": rule_text}
-
-            # Add metadata if available
-            metadata_dict = dict(rule.metadata)
-            if "description" in metadata_dict:
-                yara_match["rule_description"] = metadata_dict["description"]
-
-            # Process patterns (strings in yara-x)
-            for pattern in rule.patterns:
-                if pattern.matches:  # Only process patterns that had matches
+        with open(file_path, "rb") as f, _map_file(f) as file_data:
+            for rule in scan_results:
+                rule_text = self.rule_manager.get_rule_content(rule.identifier)
+                yara_match = {"rule_name": rule.identifier, "rule_string_matches": [], "rule_text": rule_text}
+
+                # Add metadata if available
+                metadata_dict = dict(rule.metadata)
+                if "description" in metadata_dict:
+                    yara_match["rule_description"] = metadata_dict["description"]
+
+                # Process patterns (strings in yara-x)
+                for pattern in rule.patterns:
+                    if not pattern.matches:  # Only process patterns that had matches
+                        continue
+
                     string_match = {
                         "identifier": pattern.identifier,
                         "yara_string_match_instances": [],
                     }
 
                     for match in pattern.matches:
-                        if match.length < 1000:
-                            # Read the matched data from the file
-                            with open(file_path, "rb") as f:
-                                f.seek(match.offset)
-                                matched_data = f.read(match.length)
-
-                                string_match_instance = {
-                                    "offset": match.offset,
-                                    "length": match.length,
-                                }
-
-                                # Always include base64 representation for compatibility
-                                string_match_instance["matched_data_b64"] = base64.b64encode(matched_data).decode(
-                                    "utf-8"
-                                )
-
-                                # Format differently based on file type
-                                if hasattr(file_enriched, "is_plaintext") and file_enriched.is_plaintext:
-                                    try:
-                                        # Try to decode as UTF-8
-                                        string_match_instance["matched_data_text"] = matched_data.decode("utf-8")
-                                    except UnicodeDecodeError:
-                                        try:
-                                            # Fallback to a more lenient encoding
-                                            string_match_instance["matched_data_text"] = matched_data.decode(
-                                                "unicode_escape"
-                                            )
-                                        except Exception:
-                                            # If both decodings fail, use hex format
-                                            string_match_instance["matched_data_hex"] = format_hex_like_xxd(
-                                                matched_data
-                                            )
-                                else:
-                                    # Binary file - format as hex
-                                    string_match_instance["matched_data_hex"] = format_hex_like_xxd(matched_data)
-                        else:
+                        if match.length >= 1000:
                             logger.warning(
                                 f"Yara match for rule '{rule.identifier}' is length {match.length}, not including in base64 data"
                             )
-                            string_match_instance = {
-                                "offset": match.offset,
-                                "length": match.length,
-                            }
-                        string_match["yara_string_match_instances"].append(string_match_instance)
+                        string_match["yara_string_match_instances"].append(
+                            string_match_instance(file_data, match.offset, match.length, is_plaintext)
+                        )
 
                     yara_match["rule_string_matches"].append(string_match)
 
@@ -167,12 +193,10 @@ class YaraScanner(EnrichmentModule):
 
                     enrichment_result.findings.append(finding)
 
-            yara_matches.append(yara_match)
+                yara_matches.append(yara_match)
 
-        if yara_matches:
-            enrichment_result.results = {"yara_matches": yara_matches}
-            return enrichment_result
-        return None
+        enrichment_result.results = {"yara_matches": yara_matches}
+        return enrichment_result
 
     async def process(self, object_id: str, file_path: str | None = None) -> EnrichmentResult | None:
         """Process file using Yara scanning.
@@ -1,7 +1,12 @@
+import asyncio
 import glob
+import hashlib
+import io
 import os
 import threading
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from importlib.metadata import version
 from typing import TYPE_CHECKING
 
 import plyara
@@ -19,13 +24,56 @@ YARA_RULES_FOLDER_PATH = os.getenv("YARA_RULES_FOLDER_PATH", "/yara_rules/")
 check_directory_exists(YARA_RULES_FOLDER_PATH)
 
 
+@dataclass(frozen=True)
+class LoadedRules:
+    """A compiled rule set and the text of its rules, replaced as one unit when rules are reloaded."""
+
+    compiled: yara_x.Rules
+    texts: dict[str, str]  # rule name -> rule text
+    rule_set_hash: str
+
+
+def hash_rule_set(rules) -> str:
+    """Key for a set of (name, content) rules, including the yara-x version that compiles them."""
+    digest = hashlib.sha256(version("yara-x").encode())
+    for rule in sorted(rules, key=lambda rule: rule["name"]):
+        digest.update(b"\x00" + rule["name"].encode() + b"\x00" + rule["content"].encode())
+    return digest.hexdigest()
+
+
+def compile_rules(rules) -> tuple[yara_x.Rules, set[str]]:
+    """Compile rules into one rule set, skipping (and logging) those that don't compile.
+
+    A source that fails to compile leaves the compiler as it was, so no separate validation pass is needed.
+    yara_x compilers can't move between threads, so this runs start to finish on one.
+
+    Returns:
+        (compiled rules, names of the rules that compiled)
+    """
+    compiler = yara_x.Compiler()
+    valid_rules = set()
+    for rule in rules:
+        try:
+            compiler.add_source(rule["content"], origin=rule.get("source", "database"))
+            valid_rules.add(rule["name"])
+        except Exception as e:
+            logger.warn(f"Error compiling Yara rule '{rule['name']}': {e}")
+            logger.debug("Error compiling Yara rule", rule=rule["name"])
+    return compiler.build(), valid_rules
+
+
+def serialize_rules(compiled: yara_x.Rules) -> bytes:
+    buffer = io.BytesIO()
+    compiled.serialize_into(buffer)
+    return buffer.getvalue()
+
+
 class YaraRuleManager:
     _thread_local = threading.local()
 
     def __init__(self):
         self.parser = plyara.Plyara()
-        self._compiler = yara_x.Compiler()
-        self._compiled_rules: yara_x.Rules | None = None
+        self._loaded: LoadedRules | None = None
         self.asyncpg_pool: asyncpg.Pool | None = None  # Connection pool for database operations
 
     async def initialize(self):
@@ -38,20 +86,16 @@ class YaraRuleManager:
         await self.load_db_rules()
 
     def _get_scanner(self) -> yara_x.Scanner | None:
-        """Get or create thread-local scanner instance."""
-        if not hasattr(self._thread_local, "scanner"):
-            if self._compiled_rules:
-                self._thread_local.scanner = yara_x.Scanner(self._compiled_rules)
-                self._thread_local.scanner.set_timeout(60)
-            else:
-                return None
+        """Get the calling thread's scanner, creating it when rules were (re)loaded since its last use."""
+        loaded = self._loaded
+        if not loaded:
+            return None
+        if getattr(self._thread_local, "loaded", None) is not loaded:
+            self._thread_local.scanner = yara_x.Scanner(loaded.compiled)
+            self._thread_local.scanner.set_timeout(60)
+            self._thread_local.loaded = loaded
         return self._thread_local.scanner
 
-    def _clear_scanner(self):
-        """Clear the thread-local scanner if it exists."""
-        if hasattr(self._thread_local, "scanner"):
-            delattr(self._thread_local, "scanner")
-
     async def _process_disk_rules(self):
         """Load Yara rules from disk and insert into database if they don't exist."""
         try:
@@ -79,30 +123,29 @@ class YaraRuleManager:
                     continue
 
             if disk_rules:
-                # Try to compile all disk rules first to validate them
-                try:
-                    compiler = yara_x.Compiler()
-                    for rule_name, rule_text in disk_rules.items():
-                        try:
-                            compiler.add_source(rule_text, origin=disk_sources[rule_name])
-                        except Exception as e:
-                            logger.warn("Error compiling disk rule", rule=rule_name)
-                            logger.debug(f"Error compiling disk rule {rule_name} : {e}")
-                    # Test compilation
-                    compiler.build()
-                    logger.info(f"Successfully built {len(disk_rules)} disk rules")
-                except Exception as e:
-                    logger.warn("Error compiling disk rules")
-                    logger.debug(f"Error compiling disk rules: {e}")
-                    return
-
-                # Insert rules into database if they don't exist
                 if not self.asyncpg_pool:
                     logger.warning("No asyncpg pool available, cannot insert disk rules into database")
                     return
 
                 async with self.asyncpg_pool.acquire() as conn:
-                    for rule_name, rule_text in disk_rules.items():
+                    existing = await conn.fetch(
+                        "SELECT name FROM yara_rules WHERE name = ANY($1::text[])", list(disk_rules)
+                    )
+                existing_names = {row["name"] for row in existing}
+                new_rules = [
+                    {"name": rule_name, "content": rule_text, "source": disk_sources[rule_name]}
+                    for rule_name, rule_text in disk_rules.items()
+                    if rule_name not in existing_names
+                ]
+
+                # Only rules that aren't in the database yet need validating
+                _, valid_rules = await asyncio.to_thread(compile_rules, new_rules)
+                logger.info(f"Validated {len(valid_rules)} of {len(new_rules)} new disk rules")
+
+                async with self.asyncpg_pool.acquire() as conn:
+                    for rule in new_rules:
+                        if rule["name"] not in valid_rules:
+                            continue
                         try:
                             # Try to insert the rule if it doesn't exist
                             await conn.execute(
@@ -113,15 +156,15 @@ class YaraRuleManager:
                                     ($1, $2, $3, true, true, $4, $5)
                                 ON CONFLICT (name) DO NOTHING
                                 """,
-                                rule_name,
-                                rule_text.strip(),
-                                disk_sources[rule_name],
+                                rule["name"],
+                                rule["content"].strip(),
+                                rule["source"],
                                 datetime.now(UTC),
                                 datetime.now(UTC),
                             )
                         except Exception as e:
-                            logger.warn("Error inserting disk rule", rule=rule_name)
-                            logger.debug(f"Error inserting disk rule: {e}", rule=rule_name)
+                            logger.warn("Error inserting disk rule", rule=rule["name"])
+                            logger.debug(f"Error inserting disk rule: {e}", rule=rule["name"])
                             continue
 
                 logger.info(f"Processed {len(disk_rules)} disk rules")
@@ -130,9 +173,9 @@ class YaraRuleManager:
             logger.exception(message="Error processing disk rules")
             raise
 
-    async def get_rule_content(self, rule_name: str) -> str | None:
+    def get_rule_content(self, rule_name: str) -> str | None:
         """
-        Retrieve the content of a Yara rule by name.
+        Retrieve the content of a loaded Yara rule by name.
 
         Args:
             rule_name: Name of the rule to retrieve
@@ -140,36 +183,21 @@ class YaraRuleManager:
         Returns:
             The rule content if found, None otherwise
         """
-        if not self.asyncpg_pool:
-            logger.warning("No asyncpg pool available, cannot retrieve rule content")
-            return None
-
-        try:
-            async with self.asyncpg_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    """
-                    SELECT content
-                    FROM yara_rules
-                    WHERE name = $1
-                    """,
-                    rule_name,
-                )
-                return result["content"] if result else None
-        except Exception as e:
-            logger.error(f"Error retrieving rule: {e}", rule=rule_name)
-            return None
+        loaded = self._loaded
+        return loaded.texts.get(rule_name) if loaded else None
 
     async def load_db_rules(self):
-        """Load all enabled rules from database and compile them."""
+        """Load all enabled rules from database and compile them.
+
+        Compiled rules are cached in `yara_compiled_rules` by a hash of the enabled rules, so only the first
+        replica to see a rule set compiles it; compiling happens off the event loop, and scanners keep using
+        the previous rules until the new ones are swapped in.
+        """
         if not self.asyncpg_pool:
             logger.warning("No asyncpg pool available, cannot load rules from database")
             return
 
         try:
-            # Create a new compiler instance
-            self._compiler = yara_x.Compiler()
-            valid_rules = 0
-
             async with self.asyncpg_pool.acquire() as conn:
                 rules = await conn.fetch("""
                     SELECT name, content, source
@@ -178,46 +206,68 @@ class YaraRuleManager:
                     ORDER BY name
                 """)
 
+            rule_set_hash = hash_rule_set(rules)
+            if self._loaded and self._loaded.rule_set_hash == rule_set_hash:
+                logger.info("Enabled yara rules are unchanged, keeping the compiled rules")
+                return
+
             logger.info(f"Loading {len(rules)} yara rules from the database")
 
-            # Try to add each rule to the compiler
-            for rule in rules:
-                try:
-                    # Test compile the individual rule first
-                    test_compiler = yara_x.Compiler()
-                    test_compiler.add_source(rule["content"], origin=rule.get("source", "database"))
-                    test_compiler.build()
-
-                    # If test compilation succeeds, add to main compiler
-                    self._compiler.add_source(rule["content"], origin=rule.get("source", "database"))
-                    valid_rules += 1
-                except Exception as e:
-                    logger.warn(f"Error compiling database Yara rule '{rule['name']}': {e}")
-                    logger.debug("Error compiling database rule", rule=rule["name"])
-                    continue
+            compiled = await self._load_cached_rules(rule_set_hash)
+            if compiled is None:
+                compiled, valid_rules = await asyncio.to_thread(compile_rules, rules)
+                logger.info(f"{len(valid_rules)} valid yara rules compiled from the database")
+                if not valid_rules:
+                    logger.warning("No valid rules to compile")
+                    self._loaded = None
+                    return
+                await self._store_cached_rules(rule_set_hash, compiled)
 
-            logger.info(f"{valid_rules} valid yara rules compiled from the database")
-
-            if valid_rules > 0:
-                try:
-                    # Compile all valid rules together
-                    self._compiled_rules = self._compiler.build()
-                    # Clear any existing thread-local scanners
-                    self._clear_scanner()
-                    logger.info(f"Successfully compiled {valid_rules} database rules")
-                except Exception as e:
-                    logger.error(f"Error in final compilation of database rules: {e}")
-                    self._compiled_rules = None
-                    self._clear_scanner()
-            else:
-                logger.warning("No valid rules to compile")
-                self._compiled_rules = None
-                self._clear_scanner()
+            self._loaded = LoadedRules(
+                compiled=compiled,
+                texts={rule["name"]: rule["content"] for rule in rules},
+                rule_set_hash=rule_set_hash,
+            )
+            logger.info("Loaded compiled yara rules", rule_set_hash=rule_set_hash)
 
         except Exception:
             logger.exception(message="Error loading rules from database")
             raise
 
+    async def _load_cached_rules(self, rule_set_hash: str) -> yara_x.Rules | None:
+        assert self.asyncpg_pool is not None
+        try:
+            async with self.asyncpg_pool.acquire() as conn:
+                data = await conn.fetchval(
+                    "SELECT compiled_rules FROM yara_compiled_rules WHERE rule_set_hash = $1", rule_set_hash
+                )
+            if data is None:
+                return None
+            return await asyncio.to_thread(yara_x.Rules.deserialize_from, io.BytesIO(data))
+        except Exception as e:
+            logger.warning(f"Could not load cached compiled yara rules, compiling them instead: {e}")
+            return None
+
+    async def _store_cached_rules(self, rule_set_hash: str, compiled: yara_x.Rules) -> None:
+        assert self.asyncpg_pool is not None
+        try:
+            data = await asyncio.to_thread(serialize_rules, compiled)
+            async with self.asyncpg_pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(
+                        """
+                        INSERT INTO yara_compiled_rules (rule_set_hash, compiled_rules)
+                        VALUES ($1, $2)
+                        ON CONFLICT (rule_set_hash) DO NOTHING
+                        """,
+                        rule_set_hash,
+                        data,
+                    )
+                    # Only the current rule set is worth keeping
+                    await conn.execute("DELETE FROM yara_compiled_rules WHERE rule_set_hash <> $1", rule_set_hash)
+        except Exception as e:
+            logger.warning(f"Could not cache compiled yara rules: {e}")
+
     def match(self, target) -> list[yara_x.Rule]:
         """
         Performs Yara matching on the given target.
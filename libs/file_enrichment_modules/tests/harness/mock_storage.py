@@ -176,6 +176,18 @@ class MockStorageS3:
         self._uploaded_files[str(file_uuid)] = data
         return file_uuid
 
+    def upload_stream(self, data, length: int) -> uuid.UUID:
+        """Upload a readable binary stream and return its UUID.
+
+        Args:
+            data: Readable binary file object
+            length: Number of bytes in the stream
+
+        Returns:
+            UUID assigned to the uploaded data
+        """
+        return self.upload(data.read(length))
+
     def check_file_exists(self, object_name: str) -> bool:
         """Check if a file exists in storage.
 
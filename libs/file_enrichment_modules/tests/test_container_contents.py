@@ -0,0 +1,151 @@
+# tests/test_container_contents.py
+"""Tests for the streaming archive member pipeline used by the container contents analyzer."""
+
+import gzip
+import io
+import tarfile
+import zipfile
+from unittest.mock import AsyncMock
+
+import py7zr
+import pytest
+from common.models import FileEnriched
+from file_enrichment_modules.container_contents import containers
+from file_enrichment_modules.container_contents.containers import ContainerExtractor, iter_archive_members
+
+from tests.harness import FileEnrichedFactory, MockStorageS3
+
+MEMBERS = {"docs/readme.txt": b"hello", "bin/tool.exe": b"MZ" + b"\x00" * 64, "empty.txt": b""}
+
+
+def read_members(path: str, **kwargs) -> dict[str, bytes]:
+    members = {}
+    for name, member, size in iter_archive_members(path, **kwargs):
+        with member:
+            data = member.read()
+        assert len(data) == size
+        members[name] = data
+    return members
+
+
+def make_zip(path, files: dict[str, bytes]) -> str:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return str(path)
+
+
+def make_tar_gz(path, files: dict[str, bytes]) -> str:
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+class TestIterArchiveMembers:
+    def test_zip(self, tmp_path):
+        archive = make_zip(tmp_path / "a.zip", {**MEMBERS, "../escape.txt": b"x", "/abs.txt": b"x"})
+
+        assert read_members(archive) == {"docs/readme.txt": b"hello", "bin/tool.exe": MEMBERS["bin/tool.exe"]}
+
+    def test_tar_gz_skips_links(self, tmp_path):
+        archive = tmp_path / "a.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            for name, data in MEMBERS.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+            link = tarfile.TarInfo("link")
+            link.type = tarfile.SYMTYPE
+            link.linkname = "/etc/passwd"
+            tf.addfile(link)
+
+        assert read_members(str(archive)) == {"docs/readme.txt": b"hello", "bin/tool.exe": MEMBERS["bin/tool.exe"]}
+
+    def test_7z(self, tmp_path):
+        archive = tmp_path / "a.7z"
+        with py7zr.SevenZipFile(archive, "w") as sz:
+            sz.writestr(b"hello", "docs/readme.txt")
+            sz.writestr(b"world", "other.txt")
+
+        assert read_members(str(archive)) == {"docs/readme.txt": b"hello", "other.txt": b"world"}
+
+    def test_bare_gzip(self, tmp_path):
+        archive = tmp_path / "a.gz"
+        archive.write_bytes(gzip.compress(b"plain contents"))
+
+        assert read_members(str(archive), gzip_name="notes.txt") == {"notes.txt": b"plain contents"}
+
+    def test_accept_filter(self, tmp_path):
+        archive = make_zip(tmp_path / "a.zip", MEMBERS)
+
+        assert list(read_members(archive, accept=lambda name: name.endswith(".exe"))) == ["bin/tool.exe"]
+
+    def test_size_budget(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(containers, "MAX_EXTRACTED_SIZE", 10)
+        archive = make_zip(tmp_path / "a.zip", MEMBERS)
+
+        with pytest.raises(containers.ArchiveExtractionError):
+            read_members(archive)
+
+    def test_unsupported(self, tmp_path):
+        path = tmp_path / "a.bin"
+        path.write_bytes(b"not an archive")
+
+        with pytest.raises(containers.FileNotSupportedException):
+            read_members(str(path))
+
+
+class TestContainerExtractor:
+    @pytest.mark.asyncio
+    async def test_extract_uploads_and_publishes_in_batches(self, tmp_path):
+        files = {f"dir/file{i}.txt": f"contents {i}".encode() for i in range(7)}
+        archive = make_tar_gz(tmp_path / "archive.tar.gz", files)
+
+        storage = MockStorageS3()
+        storage.register_file("archive-id", archive)
+        dapr_client = AsyncMock()
+        extractor = ContainerExtractor(storage, dapr_client, upload_concurrency=3, publish_batch_size=2)
+        published = []
+        extractor.publish_file_messages = AsyncMock(side_effect=lambda batch, _: published.append(batch) or len(batch))
+
+        file_enriched = FileEnriched.model_validate(
+            FileEnrichedFactory.create(
+                object_id="11111111-1111-1111-1111-111111111111", file_name="archive.tar.gz", nesting_level=1
+            )
+        )
+        processed = await extractor.extract_members(archive, file_enriched)
+
+        assert processed == 7
+        assert all(len(batch) <= 2 for batch in published)
+        messages = [message for batch in published for message in batch]
+        assert sorted(message.path for message in messages) == sorted(f"/test/path/{name}" for name in files)
+        for message in messages:
+            assert storage.download_bytes(message.object_id) == files[message.path.removeprefix("/test/path/")]
+            assert message.nesting_level == 2
+            assert message.originating_object_id == file_enriched.object_id
+
+    @pytest.mark.asyncio
+    async def test_publish_file_messages_counts_failures(self):
+        dapr_client = AsyncMock()
+        dapr_client.publish_event.side_effect = [None, ConnectionError("down"), None]
+        extractor = ContainerExtractor(MockStorageS3(), dapr_client)
+        file_enriched = FileEnriched.model_validate(
+            FileEnrichedFactory.create(object_id="11111111-1111-1111-1111-111111111111", file_name="a.zip")
+        )
+        messages = [
+            containers.File(
+                object_id=f"{i}" * 8 + "-1111-1111-1111-111111111111",
+                agent_id="agent",
+                project="project",
+                timestamp=file_enriched.timestamp,
+                expiration=file_enriched.expiration,
+                path=f"/p{i}",
+            )
+            for i in range(3)
+        ]
+
+        assert await extractor.publish_file_messages(messages, file_enriched) == 2
+        assert dapr_client.publish_event.await_count == 3
@@ -0,0 +1,86 @@
+# tests/test_evtx.py
+"""Tests for the EVTX analyzer's record parsing."""
+
+import importlib
+import json
+
+import pytest
+
+
+def make_record(event_id, event_data: dict | None, computer: str = "DC01.contoso.local", time: str = "") -> dict:
+    """A record as yielded by `PyEvtxParser.records_json()`."""
+    event = {
+        "#attributes": {"xmlns": "http://schemas.microsoft.com/win/2004/08/events/event"},
+        "System": {
+            "Provider": {"#attributes": {"Name": "Microsoft-Windows-Security-Auditing"}},
+            "EventID": event_id,
+            "TimeCreated": {"#attributes": {"SystemTime": time}},
+            "Computer": computer,
+            "Security": None,
+        },
+    }
+    if event_data is not None:
+        event["EventData"] = event_data
+    return {"event_record_id": 1, "timestamp": time, "data": json.dumps({"Event": event}, indent=2)}
+
+
+RECORDS = [
+    make_record(
+        4634,
+        {"TargetUserName": "alice", "TargetDomainName": "CONTOSO", "LogonType": 3},
+        time="2024-05-01T10:00:00.000000Z",
+    ),
+    make_record(
+        4624,
+        {"TargetUserName": "bob", "LogonType": 10, "IpAddress": "10.0.0.5", "WorkstationName": "WS01"},
+        time="2024-05-01T09:00:00.000000Z",
+    ),
+    make_record(
+        {"#attributes": {"Qualifiers": 16384}, "#text": 7036},
+        {"param1": "Windows Update", "param2": "running"},
+        computer='WS\\"02',
+        time="2024-05-02T08:00:00.000000Z",
+    ),
+    make_record(
+        4672,
+        {"SubjectUserName": "DOMAIN\\carol", "IpAddress": None, "Workstation": "-"},
+        time="2024-04-30T23:59:59.000000Z",
+    ),
+    make_record(4769, {"TargetUserName": "svc$", "IpAddress": "::ffff:10.0.0.9"}),
+    make_record(5, None, time="2024-05-01T12:00:00.000000Z"),
+]
+
+
+class FakeParser:
+    def __init__(self, path, number_of_threads=0):
+        pass
+
+    def records_json(self):
+        return iter(RECORDS)
+
+
+@pytest.fixture
+def evtx_module(monkeypatch):
+    module = importlib.import_module("file_enrichment_modules.evtx.analyzer")
+    monkeypatch.setattr(module.evtx_lib, "PyEvtxParser", FakeParser)
+    return module
+
+
+def test_text_only_records_match_deserialized_records(evtx_module, monkeypatch):
+    analyzer = evtx_module.EVTXAnalyzer.__new__(evtx_module.EVTXAnalyzer)
+    parsed = analyzer._parse_evtx("Security.evtx")
+
+    monkeypatch.setattr(evtx_module, "DETAILED_EVENT_IDS", frozenset(str(i) for i in range(10000)))
+    fully_deserialized = analyzer._parse_evtx("Security.evtx")
+
+    assert parsed == fully_deserialized
+    assert parsed["event_counts"] == {"4634": 1, "4624": 1, "7036": 1, "4672": 1, "4769": 1, "5": 1}
+    assert (parsed["first_timestamp"], parsed["last_timestamp"]) == (
+        "2024-04-30T23:59:59.000000Z",
+        "2024-05-02T08:00:00.000000Z",
+    )
+    assert sorted(parsed["unique_accounts"]) == ["DOMAIN\\carol", "alice", "bob"]
+    assert sorted(parsed["unique_computers"]) == ["DC01.contoso.local", 'WS\\"02']
+    assert sorted(parsed["unique_ips"]) == ["10.0.0.5", "::ffff:10.0.0.9", "WS01"]
+    assert [event["target_user"] for event in parsed["logon_events"]] == ["bob"]
+    assert [event["client_name"] for event in parsed["kerberos_st_events"]] == ["svc$"]
@@ -0,0 +1,135 @@
+"""Tests for declarative module triggers and the ModuleLoader's TriggerIndex."""
+
+import uuid
+
+import pytest
+from common.models import FileEnriched
+from file_enrichment_modules.certificate.analyzer import CertificateAnalyzer
+from file_enrichment_modules.container.analyzer import ContainerAnalyzer
+from file_enrichment_modules.dotnet.analyzer import DotNetAnalyzer
+from file_enrichment_modules.filename.analyzer import FilenameScanner
+from file_enrichment_modules.gitcredentials.analyzer import GitCredentialsParser
+from file_enrichment_modules.lnk.analyzer import LnkParser
+from file_enrichment_modules.module_loader import ModuleTriggers, TriggerIndex
+from file_enrichment_modules.office_doc.analyzer import OfficeAnalyzer
+from file_enrichment_modules.parquet.analyzer import ParquetFileParser
+from file_enrichment_modules.pdf.analyzer import PDFAnalyzer
+from file_enrichment_modules.sqlite.analyzer import SqliteParser
+
+from tests.harness import FileEnrichedFactory, ModuleTestHarness
+
+
+class FakeModule:
+    def __init__(self, triggers: ModuleTriggers | None = None):
+        if triggers is not None:
+            self.triggers = triggers
+
+
+def make_file(**kwargs) -> FileEnriched:
+    return FileEnriched.model_validate(FileEnrichedFactory.create(**kwargs))
+
+
+class TestTriggerIndex:
+    def test_resolves_by_each_criterion(self):
+        index = TriggerIndex(
+            {
+                "by_mime": FakeModule(ModuleTriggers(mime_types=("text/XML",))),
+                "by_magic": FakeModule(ModuleTriggers(magic_substrings=("PDF document",))),
+                "by_ext": FakeModule(ModuleTriggers(extensions=(".EVTX",))),
+                "by_glob": FakeModule(ModuleTriggers(path_globs=("*/.ssh/*",))),
+            }
+        )
+
+        assert index.resolve(make_file(file_name="a.xml", mime_type="text/xml"))[0] == {"by_mime"}
+        assert index.resolve(make_file(file_name="a", magic_type="PDF document, version 1.4"))[0] == {"by_magic"}
+        assert index.resolve(make_file(file_name="Security.evtx"))[0] == {"by_ext"}
+        assert index.resolve(make_file(file_name="id_rsa", path="/home/u/.ssh/id_rsa"))[0] == {"by_glob"}
+        assert index.resolve(make_file(file_name="other.bin")) == (set(), set())
+
+    def test_globs_match_file_name_or_path(self):
+        index = TriggerIndex({"git": FakeModule(ModuleTriggers(path_globs=(".git-credentials",)))})
+
+        assert index.resolve(make_file(file_name=".git-credentials"))[0] == {"git"}
+        assert index.resolve(make_file(file_name=".git-credentials.bak"))[0] == set()
+
+    def test_constraints_filter_candidates(self):
+        index = TriggerIndex(
+            {
+                "small_text": FakeModule(ModuleTriggers(max_size=100, is_plaintext=True)),
+            }
+        )
+
+        assert index.resolve(make_file(size=100, is_plaintext=True))[0] == {"small_text"}
+        assert index.resolve(make_file(size=101, is_plaintext=True))[0] == set()
+        assert index.resolve(make_file(size=10, is_plaintext=False))[0] == set()
+
+    def test_needs_should_process_and_untriggered_modules(self):
+        index = TriggerIndex(
+            {
+                "all": FakeModule(ModuleTriggers()),
+                "narrowed": FakeModule(ModuleTriggers(magic_substrings=("sqlite",), needs_should_process=True)),
+                "legacy": FakeModule(),
+            }
+        )
+
+        selected, needs_check = index.resolve(make_file(magic_type="SQLite 3.x database"))
+        assert selected == {"all"}
+        assert needs_check == {"narrowed", "legacy"}
+
+        selected, needs_check = index.resolve(make_file(magic_type="data"))
+        assert selected == {"all"}
+        assert needs_check == {"legacy"}
+
+
+# Modules whose triggers fully replace should_process() must agree with it on every file
+PARITY_MODULES = [
+    ("certificate", CertificateAnalyzer),
+    ("container", ContainerAnalyzer),
+    ("dotnet", DotNetAnalyzer),
+    ("filename", FilenameScanner),
+    ("gitcredentials", GitCredentialsParser),
+    ("lnk", LnkParser),
+    ("office_doc", OfficeAnalyzer),
+    ("parquet", ParquetFileParser),
+    ("pdf", PDFAnalyzer),
+    ("sqlite", SqliteParser),
+]
+
+PARITY_FILES = [
+    {"file_name": "server.pem", "magic_type": "ASCII text", "mime_type": "text/plain", "is_plaintext": True},
+    {"file_name": "cert.bin", "magic_type": "PEM certificate", "mime_type": "text/plain", "is_plaintext": True},
+    {"file_name": "archive.zip", "magic_type": "Zip archive data", "mime_type": "application/zip"},
+    {"file_name": "lib.dll", "magic_type": "PE32 executable (DLL) Mono/.Net assembly"},
+    {"file_name": ".git-credentials", "magic_type": "ASCII text", "mime_type": "text/plain", "is_plaintext": True},
+    {"file_name": ".git-credentials", "magic_type": "data"},
+    {"file_name": "link.lnk", "magic_type": "MS Windows shortcut, Item id list present"},
+    {"file_name": "report.DOCX", "magic_type": "data"},
+    {"file_name": "legacy", "magic_type": "Composite Document File V2 Document"},
+    {"file_name": "data.parquet", "magic_type": "Apache Parquet"},
+    {"file_name": "doc.pdf", "magic_type": "PDF document, version 1.7"},
+    {"file_name": "Cookies", "magic_type": "SQLite 3.x database, last written using SQLite version 3039004"},
+    {"file_name": "notes.sqlite", "magic_type": "ASCII text", "mime_type": "text/plain", "is_plaintext": True},
+    {"file_name": "notes.sqlite", "magic_type": "data"},
+    {"file_name": "random.bin", "magic_type": "data"},
+]
+
+
+@pytest.mark.asyncio
+async def test_triggers_match_should_process():
+    # a single test (one event loop) because get_file_enriched_async is an alru_cache
+    harness = ModuleTestHarness()
+
+    for module_name, module_class in PARITY_MODULES:
+        async with harness.create_module(module_class) as module:
+            assert module.triggers.needs_should_process is False
+            index = TriggerIndex({module_name: module})
+
+            for file_kwargs in PARITY_FILES:
+                object_id = str(uuid.uuid4())
+                file_enriched = FileEnrichedFactory.create(object_id=object_id, **file_kwargs)
+                harness.register_file_bytes(object_id, b"", file_enriched)
+
+                selected, _ = index.resolve(FileEnriched.model_validate(file_enriched))
+                expected = await module.should_process(object_id)
+
+                assert (module_name in selected) == expected, (module_name, file_kwargs)
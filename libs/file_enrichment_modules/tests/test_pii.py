@@ -0,0 +1,118 @@
+# tests/test_pii.py
+"""Tests for chunked PII detection."""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from file_enrichment_modules.pii.analyzer import PIIAnalyzer
+from file_enrichment_modules.pii.chunked_engine import iter_windows
+
+TEXT = "".join(chr(ord("a") + i % 26) for i in range(1000))
+
+
+def owners(windows, position: int) -> list[int]:
+    return [i for i, (_, _, owned_start, owned_end) in enumerate(windows) if owned_start <= position < owned_end]
+
+
+class TestIterWindows:
+    """Tests for iter_windows."""
+
+    @pytest.mark.parametrize("chunk_size,overlap", [(100, 20), (7, 3), (64, 64), (2000, 50)])
+    def test_every_position_is_owned_by_exactly_one_window(self, chunk_size, overlap):
+        windows = list(iter_windows(io.StringIO(TEXT), chunk_size, overlap))
+
+        for text, window_start, owned_start, owned_end in windows:
+            assert TEXT[window_start : window_start + len(text)] == text
+            assert window_start <= owned_start <= owned_end <= window_start + len(text)
+        assert all(len(owners(windows, position)) == 1 for position in range(len(TEXT)))
+        assert windows[-1][3] == len(TEXT)
+
+    def test_short_match_across_a_window_edge_is_whole_in_its_owner(self):
+        windows = list(iter_windows(io.StringIO(TEXT), 100, 20))
+
+        # A 10 character match starting just before the first read boundary
+        start = 95
+        [owner] = owners(windows, start)
+        text, window_start, _, _ = windows[owner]
+        assert text[start - window_start : start - window_start + 10] == TEXT[start : start + 10]
+
+    def test_limit_stops_reading(self):
+        windows = list(iter_windows(io.StringIO(TEXT), 100, 20, limit=250))
+
+        assert windows[-1][3] == 250
+        assert (
+            "".join(text[owned_start - start : owned_end - start] for text, start, owned_start, owned_end in windows)
+            == TEXT[:250]
+        )
+
+    def test_empty_file_has_no_windows(self):
+        assert list(iter_windows(io.StringIO(""), 100, 20)) == []
+
+
+class FakeEngine:
+    """Yields a fixed list of matches, like ChunkedPIIEngine.analyze_file."""
+
+    def __init__(self, matches: list[dict]):
+        self.matches = matches
+
+    async def analyze_file(self, file_path: str, limit: int = 0):
+        for match in self.matches:
+            yield match
+
+
+def make_match(entity_type: str, offset: int) -> dict:
+    value = f"value-{offset}"
+    return {
+        "value": value,
+        "context": f"before {value} after",
+        "offset": offset,
+        "length": len(value),
+        "score": 0.9,
+        "entity_type": entity_type,
+    }
+
+
+@pytest.mark.asyncio
+class TestPIIAnalyzer:
+    """Tests for turning streamed matches into the PII finding and transform."""
+
+    def setup_method(self):
+        with patch("file_enrichment_modules.pii.analyzer.StorageMinio"):
+            self.analyzer = PIIAnalyzer()
+        self.uploaded = []
+        self.analyzer.storage.upload_file.side_effect = self.upload_file
+        self.file_enriched = SimpleNamespace(object_id="obj", file_name="notes.txt")
+
+    def upload_file(self, path: str) -> str:
+        with open(path, encoding="utf-8") as f:
+            self.uploaded.append(f.read())
+        return "t1"
+
+    async def test_findings_keep_counts_and_a_capped_sample(self):
+        matches = [make_match("CREDIT_CARD", offset) for offset in range(0, 50, 10)] + [make_match("US_SSN", 99)]
+        self.analyzer.engine = FakeEngine(matches)
+        self.analyzer.max_sample_matches = 2
+
+        result = await self.analyzer._analyze_pii("/tmp/f", self.file_enriched)
+
+        counts = {"Credit Card Number": 5, "Social Security Number": 1}
+        assert result.results["counts"] == counts
+        assert [match["offset"] for match in result.results["pii_detected"]["Credit Card Number"]] == [0, 10]
+        assert result.findings[0].raw_data["counts"] == counts
+        assert "| Credit Card Number | 5 |" in result.findings[0].data[0].metadata["summary"]
+
+        # The displayable transform still lists every match, grouped by type
+        [display] = self.uploaded
+        assert display.count("value-") == 6
+        assert display.index("value-40") < display.index("Social Security Number:")
+        assert result.transforms[0].object_id == "t1"
+
+    async def test_no_matches_means_no_finding(self):
+        self.analyzer.engine = FakeEngine([])
+
+        result = await self.analyzer._analyze_pii("/tmp/f", self.file_enriched)
+
+        assert not result.findings
+        assert self.uploaded == []
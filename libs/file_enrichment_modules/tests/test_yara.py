@@ -0,0 +1,168 @@
+# tests/test_yara.py
+"""Tests for the Yara scanner module."""
+
+import importlib
+from contextlib import asynccontextmanager
+
+import pytest
+import yara_x
+
+from tests.harness import FileEnrichedFactory, ModuleTestHarness
+
+RULE_TEXT = """rule test_secret_marker {
+    meta:
+        description = "Finds the test secret marker"
+    strings:
+        $marker = "SECRET_MARKER"
+    condition:
+        $marker
+}"""
+
+OTHER_RULE_TEXT = 'rule test_other_marker { strings: $a = "OTHER" condition: $a }'
+
+
+@pytest.fixture
+def yara_analyzer(tmp_path, monkeypatch):
+    """Import the yara module against an empty rules folder."""
+    monkeypatch.setenv("YARA_RULES_FOLDER_PATH", str(tmp_path))
+    return importlib.import_module("file_enrichment_modules.yara.analyzer")
+
+
+def load_rules(module, *rule_texts: str) -> None:
+    texts = {text.split()[1]: text for text in rule_texts}
+    module.rule_manager._loaded = rule_manager_module().LoadedRules(
+        compiled=yara_x.compile("\n".join(rule_texts)), texts=texts, rule_set_hash=str(len(texts))
+    )
+
+
+def rule_manager_module():
+    return importlib.import_module("file_enrichment_modules.yara.yara_manager")
+
+
+class FakeConnection:
+    def __init__(self, db: "FakePool"):
+        self.db = db
+
+    async def fetch(self, query: str, *args):
+        return [rule for rule in self.db.rules if rule["enabled"]]
+
+    async def fetchval(self, query: str, *args):
+        return self.db.compiled.get(args[0])
+
+    async def execute(self, query: str, *args):
+        if "INSERT INTO yara_compiled_rules" in query:
+            self.db.compiled.setdefault(args[0], args[1])
+        elif "DELETE FROM yara_compiled_rules" in query:
+            self.db.compiled = {key: value for key, value in self.db.compiled.items() if key == args[0]}
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakePool:
+    def __init__(self, rules: list[dict]):
+        self.rules = rules
+        self.compiled: dict[str, bytes] = {}
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+class TestYaraScanner:
+    """Tests for YaraScanner."""
+
+    @pytest.mark.asyncio
+    async def test_matches_include_rule_text_and_matched_data(self, yara_analyzer):
+        data = b"header\x00\x01 SECRET_MARKER trailer"
+        file_enriched = FileEnrichedFactory.create_plaintext_file(object_id="test-yara-uuid", file_name="notes.txt")
+
+        harness = ModuleTestHarness()
+        harness.register_file_bytes("test-yara-uuid", data, file_enriched)
+
+        async with harness.create_module(yara_analyzer.YaraScanner) as module:
+            load_rules(module, RULE_TEXT, OTHER_RULE_TEXT)
+            result = await module.process("test-yara-uuid")
+
+        assert result is not None
+        [yara_match] = result.results["yara_matches"]
+        assert yara_match["rule_name"] == "test_secret_marker"
+        assert yara_match["rule_text"] == RULE_TEXT
+        assert yara_match["rule_description"] == "Finds the test secret marker"
+        [instance] = yara_match["rule_string_matches"][0]["yara_string_match_instances"]
+        assert instance["offset"] == data.index(b"SECRET_MARKER")
+        assert instance["matched_data_text"] == "SECRET_MARKER"
+        assert len(result.findings) == 1
+
+    @pytest.mark.asyncio
+    async def test_scan_threads_pick_up_reloaded_rules(self, yara_analyzer):
+        harness = ModuleTestHarness()
+        harness.register_file_bytes(
+            "test-yara-uuid", b"OTHER data", FileEnrichedFactory.create(object_id="test-yara-uuid")
+        )
+
+        async with harness.create_module(yara_analyzer.YaraScanner) as module:
+            load_rules(module, RULE_TEXT)
+            assert await module.process("test-yara-uuid") is None
+
+            load_rules(module, OTHER_RULE_TEXT)
+            result = await module.process("test-yara-uuid")
+
+        assert result is not None
+        [yara_match] = result.results["yara_matches"]
+        assert yara_match["rule_name"] == "test_other_marker"
+        [instance] = yara_match["rule_string_matches"][0]["yara_string_match_instances"]
+        assert instance["matched_data_hex"] == "4f544845 52"
+
+
+class TestYaraRuleManager:
+    """Tests for loading and caching compiled rules."""
+
+    @pytest.fixture
+    def pool(self) -> FakePool:
+        return FakePool(
+            [
+                {"name": "test_secret_marker", "content": RULE_TEXT, "source": "test", "enabled": True},
+                {"name": "broken", "content": "rule broken { condition: $x }", "source": "test", "enabled": True},
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_compiled_rules_are_cached_by_rule_set(self, yara_analyzer, pool, monkeypatch):
+        manager_module = rule_manager_module()
+        first = manager_module.YaraRuleManager()
+        first.asyncpg_pool = pool
+        await first.load_db_rules()
+
+        assert first.get_rule_content("test_secret_marker") == RULE_TEXT
+        assert list(pool.compiled) == [first._loaded.rule_set_hash]
+
+        # Another replica loading the same rules deserializes them instead of compiling
+        def fail_compile(rules):
+            raise AssertionError("rules should come from the cache")
+
+        monkeypatch.setattr(manager_module, "compile_rules", fail_compile)
+        second = manager_module.YaraRuleManager()
+        second.asyncpg_pool = pool
+        await second.load_db_rules()
+        assert [rule.identifier for rule in second.match(b"has a SECRET_MARKER")] == ["test_secret_marker"]
+
+        # Reloading an unchanged rule set keeps the loaded rules
+        loaded = second._loaded
+        await second.load_db_rules()
+        assert second._loaded is loaded
+
+    @pytest.mark.asyncio
+    async def test_changed_rule_set_is_recompiled(self, yara_analyzer, pool):
+        manager = rule_manager_module().YaraRuleManager()
+        manager.asyncpg_pool = pool
+        await manager.load_db_rules()
+        previous_hash = manager._loaded.rule_set_hash
+
+        pool.rules.append({"name": "test_other_marker", "content": OTHER_RULE_TEXT, "source": "test", "enabled": True})
+        await manager.load_db_rules()
+
+        assert manager._loaded.rule_set_hash != previous_hash
+        assert list(pool.compiled) == [manager._loaded.rule_set_hash]
+        assert [rule.identifier for rule in manager.match(b"OTHER")] == ["test_other_marker"]
@@ -5,7 +5,7 @@ This module provides rule-based detection and tracking of file dependencies and
 """
 
 from .database_service import FileLinkingDatabaseService, FileListingStatus
-from .helpers import add_file_linking
+from .helpers import add_file_linking, get_file_linking_engine
 from .rules_engine import FileLinkingEngine
 
 __all__ = [
@@ -13,4 +13,5 @@ __all__ = [
     "FileLinkingDatabaseService",
     "FileListingStatus",
     "add_file_linking",
+    "get_file_linking_engine",
 ]
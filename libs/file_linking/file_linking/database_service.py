@@ -145,6 +145,104 @@ class FileLinkingDatabaseService:
 
         return False
 
+    async def add_linked_files(
+        self, source: str, file_path: str, linked_files: list[tuple[str, FileListingStatus, str | None]], conn=None
+    ) -> bool:
+        """
+        Add file listings for several linked paths and the linkings from a file to them in one round trip.
+
+        Uses the same upsert semantics as add_file_listing() and add_file_linking(), with a single
+        statement that upserts the listings in a CTE and the linkings in the main query.
+
+        Args:
+            source: Source identifier
+            file_path: Path of the file the linkings start from (file_path_1)
+            linked_files: (linked path, listing status, link type) for each linked file
+            conn: Optional database connection to use (for transactions)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not source or not file_path:
+            return False
+
+        # One row per key (a statement can't upsert the same row twice), resolved the way successive
+        # add_file_listing() and add_file_linking() calls would: a listing keeps the path it was first
+        # inserted with and the last status, unless an earlier status was 'collected', and later link
+        # types win. Rows are sorted so concurrent batches lock them in the same order.
+        listings: dict[str, tuple[str, str]] = {}
+        linkings: dict[str, tuple[str, str | None]] = {}
+        for linked_path, status, link_type in linked_files:
+            if not linked_path:
+                continue
+            first_path, previous_status = listings.get(linked_path.lower(), (linked_path, None))
+            if previous_status != FileListingStatus.COLLECTED:
+                listings[linked_path.lower()] = (first_path, status.value)
+            linkings[linked_path] = (linked_path, link_type)
+
+        if not listings:
+            return False
+
+        listing_rows = [listings[key] for key in sorted(listings)]
+        linking_rows = [linkings[key] for key in sorted(linkings)]
+
+        query = """
+            WITH listings AS (
+                INSERT INTO file_listings (source, path, object_id, status)
+                SELECT $1, t.path, NULL::uuid, t.status
+                FROM unnest($3::text[], $4::text[]) AS t(path, status)
+                ON CONFLICT (source, path_lower)
+                DO UPDATE SET
+                    object_id = CASE
+                        WHEN file_listings.status = 'collected' THEN file_listings.object_id
+                        ELSE EXCLUDED.object_id
+                    END,
+                    status = CASE
+                        WHEN file_listings.status = 'collected' THEN file_listings.status
+                        ELSE EXCLUDED.status
+                    END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE file_listings.status != 'collected' OR EXCLUDED.status = 'collected'
+            )
+            INSERT INTO file_linkings (source, file_path_1, file_path_2, link_type)
+            SELECT $1, $2, t.file_path_2, t.link_type
+            FROM unnest($5::text[], $6::text[]) AS t(file_path_2, link_type)
+            ON CONFLICT (source, file_path_1, file_path_2)
+            DO UPDATE SET
+                link_type = EXCLUDED.link_type,
+                updated_at = CURRENT_TIMESTAMP
+        """
+        args = (
+            source,
+            file_path,
+            [row[0] for row in listing_rows],
+            [row[1] for row in listing_rows],
+            [row[0] for row in linking_rows],
+            [row[1] for row in linking_rows],
+        )
+
+        try:
+            if conn:
+                # Use provided connection (part of transaction)
+                await conn.execute(query, *args)
+            else:
+                # Acquire new connection
+                async with self.pool.acquire() as conn:
+                    await conn.execute(query, *args)
+
+            logger.debug(
+                "Added linked files",
+                source=source,
+                file_path=file_path,
+                listings=len(listing_rows),
+                linkings=len(linking_rows),
+            )
+            return True
+
+        except Exception as e:
+            logger.exception("Error adding linked files", source=source, file_path=file_path, error=str(e))
+            return False
+
     async def get_placeholder_entries(self, source: str) -> list[dict]:
         """
         Query entries containing any known placeholders for a given source.
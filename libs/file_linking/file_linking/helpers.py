@@ -13,6 +13,20 @@ from .rules_engine import FileLinkingEngine
 
 logger = get_logger(__name__)
 
+# One engine per connection pool so the placeholder index is shared by every caller in the process
+_engines: dict[int, tuple[asyncpg.Pool, FileLinkingEngine]] = {}
+
+
+def get_file_linking_engine(connection_pool: asyncpg.Pool) -> FileLinkingEngine:
+    """Return the process-wide FileLinkingEngine for a connection pool, creating it on first use."""
+    cached = _engines.get(id(connection_pool))
+    if cached is not None and cached[0] is connection_pool:
+        return cached[1]
+
+    engine = FileLinkingEngine(connection_pool)
+    _engines[id(connection_pool)] = (connection_pool, engine)
+    return engine
+
 
 async def add_file_linkings(
     source: str,
@@ -61,7 +75,7 @@ async def add_file_linkings(
 
     try:
         if connection_pool is not None:
-            file_linking_engine = FileLinkingEngine(connection_pool)
+            file_linking_engine = get_file_linking_engine(connection_pool)
         else:
             # Fallback: create temporary pool for backward compatibility
             logger.warning(
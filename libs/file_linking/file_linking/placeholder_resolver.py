@@ -5,7 +5,10 @@ Provides bidirectional resolution between placeholder paths (e.g., containing <W
 and real file paths, handling files arriving in any order.
 """
 
+import asyncio
+import json
 import re
+import time
 from dataclasses import dataclass
 
 from common.logger import get_logger
@@ -45,6 +48,103 @@ PLACEHOLDERS = [
 ]
 
 
+# How long a source's placeholder index is trusted before it is rebuilt from the database
+# (a safety net in case change notifications were missed)
+PLACEHOLDER_INDEX_TTL = 300
+
+
+def contains_placeholder(path: str) -> bool:
+    """Return True if the path contains any known placeholder."""
+    return "<" in path and any(p.name in path for p in PLACEHOLDERS)
+
+
+class _PlaceholderIndexNode:
+    __slots__ = ("children", "wildcard", "entries")
+
+    def __init__(self):
+        self.children: dict[str, _PlaceholderIndexNode] = {}
+        self.wildcard: _PlaceholderIndexNode | None = None
+        self.entries: dict[str, list] = {}  # lowercased path -> [placeholder path, compiled pattern or None]
+
+
+class PlaceholderIndex:
+    """
+    In-memory index of one source's placeholder paths.
+
+    Placeholder paths are stored in a trie keyed on their lowercased directory components, and
+    components containing a placeholder become a wildcard edge. Placeholder patterns never match '/',
+    so a real path can only match placeholders whose directories line up with its own - those are
+    the only ones its regex is tried against. Patterns are compiled once, on first use.
+    """
+
+    def __init__(self, compile_pattern):
+        self._compile_pattern = compile_pattern
+        self._roots: dict[str, _PlaceholderIndexNode] = {}  # table name -> trie root
+        self._nodes: dict[tuple[str, str], _PlaceholderIndexNode] = {}  # (table name, lowercased path) -> node
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(self, table_name: str, path: str) -> None:
+        """Add a placeholder path (no-op for real paths or paths already indexed)."""
+        if not path or not contains_placeholder(path):
+            return
+
+        key = (table_name, path.lower())
+        if key in self._nodes:
+            return
+
+        node = self._roots.setdefault(table_name, _PlaceholderIndexNode())
+        for component in path.split("/")[:-1]:
+            if contains_placeholder(component):
+                if node.wildcard is None:
+                    node.wildcard = _PlaceholderIndexNode()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(component.lower(), _PlaceholderIndexNode())
+
+        node.entries[key[1]] = [path, None]
+        self._nodes[key] = node
+
+    def remove(self, table_name: str, path: str) -> None:
+        """Remove a placeholder path (e.g. once it has been resolved to a real path)."""
+        node = self._nodes.pop((table_name, path.lower()), None)
+        if node is not None:
+            node.entries.pop(path.lower(), None)
+
+    def match(self, table_name: str, real_path: str) -> list[tuple[str, re.Match]]:
+        """Return (placeholder path, match) for every indexed placeholder the real path matches."""
+        root = self._roots.get(table_name)
+        if root is None:
+            return []
+
+        components = real_path.lower().split("/")
+        last_dir = len(components) - 1
+        matches = []
+
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+
+            for entry in node.entries.values():
+                if entry[1] is None:
+                    entry[1] = self._compile_pattern(entry[0]) or False
+                if entry[1]:
+                    match = entry[1].match(real_path)
+                    if match:
+                        matches.append((entry[0], match))
+
+            if depth < last_dir:
+                child = node.children.get(components[depth])
+                if child is not None:
+                    stack.append((child, depth + 1))
+                if node.wildcard is not None:
+                    stack.append((node.wildcard, depth + 1))
+
+        return matches
+
+
 class PlaceholderResolver:
     """
     Resolves placeholders in file paths bidirectionally.
@@ -63,6 +163,100 @@ class PlaceholderResolver:
         """
         self.db_service = db_service
 
+        # Per-source placeholder indexes, loaded lazily and kept current through index_placeholder(),
+        # forget_placeholder() and apply_placeholder_notification()
+        self._indexes: dict[str, PlaceholderIndex] = {}
+        self._pending_changes: dict[str, list[tuple[str, str, str]]] = {}  # changes seen while an index loads
+        self._loading: dict[str, asyncio.Task[PlaceholderIndex]] = {}  # in-flight load per source
+
+    async def get_placeholder_index(self, source: str) -> PlaceholderIndex:
+        """Return the placeholder index for a source, (re)loading it from the database when needed.
+
+        Concurrent callers share one load per source, so a slower load can't overwrite a newer index
+        or drop changes recorded for another.
+        """
+        index = self._indexes.get(source)
+        if index is not None and time.monotonic() - index.loaded_at < PLACEHOLDER_INDEX_TTL:
+            return index
+
+        load = self._loading.get(source)
+        if load is None:
+            # Record changes made while the query runs so they aren't lost if it read an older snapshot
+            self._pending_changes[source] = []
+            load = asyncio.ensure_future(self._load_index(source))
+            self._loading[source] = load
+            load.add_done_callback(lambda _: self._finish_load(source))
+        # Shielded so one caller being cancelled doesn't cancel the load the others are waiting on
+        return await asyncio.shield(load)
+
+    def _finish_load(self, source: str) -> None:
+        self._loading.pop(source, None)
+        self._pending_changes.pop(source, None)  # only still set if the load failed or was cancelled
+
+    async def _load_index(self, source: str) -> PlaceholderIndex:
+        placeholder_entries = await self.db_service.get_placeholder_entries(source)
+        pending = self._pending_changes.pop(source, [])
+
+        index = PlaceholderIndex(self._convert_placeholder_to_regex)
+        for entry in placeholder_entries:
+            index.add(entry["table_name"], entry["path"])
+        for op, table_name, path in pending:
+            if op == "add":
+                index.add(table_name, path)
+            else:
+                index.remove(table_name, path)
+
+        self._indexes[source] = index
+        logger.debug("Loaded placeholder index", source=source, count=len(index))
+        return index
+
+    def _record_change(self, op: str, source: str, table_name: str, path: str) -> None:
+        if source in self._pending_changes:
+            self._pending_changes[source].append((op, table_name, path))
+
+        index = self._indexes.get(source)
+        if index is not None:
+            if op == "add":
+                index.add(table_name, path)
+            else:
+                index.remove(table_name, path)
+
+    def index_placeholder(self, source: str, table_name: str, path: str) -> None:
+        """Add a newly stored placeholder path to the source's index (if it is loaded)."""
+        if path and contains_placeholder(path):
+            self._record_change("add", source, table_name, path)
+
+    def forget_placeholder(self, source: str, table_name: str, path: str) -> None:
+        """Remove a placeholder path that has been resolved from the source's index (if it is loaded)."""
+        self._record_change("remove", source, table_name, path)
+
+    def apply_placeholder_notification(self, payload: str) -> None:
+        """
+        Apply a change notification from the database (see notify_file_linking_placeholder() in the schema).
+
+        The payload is JSON with 'source', 'table', 'old_path' and 'new_path'. If it only carries 'source',
+        the source's index is dropped and reloaded on next use.
+        """
+        change = json.loads(payload)
+        source = change["source"]
+        table_name = change.get("table")
+
+        if not table_name:
+            self._indexes.pop(source, None)
+            return
+
+        if change.get("old_path"):
+            self.forget_placeholder(source, table_name, change["old_path"])
+        if change.get("new_path"):
+            self.index_placeholder(source, table_name, change["new_path"])
+
+    async def find_placeholder_matches(
+        self, source: str, real_path: str, table_name: str
+    ) -> list[tuple[str, re.Match]]:
+        """Return (placeholder path, match) for each placeholder entry in `table_name` matching a real path."""
+        index = await self.get_placeholder_index(source)
+        return index.match(table_name, real_path)
+
     def _convert_placeholder_to_regex(self, template_path: str) -> re.Pattern | None:
         """
         Convert a placeholder template path to a compiled regex pattern.
@@ -203,28 +397,10 @@ class PlaceholderResolver:
         if not file_path or not source:
             return 0
 
-        # Query for placeholder entries for this source
-        placeholder_entries = await self.db_service.get_placeholder_entries(source)
-
-        if not placeholder_entries:
-            logger.debug("No placeholder entries found for source", source=source)
-            return 0
-
         resolved_count = 0
 
-        for entry in placeholder_entries:
-            table_name = entry["table_name"]
-            placeholder_path = entry["path"]
-
-            # Convert placeholder path to regex
-            pattern = self._convert_placeholder_to_regex(placeholder_path)
-            if not pattern:
-                continue
-
-            # Try to match against the real file path
-            match = pattern.match(file_path)
-
-            if match:
+        for table_name in ("file_listings", "file_linkings"):
+            for placeholder_path, match in await self.find_placeholder_matches(source, file_path, table_name):
                 # Resolve the placeholder path using captured values
                 resolved_path = self._replace_placeholders_with_captures(placeholder_path, match)
 
@@ -239,9 +415,12 @@ class PlaceholderResolver:
 
                 # Update the database
                 if table_name == "file_listings":
-                    await self.db_service.update_file_listing_path(source, placeholder_path, resolved_path)
-                elif table_name == "file_linkings":
-                    await self.db_service.update_file_linking_path(source, placeholder_path, resolved_path)
+                    updated = await self.db_service.update_file_listing_path(source, placeholder_path, resolved_path)
+                else:
+                    updated = await self.db_service.update_file_linking_path(source, placeholder_path, resolved_path)
+
+                if updated:
+                    self.forget_placeholder(source, table_name, placeholder_path)
 
                 resolved_count += 1
 
@@ -9,6 +9,7 @@ Processes files to detect relationships and create linkings based on:
 import fnmatch
 import os
 import posixpath
+import re
 from dataclasses import dataclass
 
 import asyncpg
@@ -22,6 +23,11 @@ from .placeholder_resolver import PlaceholderResolver
 logger = get_logger(__name__)
 
 
+def _compile_file_patterns(patterns: list[str]) -> re.Pattern:
+    """Compile glob patterns into one regex matching what any of them would match with fnmatch."""
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
 @dataclass
 class Trigger:
     """Represents a trigger condition for a linking rule."""
@@ -30,6 +36,24 @@ class Trigger:
     mime_patterns: list[str]
     magic_patterns: list[str]
 
+    def __post_init__(self):
+        # Compiled once here instead of running fnmatch per pattern for every file
+        self._file_regex = _compile_file_patterns(self.file_patterns) if self.file_patterns else None
+        self._mime_types = frozenset(self.mime_patterns)
+
+    def matches(self, file_path: str, mime_type: str, magic_type: str) -> bool:
+        """Check if a file matches all of this trigger's path, mime type, and magic type conditions."""
+        if self._file_regex is not None and not self._file_regex.match(file_path):
+            return False
+
+        if self._mime_types and mime_type not in self._mime_types:
+            return False
+
+        if self.magic_patterns and not any(pattern in magic_type for pattern in self.magic_patterns):
+            return False
+
+        return True
+
 
 @dataclass
 class LinkedFile:
@@ -54,6 +78,51 @@ class LinkingRule:
     linked_files: list[LinkedFile]
 
 
+class RuleMatcher:
+    """
+    The triggers of a set of rules, indexed so a file is only checked against rules that can match it.
+
+    A single regex over every rule's file patterns rules out all path-constrained rules for most files,
+    and mime types are looked up in a dict instead of scanned per trigger.
+    """
+
+    def __init__(self, rules: list[LinkingRule]):
+        self.rules = rules
+
+        file_patterns = [pattern for rule in rules for trigger in rule.triggers for pattern in trigger.file_patterns]
+        self._any_file_regex = _compile_file_patterns(file_patterns) if file_patterns else None
+
+        # Rules that can match without a file pattern or a specific mime type matching
+        self._pathless_rules: set[int] = set()
+        self._any_mime_rules: set[int] = set()
+        self._rules_by_mime: dict[str, set[int]] = {}
+
+        for i, rule in enumerate(rules):
+            for trigger in rule.triggers:
+                if not trigger.file_patterns:
+                    self._pathless_rules.add(i)
+                if not trigger.mime_patterns:
+                    self._any_mime_rules.add(i)
+                for mime_type in trigger.mime_patterns:
+                    self._rules_by_mime.setdefault(mime_type, set()).add(i)
+
+    def match(self, file_enriched: FileEnriched) -> list[LinkingRule]:
+        """Return the rules (in load order) with a trigger matching the file."""
+        file_path = file_enriched.path
+        mime_type = file_enriched.mime_type
+        magic_type = file_enriched.magic_type
+
+        candidates = self._any_mime_rules | self._rules_by_mime.get(mime_type, set())
+        if self._any_file_regex is None or not self._any_file_regex.match(file_path):
+            candidates &= self._pathless_rules
+
+        return [
+            self.rules[i]
+            for i in sorted(candidates)
+            if any(trigger.matches(file_path, mime_type, magic_type) for trigger in self.rules[i].triggers)
+        ]
+
+
 class FileLinkingEngine:
     """
     Engine for processing file linking rules and creating database entries.
@@ -65,6 +134,7 @@ class FileLinkingEngine:
         self.db_service = FileLinkingDatabaseService(connection_pool)
         self.placeholder_resolver = PlaceholderResolver(self.db_service)
         self.rules: list[LinkingRule] = []
+        self.rule_matcher = RuleMatcher(self.rules)
 
         if rules_dir is None:
             rules_dir = os.path.join(os.path.dirname(__file__), "rules")
@@ -92,6 +162,8 @@ class FileLinkingEngine:
                     except Exception as e:
                         logger.exception("Error loading rule file", rule_path=rule_path, error=str(e))
 
+        self.rule_matcher = RuleMatcher(self.rules)
+
         logger.info("Loaded file linking rules", count=rules_loaded, rules_dir=self.rules_dir)
 
     def _load_rule_file(self, rule_path: str) -> LinkingRule | None:
@@ -139,32 +211,7 @@ class FileLinkingEngine:
 
     def _matches_trigger(self, file_enriched: FileEnriched, trigger: Trigger) -> bool:
         """Check if a file matches a path, mime type, or magic type trigger condition."""
-        file_path = file_enriched.path
-        mime_type = file_enriched.mime_type
-        magic_type = file_enriched.magic_type
-
-        # Check file patterns
-        logger.debug(f"file_patterns: {trigger.file_patterns}")
-
-        if trigger.file_patterns:
-            path_match = any(fnmatch.fnmatch(file_path, pattern) for pattern in trigger.file_patterns)
-
-            if not path_match:
-                return False
-
-        # Check MIME types
-        if trigger.mime_patterns and mime_type not in trigger.mime_patterns:
-            logger.debug(f"path_match but mime types mismatch: {mime_type}")
-            return False
-
-        # Check magic patterns
-        if trigger.magic_patterns:
-            magic_match = any(pattern in magic_type for pattern in trigger.magic_patterns)
-            if not magic_match:
-                logger.debug("path_match but magic string mismatch")
-                return False
-
-        return True
+        return trigger.matches(file_enriched.path, file_enriched.mime_type, file_enriched.magic_type)
 
     async def _resolve_backward(self, source: str, linked_path: str) -> tuple[str, FileListingStatus]:
         """
@@ -220,36 +267,29 @@ class FileLinkingEngine:
             return
 
         try:
-            placeholder_entries = await self.db_service.get_placeholder_entries(source)
+            # Only placeholders whose directories line up with real_path are regex-matched (see PlaceholderIndex)
+            matches = await self.placeholder_resolver.find_placeholder_matches(source, real_path, table_name)
 
-            for entry in placeholder_entries:
-                if entry["table_name"] != table_name:
-                    continue
+            for placeholder_path, match in matches:
+                # This real path matches an existing placeholder
+                resolved_path = self.placeholder_resolver._replace_placeholders_with_captures(placeholder_path, match)
 
-                placeholder_path = entry["path"]
-
-                # Convert placeholder to regex and try to match
-                pattern = self.placeholder_resolver._convert_placeholder_to_regex(placeholder_path)
-                match = pattern.match(real_path) if pattern else None
-                if match:
-                    # This real path matches an existing placeholder
-                    resolved_path = self.placeholder_resolver._replace_placeholders_with_captures(
-                        placeholder_path, match
-                    )
+                logger.info(
+                    f"Forward resolution matched placeholder in {table_name}",
+                    placeholder_path=placeholder_path,
+                    real_path=real_path,
+                    source=source,
+                )
 
-                    logger.info(
-                        f"Forward resolution matched placeholder in {table_name}",
-                        placeholder_path=placeholder_path,
-                        real_path=real_path,
-                        source=source,
-                    )
+                # Update the placeholder in the appropriate table
+                if table_name == "file_listings":
+                    updated = await self.db_service.update_file_listing_path(source, placeholder_path, resolved_path)
+                else:
+                    updated = await self.db_service.update_file_linking_path(source, placeholder_path, resolved_path)
 
-                    # Update the placeholder in the appropriate table
-                    if table_name == "file_listings":
-                        await self.db_service.update_file_listing_path(source, placeholder_path, resolved_path)
-                    elif table_name == "file_linkings":
-                        await self.db_service.update_file_linking_path(source, placeholder_path, resolved_path)
-                    # Continue checking other placeholders (no break)
+                if updated:
+                    self.placeholder_resolver.forget_placeholder(source, table_name, placeholder_path)
+                # Continue checking other placeholders (no break)
 
         except Exception as e:
             logger.warning(
@@ -259,6 +299,21 @@ class FileLinkingEngine:
                 error=str(e),
             )
 
+    async def _add_listing_and_linking(
+        self, source: str, file_path: str, linked_path: str, status: FileListingStatus, link_type: str
+    ) -> None:
+        """Add the file listing for a linked path and the linking to it, indexing any new placeholder paths."""
+        if await self.db_service.add_file_listing(source=source, path=linked_path, status=status):
+            self.placeholder_resolver.index_placeholder(source, "file_listings", linked_path)
+
+        if await self.db_service.add_file_linking(
+            source=source,
+            file_path_1=file_path,
+            file_path_2=linked_path,
+            link_type=link_type,
+        ):
+            self.placeholder_resolver.index_placeholder(source, "file_linkings", linked_path)
+
     def _expand_path_template(self, template: str, file_path: str) -> str:
         """Expand a path template with file-specific values."""
 
@@ -302,8 +357,9 @@ class FileLinkingEngine:
         - Forward: resolves existing placeholder entries using this real file
         - Backward: checks if placeholder paths already have matching real files
 
-        Database operations use individual atomic upserts to avoid deadlocks in
-        concurrent file processing scenarios.
+        Database operations use atomic upserts (no wrapping transaction) to avoid deadlocks in
+        concurrent file processing scenarios. The listings and linkings for all matched rules
+        are written together with one multi-row upsert per table.
 
         Args:
             file_enriched: File data from files_enriched table
@@ -351,56 +407,42 @@ class FileLinkingEngine:
         )
         logger.debug("Adding file listing (collected)", file_path=file_path, source=source)
 
-        # Process each rule
-        for rule in self.rules:
+        # Collect the listings/linkings from every matching rule and write them in one batch
+        linked_files: list[tuple[str, FileListingStatus, str]] = []
+
+        for rule in self.rule_matcher.match(file_enriched):
+            logger.debug("File matches rule trigger", rule_name=rule.name, file_path=file_path)
+
             try:
-                # Check if any trigger matches
-                for trigger in rule.triggers:
-                    if self._matches_trigger(file_enriched, trigger):
-                        logger.debug("File matches rule trigger", rule_name=rule.name, file_path=file_path)
-
-                        # Process linked files for this rule
-                        for linked_file in rule.linked_files:
-                            for template in linked_file.path_templates:
-                                linked_path = self._expand_path_template(template, file_enriched.path)
-
-                                # Backward resolution: If linked_path contains placeholders,
-                                # check if a matching real file already exists
-                                linked_path, status = await self._resolve_backward(source, linked_path)
-
-                                # Add file listing
-                                await self.db_service.add_file_listing(
-                                    source=source,
-                                    path=linked_path,
-                                    status=status,
-                                )
-
-                                # Add file linking
-                                link_type = f"{rule.category}:{linked_file.name}"
-                                await self.db_service.add_file_linking(
-                                    source=source,
-                                    file_path_1=file_path,
-                                    file_path_2=linked_path,
-                                    link_type=link_type,
-                                )
-
-                                linkings_created += 1
-
-                                logger.debug(
-                                    "Created file linking",
-                                    rule_name=rule.name,
-                                    linked_file=linked_file.name,
-                                    source_path=file_path,
-                                    linked_path=linked_path,
-                                    link_type=link_type,
-                                )
-
-                        # Only match first trigger per rule
-                        break
+                for linked_file in rule.linked_files:
+                    for template in linked_file.path_templates:
+                        linked_path = self._expand_path_template(template, file_enriched.path)
+
+                        # Backward resolution: If linked_path contains placeholders,
+                        # check if a matching real file already exists
+                        linked_path, status = await self._resolve_backward(source, linked_path)
+
+                        link_type = f"{rule.category}:{linked_file.name}"
+                        linked_files.append((linked_path, status, link_type))
+
+                        logger.debug(
+                            "Created file linking",
+                            rule_name=rule.name,
+                            linked_file=linked_file.name,
+                            source_path=file_path,
+                            linked_path=linked_path,
+                            link_type=link_type,
+                        )
 
             except Exception as e:
                 logger.exception("Error processing rule", rule_name=rule.name, file_path=file_path, error=str(e))
 
+        if linked_files and await self.db_service.add_linked_files(source, file_path, linked_files):
+            linkings_created = len(linked_files)
+            for linked_path, _, _ in linked_files:
+                self.placeholder_resolver.index_placeholder(source, "file_listings", linked_path)
+                self.placeholder_resolver.index_placeholder(source, "file_linkings", linked_path)
+
         if linkings_created > 0:
             logger.info("Created file linkings from rules", file_path=file_path, linkings_created=linkings_created)
 
@@ -446,22 +488,16 @@ class FileLinkingEngine:
             await self._resolve_forward_for_table(source, final_linked_path, "file_linkings")
             await self._resolve_forward_for_table(source, final_linked_path, "file_listings")
 
-            # Add file listing
-            await self.db_service.add_file_listing(
-                source=source,
-                path=final_linked_path,
-                status=status,
-            )
-
-            # Add file linking
+            # Add file listing and file linking
             full_link_type = link_type
             if collection_reason:
                 full_link_type += f":{collection_reason}"
 
-            await self.db_service.add_file_linking(
+            await self._add_listing_and_linking(
                 source=source,
-                file_path_1=source_file_path,
-                file_path_2=final_linked_path,
+                file_path=source_file_path,
+                linked_path=final_linked_path,
+                status=status,
                 link_type=full_link_type,
             )
 
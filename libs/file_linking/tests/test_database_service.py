@@ -0,0 +1,59 @@
+"""Tests for the file linking database service."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from file_linking.database_service import FileLinkingDatabaseService, FileListingStatus
+
+
+@pytest.mark.asyncio
+class TestAddLinkedFiles:
+    """Tests for add_linked_files."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.conn = MagicMock()
+        self.conn.execute = AsyncMock()
+        self.db_service = FileLinkingDatabaseService(MagicMock())
+
+    async def test_listings_and_linkings_are_written_in_one_statement(self):
+        """Test that both tables are upserted with a single deduplicated, sorted statement."""
+        linked_files = [
+            ("C:/b.txt", FileListingStatus.NEEDS_TO_BE_COLLECTED, "first"),
+            ("C:/a.txt", FileListingStatus.NOT_WANTED, None),
+            ("C:/B.TXT", FileListingStatus.COLLECTED, "second"),
+            ("C:/b.txt", FileListingStatus.NOT_EXISTS, "third"),
+        ]
+
+        assert await self.db_service.add_linked_files("agent", "C:/src.txt", linked_files, conn=self.conn)
+
+        self.conn.execute.assert_awaited_once()
+        _, source, file_path, listing_paths, statuses, linking_paths, link_types = self.conn.execute.call_args.args
+        assert (source, file_path) == ("agent", "C:/src.txt")
+        assert listing_paths == ["C:/a.txt", "C:/b.txt"]
+        assert statuses == ["not_wanted", "collected"]
+        assert linking_paths == ["C:/B.TXT", "C:/a.txt", "C:/b.txt"]
+        assert link_types == ["second", None, "third"]
+
+    async def test_last_listing_status_wins_unless_collected(self):
+        """Test that duplicate listings resolve like successive upserts: last status wins, 'collected' sticks."""
+        linked_files = [
+            ("C:/a.txt", FileListingStatus.NEEDS_TO_BE_COLLECTED, None),
+            ("C:/A.TXT", FileListingStatus.NOT_WANTED, None),
+            ("C:/b.txt", FileListingStatus.COLLECTED, None),
+            ("C:/b.txt", FileListingStatus.NOT_EXISTS, None),
+        ]
+
+        assert await self.db_service.add_linked_files("agent", "C:/src.txt", linked_files, conn=self.conn)
+
+        _, _, _, listing_paths, statuses, _, _ = self.conn.execute.call_args.args
+        assert listing_paths == ["C:/a.txt", "C:/b.txt"]
+        assert statuses == ["not_wanted", "collected"]
+
+    async def test_nothing_to_link(self):
+        """Test that empty linked paths are skipped without touching the database."""
+        linked_files = [("", FileListingStatus.NOT_WANTED, None)]
+
+        assert not await self.db_service.add_linked_files("agent", "C:/src.txt", linked_files, conn=self.conn)
+
+        self.conn.execute.assert_not_called()
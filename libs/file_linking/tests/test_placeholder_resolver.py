@@ -1,5 +1,7 @@
 """Tests for the placeholder resolver."""
 
+import asyncio
+import json
 import re
 from unittest.mock import AsyncMock, MagicMock
 
@@ -7,6 +9,7 @@ import pytest
 from file_linking.placeholder_resolver import (
     PLACEHOLDERS,
     PlaceholderDefinition,
+    PlaceholderIndex,
     PlaceholderResolver,
 )
 
@@ -395,3 +398,165 @@ class TestPlaceholderResolutionScenarios:
         # Should return the real path instead of None
         assert result == real_path
         self.db_service.get_collected_files.assert_called_once_with(source)
+
+
+INDEXED_PLACEHOLDERS = [
+    "/C:/Users/<WINDOWS_USERNAME>/AppData/Roaming/Microsoft/Protect/<WINDOWS_SECURITY_IDENTIFIER>/abc-123",
+    "/C:/Users/<WINDOWS_USERNAME>/AppData/Local/Google/Chrome/User Data/Local State",
+    "/C:/Users/<WINDOWS_USERNAME>/AppData/file.txt",
+    "/C:/ProgramData/Microsoft/Crypto/SystemKeys/7096db7aeb75c0d3497ecd56d355a695_<WINDOWS_MACHINE_GUID>",
+    "/C:/Windows/<WINDOWS_USERNAME>.txt",
+    "<WINDOWS_USERNAME>.ini",
+]
+
+REAL_PATHS = [
+    "/C:/Users/john.doe/AppData/Roaming/Microsoft/Protect/S-1-5-21-1-2-3-1000/abc-123",
+    "/C:/Users/john.doe/AppData/Roaming/Microsoft/Protect/S-1-5-21-1-2-3-1000/other",
+    "/c:/users/JANE/appdata/local/google/chrome/user data/local state",
+    "/C:/Users/john.doe/AppData/file.txt",
+    "/C:/Users/john.doe/AppData/file.txt.bak",
+    "/C:/Users/a/b/AppData/file.txt",
+    "/C:/ProgramData/Microsoft/Crypto/SystemKeys/7096db7aeb75c0d3497ecd56d355a695_f26c165b-53c8-414e-8abb-ec5f0f52df22",
+    "/C:/Windows/admin.txt",
+    "admin.ini",
+    "/admin.ini",
+    "",
+]
+
+
+class TestPlaceholderIndex:
+    """Tests for the in-memory placeholder index used by forward resolution."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.resolver = PlaceholderResolver(MagicMock())
+        self.index = PlaceholderIndex(self.resolver._convert_placeholder_to_regex)
+        for path in INDEXED_PLACEHOLDERS:
+            self.index.add("file_listings", path)
+
+    def test_matches_agree_with_regex_scan(self):
+        """Test that the index returns exactly what matching every placeholder regex would."""
+        for real_path in REAL_PATHS:
+            expected = [
+                path
+                for path in INDEXED_PLACEHOLDERS
+                if self.resolver._convert_placeholder_to_regex(path).match(real_path)
+            ]
+
+            matched = [path for path, _ in self.index.match("file_listings", real_path)]
+
+            assert sorted(matched) == sorted(expected), real_path
+
+    def test_match_returns_usable_captures(self):
+        """Test that the returned match can be used to build the resolved path."""
+        real_path = REAL_PATHS[0]
+
+        [(placeholder_path, match)] = self.index.match("file_listings", real_path)
+
+        assert self.resolver._replace_placeholders_with_captures(placeholder_path, match) == real_path
+
+    def test_tables_are_separate(self):
+        """Test that placeholders are only matched for the table they were added to."""
+        assert self.index.match("file_linkings", REAL_PATHS[0]) == []
+
+    def test_real_paths_are_not_indexed(self):
+        """Test that paths without placeholders are ignored."""
+        self.index.add("file_listings", "/C:/Windows/notepad.exe")
+
+        assert len(self.index) == len(INDEXED_PLACEHOLDERS)
+
+    def test_remove_is_case_insensitive(self):
+        """Test that removing a placeholder path stops it from matching."""
+        self.index.remove("file_listings", INDEXED_PLACEHOLDERS[2].upper())
+
+        assert self.index.match("file_listings", REAL_PATHS[3]) == []
+        assert len(self.index) == len(INDEXED_PLACEHOLDERS) - 1
+
+
+@pytest.mark.asyncio
+class TestPlaceholderIndexMaintenance:
+    """Tests for keeping the resolver's per-source placeholder index current."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.db_service = MagicMock()
+        self.db_service.get_placeholder_entries = AsyncMock(
+            return_value=[{"table_name": "file_listings", "path": INDEXED_PLACEHOLDERS[2]}]
+        )
+        self.resolver = PlaceholderResolver(self.db_service)
+
+    async def test_index_is_loaded_once_per_source(self):
+        """Test that repeated lookups reuse the loaded index."""
+        await self.resolver.find_placeholder_matches("agent", REAL_PATHS[3], "file_listings")
+        await self.resolver.find_placeholder_matches("agent", REAL_PATHS[3], "file_linkings")
+        await self.resolver.find_placeholder_matches("other", REAL_PATHS[3], "file_listings")
+
+        assert self.db_service.get_placeholder_entries.await_count == 2
+
+    async def test_index_and_forget_placeholder(self):
+        """Test that locally stored and resolved placeholders update the loaded index."""
+        await self.resolver.get_placeholder_index("agent")
+
+        self.resolver.index_placeholder("agent", "file_linkings", INDEXED_PLACEHOLDERS[4])
+        self.resolver.forget_placeholder("agent", "file_listings", INDEXED_PLACEHOLDERS[2])
+
+        assert await self.resolver.find_placeholder_matches("agent", REAL_PATHS[3], "file_listings") == []
+        matches = await self.resolver.find_placeholder_matches("agent", REAL_PATHS[7], "file_linkings")
+        assert [path for path, _ in matches] == [INDEXED_PLACEHOLDERS[4]]
+
+    async def test_apply_placeholder_notification(self):
+        """Test that change notifications from other workers update the index."""
+        await self.resolver.get_placeholder_index("agent")
+
+        self.resolver.apply_placeholder_notification(
+            json.dumps(
+                {
+                    "source": "agent",
+                    "table": "file_listings",
+                    "old_path": INDEXED_PLACEHOLDERS[2],
+                    "new_path": REAL_PATHS[3],
+                }
+            )
+        )
+        assert await self.resolver.find_placeholder_matches("agent", REAL_PATHS[3], "file_listings") == []
+
+        # a source-only payload drops the index so it is reloaded
+        self.resolver.apply_placeholder_notification(json.dumps({"source": "agent"}))
+        await self.resolver.get_placeholder_index("agent")
+        assert self.db_service.get_placeholder_entries.await_count == 2
+
+    async def test_changes_during_load_are_kept(self):
+        """Test that placeholders stored while the index is loading are not lost."""
+
+        async def slow_load(source):
+            self.resolver.index_placeholder(source, "file_listings", INDEXED_PLACEHOLDERS[4])
+            return [{"table_name": "file_listings", "path": INDEXED_PLACEHOLDERS[2]}]
+
+        self.db_service.get_placeholder_entries.side_effect = slow_load
+
+        index = await self.resolver.get_placeholder_index("agent")
+
+        assert len(index) == 2
+
+    async def test_concurrent_reloads_share_one_load(self):
+        """Test that concurrent lookups of an expired index share one load and keep changes made during it."""
+        release = asyncio.Event()
+
+        async def slow_load(source):
+            await release.wait()
+            return [{"table_name": "file_listings", "path": INDEXED_PLACEHOLDERS[2]}]
+
+        self.db_service.get_placeholder_entries.side_effect = slow_load
+
+        first = asyncio.create_task(self.resolver.get_placeholder_index("agent"))
+        second = asyncio.create_task(self.resolver.get_placeholder_index("agent"))
+        await asyncio.sleep(0)
+        self.resolver.index_placeholder("agent", "file_listings", INDEXED_PLACEHOLDERS[4])
+        release.set()
+
+        first_index, second_index = await asyncio.gather(first, second)
+
+        assert first_index is second_index
+        assert self.resolver._indexes["agent"] is first_index
+        assert len(first_index) == 2
+        assert self.db_service.get_placeholder_entries.await_count == 1
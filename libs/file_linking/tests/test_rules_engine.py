@@ -5,7 +5,8 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from common.models import FileEnriched, FileHashes
-from file_linking.rules_engine import FileLinkingEngine, Trigger
+from file_linking.database_service import FileListingStatus
+from file_linking.rules_engine import FileLinkingEngine, LinkingRule, RuleMatcher, Trigger
 
 
 @pytest.fixture
@@ -570,8 +571,8 @@ class TestPlaceholderResolutionIntegration:
         await engine.apply_linking_rules(real_file)
 
         # Verify forward resolution was called and placeholder was updated
-        # Called twice: once for file_listings, once for file_linkings
-        assert engine.db_service.get_placeholder_entries.call_count == 2
+        # The source's placeholder index is loaded once and used for both file_listings and file_linkings
+        assert engine.db_service.get_placeholder_entries.call_count == 1
         engine.db_service.update_file_listing_path.assert_called_once()
         call_args = engine.db_service.update_file_listing_path.call_args
         assert call_args[0][1] == placeholder_path  # old path
@@ -815,3 +816,95 @@ linked_files:
 
         # Verify query was called with correct source
         engine.db_service.get_placeholder_entries.assert_called_with("source-2")
+
+
+class TestBatchedLinking:
+    """Tests for compiled rule matching and batched listing/linking upserts."""
+
+    @pytest.fixture
+    def engine(self, mock_asyncpg_pool):
+        """Create a FileLinkingEngine with the bundled rules and mocked database writes."""
+        import os
+
+        rules_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "file_linking", "rules")
+        engine = FileLinkingEngine(connection_pool=mock_asyncpg_pool, rules_dir=rules_dir)
+        engine.db_service.get_placeholder_entries = AsyncMock(return_value=[])
+        engine.db_service.add_file_listing = AsyncMock(return_value=True)
+        engine.db_service.add_linked_files = AsyncMock(return_value=True)
+        return engine
+
+    def test_rule_matcher_agrees_with_trigger_scan(self, engine):
+        """Test that the rule matcher selects exactly the rules a full trigger scan would."""
+        engine.rules.append(
+            LinkingRule(
+                name="any_sqlite",
+                description="Matches on mime type only",
+                category="test",
+                enabled=True,
+                triggers=[Trigger(file_patterns=[], mime_patterns=["application/vnd.sqlite3"], magic_patterns=[])],
+                linked_files=[],
+            )
+        )
+        matcher = RuleMatcher(engine.rules)
+
+        files = [
+            ("C:/Users/a/AppData/Local/Google/Chrome/User Data/Local State", "application/json", "JSON data"),
+            ("C:/Users/a/AppData/Roaming/Opera Software/Opera Stable/Local State", "application/json", "JSON data"),
+            ("C:/Users/a/AppData/Local/Google/Chrome/User Data/Local State", "text/plain", "ASCII text"),
+            ("C:/Users/a/Chrome/User Data/Default/Network/Cookies", "application/vnd.sqlite3", "SQLite 3.x"),
+            ("C:/Users/a/Chrome/User Data/Default/Login Data", "application/vnd.sqlite3; charset=binary", "SQLite"),
+            ("C:/Users/a/Chrome/User Data/Default/History", "application/vnd.sqlite3", "SQLite 3.x"),
+            ("C:/Windows/notepad.exe", "application/x-dosexec", "PE32+ executable"),
+        ]
+
+        for i, (path, mime_type, magic_type) in enumerate(files):
+            file_enriched = create_file_enriched(f"test-{i}", path, mime_type, magic_type)
+            expected = [
+                rule.name
+                for rule in engine.rules
+                if any(engine._matches_trigger(file_enriched, trigger) for trigger in rule.triggers)
+            ]
+
+            assert [rule.name for rule in matcher.match(file_enriched)] == expected, path
+
+    @pytest.mark.asyncio
+    async def test_linked_files_are_written_in_one_batch(self, engine):
+        """Test that all linked files for a matched rule are upserted with a single call."""
+        local_state_path = "C:/Users/Alice/AppData/Local/Google/Chrome/User Data/Local State"
+        file_local_state = create_file_enriched(
+            object_id="test-local-state-001",
+            path=local_state_path,
+            mime_type="application/json",
+            magic_type="JSON data",
+        )
+        file_local_state.source = "test-agent"
+
+        linkings_created = await engine.apply_linking_rules(file_local_state)
+
+        assert linkings_created == 2
+        engine.db_service.add_linked_files.assert_awaited_once_with(
+            "test-agent",
+            local_state_path,
+            [
+                (
+                    "C:/Users/Alice/AppData/Local/Google/Chrome/User Data/Default/Login Data",
+                    FileListingStatus.NEEDS_TO_BE_COLLECTED,
+                    "chromium:login_data",
+                ),
+                (
+                    "C:/Users/Alice/AppData/Local/Google/Chrome/User Data/Default/Network/Cookies",
+                    FileListingStatus.NEEDS_TO_BE_COLLECTED,
+                    "chromium:cookies",
+                ),
+            ],
+        )
+
+    @pytest.mark.asyncio
+    async def test_no_batch_when_no_rule_matches(self, engine):
+        """Test that files matching no rule only get their own listing."""
+        file_enriched = create_file_enriched("test-001", "C:/Windows/notepad.exe", "application/x-dosexec", "PE32")
+        file_enriched.source = "test-agent"
+
+        assert await engine.apply_linking_rules(file_enriched) == 0
+        engine.db_service.add_file_listing.assert_awaited_once()
+        engine.db_service.add_linked_files.assert_not_called()
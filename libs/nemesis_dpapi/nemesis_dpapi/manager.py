@@ -178,6 +178,44 @@ class DpapiManager(DpapiManagerProtocol):
         elif new_masterkey.encrypted_key_usercred or new_masterkey.encrypted_key_backup:
             await self._publisher.publish_event(NewEncryptedMasterKeyEvent(masterkey_guid=new_masterkey.guid))
 
+    async def upsert_masterkeys(self, masterkeys: list[MasterKey]) -> list[UUID]:
+        """Add or update several masterkeys with one storage round trip.
+
+        Intended for bulk results such as masterkeys decrypted with a newly submitted credential.
+        Write-once semantics are enforced by the repository: unlike upsert_masterkey(), masterkeys
+        that would modify already-set fields are skipped rather than raising.
+
+        Args:
+            masterkeys: MasterKey objects to add or update
+
+        Returns:
+            GUIDs of the masterkeys that were written
+
+        Raises:
+            ValueError: If a masterkey's plaintext_key and plaintext_key_sha1 don't match
+        """
+        if not self._initialized:
+            await self._initialize_storage()
+
+        validated = []
+        for masterkey in masterkeys:
+            validated_sha1 = validate_and_calculate_sha1(masterkey.plaintext_key, masterkey.plaintext_key_sha1)
+            if validated_sha1 != masterkey.plaintext_key_sha1:
+                masterkey = masterkey.model_copy(update={"plaintext_key_sha1": validated_sha1})
+            validated.append(masterkey)
+
+        written = set(await self._masterkey_repo.upsert_masterkeys(validated))
+
+        for masterkey in validated:
+            if masterkey.guid not in written:
+                continue
+            if masterkey.plaintext_key or masterkey.plaintext_key_sha1:
+                await self._publisher.publish_event(NewPlaintextMasterKeyEvent(masterkey_guid=masterkey.guid))
+            elif masterkey.encrypted_key_usercred or masterkey.encrypted_key_backup:
+                await self._publisher.publish_event(NewEncryptedMasterKeyEvent(masterkey_guid=masterkey.guid))
+
+        return [masterkey.guid for masterkey in validated if masterkey.guid in written]
+
     async def get_masterkeys(
         self,
         guid: UUID | None = None,
@@ -1,9 +1,11 @@
 import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
 from time import perf_counter
 
 from common.logger import get_logger
 
-from .core import MasterKeyType
+from .core import MasterKey, MasterKeyType
 from .exceptions import MasterKeyDecryptionError
 from .keys import CredKey, CredKeyHashType, MasterKeyEncryptionKey, NtlmHash, Password, Pbkdf2Hash, Sha1Hash
 from .manager import DpapiManager, EncryptionFilter
@@ -11,12 +13,62 @@ from .types import Sid
 
 logger = get_logger(__name__)
 
+# Number of encrypted masterkeys handed to a worker process at a time
+MASTERKEY_DECRYPT_BATCH_SIZE = 32
+
+_decryption_executor: ProcessPoolExecutor | None = None
+
+
+def get_decryption_executor() -> ProcessPoolExecutor:
+    """Return the process pool shared by all decryption tasks, creating it on first use."""
+    global _decryption_executor
+    if _decryption_executor is None:
+        # spawn rather than fork: the parent runs an event loop and other threads
+        _decryption_executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    return _decryption_executor
+
+
+def decrypt_masterkey_batch(
+    masterkeys: list[MasterKey], mk_keys_to_try: list[MasterKeyEncryptionKey]
+) -> list[MasterKey | None]:
+    """Try each key against each masterkey, stopping at the first that works.
+
+    Runs in a worker process (PBKDF2/HMAC work would otherwise block the event loop).
+
+    Returns:
+        The decrypted masterkey, or None if no key worked, for each input masterkey
+    """
+    results: list[MasterKey | None] = []
+    for masterkey in masterkeys:
+        decrypted = None
+        for mk_key in mk_keys_to_try:
+            try:
+                decrypted = masterkey.decrypt(mk_key)
+                break  # We decrypted it, no need to try other keys
+            except MasterKeyDecryptionError:
+                continue
+        results.append(decrypted)
+    return results
+
 
 class MasterKeyDecryptorService:
     """Handles DPAPI master key decryption with background task processing."""
 
-    def __init__(self, dpapi_manager: DpapiManager):
+    def __init__(
+        self,
+        dpapi_manager: DpapiManager,
+        executor: Executor | None = None,
+        batch_size: int = MASTERKEY_DECRYPT_BATCH_SIZE,
+    ):
+        """
+        Args:
+            dpapi_manager: Manager used to read encrypted masterkeys and store decrypted ones
+            executor: Executor that runs decryption attempts (default: a shared process pool)
+            batch_size: Number of masterkeys per executor task
+        """
         self.dpapi_manager = dpapi_manager
+        self._executor = executor
+        self._batch_size = batch_size
         self._background_tasks = set()
 
     async def process_password_based_credential(
@@ -51,30 +103,29 @@ class MasterKeyDecryptorService:
                 masterkey_type=[MasterKeyType.USER, MasterKeyType.UNKNOWN],
             )
 
-            decrypted_count = 0
-
-            logger.info(f"Attempting to decrypt {len(encrypted_masterkeys)} encrypted master keys")
-            for masterkey in encrypted_masterkeys:
-                if not masterkey.encrypted_key_usercred:
-                    continue
-
-                for mk_key in mk_keys_to_try:
-                    try:
-                        plaintext_mk = masterkey.decrypt(mk_key)
-                        await self.dpapi_manager.upsert_masterkey(plaintext_mk)
-                        decrypted_count += 1
-                        logger.info(
-                            f"Successfully decrypted master key {masterkey.guid} with {credential_type.__name__}"
-                        )
-                        break  # We decrypted it, no need to try other keys
-                    except MasterKeyDecryptionError as e:
-                        logger.debug(f"Failed to decrypt master key: {e}")
-                        continue
+            candidates = [mk for mk in encrypted_masterkeys if mk.encrypted_key_usercred]
+            logger.info(f"Attempting to decrypt {len(candidates)} encrypted master keys")
+
+            # Fan batches out over the executor; each worker short-circuits per masterkey on the first key that works
+            loop = asyncio.get_running_loop()
+            executor = self._executor or get_decryption_executor()
+            batches = [candidates[i : i + self._batch_size] for i in range(0, len(candidates), self._batch_size)]
+            results = await asyncio.gather(
+                *(loop.run_in_executor(executor, decrypt_masterkey_batch, batch, mk_keys_to_try) for batch in batches)
+            )
+
+            decrypted = [mk for batch_results in results for mk in batch_results if mk is not None]
+            for mk in decrypted:
+                logger.info(f"Successfully decrypted master key {mk.guid} with {credential_type.__name__}")
+
+            # Write everything back with one bulk upsert
+            written = await self.dpapi_manager.upsert_masterkeys(decrypted) if decrypted else []
+            decrypted_count = len(written)
 
             # TODO: Notify the user that new master keys have been decrypted
             elapsed_time = perf_counter() - start_time
             logger.info(
-                f"Background decryption completed. Decrypted {decrypted_count}/({len(encrypted_masterkeys)}) master keys in {elapsed_time:.2f} seconds"
+                f"Background decryption completed. Decrypted {decrypted_count}/({len(candidates)}) master keys in {elapsed_time:.2f} seconds"
             )
 
         except Exception as e:
@@ -25,6 +25,10 @@ class NullDpapiManager(DpapiManagerProtocol):
         """Add or update a masterkey (does nothing)."""
         pass
 
+    async def upsert_masterkeys(self, masterkeys: list[MasterKey]) -> list[UUID]:
+        """Add or update several masterkeys (does nothing)."""
+        return []
+
     async def upsert_domain_backup_key(self, backup_key: DomainBackupKey) -> int:
         """Add or update a domain backup key (does nothing)."""
         return 0
@@ -24,6 +24,10 @@ class DpapiManagerProtocol(Protocol):
         """Add or update a masterkey (encrypted or plaintext)."""
         ...
 
+    async def upsert_masterkeys(self, masterkeys: list[MasterKey]) -> list[UUID]:
+        """Add or update several masterkeys, returning the GUIDs that were written."""
+        ...
+
     async def upsert_domain_backup_key(self, backup_key: DomainBackupKey) -> int:
         """Add or update a domain backup key."""
         ...
@@ -23,6 +23,14 @@ class MasterKeyRepository(Protocol):
         """Add or update a masterkey in storage."""
         ...
 
+    async def upsert_masterkeys(self, masterkeys: list[MasterKey]) -> list[UUID]:
+        """Add or update several masterkeys in storage, skipping any that violate write-once semantics.
+
+        Returns:
+            GUIDs of the masterkeys that were written
+        """
+        ...
+
     async def get_masterkeys(
         self,
         guid: UUID | None = None,
@@ -47,6 +47,21 @@ class InMemoryMasterKeyRepository:
         # Insert or update (only reached if no conflicts)
         self._masterkeys[masterkey.guid] = masterkey
 
+    async def upsert_masterkeys(self, masterkeys: list[MasterKey]) -> list[UUID]:
+        """Add or update several masterkeys, skipping any that violate write-once semantics.
+
+        Returns:
+            GUIDs of the masterkeys that were written
+        """
+        written = []
+        for masterkey in masterkeys:
+            try:
+                await self.upsert_masterkey(masterkey)
+            except WriteOnceViolationError:
+                continue
+            written.append(masterkey.guid)
+        return written
+
     async def get_masterkeys(
         self,
         guid: UUID | None = None,
@@ -13,6 +13,36 @@ MASTKEYS_TABLE = "dpapi.masterkeys"
 BACKUPKEYS_TABLE = "dpapi.domain_backup_keys"
 SYSTEMCREDS_TABLE = "dpapi.system_credentials"
 
+# Shared by single and bulk masterkey upserts
+_MASTERKEY_UPSERT_CONFLICT = f"""
+    ON CONFLICT (guid) DO UPDATE SET
+        encrypted_key_usercred = EXCLUDED.encrypted_key_usercred,
+        encrypted_key_backup = EXCLUDED.encrypted_key_backup,
+        plaintext_key = EXCLUDED.plaintext_key,
+        plaintext_key_sha1 = EXCLUDED.plaintext_key_sha1,
+        backup_key_guid = EXCLUDED.backup_key_guid,
+        masterkey_type = EXCLUDED.masterkey_type
+    WHERE
+        -- Write-once enforcement: only update if existing is NULL or matches new value
+        -- SQL Pattern: (existing IS NULL OR existing = new)
+        -- This correctly handles NULL because:
+        --   - If existing IS NULL: first condition is TRUE, allows write
+        --   - If existing is NOT NULL: second condition checked, must equal new value
+        --   - Note: "NULL = NULL" returns NULL (falsy), but "IS NULL" returns TRUE
+        ({MASTKEYS_TABLE}.encrypted_key_usercred IS NULL OR
+         {MASTKEYS_TABLE}.encrypted_key_usercred = EXCLUDED.encrypted_key_usercred)
+        AND ({MASTKEYS_TABLE}.encrypted_key_backup IS NULL OR
+             {MASTKEYS_TABLE}.encrypted_key_backup = EXCLUDED.encrypted_key_backup)
+        AND ({MASTKEYS_TABLE}.plaintext_key IS NULL OR
+             {MASTKEYS_TABLE}.plaintext_key = EXCLUDED.plaintext_key)
+        AND ({MASTKEYS_TABLE}.plaintext_key_sha1 IS NULL OR
+             {MASTKEYS_TABLE}.plaintext_key_sha1 = EXCLUDED.plaintext_key_sha1)
+        AND ({MASTKEYS_TABLE}.backup_key_guid IS NULL OR
+             {MASTKEYS_TABLE}.backup_key_guid = EXCLUDED.backup_key_guid)
+        AND ({MASTKEYS_TABLE}.masterkey_type IS NULL OR
+             {MASTKEYS_TABLE}.masterkey_type = EXCLUDED.masterkey_type)
+"""
+
 
 class PostgresMasterKeyRepository:
     """PostgreSQL storage for masterkeys."""
@@ -35,32 +65,7 @@ class PostgresMasterKeyRepository:
                 INSERT INTO {MASTKEYS_TABLE} (guid, encrypted_key_usercred, encrypted_key_backup,
                                       plaintext_key, plaintext_key_sha1, backup_key_guid, masterkey_type)
                 VALUES ($1, $2, $3, $4, $5, $6, $7)
-                ON CONFLICT (guid) DO UPDATE SET
-                    encrypted_key_usercred = EXCLUDED.encrypted_key_usercred,
-                    encrypted_key_backup = EXCLUDED.encrypted_key_backup,
-                    plaintext_key = EXCLUDED.plaintext_key,
-                    plaintext_key_sha1 = EXCLUDED.plaintext_key_sha1,
-                    backup_key_guid = EXCLUDED.backup_key_guid,
-                    masterkey_type = EXCLUDED.masterkey_type
-                WHERE
-                    -- Write-once enforcement: only update if existing is NULL or matches new value
-                    -- SQL Pattern: (existing IS NULL OR existing = new)
-                    -- This correctly handles NULL because:
-                    --   - If existing IS NULL: first condition is TRUE, allows write
-                    --   - If existing is NOT NULL: second condition checked, must equal new value
-                    --   - Note: "NULL = NULL" returns NULL (falsy), but "IS NULL" returns TRUE
-                    ({MASTKEYS_TABLE}.encrypted_key_usercred IS NULL OR
-                     {MASTKEYS_TABLE}.encrypted_key_usercred = EXCLUDED.encrypted_key_usercred)
-                    AND ({MASTKEYS_TABLE}.encrypted_key_backup IS NULL OR
-                         {MASTKEYS_TABLE}.encrypted_key_backup = EXCLUDED.encrypted_key_backup)
-                    AND ({MASTKEYS_TABLE}.plaintext_key IS NULL OR
-                         {MASTKEYS_TABLE}.plaintext_key = EXCLUDED.plaintext_key)
-                    AND ({MASTKEYS_TABLE}.plaintext_key_sha1 IS NULL OR
-                         {MASTKEYS_TABLE}.plaintext_key_sha1 = EXCLUDED.plaintext_key_sha1)
-                    AND ({MASTKEYS_TABLE}.backup_key_guid IS NULL OR
-                         {MASTKEYS_TABLE}.backup_key_guid = EXCLUDED.backup_key_guid)
-                    AND ({MASTKEYS_TABLE}.masterkey_type IS NULL OR
-                         {MASTKEYS_TABLE}.masterkey_type = EXCLUDED.masterkey_type)
+                {_MASTERKEY_UPSERT_CONFLICT}
                 """,
                 str(masterkey.guid),
                 masterkey.encrypted_key_usercred,
@@ -77,6 +82,41 @@ class PostgresMasterKeyRepository:
             # However, asyncpg's execute() doesn't reliably return row counts for ON CONFLICT
             # so we rely on service layer validation as the primary check
 
+    async def upsert_masterkeys(self, masterkeys: list[MasterKey]) -> list[UUID]:
+        """Add or update several masterkeys with a single statement.
+
+        Write-once enforcement is the same as upsert_masterkey(), but rows that would violate it are
+        skipped instead of relying on a prior service layer check.
+
+        Returns:
+            GUIDs of the masterkeys that were inserted or updated
+        """
+        # A statement can't upsert the same row twice, so keep the last entry per GUID
+        unique = list({mk.guid: mk for mk in masterkeys}.values())
+        if not unique:
+            return []
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                INSERT INTO {MASTKEYS_TABLE} (guid, encrypted_key_usercred, encrypted_key_backup,
+                                      plaintext_key, plaintext_key_sha1, backup_key_guid, masterkey_type)
+                SELECT * FROM unnest($1::text[], $2::bytea[], $3::bytea[], $4::bytea[], $5::bytea[],
+                                     $6::text[], $7::text[])
+                {_MASTERKEY_UPSERT_CONFLICT}
+                RETURNING guid
+                """,
+                [str(mk.guid) for mk in unique],
+                [mk.encrypted_key_usercred for mk in unique],
+                [mk.encrypted_key_backup for mk in unique],
+                [mk.plaintext_key for mk in unique],
+                [mk.plaintext_key_sha1 for mk in unique],
+                [str(mk.backup_key_guid) if mk.backup_key_guid else None for mk in unique],
+                [mk.masterkey_type.value for mk in unique],
+            )
+
+        return [UUID(row["guid"]) for row in rows]
+
     async def get_masterkeys(
         self,
         guid: UUID | None = None,
@@ -0,0 +1,73 @@
+"""Tests for process-pool masterkey decryption."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from uuid import uuid4
+
+import pytest
+from nemesis_dpapi.core import MasterKey, MasterKeyFile, MasterKeyType
+from nemesis_dpapi.keys import Password
+from nemesis_dpapi.manager import DpapiManager
+from nemesis_dpapi.masterkey_decryptor import MasterKeyDecryptorService
+from nemesis_dpapi.repositories import EncryptionFilter
+
+PASSWORD = "Qwerty12345"
+USER_SID = "S-1-5-21-3821320868-1508310791-3575676346-1103"
+EXPECTED_SHA1 = bytes.fromhex("17FD87F91D25A18ABD9BCD66B6D9F3C6BFC16778")
+
+
+@pytest.fixture
+def executor():
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield pool
+
+
+@pytest.mark.asyncio
+async def test_password_decrypts_matching_masterkeys_in_worker_processes(executor, get_file_path):
+    """Only masterkeys protected by the password are decrypted and written back."""
+    domain_file = MasterKeyFile.from_file(get_file_path("masterkey_domain.bin"))
+    local_file = MasterKeyFile.from_file(get_file_path("masterkey_local.bin"))
+
+    async with DpapiManager(storage_backend="memory", auto_decrypt=False) as manager:
+        await manager.upsert_masterkey(
+            MasterKey(
+                guid=domain_file.masterkey_guid,
+                masterkey_type=MasterKeyType.USER,
+                encrypted_key_usercred=domain_file.master_key,
+            )
+        )
+        await manager.upsert_masterkey(
+            MasterKey(
+                guid=local_file.masterkey_guid,
+                masterkey_type=MasterKeyType.USER,
+                encrypted_key_usercred=local_file.master_key,
+            )
+        )
+
+        service = MasterKeyDecryptorService(manager, executor=executor, batch_size=1)
+        mk_keys = service._generate_mk_encryption_keys(Password(value=PASSWORD), USER_SID)
+        await service._decrypt_masterkeys_background(mk_keys, Password)
+
+        [decrypted] = await manager.get_masterkeys(encryption_filter=EncryptionFilter.DECRYPTED_ONLY)
+        assert decrypted.guid == domain_file.masterkey_guid
+        assert decrypted.plaintext_key_sha1 == EXPECTED_SHA1
+
+        [still_encrypted] = await manager.get_masterkeys(encryption_filter=EncryptionFilter.ENCRYPTED_ONLY)
+        assert still_encrypted.guid == local_file.masterkey_guid
+
+
+@pytest.mark.asyncio
+async def test_upsert_masterkeys_skips_write_once_conflicts():
+    """Bulk upserts write what they can and report which masterkeys were written."""
+    async with DpapiManager(storage_backend="memory", auto_decrypt=False) as manager:
+        existing = MasterKey(guid=uuid4(), masterkey_type=MasterKeyType.USER, plaintext_key=b"original")
+        await manager.upsert_masterkey(existing)
+
+        conflicting = MasterKey(guid=existing.guid, masterkey_type=MasterKeyType.USER, plaintext_key=b"changed")
+        new = MasterKey(guid=uuid4(), masterkey_type=MasterKeyType.USER, plaintext_key=b"new")
+
+        written = await manager.upsert_masterkeys([conflicting, new])
+
+        assert written == [new.guid]
+        [stored] = await manager.get_masterkeys(guid=existing.guid)
+        assert stored.plaintext_key == b"original"
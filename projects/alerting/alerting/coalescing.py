@@ -0,0 +1,89 @@
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sends (title, body, tag) and returns whether the notification was delivered
+SendFunction = Callable[[str, str, str], Awaitable[bool]]
+
+
+@dataclass
+class _PendingAlert:
+    title: str
+    body: str
+    delivered: asyncio.Future[bool]
+
+
+class AlertCoalescer:
+    """Limits each Apprise tag (channel) to one notification per window, grouping bursts into digests.
+
+    The first alert for an idle tag is sent right away. Alerts arriving while the tag's window is open are
+    held and sent together as one digest when it closes, which opens the next window. A burst of hundreds
+    of findings becomes a handful of messages instead of tripping the channel's rate limits.
+    """
+
+    def __init__(self, send: SendFunction, window_seconds: float, max_digest_alerts: int):
+        """
+        Args:
+            send: Delivers one notification
+            window_seconds: Minimum time between notifications to the same tag (0 sends every alert on its own)
+            max_digest_alerts: Alerts shown in full in a digest; the rest are summarized by title
+        """
+        self._send = send
+        self.window_seconds = window_seconds
+        self.max_digest_alerts = max_digest_alerts
+        self._pending: dict[str, list[_PendingAlert]] = {}
+        self._channels: dict[str, asyncio.Task] = {}
+
+    async def submit(self, title: str, body: str, tag: str) -> bool:
+        """Queue an alert for its tag and wait until the notification carrying it was sent (or failed)."""
+        if self.window_seconds <= 0:
+            return await self._send(title, body, tag)
+
+        delivered = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(tag, []).append(_PendingAlert(title, body, delivered))
+        if tag not in self._channels:
+            self._channels[tag] = asyncio.create_task(self._run_channel(tag))
+        return await delivered
+
+    async def _run_channel(self, tag: str) -> None:
+        try:
+            while batch := self._pending.pop(tag, None):
+                title, body = self.build_message(batch)
+                try:
+                    sent = await self._send(title, body, tag)
+                except Exception:
+                    logger.exception(message="Error sending coalesced alerts", tag=tag, alerts=len(batch))
+                    sent = False
+
+                for alert in batch:
+                    if not alert.delivered.done():
+                        alert.delivered.set_result(sent)
+
+                await asyncio.sleep(self.window_seconds)
+        finally:
+            # Only reached with alerts still pending if the task was cancelled
+            for alert in self._pending.pop(tag, []):
+                if not alert.delivered.done():
+                    alert.delivered.set_result(False)
+            del self._channels[tag]
+
+    def build_message(self, batch: list[_PendingAlert]) -> tuple[str, str]:
+        """Title and body of the notification for a batch: the alert itself, or a digest of several."""
+        if len(batch) == 1:
+            return batch[0].title, batch[0].body
+
+        shown, rest = batch[: self.max_digest_alerts], batch[self.max_digest_alerts :]
+        parts = [f"*{alert.title}*\n{alert.body}" for alert in shown]
+        if rest:
+            counts = Counter(alert.title for alert in rest)
+            summary = ", ".join(f"{title} ({count})" for title, count in counts.most_common(5))
+            if len(counts) > 5:
+                summary += ", ..."
+            parts.append(f"_...and {len(rest)} more alerts: {summary}_")
+
+        return f"{len(batch)} Nemesis alerts", "\n\n".join(parts)
@@ -0,0 +1,92 @@
+import re
+from dataclasses import dataclass, field
+
+from common.logger import get_logger, sanitize_exception_message
+from common.models import Alert
+
+logger = get_logger(__name__)
+
+
+def _compile_patterns(patterns: list[str], kind: str) -> tuple[re.Pattern, ...]:
+    compiled = []
+    for pattern in patterns:
+        if not pattern:  # Skip empty patterns
+            continue
+        try:
+            compiled.append(re.compile(pattern))
+        except re.error as e:
+            logger.error(f"Invalid {kind} regex pattern", pattern=pattern, error=sanitize_exception_message(e))
+    return tuple(compiled)
+
+
+@dataclass(frozen=True)
+class AlertFilter:
+    """Alert settings with the file path regexes compiled, built once per settings change."""
+
+    alerting_enabled: bool = True
+    minimum_severity: int = 4
+    category_included: frozenset[str] = frozenset()
+    category_excluded: frozenset[str] = frozenset()
+    # Set when included regexes are configured, even if none of them compiled (then nothing matches)
+    requires_included_path: bool = False
+    file_path_included: tuple[re.Pattern, ...] = field(default=())
+    file_path_excluded: tuple[re.Pattern, ...] = field(default=())
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "AlertFilter":
+        """Build a filter from the `alert_settings` values, logging invalid regexes once."""
+        file_path_included_regexes = settings.get("file_path_included_regex") or []
+        return cls(
+            alerting_enabled=settings.get("alerting_enabled", True),
+            minimum_severity=settings.get("minimum_severity", 4),
+            category_included=frozenset(settings.get("category_included") or []),
+            category_excluded=frozenset(settings.get("category_excluded") or []),
+            requires_included_path=bool(file_path_included_regexes),
+            file_path_included=_compile_patterns(file_path_included_regexes, "included"),
+            file_path_excluded=_compile_patterns(settings.get("file_path_excluded_regex") or [], "excluded"),
+        )
+
+    def check(self, alert: Alert) -> tuple[bool, str]:
+        """
+        Determine if an alert should be filtered.
+
+        Args:
+            alert: The Alert object to check
+
+        Returns:
+            tuple: (should_filter: bool, reason: str)
+                   True if alert should be filtered (not sent), False if it should be sent
+        """
+        # Check if alerting is globally disabled
+        if not self.alerting_enabled:
+            return True, "Alerting is globally disabled"
+
+        # Check severity threshold (only if severity is present)
+        if alert.severity is not None and alert.severity < self.minimum_severity:
+            return True, f"Severity {alert.severity} below minimum threshold {self.minimum_severity}"
+
+        # Check category filters (only if category is present)
+        if alert.category:
+            # If category_included is not empty, only allow those categories
+            if self.category_included and alert.category not in self.category_included:
+                return True, f"Category '{alert.category}' not in included list"
+
+            # Then apply exclusion list
+            if alert.category in self.category_excluded:
+                return True, f"Category '{alert.category}' is in excluded list"
+
+        # Check file path regex filters (only if file_path is present)
+        if alert.file_path:
+            # If included regexes are set, file_path must match at least one
+            if self.requires_included_path and not any(
+                pattern.search(alert.file_path) for pattern in self.file_path_included
+            ):
+                return True, "File path does not match any included regex patterns"
+
+            # Then check excluded regexes - if any match, filter the alert
+            for pattern in self.file_path_excluded:
+                if pattern.search(alert.file_path):
+                    return True, f"File path matches excluded regex: {pattern.pattern}"
+
+        # Alert passes all filters
+        return False, "Alert passes all filters"
@@ -1,11 +1,15 @@
 import asyncio
+import functools
 import os
 import re
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
 
 import aiohttp
 import apprise
 import common.helpers as helpers
+from alerting.coalescing import AlertCoalescer
+from alerting.filters import AlertFilter
 from common.health_contract import (
     build_health_response,
     dependency_degraded,
@@ -42,6 +46,8 @@ alert_settings = {
     "file_path_included_regex": [],
     "llm_triage_values_to_alert": ["true_positive"],
 }
+# Filters compiled from alert_settings, rebuilt whenever they change
+alert_filter = AlertFilter.from_settings(alert_settings)
 
 # LLM configuration
 llm_enabled = False
@@ -52,6 +58,11 @@ MAX_CONCURRENT_ALERTS = int(os.getenv("MAX_CONCURRENT_ALERTS", "10"))
 MAX_ALERT_RETRIES = int(os.getenv("MAX_ALERT_RETRIES", "5"))
 RETRY_DELAY_SECONDS = int(os.getenv("RETRY_DELAY_SECONDS", "30"))
 
+# Minimum seconds between notifications to the same tag; alerts arriving in between are sent as one digest
+ALERT_COALESCE_WINDOW_SECONDS = float(os.getenv("ALERT_COALESCE_WINDOW_SECONDS", "10"))
+# Alerts shown in full in a digest, the rest are summarized by title
+ALERT_DIGEST_MAX_ALERTS = int(os.getenv("ALERT_DIGEST_MAX_ALERTS", "20"))
+
 # Create a semaphore to limit concurrent alert processing
 alert_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ALERTS)
 
@@ -118,10 +129,26 @@ async def check_llm_enabled():
     return False
 
 
+def apply_alert_settings(settings: dict):
+    """Update the global alert settings from an alert_settings row and recompile the alert filter."""
+    global alert_filter
+
+    alert_settings.update(
+        {
+            "alerting_enabled": settings.get("alerting_enabled", True),
+            "minimum_severity": settings.get("minimum_severity", 4),
+            "category_excluded": settings.get("category_excluded", []),
+            "category_included": settings.get("category_included", []),
+            "file_path_excluded_regex": settings.get("file_path_excluded_regex", []),
+            "file_path_included_regex": settings.get("file_path_included_regex", []),
+            "llm_triage_values_to_alert": settings.get("llm_triage_values_to_alert", ["true_positive"]),
+        }
+    )
+    alert_filter = AlertFilter.from_settings(alert_settings)
+
+
 async def load_alert_settings():
     """Load alert settings from database, creating defaults if none exist."""
-    global alert_settings
-
     QUERY_SETTINGS = gql("""
         query GetAlertSettings {
             alert_settings(limit: 1) {
@@ -176,18 +203,7 @@ async def load_alert_settings():
                 settings_list = result.get("alert_settings", [])
 
             if settings_list:
-                settings = settings_list[0]
-                alert_settings.update(
-                    {
-                        "alerting_enabled": settings.get("alerting_enabled", True),
-                        "minimum_severity": settings.get("minimum_severity", 4),
-                        "category_excluded": settings.get("category_excluded", []),
-                        "category_included": settings.get("category_included", []),
-                        "file_path_excluded_regex": settings.get("file_path_excluded_regex", []),
-                        "file_path_included_regex": settings.get("file_path_included_regex", []),
-                        "llm_triage_values_to_alert": settings.get("llm_triage_values_to_alert", ["true_positive"]),
-                    }
-                )
+                apply_alert_settings(settings_list[0])
                 logger.info("Alert settings loaded", settings=alert_settings)
             else:
                 logger.warning("Failed to load alert settings, using defaults")
@@ -243,6 +259,11 @@ async def lifespan(app: FastAPI):
             logger.info("Started findings triage subscription handler")
 
         logger.info("Alert rate limiter configured", max_concurrent_alerts=MAX_CONCURRENT_ALERTS)
+        logger.info(
+            "Alert coalescing configured",
+            window_seconds=ALERT_COALESCE_WINDOW_SECONDS,
+            max_digest_alerts=ALERT_DIGEST_MAX_ALERTS,
+        )
         logger.info(
             "Alert retry policy configured",
             max_alert_retries=MAX_ALERT_RETRIES,
@@ -269,8 +290,6 @@ class TestAlert(BaseModel):
 
 async def handle_alert_settings_subscription():
     """Sets up and handles subscription to alert_settings table in Hasura"""
-    global alert_settings
-
     SUBSCRIPTION = gql("""
         subscription AlertSettings {
             alert_settings {
@@ -304,18 +323,7 @@ async def handle_alert_settings_subscription():
                     if not settings_list:
                         continue
 
-                    settings = settings_list[0]
-                    alert_settings.update(
-                        {
-                            "alerting_enabled": settings.get("alerting_enabled", True),
-                            "minimum_severity": settings.get("minimum_severity", 4),
-                            "category_excluded": settings.get("category_excluded", []),
-                            "category_included": settings.get("category_included", []),
-                            "file_path_excluded_regex": settings.get("file_path_excluded_regex", []),
-                            "file_path_included_regex": settings.get("file_path_included_regex", []),
-                            "llm_triage_values_to_alert": settings.get("llm_triage_values_to_alert", ["true_positive"]),
-                        }
-                    )
+                    apply_alert_settings(settings_list[0])
                     logger.info("Alert settings updated", settings=alert_settings)
 
         except Exception:
@@ -350,6 +358,22 @@ async def handle_feedback_subscription():
         }
     """)
 
+    # Feedback whose alert is still being sent, so repeated subscription results don't send it twice
+    pending_feedback: set[str] = set()
+
+    async def record_feedback_alert(session, object_id: str, result: str) -> None:
+        try:
+            if result == "sent":
+                # Mark alert as sent in database
+                try:
+                    await session.execute(UPDATE_ALERT_SENT, variable_values={"object_id": object_id})
+                except Exception as e:
+                    logger.error("Failed to update alert_sent status", error=sanitize_exception_message(e))
+            elif result == "failed":
+                logger.error("Failed to send feedback notification through Apprise after retries")
+        finally:
+            pending_feedback.discard(object_id)
+
     while True:
         try:
             transport = WebsocketsTransport(
@@ -364,51 +388,41 @@ async def handle_feedback_subscription():
                     if result is None:
                         continue
 
-                    feedback_list = result.get("files_feedback", [])
-                    if not feedback_list:
-                        continue
-
-                    feedback = feedback_list[0]
-
-                    # Construct markdown message
-                    message_parts = []
-                    object_id = feedback["object_id"]
-                    nemesis_file_url = f"{nemesis_url}files/{object_id}"
-                    message_parts.append(f"*object_id:* <{nemesis_file_url}|{object_id}>")
-                    message_parts.append(f"*user*: {feedback['username']}")
+                    for feedback in result.get("files_feedback", []):
+                        if feedback["object_id"] in pending_feedback:
+                            continue
+                        pending_feedback.add(feedback["object_id"])
+                        send_feedback_alert(feedback, functools.partial(record_feedback_alert, session))
 
-                    if feedback.get("missing_parser"):
-                        message_parts.append("- 📄 Missing parser")
-                    if feedback.get("missing_file_viewer"):
-                        message_parts.append("- 👁️ Missing file viewer")
-                    if feedback.get("sensitive_info_not_detected"):
-                        message_parts.append("- 🔒 Sensitive information not detected")
+        except Exception:
+            logger.exception(message="Error in feedback subscription, reconnecting in 5 seconds...")
+            await asyncio.sleep(5)
 
-                    # Join all parts with newlines
-                    body = "\n".join(message_parts)
 
-                    logger.info(f"Nemesis feedback: {body}")
+def send_feedback_alert(feedback: dict, on_result: Callable[[str, str], Awaitable[None]]) -> asyncio.Task:
+    """Send the alert for a files_feedback row in the background, then await `on_result(object_id, result)`."""
+    # Construct markdown message
+    message_parts = []
+    object_id = feedback["object_id"]
+    nemesis_file_url = f"{nemesis_url}files/{object_id}"
+    message_parts.append(f"*object_id:* <{nemesis_file_url}|{object_id}>")
+    message_parts.append(f"*user*: {feedback['username']}")
 
-                    # Create an Alert object and process it through the rate-limited handler
-                    alert = Alert(title="Nemesis Feedback", body=body, tag="feedback", service="feedback")
+    if feedback.get("missing_parser"):
+        message_parts.append("- 📄 Missing parser")
+    if feedback.get("missing_file_viewer"):
+        message_parts.append("- 👁️ Missing file viewer")
+    if feedback.get("sensitive_info_not_detected"):
+        message_parts.append("- 🔒 Sensitive information not detected")
 
-                    # Use the send_alert function but handle the result specifically for feedback
-                    result = await send_alert_with_retries(alert)
+    # Join all parts with newlines
+    body = "\n".join(message_parts)
 
-                    if result == "sent":
-                        # Mark alert as sent in database
-                        try:
-                            await session.execute(
-                                UPDATE_ALERT_SENT, variable_values={"object_id": feedback["object_id"]}
-                            )
-                        except Exception as e:
-                            logger.error("Failed to update alert_sent status", error=sanitize_exception_message(e))
-                    elif result == "failed":
-                        logger.error("Failed to send feedback notification through Apprise after retries")
+    logger.info(f"Nemesis feedback: {body}")
 
-        except Exception:
-            logger.exception(message="Error in feedback subscription, reconnecting in 5 seconds...")
-            await asyncio.sleep(5)
+    # Create an Alert object and process it through the rate-limited handler
+    alert = Alert(title="Nemesis Feedback", body=body, tag="feedback", service="feedback")
+    return send_alert_in_background(alert, functools.partial(on_result, object_id))
 
 
 async def handle_findings_triage_subscription():
@@ -540,8 +554,9 @@ async def handle_findings_triage_subscription():
                             severity=severity,
                         )
 
-                        # Send alert through normal filtering and rate limiting
-                        await send_alert_with_retries(alert)
+                        # Send alert through normal filtering and rate limiting, without waiting for the
+                        #   coalescing window so the rest of the burst can join the same digest
+                        send_alert_in_background(alert)
 
                         # Mark as processed
                         processed_triage_ids.add(triage_id)
@@ -600,79 +615,54 @@ def should_filter_alert(alert: Alert) -> tuple[bool, str]:
         tuple: (should_filter: bool, reason: str)
                True if alert should be filtered (not sent), False if it should be sent
     """
-    global alert_settings
+    return alert_filter.check(alert)
 
-    # Check if alerting is globally disabled
-    if not alert_settings.get("alerting_enabled", True):
-        return True, "Alerting is globally disabled"
-
-    # Check severity threshold (only if severity is present)
-    if alert.severity is not None:
-        min_severity = alert_settings.get("minimum_severity", 4)
-        if alert.severity < min_severity:
-            return True, f"Severity {alert.severity} below minimum threshold {min_severity}"
-
-    # Check category filters (only if category is present)
-    if alert.category:
-        category_included = alert_settings.get("category_included", [])
-        category_excluded = alert_settings.get("category_excluded", [])
-
-        # If category_included is not empty, only allow those categories
-        if category_included and alert.category not in category_included:
-            return True, f"Category '{alert.category}' not in included list"
-
-        # Then apply exclusion list
-        if alert.category in category_excluded:
-            return True, f"Category '{alert.category}' is in excluded list"
-
-    # Check file path regex filters (only if file_path is present)
-    if alert.file_path:
-        file_path_excluded_regexes = alert_settings.get("file_path_excluded_regex", [])
-        file_path_included_regexes = alert_settings.get("file_path_included_regex", [])
-
-        # If included regexes are set, file_path must match at least one
-        if file_path_included_regexes:
-            matched_any = False
-            for pattern in file_path_included_regexes:
-                logger.warning(f"file_path: {alert.file_path}, regex: {pattern}")
-                if not pattern:  # Skip empty patterns
-                    continue
-                try:
-                    if re.search(pattern, alert.file_path):
-                        matched_any = True
-                        break
-                except re.error as e:
-                    logger.error(
-                        "Invalid included regex pattern",
-                        pattern=pattern,
-                        error=sanitize_exception_message(e),
-                    )
-
-            if not matched_any:
-                return True, "File path does not match any included regex patterns"
-
-        # Then check excluded regexes - if any match, filter the alert
-        if file_path_excluded_regexes:
-            for pattern in file_path_excluded_regexes:
-                if not pattern:  # Skip empty patterns
-                    continue
-                try:
-                    if re.search(pattern, alert.file_path):
-                        return True, f"File path matches excluded regex: {pattern}"
-                except re.error as e:
-                    logger.error(
-                        "Invalid excluded regex pattern",
-                        pattern=pattern,
-                        error=sanitize_exception_message(e),
-                    )
 
-    # Alert passes all filters
-    return False, "Alert passes all filters"
+async def notify_with_retries(title: str, body: str, tag: str) -> bool:
+    """
+    Send one notification through Apprise with retry logic, respecting the semaphore limit.
+
+    Returns:
+        bool: True if the notification was sent, False if delivery failed after all retries
+    """
+    kwargs = {"body": body, "title": title, "notify_type": apprise.NotifyType.WARNING, "tag": tag}
+
+    # Acquire semaphore to limit concurrent alerts
+    async with alert_semaphore:
+        retry_count = 0
+        while retry_count < MAX_ALERT_RETRIES:
+            try:
+                success = await apobj.async_notify(**kwargs)
+                if success:
+                    logger.info(f"Alert sent successfully: {title}")
+                    return True
+
+                retry_count += 1
+                logger.warning(f"Failed to send alert, retrying ({retry_count}/{MAX_ALERT_RETRIES})", title=title)
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+            except Exception as e:
+                retry_count += 1
+                logger.error(
+                    "Error sending alert, retrying",
+                    retry_count=retry_count,
+                    max_retries=MAX_ALERT_RETRIES,
+                    error=sanitize_exception_message(e),
+                    title=title,
+                )
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+    logger.error(f"Failed to send alert after {MAX_ALERT_RETRIES} retries", title=title)
+    return False
+
+
+alert_coalescer = AlertCoalescer(
+    notify_with_retries, window_seconds=ALERT_COALESCE_WINDOW_SECONDS, max_digest_alerts=ALERT_DIGEST_MAX_ALERTS
+)
 
 
 async def send_alert_with_retries(alert) -> str:
     """
-    Send an alert with retry logic, respecting the semaphore limit.
+    Send an alert with retry logic, coalesced with other alerts sent to the same tag.
 
     Args:
         alert: The Alert object to send
@@ -697,39 +687,35 @@ async def send_alert_with_retries(alert) -> str:
     if alert.service:
         title = f"[{alert.service}] {alert.title}"
 
-    kwargs = {"body": alert.body, "title": title, "notify_type": apprise.NotifyType.WARNING}
+    sent = await alert_coalescer.submit(title, alert.body, alert.tag or "default")
+    return "sent" if sent else "failed"
 
-    if alert.tag:
-        kwargs["tag"] = alert.tag
-    else:
-        kwargs["tag"] = "default"
 
-    # Acquire semaphore to limit concurrent alerts
-    async with alert_semaphore:
-        retry_count = 0
-        while retry_count < MAX_ALERT_RETRIES:
-            try:
-                success = await apobj.async_notify(**kwargs)
-                if success:
-                    logger.info(f"Alert sent successfully: {title}")
-                    return "sent"
+# Alerts handed off by the Hasura subscription loops, referenced until they finish
+_background_alerts: set[asyncio.Task] = set()
 
-                retry_count += 1
-                logger.warning(f"Failed to send alert, retrying ({retry_count}/{MAX_ALERT_RETRIES})", title=title)
-                await asyncio.sleep(RETRY_DELAY_SECONDS)
-            except Exception as e:
-                retry_count += 1
-                logger.error(
-                    "Error sending alert, retrying",
-                    retry_count=retry_count,
-                    max_retries=MAX_ALERT_RETRIES,
-                    error=sanitize_exception_message(e),
-                    title=title,
-                )
-                await asyncio.sleep(RETRY_DELAY_SECONDS)
 
-    logger.error(f"Failed to send alert after {MAX_ALERT_RETRIES} retries", title=title)
-    return "failed"
+def send_alert_in_background(alert: Alert, on_result: Callable[[str], Awaitable[None]] | None = None) -> asyncio.Task:
+    """Send an alert without blocking the caller, then await `on_result` with the outcome.
+
+    The subscription loops hand alerts off this way so a burst reaches the coalescer together and is
+    grouped into digests, instead of each alert waiting out the window opened by the one before it.
+    """
+
+    async def send() -> str:
+        try:
+            result = await send_alert_with_retries(alert)
+        except Exception:
+            logger.exception(message="Error sending alert", alert_title=alert.title)
+            result = "failed"
+        if on_result is not None:
+            await on_result(result)
+        return result
+
+    task = asyncio.create_task(send())
+    _background_alerts.add(task)
+    task.add_done_callback(_background_alerts.discard)
+    return task
 
 
 @dapr_app.subscribe(pubsub=ALERTING_PUBSUB, topic=ALERTING_NEW_ALERT_TOPIC)
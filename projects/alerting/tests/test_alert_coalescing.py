@@ -0,0 +1,72 @@
+"""Tests for coalescing alerts per tag into digests."""
+
+import asyncio
+
+import pytest
+from alerting.coalescing import AlertCoalescer
+
+
+class FakeSender:
+    def __init__(self, result: bool = True):
+        self.result = result
+        self.sent: list[tuple[str, str, str]] = []
+
+    async def __call__(self, title: str, body: str, tag: str) -> bool:
+        self.sent.append((title, body, tag))
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_burst_is_sent_as_one_digest_per_tag():
+    sender = FakeSender()
+    coalescer = AlertCoalescer(sender, window_seconds=0.05, max_digest_alerts=20)
+
+    results = await asyncio.gather(
+        *(coalescer.submit(f"Finding {i}", f"body {i}", "default") for i in range(3)),
+        coalescer.submit("Feedback", "feedback body", "feedback"),
+    )
+
+    assert all(results)
+    assert sender.sent == [
+        ("3 Nemesis alerts", "*Finding 0*\nbody 0\n\n*Finding 1*\nbody 1\n\n*Finding 2*\nbody 2", "default"),
+        ("Feedback", "feedback body", "feedback"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_alerts_during_the_window_wait_for_it_to_close():
+    sender = FakeSender()
+    coalescer = AlertCoalescer(sender, window_seconds=0.05, max_digest_alerts=20)
+
+    assert await coalescer.submit("First", "body", "default")
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await coalescer.submit("Second", "body", "default")
+
+    assert loop.time() - started >= 0.04
+    assert [title for title, _, _ in sender.sent] == ["First", "Second"]
+
+
+@pytest.mark.asyncio
+async def test_large_digest_summarizes_alerts_past_the_limit():
+    sender = FakeSender()
+    coalescer = AlertCoalescer(sender, window_seconds=0.05, max_digest_alerts=2)
+
+    first = asyncio.create_task(coalescer.submit("First", "body", "default"))
+    await asyncio.sleep(0)
+    titles = ["Credential", "Credential", "Hash", "Credential", "Hash", "Yara"]
+    await asyncio.gather(first, *(coalescer.submit(title, "body", "default") for title in titles))
+
+    assert len(sender.sent) == 2
+    title, body, _ = sender.sent[1]
+    assert title == "6 Nemesis alerts"
+    assert body.endswith("_...and 4 more alerts: Hash (2), Credential (1), Yara (1)_")
+
+
+@pytest.mark.asyncio
+async def test_failed_digest_fails_every_alert_in_it():
+    coalescer = AlertCoalescer(FakeSender(result=False), window_seconds=0.05, max_digest_alerts=20)
+
+    results = await asyncio.gather(*(coalescer.submit("Finding", "body", "default") for _ in range(3)))
+
+    assert results == [False, False, False]
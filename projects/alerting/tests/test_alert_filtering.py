@@ -1,8 +1,10 @@
 """Tests for alert filtering vs delivery failure distinction."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from alerting.coalescing import AlertCoalescer
 from common.models import Alert
 
 # Mock DaprClient before importing alerting.main (it runs DaprClient at module level)
@@ -21,15 +23,27 @@ with patch("dapr.clients.DaprClient", return_value=_mock_dapr):
 def _reset_alerting_state():
     """Reset global state for each test."""
     alerting_main.is_initialized = True
-    alerting_main.alert_settings = {
-        "alerting_enabled": True,
-        "minimum_severity": 4,
-        "category_excluded": [],
-        "category_included": [],
-        "file_path_excluded_regex": [],
-        "file_path_included_regex": [],
-        "llm_triage_values_to_alert": ["true_positive"],
-    }
+    alerting_main.alert_settings = {}
+    apply_settings()
+    # Send every alert on its own so each test sees its own delivery
+    alerting_main.alert_coalescer = AlertCoalescer(
+        alerting_main.notify_with_retries, window_seconds=0, max_digest_alerts=20
+    )
+
+
+def apply_settings(**overrides):
+    alerting_main.apply_alert_settings(
+        {
+            "alerting_enabled": True,
+            "minimum_severity": 4,
+            "category_excluded": [],
+            "category_included": [],
+            "file_path_excluded_regex": [],
+            "file_path_included_regex": [],
+            "llm_triage_values_to_alert": ["true_positive"],
+            **overrides,
+        }
+    )
 
 
 @pytest.fixture
@@ -59,14 +73,14 @@ class TestSendAlertWithRetries:
     @pytest.mark.asyncio
     async def test_disabled_alerting_returns_filtered(self, high_severity_alert):
         """Alert when alerting is globally disabled should return 'filtered'."""
-        alerting_main.alert_settings["alerting_enabled"] = False
+        apply_settings(alerting_enabled=False)
         result = await alerting_main.send_alert_with_retries(high_severity_alert)
         assert result == "filtered"
 
     @pytest.mark.asyncio
     async def test_excluded_category_returns_filtered(self):
         """Alert with excluded category should return 'filtered'."""
-        alerting_main.alert_settings["category_excluded"] = ["yara_match"]
+        apply_settings(category_excluded=["yara_match"])
         alert = Alert(title="Excluded", body="test", category="yara_match", severity=5)
         result = await alerting_main.send_alert_with_retries(alert)
         assert result == "filtered"
@@ -108,6 +122,49 @@ class TestSendAlertWithRetries:
         assert result == "sent"
 
 
+class TestSendAlertInBackground:
+    """Tests for handing alerts off from the subscription loops."""
+
+    @pytest.mark.asyncio
+    async def test_alerts_handed_off_one_at_a_time_are_coalesced(self):
+        """Alerts fed in one by one, as the subscription loops do, share a digest instead of queueing."""
+        alerting_main.alert_coalescer = AlertCoalescer(
+            alerting_main.notify_with_retries, window_seconds=0.05, max_digest_alerts=20
+        )
+        results = []
+
+        async def on_result(result: str) -> None:
+            results.append(result)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with patch.object(alerting_main.apobj, "async_notify", new_callable=AsyncMock, return_value=True) as notify:
+            tasks = []
+            for i in range(4):
+                alert = Alert(title=f"Finding {i}", body="test", severity=5)
+                tasks.append(alerting_main.send_alert_in_background(alert, on_result))
+                await asyncio.sleep(0)  # the loop moves on to its next result
+            await asyncio.gather(*tasks)
+
+        assert results == ["sent"] * 4
+        assert [call.kwargs["title"] for call in notify.await_args_list] == ["Finding 0", "3 Nemesis alerts"]
+        assert loop.time() - started < 0.1  # one window, not one per alert
+
+    @pytest.mark.asyncio
+    async def test_feedback_result_is_reported_with_its_object_id(self):
+        """The feedback loop learns which feedback row was sent so it can set alert_sent."""
+        reported = []
+
+        async def on_result(object_id: str, result: str) -> None:
+            reported.append((object_id, result))
+
+        feedback = {"object_id": "obj-1", "username": "analyst", "missing_parser": True}
+        with patch.object(alerting_main.apobj, "async_notify", new_callable=AsyncMock, return_value=True):
+            await alerting_main.send_feedback_alert(feedback, on_result)
+
+        assert reported == [("obj-1", "sent")]
+
+
 class TestShouldFilterAlert:
     """Tests for the should_filter_alert function."""
 
@@ -121,14 +178,37 @@ class TestShouldFilterAlert:
         assert should_filter is False
 
     def test_alerting_disabled(self, high_severity_alert):
-        alerting_main.alert_settings["alerting_enabled"] = False
+        apply_settings(alerting_enabled=False)
         should_filter, reason = alerting_main.should_filter_alert(high_severity_alert)
         assert should_filter is True
         assert "globally disabled" in reason
 
     def test_file_path_excluded_regex(self):
-        alerting_main.alert_settings["file_path_excluded_regex"] = [r".*\.tmp$"]
+        apply_settings(file_path_excluded_regex=[r".*\.tmp$"])
         alert = Alert(title="test", body="test", severity=5, file_path="/data/foo.tmp")
         should_filter, reason = alerting_main.should_filter_alert(alert)
         assert should_filter is True
         assert "excluded regex" in reason
+
+    def test_file_path_included_regex(self):
+        apply_settings(file_path_included_regex=["", r"^/data/"])
+        should_filter, _ = alerting_main.should_filter_alert(
+            Alert(title="test", body="test", severity=5, file_path="/data/foo.txt")
+        )
+        assert should_filter is False
+
+        should_filter, reason = alerting_main.should_filter_alert(
+            Alert(title="test", body="test", severity=5, file_path="/tmp/foo.txt")
+        )
+        assert should_filter is True
+        assert "does not match any included regex" in reason
+
+    def test_only_invalid_included_regexes_filter_everything(self):
+        apply_settings(file_path_included_regex=["(unclosed"])
+        alert = Alert(title="test", body="test", severity=5, file_path="/data/foo.txt")
+        should_filter, _ = alerting_main.should_filter_alert(alert)
+        assert should_filter is True
+
+    def test_settings_are_compiled_when_applied(self):
+        apply_settings(file_path_excluded_regex=[r"\.log$", "[invalid"])
+        assert [pattern.pattern for pattern in alerting_main.alert_filter.file_path_excluded] == [r"\.log$"]
@@ -1,7 +1,10 @@
 """Text extraction activities."""
 
 import asyncio
+import heapq
+import mmap
 import os
+import re
 import tempfile
 
 import document_conversion.global_vars as global_vars
@@ -14,12 +17,22 @@ from dapr.ext.workflow.workflow_activity_context import WorkflowActivityContext
 
 logger = get_logger(__name__)
 
+strings_include_offsets = os.getenv("STRINGS_INCLUDE_OFFSETS", "false").lower() == "true"
+
 storage = StorageS3()
 
+# Bytes of the file scanned per step; strings are cut only if a run of printable bytes exceeds half of this
+STRINGS_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Byte classes matched by the string patterns: printable ASCII and tab ("A"), NUL ("Z"), and anything else (".")
+_BYTE_CLASSES = bytes(
+    ord("A") if byte == 0x09 or 0x20 <= byte <= 0x7E else ord("Z") if byte == 0 else ord(".") for byte in range(256)
+)
+
 
 @workflow_activity
 async def extract_strings(ctx: WorkflowActivityContext, file_input: dict) -> dict | None:
-    """Runs "strings" on a binary to extract strings."""
+    """Extracts ASCII and UTF-16 strings from a binary."""
 
     assert global_vars.tracking_service is not None, "tracking_service must be initialized"
 
@@ -36,8 +49,8 @@ async def extract_strings(ctx: WorkflowActivityContext, file_input: dict) -> dic
             with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", delete=False) as tmp_file:
                 tmp_file_path = tmp_file.name
 
-                # Stream strings directly to temp file with filtering
-                await extract_all_strings(temp_file.name, tmp_file, min_len=5)
+                # Stream strings directly to temp file
+                await extract_all_strings(temp_file.name, tmp_file, min_len=5, include_offsets=strings_include_offsets)
 
                 if os.path.getsize(tmp_file_path) == 0:
                     logger.info("Temporary strings file is empty", object_id=file_enriched.object_id)
@@ -84,44 +97,61 @@ async def extract_strings(ctx: WorkflowActivityContext, file_input: dict) -> dic
         raise
 
 
-async def extract_all_strings(filename: str, output_file, min_len: int = 5):
+async def extract_all_strings(filename: str, output_file, min_len: int = 5, include_offsets: bool = False):
     """
     Extracts all single-byte ASCII strings and UTF-16 (both LE and BE) strings
-    from a file using the `strings` utility, streaming filtered results directly
-    to the output file.
+    from a file in a single pass, streaming them directly to the output file.
 
     Args:
         filename: Path to the file to extract strings from
-        output_file: File handle to write filtered strings to
+        output_file: File handle to write strings to
         min_len: Minimum string length to extract (default: 5)
+        include_offsets: Prefix each string with its hex file offset
     """
-    commands = [
-        ["strings", "-a", "-n", str(min_len), filename],  # ASCII
-        ["strings", "-a", "-n", str(min_len), "-e", "l", filename],  # UTF-16 LE
-        ["strings", "-a", "-n", str(min_len), "-e", "b", filename],  # UTF-16 BE
-    ]
+    await asyncio.to_thread(_scan_strings, filename, output_file, min_len, include_offsets)
 
-    for cmd in commands:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            limit=1024 * 1024 * 10,  # 10MB buffer
-        )
-
-        # Stream output line by line and filter as we go
-        assert process.stdout is not None, "stdout must not be None when PIPE is used"
-        while True:
-            line = await process.stdout.readline()
-            if not line:
-                break
 
-            # Decode and strip the line
-            line_str = line.decode("utf-8").rstrip("\n\r")
-
-            # Filter out null/empty strings
-            if line_str and line_str.strip():
-                output_file.write(line_str + "\n")
+def _scan_strings(filename: str, output_file, min_len: int, include_offsets: bool) -> None:
+    """Scans an mmap of the file chunk by chunk, writing strings in file offset order."""
+    patterns = [
+        (re.compile(b"A" * min_len + b"A*"), "ascii"),
+        (re.compile(b"AZ" * min_len + b"(?:AZ)*"), "utf-16-le"),
+        (re.compile(b"ZA" * min_len + b"(?:ZA)*"), "utf-16-be"),
+    ]
 
-        # Wait for the process to complete
-        await process.wait()
+    with open(filename, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+            pos = 0
+            while pos < size:
+                data = mm[pos : pos + STRINGS_CHUNK_SIZE]
+                classes = data.translate(_BYTE_CLASSES)
+
+                cut = len(data)
+                if pos + cut < size:
+                    # Stop after the last byte no string can span (any other byte, or between two NULs) so
+                    # strings running into the next chunk are scanned whole. A run longer than half a chunk
+                    # without such a byte is split instead of rescanned.
+                    boundary = max(classes.rfind(b"."), classes.rfind(b"ZZ")) + 1
+                    if boundary > cut // 2:
+                        cut = boundary
+
+                matches = heapq.merge(*(_find_runs(pattern, encoding, classes, cut) for pattern, encoding in patterns))
+                lines = []
+                for start, end, encoding in matches:
+                    text = data[start:end].decode(encoding)
+                    if not text.strip():
+                        continue
+                    lines.append(f"{pos + start:x} {text}\n" if include_offsets else f"{text}\n")
+                output_file.write("".join(lines))
+
+                pos += cut
+
+
+def _find_runs(pattern: re.Pattern, encoding: str, classes: bytes, end: int):
+    for match in pattern.finditer(classes, 0, end):
+        yield match.start(), match.end(), encoding
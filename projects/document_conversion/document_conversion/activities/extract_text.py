@@ -3,7 +3,10 @@
 import asyncio
 import os
 import tempfile
+import threading
+from collections.abc import Callable
 from types import SimpleNamespace
+from typing import Any
 
 import document_conversion.global_vars as global_vars
 import jpype
@@ -14,20 +17,160 @@ from common.state_helpers import get_file_enriched_async
 from common.storage import StorageS3
 from common.workflows.setup import workflow_activity
 from dapr.ext.workflow.workflow_activity_context import WorkflowActivityContext
+from document_conversion.transform_cache import find_identical_content_transform
 
 logger = get_logger(__name__)
 
 storage = StorageS3()
 java = SimpleNamespace()  # Java types namespace - initialized in init_jvm
-tika_instance: jpype.JClass | None = None  # Initialized by init_tika()
+tika_pool: "TikaPool | None" = None  # Initialized by init_tika()
+
+# Number of Tika parsers; documents beyond this wait for a free parser instead of piling onto the JVM
+tika_pool_size = int(os.getenv("TIKA_POOL_SIZE", "2"))
+# Seconds a single document may spend in Tika before its parse is abandoned
+tika_timeout_seconds = float(os.getenv("TIKA_TIMEOUT_SECONDS", "300"))
+# Files larger than this are not sent to Tika
+tika_max_file_size = int(os.getenv("TIKA_MAX_FILE_SIZE", str(500 * 1024 * 1024)))
+# Extracted text is truncated after this many characters
+tika_max_text_chars = int(os.getenv("TIKA_MAX_TEXT_CHARS", str(100 * 1024 * 1024)))
+
+# Characters copied from Tika per read
+TEXT_READ_CHUNK = 1024 * 1024
+
+
+class TikaPool:
+    """A fixed number of Tika parsers, each parsing one document at a time."""
+
+    def __init__(self, create_parser: Callable[[], Any], size: int):
+        self._create_parser = create_parser
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(create_parser())
+
+    async def extract_to_file(self, path: str, output_file, timeout: float, max_chars: int) -> tuple[int, bool]:
+        """Parse the file at `path`, streaming its text to `output_file`.
+
+        Tika parses in a background Java thread and hands the text over through a reader, so the text is
+        never held as a single Java string. `timeout` covers the whole parse, including the wait for Tika's
+        first output. A parse that runs over is abandoned: its reader is closed from a separate thread (closing
+        can block behind a hung read), nothing more is written to `output_file`, and its parser is replaced
+        rather than reused, since its Java parse may still be running.
+
+        Returns:
+            (characters written, whether the text was truncated at `max_chars`)
+
+        Raises:
+            TimeoutError: If the document took longer than `timeout` seconds
+        """
+        parser = await self._idle.get()
+        parse = _TikaParse(parser, path, output_file, max_chars)
+        task = parse.start(asyncio.get_running_loop())
+        try:
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+        except asyncio.CancelledError:
+            self._abandon(parse, task)
+            raise
+
+        if task not in done:
+            self._abandon(parse, task)
+            raise TimeoutError(f"Tika extraction exceeded {timeout:g}s")
+
+        self._idle.put_nowait(parser)
+        return task.result()
+
+    def _abandon(self, parse: "_TikaParse", task: asyncio.Future) -> None:
+        # The abandoned parse ends with an error (or never); nobody is waiting for it anymore
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        threading.Thread(target=parse.abandon, name="tika-abandon", daemon=True).start()
+
+        replacement = asyncio.get_running_loop().run_in_executor(None, self._create_parser)
+        replacement.add_done_callback(self._add_replacement)
+
+    def _add_replacement(self, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception():
+            logger.error("Failed to create a replacement Tika parser, the pool is one parser smaller")
+            return
+        self._idle.put_nowait(future.result())
+
+
+class _TikaParse:
+    """One document's parse, run on a worker thread. `abandon` stops it from another thread."""
+
+    def __init__(self, parser, path: str, output_file, max_chars: int):
+        self.parser = parser
+        self.path = path
+        self.output_file = output_file
+        self.max_chars = max_chars
+        self._abandoned = threading.Event()
+        self._lock = threading.Lock()
+        self._reader = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> asyncio.Future[tuple[int, bool]]:
+        """Run the parse on its own daemon thread, so a hung parse neither holds an executor worker nor
+        keeps the process from exiting."""
+        future = loop.create_future()
+
+        def run_thread():
+            result, exception = None, None
+            try:
+                result = self.run()
+            except BaseException as e:
+                exception = e
+            try:
+                loop.call_soon_threadsafe(_set_future, future, result, exception)
+            except RuntimeError:
+                pass  # The loop closed while an abandoned parse was still running
+
+        threading.Thread(target=run_thread, name="tika-parse", daemon=True).start()
+        return future
+
+    def run(self) -> tuple[int, bool]:
+        reader = self.parser.parse(java.File(self.path))
+        with self._lock:
+            self._reader = reader
+        try:
+            return _copy_text(reader, self.output_file, self.max_chars, self._abandoned)
+        finally:
+            reader.close()
+
+    def abandon(self) -> None:
+        with self._lock:
+            self._abandoned.set()
+            reader = self._reader
+        # A parse still inside parse() closes its reader itself once it returns
+        if reader is not None:
+            reader.close()
+
+
+def _set_future(future: asyncio.Future, result, exception: BaseException | None) -> None:
+    # The loop may have moved on (or the future been cancelled) while an abandoned parse ran
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+def _copy_text(reader, output_file, max_chars: int, abandoned: threading.Event) -> tuple[int, bool]:
+    buffer = jpype.JArray(jpype.JChar)(TEXT_READ_CHUNK)
+    written = 0
+    while written < max_chars:
+        count = reader.read(buffer, 0, min(TEXT_READ_CHUNK, max_chars - written))
+        # Checked after every read so an abandoned parse never writes to a file its caller has moved on from
+        if abandoned.is_set():
+            raise TimeoutError("Tika extraction was abandoned")
+        if count < 0:
+            return written, False
+        output_file.write(str(java.String(buffer, 0, count)))
+        written += count
+    return written, True
 
 
 @workflow_activity
 async def extract_text(ctx: WorkflowActivityContext, file_input: dict) -> dict | None:
     """Extract text using Tika."""
-    global tika_instance
-
-    if not tika_instance:
+    if not tika_pool:
         raise ValueError("Tika is not initialized")
 
     object_id = file_input.get("object_id")
@@ -41,52 +184,76 @@ async def extract_text(ctx: WorkflowActivityContext, file_input: dict) -> dict |
         if not can_extract_plaintext(file_enriched.mime_type):
             return None
 
-        with storage.download(file_enriched.object_id) as temp_file:
-            extracted_text: str | None = None
-            try:
-                java_file = java.File(temp_file.name)
-                java_text = await asyncio.to_thread(tika_instance.parseToString, java_file)
-                extracted_text = str(java_text)
-
-            except Exception as e:
-                logger.warning(
-                    "Tika extraction failed",
-                    object_id=file_enriched.object_id,
-                    error=str(e),
-                )
-                # Record failure in database
-                await global_vars.tracking_service.update_enrichment_results(
-                    instance_id=ctx.workflow_id,
-                    failure_list=["extract_tika_text"],
-                )
-
-            if not extracted_text:
-                logger.debug("Text extraction complete: no text extracted.")
-                return None
-
-            # Upload extracted text
-            object_id = storage.upload(extracted_text.encode("utf-8"))
-
-            transform = Transform(
-                type="extracted_text",
-                object_id=str(object_id),
-                metadata={
-                    "file_name": "extracted_plaintext.txt",
-                    "display_type_in_dashboard": "monaco",
-                    "display_title": "Extracted Plaintext",
-                },
+        if file_enriched.size > tika_max_file_size:
+            logger.info(
+                "Skipping text extraction: file exceeds TIKA_MAX_FILE_SIZE",
+                object_id=file_enriched.object_id,
+                size=file_enriched.size,
             )
+            return None
 
-            # Record success in database
-            await global_vars.tracking_service.update_enrichment_results(
-                instance_id=ctx.workflow_id,
-                success_list=["extract_tika_text"],
-            )
+        text_object_id = await find_identical_content_transform(
+            global_vars.asyncpg_pool, file_enriched.hashes.sha256, file_enriched.object_id, "extracted_text"
+        )
+        if text_object_id:
+            logger.debug("Reusing extracted text of identical content", object_id=file_enriched.object_id)
+        else:
+            with (
+                storage.download(file_enriched.object_id) as temp_file,
+                tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", suffix=".txt") as text_file,
+            ):
+                try:
+                    chars, truncated = await tika_pool.extract_to_file(
+                        temp_file.name, text_file, tika_timeout_seconds, tika_max_text_chars
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Tika extraction failed",
+                        object_id=file_enriched.object_id,
+                        error=str(e),
+                    )
+                    # Record failure in database
+                    await global_vars.tracking_service.update_enrichment_results(
+                        instance_id=ctx.workflow_id,
+                        failure_list=["extract_tika_text"],
+                    )
+                    chars, truncated = 0, False
+
+                if not chars:
+                    logger.debug("Text extraction complete: no text extracted.")
+                    return None
+
+                if truncated:
+                    logger.info(
+                        "Extracted text truncated at TIKA_MAX_TEXT_CHARS",
+                        object_id=file_enriched.object_id,
+                        max_chars=tika_max_text_chars,
+                    )
+
+                # Upload extracted text
+                text_file.flush()
+                text_object_id = storage.upload_file(text_file.name)
+
+        transform = Transform(
+            type="extracted_text",
+            object_id=str(text_object_id),
+            metadata={
+                "file_name": "extracted_plaintext.txt",
+                "display_type_in_dashboard": "monaco",
+                "display_title": "Extracted Plaintext",
+            },
+        )
+
+        # Record success in database
+        await global_vars.tracking_service.update_enrichment_results(
+            instance_id=ctx.workflow_id,
+            success_list=["extract_tika_text"],
+        )
 
-            logger.debug("Text extracted to extracted_plaintext.txt with Tika", object_id=file_enriched.object_id)
+        logger.debug("Text extracted to extracted_plaintext.txt with Tika", object_id=file_enriched.object_id)
 
-            result = transform.model_dump()
-            return result
+        result = transform.model_dump()
+        return result
 
     except Exception as e:
         logger.exception(message="Unexpected error performing text extraction", object_id=object_id)
@@ -221,6 +388,7 @@ def init_jvm():
     java.TikaConfig = jpype.JClass("org.apache.tika.config.TikaConfig")
     java.Tika = jpype.JClass("org.apache.tika.Tika")
     java.File = jpype.JClass("java.io.File")
+    java.String = jpype.JClass("java.lang.String")
 
     pdfbox_logger = java.Logger.getLogger("org.apache.pdfbox")
     pdfbox_logger.setLevel(java.Level.SEVERE)
@@ -229,8 +397,8 @@ def init_jvm():
 
 
 def init_tika():
-    """Initialize Tika with OCR configuration."""
-    global tika_instance
+    """Initialize the Tika parser pool with OCR configuration."""
+    global tika_pool
     init_jvm()
 
     # Get OCR language from environment variable
@@ -253,9 +421,12 @@ def init_tika():
 
     try:
         config = java.TikaConfig(java.File(temp_config_path))
-        tika_instance = java.Tika(config)
+        tika_pool = TikaPool(lambda: java.Tika(config), tika_pool_size)
         logger.info(
-            "Tika initialized successfully with OCR languages", config=temp_config_path, ocr_languages=ocr_languages
+            "Tika initialized successfully with OCR languages",
+            config=temp_config_path,
+            ocr_languages=ocr_languages,
+            pool_size=tika_pool_size,
         )
     except Exception as e:
         logger.exception("Failed to load Tika config", ocr_languages=ocr_languages, config_xml=config_xml)
@@ -1,6 +1,6 @@
 """PDF conversion activities."""
 
-import os
+import asyncio
 
 import document_conversion.global_vars as global_vars
 import httpx
@@ -11,16 +11,52 @@ from common.state_helpers import get_file_enriched_async
 from common.storage import StorageS3
 from common.workflows.setup import workflow_activity
 from dapr.ext.workflow.workflow_activity_context import WorkflowActivityContext
+from document_conversion.transform_cache import find_identical_content_transform
 
 logger = get_logger(__name__)
 
 storage = StorageS3()
 
+# Bytes requested from the Gotenberg response per read
+RESPONSE_CHUNK_SIZE = 1024 * 1024
+
+
+class ResponseStream:
+    """Blocking, file-like reader over a streamed httpx response body.
+
+    The storage client reads it from a worker thread while the response is read on the event loop,
+    so a converted PDF goes to S3 part by part instead of being held in memory whole.
+    """
+
+    def __init__(self, response: httpx.Response, loop: asyncio.AbstractEventLoop):
+        self._chunks = response.aiter_bytes(RESPONSE_CHUNK_SIZE)
+        self._loop = loop
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def _next_chunk(self) -> bytes | None:
+        return await anext(self._chunks, None)
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer += chunk
+
+        if size < 0 or size > len(self._buffer):
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
 
 @workflow_activity
 async def convert_to_pdf(ctx: WorkflowActivityContext, file_input: dict) -> dict | None:
     """Convert file to PDF using Gotenberg."""
     assert global_vars.gotenberg_url is not None, "gotenberg_url must be initialized"
+    assert global_vars.gotenberg_client is not None, "gotenberg_client must be initialized"
     assert global_vars.tracking_service is not None, "tracking_service must be initialized"
 
     object_id = file_input.get("object_id")
@@ -44,52 +80,25 @@ async def convert_to_pdf(ctx: WorkflowActivityContext, file_input: dict) -> dict
             ".xlw",
         ]
 
-        with storage.download(file_enriched.object_id) as temp_file:
-            temp_file_with_ext = f"{temp_file.name}.{file_enriched.extension}"
-            os.rename(temp_file.name, temp_file_with_ext)
-
-            try:
-                with open(temp_file_with_ext, "rb") as file_data:
-                    files = {"file": file_data}
-                    data = {}
-
-                    if landscape:
-                        data["landscape"] = "true"
-
-                    # Use httpx async client instead of requests
-                    async with httpx.AsyncClient(timeout=180.0) as client:
-                        response = await client.post(
-                            global_vars.gotenberg_url,
-                            files=files,
-                            data=data,
-                        )
-
-                    if response.status_code == 200:
-                        object_id = storage.upload(response.content)
-
-                        transform = Transform(
-                            type="converted_pdf",
-                            object_id=str(object_id),
-                            metadata={
-                                "file_name": f"{file_enriched.file_name}.pdf",
-                                "display_type_in_dashboard": "pdf",
-                                "display_title": "Converted PDF",
-                            },
-                        )
-
-                        # Record success in database
-                        await global_vars.tracking_service.update_enrichment_results(
-                            instance_id=ctx.workflow_id,
-                            success_list=["convert_to_pdf"],
-                        )
-
-                        logger.debug(
-                            "File successfully converted to PDF with Gotenberg", object_id=file_enriched.object_id
-                        )
-
-                        result = transform.model_dump()
-                        return result
-                    else:
+        pdf_object_id = await find_identical_content_transform(
+            global_vars.asyncpg_pool, file_enriched.hashes.sha256, file_enriched.object_id, "converted_pdf"
+        )
+        if pdf_object_id:
+            logger.debug("Reusing PDF conversion of identical content", object_id=file_enriched.object_id)
+        else:
+            with storage.download(file_enriched.object_id) as temp_file, open(temp_file.name, "rb") as file_data:
+                # Gotenberg picks the LibreOffice import filter from the uploaded file name's extension
+                files = {"file": (f"{file_enriched.object_id}{file_enriched.extension or ''}", file_data)}
+                data = {}
+
+                if landscape:
+                    data["landscape"] = "true"
+
+                async with global_vars.gotenberg_client.stream(
+                    "POST", global_vars.gotenberg_url, files=files, data=data
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
                         logger.error(
                             "Error calling Gotenberg",
                             status_code=response.status_code,
@@ -104,8 +113,31 @@ async def convert_to_pdf(ctx: WorkflowActivityContext, file_input: dict) -> dict
 
                         return None
 
-            finally:
-                os.rename(temp_file_with_ext, temp_file.name)
+                    length = int(response.headers.get("content-length", -1))
+                    pdf_object_id = await asyncio.to_thread(
+                        storage.upload_stream, ResponseStream(response, asyncio.get_running_loop()), length
+                    )
+
+        transform = Transform(
+            type="converted_pdf",
+            object_id=str(pdf_object_id),
+            metadata={
+                "file_name": f"{file_enriched.file_name}.pdf",
+                "display_type_in_dashboard": "pdf",
+                "display_title": "Converted PDF",
+            },
+        )
+
+        # Record success in database
+        await global_vars.tracking_service.update_enrichment_results(
+            instance_id=ctx.workflow_id,
+            success_list=["convert_to_pdf"],
+        )
+
+        logger.debug("File successfully converted to PDF with Gotenberg", object_id=file_enriched.object_id)
+
+        result = transform.model_dump()
+        return result
 
     except Exception as e:
         logger.exception(message="Error in PDF conversion", object_id=object_id)
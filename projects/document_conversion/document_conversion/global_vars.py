@@ -1,11 +1,13 @@
 """Global variables for document_conversion service."""
 
 import asyncpg
+import httpx
 from common.workflows.tracking_service import WorkflowTrackingService
 from dapr.ext.workflow import DaprWorkflowClient
 
 # Global variables that will be initialized during startup
 asyncpg_pool: asyncpg.Pool | None = None
 gotenberg_url: str | None = None
+gotenberg_client: httpx.AsyncClient | None = None
 workflow_client: DaprWorkflowClient | None = None
 tracking_service: WorkflowTrackingService | None = None
@@ -6,6 +6,7 @@ from contextlib import AsyncExitStack, asynccontextmanager
 
 import asyncpg
 import document_conversion.global_vars as global_vars
+import httpx
 import jpype
 from common.db import get_postgres_connection_str
 from common.logger import WORKFLOW_CLIENT_LOG_LEVEL, get_logger
@@ -32,6 +33,9 @@ logger.info(f"max_workflow_execution_time: {max_workflow_execution_time}")
 
 postgres_connection_string = get_postgres_connection_str()
 
+# Concurrent conversions sent to Gotenberg (connections in the shared client's pool)
+gotenberg_max_connections = int(os.getenv("GOTENBERG_MAX_CONNECTIONS", max_parallel_workflows))
+
 # Workflow purge interval in seconds
 workflow_purge_interval = int(os.getenv("WORKFLOW_PURGE_INTERVAL_SECONDS", "30"))
 
@@ -65,6 +69,15 @@ async def lifespan(app: FastAPI):
     global_vars.gotenberg_url = f"http://localhost:{dapr_port}/v1.0/invoke/gotenberg/method/forms/libreoffice/convert"
 
     async with AsyncExitStack() as stack:
+        # Reuse Gotenberg connections across documents; requests beyond the limit wait for a free connection
+        global_vars.gotenberg_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(180.0, pool=None),
+            limits=httpx.Limits(
+                max_connections=gotenberg_max_connections, max_keepalive_connections=gotenberg_max_connections
+            ),
+        )
+        stack.push_async_callback(global_vars.gotenberg_client.aclose)
+
         init_tika()
         stack.callback(jpype.shutdownJVM)
 
@@ -101,8 +114,10 @@ async def lifespan(app: FastAPI):
                 max_execution_time=max_workflow_execution_time,
                 batch_size=50,
                 interval_seconds=workflow_purge_interval,
+                metrics=global_vars.tracking_service.metrics,
             )
             cleanup_dapr_workflow_state_task = asyncio.create_task(purger.run())
+            workflow_metrics_task = asyncio.create_task(global_vars.tracking_service.metrics.run())
             logger.info("Workflow purger initialized")
 
             logger.info("Document conversion service initialized successfully")
@@ -114,6 +129,7 @@ async def lifespan(app: FastAPI):
 
             # Cancel background tasks
             await cancel_task(cleanup_dapr_workflow_state_task, "Dapr workflow state purger")
+            await cancel_task(workflow_metrics_task, "workflow metrics flusher")
 
 
 app = FastAPI(lifespan=lifespan)
@@ -0,0 +1,24 @@
+"""Reuse of transforms already produced for files with identical content."""
+
+import asyncpg
+
+IDENTICAL_CONTENT_TRANSFORM_QUERY = """
+    SELECT t.transform_object_id
+    FROM files_enriched prior
+    JOIN transforms t ON t.object_id = prior.object_id AND t.type = $3
+    WHERE prior.hashes @> jsonb_build_object('sha256', $1::text) AND prior.object_id <> $2
+    LIMIT 1
+"""
+
+
+async def find_identical_content_transform(
+    pool: asyncpg.Pool, sha256: str, object_id: str, transform_type: str
+) -> str | None:
+    """Return the object of a `transform_type` transform of an earlier file with the same sha256, if any.
+
+    Transform objects may be shared between files with identical content; housekeeping only deletes
+    ones no longer referenced by any file.
+    """
+    async with pool.acquire() as conn:
+        transform_object_id = await conn.fetchval(IDENTICAL_CONTENT_TRANSFORM_QUERY, sha256, object_id, transform_type)
+    return str(transform_object_id) if transform_object_id else None
@@ -0,0 +1,64 @@
+"""Tests for the single-pass ASCII/UTF-16 strings extractor."""
+
+import importlib
+import io
+import sys
+import types
+
+import pytest
+
+
+def _load_extract_strings_module():
+    storage_stub = types.ModuleType("common.storage")
+    storage_stub.StorageS3 = lambda: None
+    sys.modules["common.storage"] = storage_stub
+    return importlib.import_module("document_conversion.activities.extract_strings")
+
+
+SAMPLE = (
+    b"\x01\x02hello world\x00\xff"
+    + "WideString".encode("utf-16-le")
+    + b"\x03\x04"
+    + b"\x00"
+    + "BigEndian".encode("utf-16-be")
+    + b"\x00\x00"
+    + b"shrt\x05      \x05tab\there\x00"
+)
+# Like `strings -e l` / `strings -e b`, a UTF-16 string also reads as the opposite byte order one byte later
+EXPECTED = ["hello world", "WideString", "ideString", "BigEndian", "BigEndian", "tab\there"]
+
+
+async def _extract(module, path, **kwargs) -> list[str]:
+    output = io.StringIO()
+    await module.extract_all_strings(str(path), output, **kwargs)
+    return output.getvalue().splitlines()
+
+
+@pytest.mark.asyncio
+async def test_extracts_ascii_and_utf16_in_offset_order(tmp_path):
+    module = _load_extract_strings_module()
+    path = tmp_path / "sample.bin"
+    path.write_bytes(SAMPLE)
+
+    assert await _extract(module, path, min_len=5) == EXPECTED
+    assert await _extract(module, path, min_len=5, include_offsets=True) == [
+        "2 hello world",
+        f"{SAMPLE.index(b'W'):x} WideString",
+        f"{SAMPLE.index(b'W') + 1:x} ideString",
+        f"{SAMPLE.index(b'B') - 1:x} BigEndian",
+        f"{SAMPLE.index(b'B'):x} BigEndian",
+        f"{SAMPLE.index(b'tab'):x} tab\there",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_strings_spanning_chunks_are_not_split(tmp_path, monkeypatch):
+    module = _load_extract_strings_module()
+    monkeypatch.setattr(module, "STRINGS_CHUNK_SIZE", 64)
+    path = tmp_path / "sample.bin"
+    path.write_bytes(SAMPLE * 3)
+
+    assert await _extract(module, path, min_len=5) == EXPECTED * 3
+
+    path.write_bytes(b"")
+    assert await _extract(module, path) == []
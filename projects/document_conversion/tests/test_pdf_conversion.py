@@ -0,0 +1,36 @@
+"""Tests for streaming Gotenberg responses to storage."""
+
+import asyncio
+import importlib
+import sys
+import types
+
+import httpx
+import pytest
+
+
+def _load_pdf_conversion_module():
+    storage_stub = types.ModuleType("common.storage")
+    storage_stub.StorageS3 = lambda: None
+    sys.modules["common.storage"] = storage_stub
+    return importlib.import_module("document_conversion.activities.pdf_conversion")
+
+
+@pytest.mark.asyncio
+async def test_response_stream_reads_body_in_requested_sizes(monkeypatch):
+    module = _load_pdf_conversion_module()
+    monkeypatch.setattr(module, "RESPONSE_CHUNK_SIZE", 4)
+    body = b"%PDF-1.7 converted document"
+    stream = module.ResponseStream(httpx.Response(200, content=body), asyncio.get_running_loop())
+
+    def read_parts():
+        parts = [stream.read(10)]
+        while part := stream.read(10):
+            parts.append(part)
+        return parts
+
+    parts = await asyncio.to_thread(read_parts)
+
+    assert b"".join(parts) == body
+    assert [len(part) for part in parts] == [10, 10, 7]
+    assert await asyncio.to_thread(stream.read) == b""
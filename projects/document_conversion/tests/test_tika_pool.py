@@ -0,0 +1,130 @@
+"""Tests for the Tika parser pool used by the extract_text activity."""
+
+import asyncio
+import importlib
+import io
+import sys
+import threading
+import types
+
+import pytest
+
+
+def _load_extract_text_module():
+    storage_stub = types.ModuleType("common.storage")
+    storage_stub.StorageS3 = lambda: None
+    sys.modules["common.storage"] = storage_stub
+    return importlib.import_module("document_conversion.activities.extract_text")
+
+
+HANG = threading.Event()  # Set at the end of each test to release hung fake parses
+
+
+class FakeReader:
+    def __init__(self, text: str | None, hang_on_close: bool = False):
+        self.text = text
+        self.hang_on_close = hang_on_close
+        self.closed = threading.Event()
+
+    def close(self):
+        if self.hang_on_close:
+            # Like Tika's reader, whose close waits for the lock held by a blocked read
+            HANG.wait()
+        self.closed.set()
+
+
+class FakeParser:
+    def __init__(self, text: str | None, hang_in_parse: bool = False, hang_on_close: bool = False):
+        self.text = text
+        self.hang_in_parse = hang_in_parse
+        self.hang_on_close = hang_on_close
+        self.readers: list[FakeReader] = []
+
+    def parse(self, java_file):
+        if self.hang_in_parse:
+            # A document Tika never produces a first character for
+            HANG.wait()
+        reader = FakeReader(self.text, self.hang_on_close)
+        self.readers.append(reader)
+        return reader
+
+
+def _fake_copy_text(reader, output_file, max_chars, abandoned):
+    if reader.text is None:
+        # A parse that never finishes: blocks until the reader is closed, like Tika's piped reader
+        while not reader.closed.wait(0.01):
+            if HANG.is_set():
+                break
+        raise OSError("Pipe closed")
+    output_file.write(reader.text[:max_chars])
+    return min(len(reader.text), max_chars), len(reader.text) > max_chars
+
+
+class ParserFactory:
+    def __init__(self, *parsers: FakeParser):
+        self.parsers = list(parsers)
+        self.created: list[FakeParser] = []
+
+    def __call__(self) -> FakeParser:
+        parser = self.parsers.pop(0)
+        self.created.append(parser)
+        return parser
+
+
+@pytest.fixture
+def extract_text_module(monkeypatch):
+    module = _load_extract_text_module()
+    monkeypatch.setattr(module, "_copy_text", _fake_copy_text)
+    monkeypatch.setattr(module.java, "File", str, raising=False)
+    HANG.clear()
+    yield module
+    HANG.set()
+
+
+@pytest.mark.asyncio
+async def test_pool_streams_text_and_truncates(extract_text_module):
+    pool = extract_text_module.TikaPool(ParserFactory(FakeParser("extracted text")), 1)
+    output = io.StringIO()
+
+    assert await pool.extract_to_file("/tmp/doc", output, timeout=5, max_chars=9) == (9, True)
+    assert output.getvalue() == "extracted"
+
+
+async def _extract_after_timeout(pool, factory):
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(pool.extract_to_file("/tmp/doc", io.StringIO(), timeout=0.05, max_chars=100), 2)
+
+    # The timed out parser was replaced, not put back
+    output = io.StringIO()
+    assert await asyncio.wait_for(pool.extract_to_file("/tmp/doc", output, timeout=5, max_chars=100), 2) == (
+        15,
+        False,
+    )
+    assert output.getvalue() == "second document"
+    assert len(factory.created) == 2
+
+
+@pytest.mark.asyncio
+async def test_timed_out_read_is_abandoned_and_parser_replaced(extract_text_module):
+    hung = FakeParser(None)
+    factory = ParserFactory(hung, FakeParser("second document"))
+    pool = extract_text_module.TikaPool(factory, 1)
+
+    await _extract_after_timeout(pool, factory)
+    assert hung.readers[0].closed.wait(2)
+
+
+@pytest.mark.asyncio
+async def test_parse_hanging_before_any_output_times_out(extract_text_module):
+    factory = ParserFactory(FakeParser("never", hang_in_parse=True), FakeParser("second document"))
+    pool = extract_text_module.TikaPool(factory, 1)
+
+    await _extract_after_timeout(pool, factory)
+
+
+@pytest.mark.asyncio
+async def test_reader_close_blocking_does_not_block_the_event_loop(extract_text_module):
+    factory = ParserFactory(FakeParser(None, hang_on_close=True), FakeParser("second document"))
+    pool = extract_text_module.TikaPool(factory, 1)
+
+    await _extract_after_timeout(pool, factory)
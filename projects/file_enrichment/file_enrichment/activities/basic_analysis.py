@@ -1,5 +1,6 @@
 """Basic file analysis activity."""
 
+import asyncio
 import json
 import pathlib
 import posixpath
@@ -17,6 +18,17 @@ from .. import global_vars
 
 logger = get_logger(__name__)
 
+# libmagic only inspects the start of a file (its default bytes_max is 1MB), so the header read
+#   during hashing is enough to derive magic/mime type without opening the file again.
+MAGIC_HEADER_SIZE = 1024 * 1024
+
+# Sample size used for the binary/plaintext check (matches helpers.is_text_file)
+PLAINTEXT_SAMPLE_SIZE = 1024
+
+# Formats libmagic only fully describes when given the file itself: it parses ELF program/section
+#   headers and reads the gzip trailer (original size) through the file descriptor
+FILE_MAGIC_SIGNATURES = (b"\x7fELF", b"\x1f\x8b")
+
 
 @workflow_activity
 async def get_basic_analysis(ctx: WorkflowActivityContext, file_dict: dict) -> None:
@@ -54,7 +66,8 @@ async def get_basic_analysis(ctx: WorkflowActivityContext, file_dict: dict) -> N
     logger.info("Executing activity: get_basic_analysis", object_id=object_id)
 
     with global_vars.storage.download(object_id) as file:
-        file_enriched_dict = process_basic_analysis(file.name, file_dict)
+        # hashing releases the GIL, so run it off the event loop
+        file_enriched_dict = await asyncio.to_thread(process_basic_analysis, file.name, file_dict)
         await save_file_enriched_to_db(file_enriched_dict)
 
 
@@ -78,22 +91,30 @@ def process_basic_analysis(temp_file_path: str, file_dict: dict) -> dict:
     """
     path = file_dict.get("path", "")
 
-    mime_type = magic.from_file(temp_file_path, mime=True)
-    if mime_type == "text/plain" or helpers.is_text_file(temp_file_path):
-        is_plaintext = True
+    # single pass over the file: every digest plus the header used for type detection
+    hashes, header = helpers.calculate_file_hashes(
+        temp_file_path,
+        ("md5", "sha1", "sha256"),
+        header_size=MAGIC_HEADER_SIZE,
+    )
+    size = pathlib.Path(temp_file_path).stat().st_size
+
+    if size == 0 or header.startswith(FILE_MAGIC_SIGNATURES):
+        # empty files are reported as inode/x-empty only by from_file
+        mime_type = magic.from_file(temp_file_path, mime=True)
+        magic_type = magic.from_file(temp_file_path)
     else:
-        is_plaintext = False
+        mime_type = magic.from_buffer(header, mime=True)
+        magic_type = magic.from_buffer(header)
+
+    is_plaintext = mime_type == "text/plain" or helpers.is_plaintext(header, PLAINTEXT_SAMPLE_SIZE)
 
     basic_analysis = {
         "file_name": posixpath.basename(path),
         "extension": get_file_extension(path),
-        "size": pathlib.Path(temp_file_path).stat().st_size,
-        "hashes": {
-            "md5": helpers.calculate_file_hash(temp_file_path, "md5"),
-            "sha1": helpers.calculate_file_hash(temp_file_path, "sha1"),
-            "sha256": helpers.calculate_file_hash(temp_file_path, "sha256"),
-        },
-        "magic_type": magic.from_file(temp_file_path),
+        "size": size,
+        "hashes": hashes,
+        "magic_type": magic_type,
         "mime_type": mime_type,
         "is_plaintext": is_plaintext,
         "is_container": is_container(mime_type),
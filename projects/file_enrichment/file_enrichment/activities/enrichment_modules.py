@@ -1,19 +1,24 @@
 """Enrichment modules activity."""
 
-import json
+import asyncio
 import os
 
-import common.helpers as helpers
 import file_enrichment.global_vars as global_vars
 from common.logger import get_logger
 from common.models import EnrichmentResult
+from common.state_helpers import get_file_enriched_async
 from common.workflows.setup import workflow_activity
 from dapr.ext.workflow.workflow_activity_context import WorkflowActivityContext
 
+from ..content_index import content_only_modules, find_reusable_results
+from ..result_writer import EnrichmentResultBatch
 from ..tracing import get_tracer
 
 logger = get_logger(__name__)
 
+# Files kept open for modules that outlived their timeout, closed once those modules finish
+_deferred_closes: set[asyncio.Task] = set()
+
 # Global module map - will be set during initialization
 
 
@@ -35,6 +40,8 @@ async def run_enrichment_modules(ctx: WorkflowActivityContext, activity_input: d
         results = []
         success_list = []
         failure_list = []
+        # Modules that timed out but are still running (and reading the file)
+        timed_out: list[asyncio.Task] = []
 
         try:
             # Download file as a separate span
@@ -70,62 +77,22 @@ async def run_enrichment_modules(ctx: WorkflowActivityContext, activity_input: d
                     module_count=len(modules_to_process),
                 )
 
-                for module_name in modules_to_process:
-                    # Create a span for each module execution
-                    with tracer.start_as_current_span(f"enrichment.{module_name}") as module_span:
-                        module_span.set_attribute("module.name", module_name)
-                        module_span.set_attribute("object_id", object_id)
-
-                        try:
-                            result = await execute_enrichment_module(object_id, temp_file.name, module_name)
-
-                            if result:
-                                # Store enrichment result directly in database
-                                await store_enrichment_results(object_id, module_name, result)
-
-                                results.append((module_name, {"status": "success", "module": module_name}))
-                                logger.debug("Module completed successfully with results", module_name=module_name)
-                                module_span.set_attribute("module.status", "success")
-                            else:
-                                results.append((module_name, None))
-                                logger.debug("Module completed successfully with no results", module_name=module_name)
-                                module_span.set_attribute("module.status", "success_no_results")
-
-                            # Track success immediately after module completes
-                            # This ensures tracking is updated even if a later module fails
-                            assert global_vars.tracking_service is not None
-                            await global_vars.tracking_service.update_enrichment_results(
-                                instance_id=ctx.workflow_id,
-                                success_list=[module_name],
-                            )
-                            success_list.append(module_name)  # Keep for logging
-
-                        except Exception as e:
-                            logger.exception(
-                                "Error in enrichment module",
-                                module_name=module_name,
-                                object_id=object_id,
-                                error=str(e),
-                            )
-
-                            # Track failure immediately
-                            failure_msg = f"{module_name}:{str(e)[:100]}"
-                            assert global_vars.tracking_service is not None
-                            await global_vars.tracking_service.update_enrichment_results(
-                                instance_id=ctx.workflow_id,
-                                failure_list=[failure_msg],
-                            )
-                            failure_list.append(failure_msg)  # Keep for logging
-
-                            results.append((module_name, None))
-                            module_span.set_attribute("module.status", "error")
-                            module_span.set_attribute("module.error", str(e)[:200])
-                            # Continue with other modules instead of raising
+                # Content-only modules that already ran on identical bytes reuse those results
+                reused = await get_reusable_results(object_id, modules_to_process)
+                span.set_attribute("reused_module_count", len(reused))
+
+                # Independent modules run concurrently; dependents start once their dependencies finish
+                results, success_list, failure_list = await run_modules_dag(
+                    ctx.workflow_id, object_id, temp_file.name, modules_to_process, reused, timed_out
+                )
             finally:
-                # Ensure temp_file is cleaned up
-                temp_file.__exit__(None, None, None)
+                # Ensure temp_file is cleaned up, but not from under modules that are still reading it
+                if timed_out:
+                    close_when_done(temp_file, timed_out)
+                else:
+                    temp_file.__exit__(None, None, None)
 
-            # Tracking is now done incrementally inside the loop above
+            # Results and tracking were written in one batch once all modules finished
             logger.debug(
                 "All enrichment modules processed",
                 success_count=len(success_list),
@@ -143,8 +110,245 @@ async def run_enrichment_modules(ctx: WorkflowActivityContext, activity_input: d
         return results
 
 
+def close_when_done(temp_file, tasks: list[asyncio.Task]) -> None:
+    """Close `temp_file` in the background once every task in `tasks` has finished."""
+
+    async def close():
+        await asyncio.wait(tasks)
+        temp_file.__exit__(None, None, None)
+
+    task = asyncio.create_task(close())
+    _deferred_closes.add(task)
+    task.add_done_callback(_deferred_closes.discard)
+
+
+def build_module_dag(modules_to_process: list[str]) -> dict[str, set[str]]:
+    """Restrict the module dependency graph to the modules selected for this file.
+
+    Dependencies that were not selected are dropped, matching the sequential behavior where they
+    only ever affected ordering.
+    """
+    selected = set(modules_to_process)
+    return {
+        module_name: {
+            dep for dep in getattr(global_vars.global_module_map[module_name], "dependencies", []) if dep in selected
+        }
+        for module_name in modules_to_process
+    }
+
+
+async def get_reusable_results(object_id: str, modules_to_process: list[str]) -> dict[str, EnrichmentResult | None]:
+    """Results of the selected content-only modules from an earlier file with the same sha256 (if any)."""
+    content_modules = set(content_only_modules(global_vars.global_module_map))
+    candidates = [module_name for module_name in modules_to_process if module_name in content_modules]
+    if not candidates:
+        return {}
+
+    try:
+        assert global_vars.asyncpg_pool is not None
+        return await find_reusable_results(global_vars.asyncpg_pool, object_id, candidates)
+    except Exception as e:
+        logger.warning("Content index lookup failed, running all modules", object_id=object_id, error=str(e))
+        return {}
+
+
+async def run_modules_dag(
+    workflow_id: str,
+    object_id: str,
+    temp_file_path: str,
+    modules_to_process: list[str],
+    reused: dict[str, EnrichmentResult | None] | None = None,
+    timed_out: list[asyncio.Task] | None = None,
+) -> tuple[list[tuple[str, dict | None]], list[str], list[str]]:
+    """Run the selected modules concurrently, respecting their dependencies.
+
+    Each module starts as soon as all of its (selected) dependencies have finished, successfully or not,
+    with at most `global_vars.module_concurrency` modules in flight and each one bounded by
+    `global_vars.module_timeout` seconds (0 for no limit). Modules that time out are recorded as failed
+    but left running, and added to `timed_out` so the caller can keep the file in place until they
+    finish. Until then they keep their concurrency slot, and modules depending on them are recorded as
+    failed rather than started against them. Modules in `reused` are not run; their stored result is
+    queued as if they had produced it.
+    Results are written to Postgres in one batch once every module has finished, and workflow tracking
+    is updated with a single call.
+
+    Returns:
+        (results, success_list, failure_list), with results in `modules_to_process` order
+    """
+    graph = build_module_dag(modules_to_process)
+    semaphore = asyncio.Semaphore(max(global_vars.module_concurrency, 1))
+    done_events = {module_name: asyncio.Event() for module_name in modules_to_process}
+    outcomes: dict[str, tuple[dict | None, str | None]] = {}
+    batch = EnrichmentResultBatch()
+    # Modules that timed out and are still running
+    running_late: set[str] = set()
+
+    def finish_late(module_name: str) -> None:
+        running_late.discard(module_name)
+        semaphore.release()
+
+    async def run_when_ready(module_name: str) -> None:
+        try:
+            for dep in graph[module_name]:
+                await done_events[dep].wait()
+            late_deps = sorted(graph[module_name] & running_late)
+            if late_deps:
+                logger.warning(
+                    "Skipping module, dependencies are still running", module_name=module_name, deps=late_deps
+                )
+                outcomes[module_name] = (None, f"{module_name}:dependency {', '.join(late_deps)} timed out")
+                return
+            if reused and module_name in reused:
+                outcomes[module_name] = queue_reused_result(object_id, module_name, reused[module_name], batch)
+                return
+
+            await semaphore.acquire()
+            late: list[asyncio.Task] = []
+            try:
+                outcomes[module_name] = await run_single_module(object_id, temp_file_path, module_name, batch, late)
+            finally:
+                if late:
+                    # The slot is released only once the module really finishes
+                    running_late.add(module_name)
+                    late[0].add_done_callback(lambda _: finish_late(module_name))
+                    if timed_out is not None:
+                        timed_out.extend(late)
+                else:
+                    semaphore.release()
+        finally:
+            done_events[module_name].set()
+
+    await asyncio.gather(*(run_when_ready(module_name) for module_name in modules_to_process))
+
+    assert global_vars.asyncpg_pool is not None
+    failed: dict[str, Exception] = {}
+    try:
+        await batch.flush(global_vars.asyncpg_pool)
+    except Exception:
+        # One bad row shouldn't cost every module its results, so retry one transaction per module
+        logger.warning("Batched result write failed, storing modules separately", object_id=object_id)
+        try:
+            failed = await batch.flush_each(global_vars.asyncpg_pool)
+        except Exception as e:
+            logger.exception("Error storing enrichment results", object_id=object_id, modules=batch.module_names)
+            failed = dict.fromkeys(batch.module_names, e)
+    for module_name, e in failed.items():
+        outcomes[module_name] = (None, f"{module_name}:failed to store results: {str(e)[:70]}")
+
+    results = []
+    success_list = []
+    failure_list = []
+    for module_name in modules_to_process:
+        result, failure_msg = outcomes.get(module_name, (None, f"{module_name}:not run"))
+        results.append((module_name, result))
+        if failure_msg is None:
+            success_list.append(module_name)
+        else:
+            failure_list.append(failure_msg)
+
+    if success_list or failure_list:
+        assert global_vars.tracking_service is not None
+        await global_vars.tracking_service.update_enrichment_results(
+            instance_id=workflow_id,
+            success_list=success_list,
+            failure_list=failure_list,
+        )
+
+    return results, success_list, failure_list
+
+
+def queue_reused_result(
+    object_id: str, module_name: str, result: EnrichmentResult | None, batch: EnrichmentResultBatch
+) -> tuple[dict | None, str | None]:
+    """Queue a result copied from identical content, returning the same outcome as a successful run."""
+    logger.debug("Reusing module result from identical content", module_name=module_name, object_id=object_id)
+    if result is None:
+        return None, None
+    batch.add(object_id, module_name, result)
+    return {"status": "success", "module": module_name}, None
+
+
+async def run_single_module(
+    object_id: str,
+    temp_file_path: str,
+    module_name: str,
+    batch: EnrichmentResultBatch,
+    timed_out: list[asyncio.Task] | None = None,
+) -> tuple[dict | None, str | None]:
+    """Execute one module and queue its result in `batch`.
+
+    A module that runs past `global_vars.module_timeout` is not cancelled, since cancelling can't stop
+    work it handed to a thread; it is recorded as failed, its late result is dropped, and its task is
+    added to `timed_out`.
+
+    Returns:
+        (result, failure_msg): the entry for the activity's results list, and the failure message
+        if the module raised or timed out (None on success)
+    """
+    tracer = get_tracer()
+
+    # Create a span for each module execution
+    with tracer.start_as_current_span(f"enrichment.{module_name}") as module_span:
+        module_span.set_attribute("module.name", module_name)
+        module_span.set_attribute("object_id", object_id)
+
+        try:
+            task = asyncio.ensure_future(execute_enrichment_module(object_id, temp_file_path, module_name))
+            try:
+                done, _ = await asyncio.wait({task}, timeout=global_vars.module_timeout or None)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            if task not in done:
+                task.add_done_callback(lambda t: _log_late_module(module_name, object_id, t))
+                if timed_out is not None:
+                    timed_out.append(task)
+                raise TimeoutError(f"timed out after {global_vars.module_timeout}s")
+            result = task.result()
+
+            if result:
+                batch.add(object_id, module_name, result)
+                entry = {"status": "success", "module": module_name}
+                logger.debug("Module completed successfully with results", module_name=module_name)
+                module_span.set_attribute("module.status", "success")
+            else:
+                entry = None
+                logger.debug("Module completed successfully with no results", module_name=module_name)
+                module_span.set_attribute("module.status", "success_no_results")
+            return entry, None
+
+        except Exception as e:
+            logger.exception(
+                "Error in enrichment module",
+                module_name=module_name,
+                object_id=object_id,
+                error=str(e),
+            )
+
+            failure_msg = f"{module_name}:{str(e)[:100]}"
+            module_span.set_attribute("module.status", "error")
+            module_span.set_attribute("module.error", str(e)[:200])
+            # Continue with other modules instead of raising
+            return None, failure_msg
+
+
+def _log_late_module(module_name: str, object_id: str, task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.warning("Timed out module later failed", module_name=module_name, object_id=object_id)
+    else:
+        logger.info("Timed out module finished, its result was dropped", module_name=module_name, object_id=object_id)
+
+
 async def determine_modules_to_process(object_id: str, temp_file_path: str, execution_order: list[str]) -> list[str]:
-    """First pass: determine which modules should process this file."""
+    """First pass: determine which modules should process this file.
+
+    Modules that declare `triggers` are resolved from the compiled trigger index with one lookup on the
+    file's metadata; `should_process()` is only awaited for the remaining modules that need custom logic.
+    """
+    selected, needs_check = await resolve_triggered_modules(object_id, execution_order)
+
     modules_to_process = []
 
     for module_name in execution_order:
@@ -152,6 +356,13 @@ async def determine_modules_to_process(object_id: str, temp_file_path: str, exec
             logger.warning("Module not found", module_name=module_name)
             continue
 
+        if module_name in selected:
+            modules_to_process.append(module_name)
+            continue
+
+        if module_name not in needs_check:
+            continue
+
         module = global_vars.global_module_map[module_name]
         try:
             should_process = await module.should_process(object_id, temp_file_path)
@@ -164,64 +375,49 @@ async def determine_modules_to_process(object_id: str, temp_file_path: str, exec
     return modules_to_process
 
 
-async def execute_enrichment_module(object_id: str, temp_file_path: str, module_name: str) -> EnrichmentResult | None:
-    """Second pass: process a single module and return its result."""
+async def resolve_triggered_modules(object_id: str, execution_order: list[str]) -> tuple[set[str], set[str]]:
+    """Resolve modules from the trigger index.
 
-    logger.debug("Starting module processing", module_name=module_name)
+    Returns:
+        (selected, needs_check): modules selected by their triggers alone, and modules whose
+        should_process() still has to be called. Falls back to checking every module if the
+        index or the file's metadata is unavailable.
+    """
+    if global_vars.module_trigger_index is None:
+        return set(), set(execution_order)
 
-    module = global_vars.global_module_map[module_name]
-    result = await module.process(object_id, temp_file_path)
+    try:
+        file_enriched = await get_file_enriched_async(object_id, global_vars.asyncpg_pool)
+    except Exception as e:
+        logger.warning("Could not load file metadata for trigger index", object_id=object_id, error=str(e))
+        return set(), set(execution_order)
 
-    return result
+    selected, needs_check = global_vars.module_trigger_index.resolve(file_enriched)
 
+    logger.debug(
+        "Resolved modules from trigger index",
+        object_id=object_id,
+        selected=sorted(selected),
+        should_process_count=len(needs_check),
+    )
 
-async def store_enrichment_results(object_id: str, module_name: str, result: EnrichmentResult):
-    """Store enrichment results, transforms, and findings in the database."""
-    assert global_vars.asyncpg_pool is not None
-    async with global_vars.asyncpg_pool.acquire() as conn:
-        async with conn.transaction():
-            # Store enrichment
-            results_escaped = json.dumps(helpers.sanitize_for_jsonb(result.model_dump(mode="json")))
-            await conn.execute(
-                """
-                INSERT INTO enrichments (object_id, module_name, result_data)
-                VALUES ($1, $2, $3)
-            """,
-                object_id,
-                module_name,
-                results_escaped,
-            )
+    return selected, needs_check
+
+
+async def execute_enrichment_module(object_id: str, temp_file_path: str, module_name: str) -> EnrichmentResult | None:
+    """Second pass: process a single module and return its result.
+
+    A module's synchronous `analyze()` runs on the shared module executor so parsing doesn't block the
+    event loop; modules without one are awaited directly.
+    """
+
+    logger.debug("Starting module processing", module_name=module_name)
+
+    module = global_vars.global_module_map[module_name]
+    analyze = getattr(module, "analyze", None)
+    if analyze is None:
+        return await module.process(object_id, temp_file_path)
 
-            # Store any transforms
-            if result.transforms:
-                for transform in result.transforms:
-                    await conn.execute(
-                        """
-                        INSERT INTO transforms (object_id, type, transform_object_id, metadata)
-                        VALUES ($1, $2, $3, $4)
-                    """,
-                        object_id,
-                        transform.type,
-                        transform.object_id,
-                        json.dumps(transform.metadata) if transform.metadata else None,
-                    )
-
-            # Store any findings
-            if result.findings:
-                for finding in result.findings:
-                    await conn.execute(
-                        """
-                        INSERT INTO findings (
-                            finding_name, category, severity, object_id,
-                            origin_type, origin_name, raw_data, data
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    """,
-                        finding.finding_name,
-                        finding.category,
-                        finding.severity,
-                        object_id,
-                        finding.origin_type,
-                        finding.origin_name,
-                        json.dumps(finding.raw_data),
-                        json.dumps([obj.model_dump_json() for obj in finding.data]),
-                    )
+    file_enriched = await get_file_enriched_async(object_id, global_vars.asyncpg_pool)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(global_vars.module_executor, analyze, temp_file_path, file_enriched)
@@ -6,9 +6,22 @@ from common.workflows.setup import workflow_activity
 from common.workflows.tracking_service import WorkflowStatus
 from dapr.ext.workflow.workflow_activity_context import WorkflowActivityContext
 
+from ..content_index import content_only_modules, record_content
+
 logger = get_logger(__name__)
 
 
+def release_cached_file(activity_input: dict) -> None:
+    """Drop the workflow's object from the local file cache now that no more activities will read it."""
+    object_id = activity_input.get("object_id")
+    if not object_id:
+        return
+    try:
+        global_vars.storage.evict_cached(object_id)
+    except Exception as e:
+        logger.warning("Failed to evict file from local cache", object_id=object_id, error=str(e))
+
+
 @workflow_activity
 async def finalize_workflow_success(ctx: WorkflowActivityContext, activity_input: dict) -> None:
     """Mark workflow as completed successfully.
@@ -16,9 +29,11 @@ async def finalize_workflow_success(ctx: WorkflowActivityContext, activity_input
     Calculates runtime from the database start_time.
 
     Args:
-        activity_input: Dict (unused, kept for consistency)
+        activity_input: Dict containing:
+            - object_id: The workflow's file, released from the local file cache
     """
     instance_id = ctx.workflow_id
+    release_cached_file(activity_input)
 
     assert global_vars.tracking_service is not None
     try:
@@ -38,6 +53,13 @@ async def finalize_workflow_success(ctx: WorkflowActivityContext, activity_input
         )
         # Don't raise - we don't want to fail the workflow just because status update failed
 
+    # Index the file's content so later files with the same bytes can reuse content-only results
+    try:
+        assert global_vars.asyncpg_pool is not None
+        await record_content(global_vars.asyncpg_pool, instance_id, content_only_modules(global_vars.global_module_map))
+    except Exception as e:
+        logger.warning("Failed to record file content in the content index", instance_id=instance_id, error=str(e))
+
 
 @workflow_activity
 async def finalize_workflow_failure(ctx: WorkflowActivityContext, activity_input: dict) -> None:
@@ -45,9 +67,11 @@ async def finalize_workflow_failure(ctx: WorkflowActivityContext, activity_input
 
     Args:
         activity_input: Dict containing:
+            - object_id: The workflow's file, released from the local file cache
             - error_message: The error message
     """
     instance_id = ctx.workflow_id
+    release_cached_file(activity_input)
     error_message = activity_input.get("error_message", "Unknown error")
 
     assert global_vars.tracking_service is not None
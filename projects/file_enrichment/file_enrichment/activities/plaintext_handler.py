@@ -1,7 +1,9 @@
 """Plaintext file handling activity."""
 
+import asyncio
 import io
 import json
+from collections.abc import Iterator
 
 from common.helpers import create_text_reader
 from common.logger import get_logger
@@ -16,6 +18,10 @@ from .. import global_vars
 
 logger = get_logger(__name__)
 
+# Chunk size for plaintext_content rows - each chunk's to_tsvector() has to stay under PostgreSQL's 1MB tsvector limit
+PLAINTEXT_CHUNK_BYTES = 200_000
+PLAINTEXT_READ_CHARS = 1024 * 1024
+
 
 @workflow_activity
 async def handle_file_if_plaintext(ctx: WorkflowActivityContext, activity_input):
@@ -47,45 +53,67 @@ async def handle_file_if_plaintext(ctx: WorkflowActivityContext, activity_input)
         )
 
 
-async def index_plaintext_content(object_id: str, file_obj: io.TextIOWrapper, max_chunk_bytes: int = 800000):
-    """Used to index plaintext content with byte-based chunking to avoid tsvector limits"""
+async def index_plaintext_content(
+    object_id: str, file_obj: io.TextIOWrapper, max_chunk_bytes: int = PLAINTEXT_CHUNK_BYTES
+) -> int:
+    """Used to index plaintext content with byte-based chunking to avoid tsvector limits.
+
+    The file is read and chunked incrementally and the chunks are streamed into `plaintext_content`
+    with COPY, so memory use is bounded by the read size rather than the file size.
+
+    Returns:
+        The number of chunks indexed
+    """
     logger.debug(f"indexing plaintext for {object_id}")
 
+    chunk_count = 0
+
+    async def records():
+        nonlocal chunk_count
+        chunks = iter_plaintext_chunks(file_obj, max_chunk_bytes)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield (object_id, chunk_count, chunk)
+            chunk_count += 1
+
     assert global_vars.asyncpg_pool is not None
     async with global_vars.asyncpg_pool.acquire() as conn:
         async with conn.transaction():
             await conn.execute("DELETE FROM plaintext_content WHERE object_id = $1", object_id)
+            await conn.copy_records_to_table(
+                "plaintext_content",
+                records=records(),
+                columns=["object_id", "chunk_number", "content"],
+            )
 
-            chunk_number = 0
-            insert_query = """
-            INSERT INTO plaintext_content (object_id, chunk_number, content)
-            VALUES ($1, $2, $3);
-            """
+    logger.debug("Indexed chunked content", object_id=object_id, num_chunks=chunk_count)
+    return chunk_count
 
-            # Read file content
-            file_content = file_obj.read()
 
-            # Sanitize content: remove null bytes which PostgreSQL text fields cannot store
-            file_content = file_content.replace("\x00", "")
+def iter_plaintext_chunks(file_obj: io.TextIOBase, max_chunk_bytes: int = PLAINTEXT_CHUNK_BYTES) -> Iterator[str]:
+    """Yield the text of `file_obj` in chunks of at most `max_chunk_bytes` UTF-8 bytes.
 
-            # Process in chunks, ensuring we don't exceed byte limits
-            i = 0
-            while i < len(file_content):
-                # Take a chunk that's guaranteed to be under the byte limit
-                chunk_end = min(i + max_chunk_bytes // 4, len(file_content))  # Div by 4 for worst-case UTF-8
-                chunk_content = file_content[i:chunk_end]
-
-                # If chunk is still too big in bytes, trim it down
-                while len(chunk_content.encode("utf-8")) > max_chunk_bytes and chunk_content:
-                    chunk_content = chunk_content[:-100]  # Remove 100 chars at a time
-
-                if chunk_content:  # Only insert non-empty chunks
-                    actual_bytes = len(chunk_content.encode("utf-8"))
-                    logger.debug(f"Inserting chunk {chunk_number} with {actual_bytes} bytes")
-                    await conn.execute(insert_query, object_id, chunk_number, chunk_content)
-                    chunk_number += 1
-
-                # Move to next chunk
-                i = chunk_end
-
-            logger.debug("Indexed chunked content", object_id=object_id, num_chunks=chunk_number)
+    Null bytes (which PostgreSQL text fields cannot store) are removed. The text is read
+    PLAINTEXT_READ_CHARS at a time and encoded once; chunk boundaries are moved back to the start of
+    a UTF-8 sequence so no character is split across chunks.
+    """
+    buffer = bytearray()
+
+    while True:
+        text = file_obj.read(PLAINTEXT_READ_CHARS)
+        if text:
+            buffer += text.replace("\x00", "").encode("utf-8")
+
+        start = 0
+        while len(buffer) - start >= max_chunk_bytes or (not text and start < len(buffer)):
+            end = min(start + max_chunk_bytes, len(buffer))
+            if end < len(buffer):
+                # 0b10xxxxxx bytes continue a multi-byte sequence
+                while end > start and buffer[end] & 0xC0 == 0x80:
+                    end -= 1
+            yield buffer[start:end].decode("utf-8")
+            start = end
+
+        del buffer[:start]
+
+        if not text:
+            return
@@ -0,0 +1,127 @@
+"""sha256-keyed content index used to reuse enrichment results across identical files.
+
+The first object with a given sha256 whose workflow completes is recorded in `file_contents`, together
+with the content-only enrichment modules that succeeded on it. Modules opt in with a `content_only = True`
+attribute when their selection and results depend only on the file's bytes. When a later file has the
+same sha256, those modules' stored results are copied to the new object_id instead of running them again.
+"""
+
+import json
+from typing import Any
+
+import asyncpg
+from common.logger import get_logger
+from common.models import EnrichmentResult
+
+logger = get_logger(__name__)
+
+
+def content_only_modules(module_map: dict[str, Any]) -> list[str]:
+    """Names of the loaded modules whose results depend only on file content."""
+    return sorted(name for name, module in module_map.items() if getattr(module, "content_only", False))
+
+
+def rebase_result(result: EnrichmentResult, object_id: str, prior_file_name: str, file_name: str) -> EnrichmentResult:
+    """Re-target a stored enrichment result at a new object with the same content.
+
+    Findings are pointed at the new object_id and transform display names derived from the prior
+    file's name are renamed after the new one. Transform objects themselves are shared.
+    """
+    transforms = []
+    for transform in result.transforms:
+        metadata = transform.metadata
+        display_name = (metadata or {}).get("file_name")
+        if prior_file_name and isinstance(display_name, str) and display_name.startswith(prior_file_name):
+            metadata = {**metadata, "file_name": file_name + display_name[len(prior_file_name) :]}  # pyright: ignore[reportOptionalMemberAccess]
+        transforms.append(transform.model_copy(update={"metadata": metadata}))
+
+    findings = [finding.model_copy(update={"object_id": object_id}) for finding in result.findings]
+    return result.model_copy(update={"transforms": transforms, "findings": findings})
+
+
+async def find_reusable_results(
+    pool: asyncpg.Pool, object_id: str, module_names: list[str]
+) -> dict[str, EnrichmentResult | None]:
+    """Look up results for `module_names` from an earlier object with identical content.
+
+    Only modules that succeeded on the indexed object are returned; a module that succeeded without
+    producing a result maps to None.
+
+    Returns:
+        module name -> result to store for `object_id`
+    """
+    if not module_names:
+        return {}
+
+    async with pool.acquire() as conn:
+        content = await conn.fetchrow(
+            """
+            SELECT fc.object_id, fc.modules, prior.file_name AS prior_file_name, fe.file_name
+            FROM files_enriched fe
+            JOIN file_contents fc ON fc.sha256 = fe.hashes->>'sha256'
+            JOIN files_enriched prior ON prior.object_id = fc.object_id
+            WHERE fe.object_id = $1 AND fc.object_id <> fe.object_id
+            """,
+            object_id,
+        )
+        if content is None:
+            return {}
+
+        reusable = [name for name in module_names if name in content["modules"]]
+        if not reusable:
+            return {}
+
+        rows = await conn.fetch(
+            """
+            SELECT DISTINCT ON (module_name) module_name, result_data
+            FROM enrichments
+            WHERE object_id = $1 AND module_name = ANY($2::text[])
+            ORDER BY module_name, enrichment_id DESC
+            """,
+            content["object_id"],
+            reusable,
+        )
+
+    results: dict[str, EnrichmentResult | None] = dict.fromkeys(reusable)
+    for row in rows:
+        try:
+            result = EnrichmentResult.model_validate(json.loads(row["result_data"]))
+        except Exception as e:
+            # Let the module run again rather than copy a result we can't read
+            logger.warning("Could not reuse stored enrichment result", module_name=row["module_name"], error=str(e))
+            del results[row["module_name"]]
+            continue
+        results[row["module_name"]] = rebase_result(
+            result, object_id, content["prior_file_name"] or "", content["file_name"] or ""
+        )
+
+    logger.debug(
+        "Reusing enrichment results from identical content",
+        object_id=object_id,
+        prior_object_id=str(content["object_id"]),
+        modules=sorted(results),
+    )
+    return results
+
+
+async def record_content(pool: asyncpg.Pool, instance_id: str, content_modules: list[str]) -> None:
+    """Index a completed workflow's object by sha256, unless identical content is already indexed.
+
+    Args:
+        instance_id: The completed workflow instance ID
+        content_modules: Content-only module names; those that succeeded for the workflow are recorded
+    """
+    async with pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO file_contents (sha256, object_id, modules)
+            SELECT fe.hashes->>'sha256', fe.object_id,
+                   ARRAY(SELECT unnest(w.enrichments_success) INTERSECT SELECT unnest($2::text[]))
+            FROM workflows w
+            JOIN files_enriched fe ON fe.object_id = w.object_id
+            WHERE w.wf_id = $1 AND fe.hashes->>'sha256' IS NOT NULL
+            ON CONFLICT (sha256) DO NOTHING
+            """,
+            instance_id,
+            content_modules,
+        )
@@ -21,7 +21,7 @@ from dapr.aio.clients import DaprClient
 from dapr.ext.fastapi import DaprApp
 from fastapi import FastAPI
 from file_enrichment.postgres_notifications import postgres_notify_listener
-from file_linking import FileLinkingEngine
+from file_linking import get_file_linking_engine
 from grpc import RpcError
 from nemesis_dpapi import DpapiManager as NemesisDpapiManager
 from nemesis_dpapi.eventing import DaprDpapiEventPublisher
@@ -103,7 +103,7 @@ async def lifespan(app: FastAPI):
         dapr_client = await stack.enter_async_context(DaprClient())
 
         global_vars.asyncpg_pool = await create_connection_pool(dapr_client)
-        global_vars.file_linking_engine = FileLinkingEngine(global_vars.asyncpg_pool)
+        global_vars.file_linking_engine = get_file_linking_engine(global_vars.asyncpg_pool)
 
         stack.push_async_callback(global_vars.asyncpg_pool.close)
 
@@ -151,9 +151,12 @@ async def lifespan(app: FastAPI):
                 max_execution_time=max_workflow_execution_time,
                 batch_size=50,
                 interval_seconds=5,
+                metrics=global_vars.tracking_service.metrics,
             )
             cleanup_dapr_workflow_state_task = asyncio.create_task(purger.run())
 
+            workflow_metrics_task = asyncio.create_task(global_vars.tracking_service.metrics.run())
+
             pool_stats_logger_task = asyncio.create_task(
                 pool_stats_logger(global_vars.asyncpg_pool, logger, interval=30)
             )
@@ -184,6 +187,7 @@ async def lifespan(app: FastAPI):
             await cancel_task(postgres_notify_listener_task, "PostgreSQL NOTIFY listener")
             await cancel_task(cleanup_dapr_workflow_state_task, "Dapr workflow state purger")
             await cancel_task(pool_stats_logger_task, "DB pool stats logger")
+            await cancel_task(workflow_metrics_task, "workflow metrics flusher")
 
             # Terminate the workflow purger monitor
             # terminate_workflow_safe("workflow-purger-monitor", "workflow purger monitor")
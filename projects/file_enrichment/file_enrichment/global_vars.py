@@ -1,12 +1,14 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import asyncpg
 import dapr.ext.workflow as wf
+from common.file_cache import configure_file_cache
 from common.logger import WORKFLOW_CLIENT_LOG_LEVEL
 from common.storage import StorageS3
 from common.workflows.tracking_service import WorkflowTrackingService
 from dapr.ext.workflow.logger.options import LoggerOptions
-from file_enrichment_modules.module_loader import EnrichmentModule
+from file_enrichment_modules.module_loader import EnrichmentModule, TriggerIndex
 from file_linking import FileLinkingEngine
 
 from .workflow_manager import WorkflowManager
@@ -18,8 +20,16 @@ workflow_client = wf.DaprWorkflowClient(
 )
 
 activity_functions = {}
+
+# Node-local cache shared by every StorageS3 instance in this process (activities and enrichment modules),
+#   so each object is only pulled from S3 once per workflow. Set FILE_CACHE_MAX_SIZE_MB=0 to disable.
+file_cache = configure_file_cache(
+    cache_dir=os.getenv("FILE_CACHE_DIR", "/tmp/nemesis_file_cache"),
+    max_bytes=int(os.getenv("FILE_CACHE_MAX_SIZE_MB", 2048)) * 1024 * 1024,
+)
 storage = StorageS3()
 global_module_map: dict[str, EnrichmentModule] = {}  # Enrichment modules loaded at initialization
+module_trigger_index: TriggerIndex | None = None  # Compiled module triggers, used to select modules per file
 
 _dapr_port = os.getenv("DAPR_HTTP_PORT", 3500)
 gotenberg_url = f"http://localhost:{_dapr_port}/v1.0/invoke/gotenberg/method/forms/libreoffice/convert"
@@ -34,6 +44,13 @@ asyncpg_pool: asyncpg.Pool | None = None  # Connection pool for database operati
 file_linking_engine: FileLinkingEngine | None = None
 
 module_execution_order: list[str] = []
+module_concurrency = int(os.getenv("ENRICHMENT_MODULE_CONCURRENCY", 4))  # Max modules run concurrently per file
+# Seconds before a single module is failed (0 disables the timeout)
+module_timeout = int(os.getenv("ENRICHMENT_MODULE_TIMEOUT", 0))
+# Threads shared by every workflow for the synchronous `analyze()` of enrichment modules
+module_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ENRICHMENT_MODULE_THREADS", 8)), thread_name_prefix="enrichment-module"
+)
 workflow_manager: WorkflowManager | None = None
 tracking_service: WorkflowTrackingService | None = None  # Workflow tracking service for monitoring workflow state
 
@@ -3,6 +3,7 @@ import asyncio
 import os
 
 import asyncpg
+import file_enrichment.global_vars as global_vars
 from common.logger import get_logger
 
 from .workflow import reload_yara_rules
@@ -13,7 +14,7 @@ logger = get_logger(__name__)
 
 async def postgres_notify_listener(asyncpg_pool: asyncpg.Pool, workflow_manager: WorkflowManager) -> None:
     """
-    Listen for PostgreSQL NOTIFY events for yara reload and workflow reset.
+    Listen for PostgreSQL NOTIFY events for yara reload, workflow reset and file linking placeholder changes.
     Runs in background task to handle notifications across all workers/replicas.
     """
 
@@ -43,8 +44,12 @@ async def postgres_notify_listener(asyncpg_pool: asyncpg.Pool, workflow_manager:
             # Add listeners for our notification channels
             await conn.add_listener("nemesis_yara_reload", notification_handler)
             await conn.add_listener("nemesis_workflow_reset", notification_handler)
+            await conn.add_listener("nemesis_file_linking_placeholders", notification_handler)
 
-            logger.info("Listening for PostgreSQL notifications on nemesis_yara_reload and nemesis_workflow_reset")
+            logger.info(
+                "Listening for PostgreSQL notifications on nemesis_yara_reload, nemesis_workflow_reset "
+                "and nemesis_file_linking_placeholders"
+            )
 
             # Process notifications
             try:
@@ -53,6 +58,13 @@ async def postgres_notify_listener(asyncpg_pool: asyncpg.Pool, workflow_manager:
                         # Wait for notification with timeout to allow for cancellation checks
                         channel, payload = await asyncio.wait_for(notification_queue.get(), timeout=5.0)
 
+                        if channel == "nemesis_file_linking_placeholders":
+                            # frequent and cheap - keep the shared placeholder index in sync without logging each one
+                            if global_vars.file_linking_engine is not None:
+                                resolver = global_vars.file_linking_engine.placeholder_resolver
+                                resolver.apply_placeholder_notification(payload)
+                            continue
+
                         logger.info(
                             f"Received PostgreSQL notification: channel={channel}, payload={payload}, pid={os.getpid()}"
                         )
@@ -83,6 +95,7 @@ async def postgres_notify_listener(asyncpg_pool: asyncpg.Pool, workflow_manager:
                 try:
                     await conn.remove_listener("nemesis_yara_reload", notification_handler)
                     await conn.remove_listener("nemesis_workflow_reset", notification_handler)
+                    await conn.remove_listener("nemesis_file_linking_placeholders", notification_handler)
                 except Exception:
                     pass
                 break
@@ -0,0 +1,156 @@
+"""Batched persistence of enrichment module results.
+
+Enrichments, transforms and findings produced while processing a file are accumulated in an
+`EnrichmentResultBatch` and written with one `executemany()` per table inside a single transaction,
+instead of one transaction per module and one INSERT per transform/finding. If that transaction fails,
+`flush_each()` writes each module's rows in its own transaction so one bad result can't lose the others.
+"""
+
+import json
+from dataclasses import dataclass, field
+
+import asyncpg
+import common.helpers as helpers
+from common.logger import get_logger
+from common.models import EnrichmentResult, Finding
+
+logger = get_logger(__name__)
+
+INSERT_ENRICHMENT_QUERY = """
+    INSERT INTO enrichments (object_id, module_name, result_data)
+    VALUES ($1, $2, $3)
+"""
+
+INSERT_TRANSFORM_QUERY = """
+    INSERT INTO transforms (object_id, type, transform_object_id, metadata)
+    VALUES ($1, $2, $3, $4)
+"""
+
+INSERT_FINDING_QUERY = """
+    INSERT INTO findings (
+        finding_name, category, severity, object_id,
+        origin_type, origin_name, raw_data, data
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+"""
+
+
+def finding_row(object_id: str, finding: Finding) -> tuple:
+    """Build the INSERT parameters for a finding (`data` is stored as an array of JSON strings)."""
+    data_as_strings = [json.dumps(helpers.sanitize_for_jsonb(obj.model_dump(mode="json"))) for obj in finding.data]
+    return (
+        finding.finding_name,
+        finding.category,
+        finding.severity,
+        object_id,
+        finding.origin_type,
+        finding.origin_name,
+        json.dumps(helpers.sanitize_for_jsonb(finding.raw_data)),
+        json.dumps(data_as_strings),
+    )
+
+
+@dataclass
+class ModuleResultRows:
+    """The rows one module's result adds to each table."""
+
+    module_name: str
+    enrichment: tuple
+    transforms: list[tuple] = field(default_factory=list)
+    findings: list[tuple] = field(default_factory=list)
+
+
+async def _insert_rows(
+    conn: asyncpg.Connection, enrichments: list[tuple], transforms: list[tuple], findings: list[tuple]
+) -> None:
+    async with conn.transaction():
+        await conn.executemany(INSERT_ENRICHMENT_QUERY, enrichments)
+        if transforms:
+            await conn.executemany(INSERT_TRANSFORM_QUERY, transforms)
+        if findings:
+            await conn.executemany(INSERT_FINDING_QUERY, findings)
+
+
+@dataclass
+class EnrichmentResultBatch:
+    """Enrichment results for one or more files, pending a single flush to Postgres."""
+
+    modules: list[ModuleResultRows] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    @property
+    def module_names(self) -> list[str]:
+        return [rows.module_name for rows in self.modules]
+
+    @property
+    def enrichments(self) -> list[tuple]:
+        return [rows.enrichment for rows in self.modules]
+
+    @property
+    def transforms(self) -> list[tuple]:
+        return [row for rows in self.modules for row in rows.transforms]
+
+    @property
+    def findings(self) -> list[tuple]:
+        return [row for rows in self.modules for row in rows.findings]
+
+    def add(self, object_id: str, module_name: str, result: EnrichmentResult) -> None:
+        """Queue a module's enrichment result along with its transforms and findings."""
+        results_escaped = json.dumps(helpers.sanitize_for_jsonb(result.model_dump(mode="json")))
+        rows = ModuleResultRows(module_name, (object_id, module_name, results_escaped))
+
+        for transform in result.transforms or []:
+            rows.transforms.append(
+                (
+                    object_id,
+                    transform.type,
+                    transform.object_id,
+                    json.dumps(transform.metadata) if transform.metadata else None,
+                )
+            )
+
+        for finding in result.findings or []:
+            rows.findings.append(finding_row(object_id, finding))
+
+        self.modules.append(rows)
+
+    async def flush(self, pool: asyncpg.Pool) -> None:
+        """Write everything queued so far in one transaction and clear the batch.
+
+        On failure nothing is written and the batch is left intact so the caller can decide what to report
+        (or retry with `flush_each()`).
+        """
+        if not self.modules:
+            return
+
+        enrichments, transforms, findings = self.enrichments, self.transforms, self.findings
+        async with pool.acquire() as conn:
+            await _insert_rows(conn, enrichments, transforms, findings)
+
+        logger.debug(
+            "Flushed enrichment results",
+            enrichments=len(enrichments),
+            transforms=len(transforms),
+            findings=len(findings),
+        )
+
+        self.modules.clear()
+
+    async def flush_each(self, pool: asyncpg.Pool) -> dict[str, Exception]:
+        """Write each module's rows in its own transaction and clear the batch.
+
+        Returns:
+            module name -> error, for the modules whose rows could not be written
+        """
+        failed: dict[str, Exception] = {}
+        async with pool.acquire() as conn:
+            for rows in self.modules:
+                try:
+                    await _insert_rows(conn, [rows.enrichment], rows.transforms, rows.findings)
+                except Exception as e:
+                    logger.exception("Error storing enrichment result", module_name=rows.module_name)
+                    failed[rows.module_name] = e
+
+        self.modules.clear()
+        return failed
@@ -365,7 +365,7 @@ async def _handle_chromium_app_bound_key(dpapi_manager: DpapiManager, request: C
             assert global_vars.asyncpg_pool is not None
             async with global_vars.asyncpg_pool.acquire() as conn:
                 # Insert into chromium.state_keys
-                await conn.execute(
+                state_key_id = await conn.fetchval(
                     """
                     INSERT INTO chromium.state_keys (
                         originating_object_id,
@@ -378,6 +378,7 @@ async def _handle_chromium_app_bound_key(dpapi_manager: DpapiManager, request: C
                         app_bound_key_dec,
                         app_bound_key_is_decrypted
                     ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                    RETURNING id
                     """,
                     None,  # originating_object_id
                     None,  # agent_id
@@ -413,7 +414,7 @@ async def _handle_chromium_app_bound_key(dpapi_manager: DpapiManager, request: C
             # Finally, try to decrypt chromium cookies and logins with newly submitted key
             assert global_vars.asyncpg_pool is not None
             chromium_data_result = await retry_decrypt_chromium_data(
-                UUID(int=0), dpapi_manager, global_vars.asyncpg_pool
+                UUID(int=0), dpapi_manager, global_vars.asyncpg_pool, state_key_ids=[state_key_id]
             )
 
             logger.debug(
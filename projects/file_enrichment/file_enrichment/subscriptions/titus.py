@@ -23,6 +23,7 @@ from common.models import (
     TitusOutput,
 )
 from file_enrichment.activities.publish_findings import publish_alerts_for_findings
+from file_enrichment.result_writer import EnrichmentResultBatch
 
 logger = get_logger(__name__)
 
@@ -315,51 +316,11 @@ async def store_titus_results(
         # Add findings to enrichment result
         enrichment_result.findings = findings_list
 
-        # Store in database
+        # Store the enrichment result and all findings in one transaction
         assert global_vars.asyncpg_pool is not None
-        async with global_vars.asyncpg_pool.acquire() as conn:
-            async with conn.transaction():
-                # Store main enrichment result
-                results_escaped = json.dumps(sanitize_for_jsonb(enrichment_result.model_dump(mode="json")))
-                await conn.execute(
-                    """
-                    INSERT INTO enrichments (object_id, module_name, result_data)
-                    VALUES ($1, $2, $3)
-                    """,
-                    object_id,
-                    "titus",
-                    results_escaped,
-                )
-
-                # Store any findings
-                for finding in findings_list:
-                    # Convert each FileObject to a JSON string
-                    data_as_strings = []
-                    for obj in finding.data:
-                        # Convert the model to a dict first
-                        if hasattr(obj, "model_dump"):
-                            obj_dict = obj.model_dump()
-                        else:
-                            obj_dict = obj
-                        sanitized_obj = sanitize_for_jsonb(obj_dict)
-                        data_as_strings.append(json.dumps(sanitized_obj))
-
-                    await conn.execute(
-                        """
-                        INSERT INTO findings (
-                            finding_name, category, severity, object_id,
-                            origin_type, origin_name, raw_data, data
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                        """,
-                        finding.finding_name,
-                        finding.category,
-                        finding.severity,
-                        object_id,
-                        finding.origin_type,
-                        finding.origin_name,
-                        json.dumps(sanitize_for_jsonb(finding.raw_data)),
-                        json.dumps(data_as_strings),  # Store as array of JSON strings
-                    )
+        batch = EnrichmentResultBatch()
+        batch.add(object_id, "titus", enrichment_result)
+        await batch.flush(global_vars.asyncpg_pool)
 
         # Update workflow enrichment status
         await global_vars.tracking_service.update_enrichment_results(
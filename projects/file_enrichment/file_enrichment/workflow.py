@@ -143,7 +143,7 @@ def enrichment_pipeline_workflow(ctx: wf.DaprWorkflowContext, file_dict: dict):
         # Mark workflow as completed
         yield ctx.call_activity(
             finalize_workflow_success,
-            input={"start_time": start_time.isoformat()},
+            input={"object_id": object_id, "start_time": start_time.isoformat()},
         )
 
         return {}
@@ -162,6 +162,7 @@ def enrichment_pipeline_workflow(ctx: wf.DaprWorkflowContext, file_dict: dict):
             yield ctx.call_activity(
                 finalize_workflow_failure,
                 input={
+                    "object_id": object_id,
                     "error_message": str(e.details.message)[:200],
                     "start_time": start_time.isoformat(),
                 },
@@ -179,6 +180,7 @@ def enrichment_pipeline_workflow(ctx: wf.DaprWorkflowContext, file_dict: dict):
             yield ctx.call_activity(
                 finalize_workflow_failure,
                 input={
+                    "object_id": object_id,
                     "error_message": str(e)[:400],
                     "start_time": start_time.isoformat(),
                 },
@@ -252,6 +254,7 @@ async def initialize_enrichment_modules(dpapi_manager: DpapiManager) -> list[str
     # Update the global_module_map in the enrichment_modules activity
 
     global_vars.global_module_map = module_loader.modules
+    global_vars.module_trigger_index = module_loader.trigger_index
 
     # Filter modules by workflow and determine execution order
     workflow_name = "default"  # This could be made configurable later
@@ -6,6 +6,7 @@ from datetime import datetime
 import asyncpg
 from common.logger import get_logger
 from common.models import File, SingleEnrichmentWorkflowInput
+from common.workflows.metrics import reseed_workflow_metrics
 from common.workflows.tracking_service import WorkflowStatus
 from dapr.ext.workflow.workflow_state import WorkflowStatus as DaprWorkflowStatus
 
@@ -126,7 +127,12 @@ class WorkflowManager:
         """Reset the workflow manager's state."""
         try:
             async with self.pool.acquire() as conn:
-                await conn.execute("DELETE FROM workflows")
+                async with conn.transaction():
+                    # Lock before deleting so in-flight workflow writes finish first (see reseed_workflow_metrics)
+                    await conn.execute("LOCK TABLE workflows IN EXCLUSIVE MODE")
+                    await conn.execute("DELETE FROM workflows")
+                    # Zeroes the metrics under a new generation, so every service drops its older pending deltas
+                    await reseed_workflow_metrics(conn)
         except Exception:
             logger.exception(message="Error resetting workflows in database")
 
@@ -0,0 +1,100 @@
+"""Tests for reusing enrichment results across files with identical content."""
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from common.models import EnrichmentResult, Finding, FindingCategory, FindingOrigin, Transform
+from file_enrichment.content_index import content_only_modules, find_reusable_results, rebase_result
+
+
+class FakeModule:
+    def __init__(self, content_only: bool | None = None):
+        if content_only is not None:
+            self.content_only = content_only
+
+
+def make_result() -> EnrichmentResult:
+    return EnrichmentResult(
+        module_name="pdf_analyzer",
+        results={"pages": 3},
+        transforms=[
+            Transform(type="display", object_id="t1", metadata={"file_name": "report.pdf.txt"}),
+            Transform(type="other", object_id="t2", metadata={"file_name": "macros.vb"}),
+            Transform(type="bare", object_id="t3"),
+        ],
+        findings=[
+            Finding(
+                category=FindingCategory.CREDENTIAL,
+                finding_name="pdf_password",
+                origin_type=FindingOrigin.ENRICHMENT_MODULE,
+                origin_name="pdf_analyzer",
+                object_id="old",
+                severity=5,
+                raw_data={},
+                data=[],
+            )
+        ],
+    )
+
+
+def test_content_only_modules():
+    modules = {"pdf": FakeModule(True), "yara": FakeModule(), "pe": FakeModule(False), "lnk": FakeModule(True)}
+
+    assert content_only_modules(modules) == ["lnk", "pdf"]
+
+
+def test_rebase_result_targets_new_object():
+    result = rebase_result(make_result(), "new", "report.pdf", "copy.pdf")
+
+    assert [t.metadata for t in result.transforms] == [{"file_name": "copy.pdf.txt"}, {"file_name": "macros.vb"}, None]
+    assert [t.object_id for t in result.transforms] == ["t1", "t2", "t3"]
+    assert result.findings[0].object_id == "new"
+    assert result.results == {"pages": 3}
+
+
+class FakeConnection:
+    def __init__(self, content, rows):
+        self.content = content
+        self.rows = rows
+        self.fetch_args = None
+
+    async def fetchrow(self, query, *args):
+        return self.content
+
+    async def fetch(self, query, *args):
+        self.fetch_args = args
+        return self.rows
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.mark.asyncio
+async def test_find_reusable_results_only_returns_indexed_modules():
+    content = {
+        "object_id": "prior",
+        "modules": ["pdf_analyzer", "lnk_analyzer"],
+        "prior_file_name": "report.pdf",
+        "file_name": "copy.pdf",
+    }
+    rows = [{"module_name": "pdf_analyzer", "result_data": json.dumps(make_result().model_dump(mode="json"))}]
+    conn = FakeConnection(content, rows)
+
+    results = await find_reusable_results(FakePool(conn), "new", ["pdf_analyzer", "lnk_analyzer", "exif_metadata"])
+
+    assert conn.fetch_args == ("prior", ["pdf_analyzer", "lnk_analyzer"])
+    assert results["lnk_analyzer"] is None  # succeeded without producing a result
+    assert results["pdf_analyzer"].findings[0].object_id == "new"
+    assert "exif_metadata" not in results
+
+
+@pytest.mark.asyncio
+async def test_find_reusable_results_without_indexed_content():
+    assert await find_reusable_results(FakePool(FakeConnection(None, [])), "new", ["pdf_analyzer"]) == {}
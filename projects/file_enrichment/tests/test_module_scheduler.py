@@ -0,0 +1,333 @@
+"""Tests for the dependency-aware concurrent enrichment module scheduler."""
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from common.models import EnrichmentResult, Finding, FindingCategory, FindingOrigin, Transform
+
+# Mock the global_vars module to avoid Dapr initialization during import
+sys.modules["file_enrichment.global_vars"] = MagicMock()
+
+import file_enrichment.activities.enrichment_modules as enrichment_modules  # noqa: E402
+
+
+class FakeModule:
+    def __init__(
+        self,
+        name: str,
+        dependencies: list[str] | None = None,
+        delay: float = 0.0,
+        error: bool = False,
+        result: EnrichmentResult | None = None,
+    ):
+        self.name = name
+        self.dependencies = dependencies or []
+        self.delay = delay
+        self.error = error
+        self.result = result
+
+
+class FakeConnection:
+    def __init__(self, fail: bool = False, bad_value: str | None = None):
+        self.fail = fail
+        self.bad_value = bad_value  # rows containing this value are rejected
+        self.executemany_calls: list[tuple[str, list]] = []
+
+    async def executemany(self, query: str, args: list) -> None:
+        if self.fail:
+            raise ConnectionError("db down")
+        if self.bad_value and any(self.bad_value in str(row) for row in args):
+            raise ValueError("invalid input syntax")
+        self.executemany_calls.append((query, list(args)))
+
+    @asynccontextmanager
+    async def transaction(self):
+        committed = len(self.executemany_calls)
+        try:
+            yield
+        except BaseException:
+            del self.executemany_calls[committed:]
+            raise
+
+
+class FakePool:
+    def __init__(self, fail: bool = False, bad_value: str | None = None):
+        self.conn = FakeConnection(fail, bad_value)
+        self.acquire_count = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquire_count += 1
+        yield self.conn
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """Configure global_vars with fake modules and record start/finish events."""
+    events = []
+    global_vars = enrichment_modules.global_vars
+    global_vars.module_concurrency = 4
+    global_vars.module_timeout = 5
+    global_vars.tracking_service = MagicMock()
+    global_vars.tracking_service.update_enrichment_results = AsyncMock()
+    global_vars.asyncpg_pool = FakePool()
+
+    async def fake_execute(object_id, temp_file_path, module_name):
+        module = global_vars.global_module_map[module_name]
+        events.append(("start", module_name))
+        await asyncio.sleep(module.delay)
+        events.append(("end", module_name))
+        if module.error:
+            raise RuntimeError("boom")
+        return module.result
+
+    monkeypatch.setattr(enrichment_modules, "execute_enrichment_module", fake_execute)
+
+    def configure(*modules: FakeModule, concurrency: int = 4, timeout: int = 5):
+        global_vars.global_module_map = {module.name: module for module in modules}
+        global_vars.module_concurrency = concurrency
+        global_vars.module_timeout = timeout
+        return events
+
+    return configure
+
+
+@pytest.mark.asyncio
+async def test_independent_modules_run_concurrently(scheduler):
+    events = scheduler(FakeModule("pe", delay=0.05), FakeModule("yara", delay=0.05), FakeModule("certificate"))
+
+    results, success_list, failure_list = await enrichment_modules.run_modules_dag(
+        "wf", "obj", "/tmp/f", ["pe", "yara", "certificate"]
+    )
+
+    # every module starts before the first one finishes
+    assert [kind for kind, _ in events[:3]] == ["start", "start", "start"]
+    assert [name for name, _ in results] == ["pe", "yara", "certificate"]
+    assert success_list == ["pe", "yara", "certificate"]
+    assert failure_list == []
+
+
+@pytest.mark.asyncio
+async def test_dependents_wait_for_dependencies_even_on_failure(scheduler):
+    events = scheduler(FakeModule("base", delay=0.05, error=True), FakeModule("child", dependencies=["base"]))
+
+    _, success_list, failure_list = await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["base", "child"])
+
+    assert events.index(("end", "base")) < events.index(("start", "child"))
+    assert success_list == ["child"]
+    assert failure_list == ["base:boom"]
+
+
+@pytest.mark.asyncio
+async def test_unselected_dependencies_are_ignored(scheduler):
+    scheduler(FakeModule("base"), FakeModule("child", dependencies=["base"]))
+
+    _, success_list, _ = await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["child"])
+
+    assert success_list == ["child"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap(scheduler):
+    events = scheduler(*(FakeModule(f"m{i}", delay=0.01) for i in range(4)), concurrency=1)
+
+    await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["m0", "m1", "m2", "m3"])
+
+    assert events == [(kind, f"m{i}") for i in range(4) for kind in ("start", "end")]
+
+
+@pytest.mark.asyncio
+async def test_module_timeout_is_recorded_as_failure(scheduler):
+    scheduler(FakeModule("slow", delay=2), FakeModule("fast"), timeout=0.05)
+
+    _, success_list, failure_list = await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["slow", "fast"])
+
+    assert success_list == ["fast"]
+    assert failure_list == ["slow:timed out after 0.05s"]
+    tracking = enrichment_modules.global_vars.tracking_service.update_enrichment_results
+    tracking.assert_awaited_once_with(
+        instance_id="wf", success_list=["fast"], failure_list=["slow:timed out after 0.05s"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_timed_out_module_keeps_running_and_its_file_stays_open(scheduler):
+    events = scheduler(FakeModule("slow", delay=0.2), timeout=0.05)
+    timed_out = []
+
+    _, _, failure_list = await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["slow"], None, timed_out)
+    assert failure_list == ["slow:timed out after 0.05s"]
+
+    temp_file = MagicMock()
+    enrichment_modules.close_when_done(temp_file, timed_out)
+    await asyncio.sleep(0)
+    temp_file.__exit__.assert_not_called()
+
+    await asyncio.wait(timed_out)
+    await asyncio.sleep(0)
+    assert ("end", "slow") in events
+    temp_file.__exit__.assert_called_once_with(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_module_keeps_its_slot_until_it_finishes(scheduler):
+    events = scheduler(FakeModule("slow", delay=0.2), FakeModule("next"), concurrency=1, timeout=0.05)
+
+    _, success_list, _ = await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["slow", "next"])
+
+    assert events.index(("end", "slow")) < events.index(("start", "next"))
+    assert success_list == ["next"]
+
+
+@pytest.mark.asyncio
+async def test_dependents_of_a_still_running_module_are_not_started(scheduler):
+    events = scheduler(
+        FakeModule("slow", delay=0.2), FakeModule("child", dependencies=["slow"]), FakeModule("other"), timeout=0.05
+    )
+
+    _, success_list, failure_list = await enrichment_modules.run_modules_dag(
+        "wf", "obj", "/tmp/f", ["slow", "child", "other"]
+    )
+
+    assert ("start", "child") not in events
+    assert success_list == ["other"]
+    assert failure_list == ["slow:timed out after 0.05s", "child:dependency slow timed out"]
+
+
+@pytest.mark.asyncio
+async def test_zero_timeout_disables_the_limit(scheduler):
+    scheduler(FakeModule("slow", delay=0.1), timeout=0)
+
+    _, success_list, failure_list = await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["slow"])
+
+    assert success_list == ["slow"]
+    assert failure_list == []
+
+
+def make_result(module_name: str, finding_count: int) -> EnrichmentResult:
+    findings = [
+        Finding(
+            category=FindingCategory.CREDENTIAL,
+            finding_name=f"{module_name}_{i}",
+            origin_type=FindingOrigin.ENRICHMENT_MODULE,
+            origin_name=module_name,
+            object_id="obj",
+            severity=5,
+            raw_data={"value": "a\x00b"},
+            data=[],
+        )
+        for i in range(finding_count)
+    ]
+    return EnrichmentResult(
+        module_name=module_name,
+        results={"ok": True},
+        transforms=[Transform(type="report", object_id="t1")],
+        findings=findings,
+    )
+
+
+@pytest.mark.asyncio
+async def test_results_are_written_in_one_batch(scheduler):
+    scheduler(
+        FakeModule("yara", result=make_result("yara", 3)),
+        FakeModule("pe", result=make_result("pe", 2)),
+        FakeModule("lnk"),
+    )
+    pool = enrichment_modules.global_vars.asyncpg_pool
+
+    results, success_list, _ = await enrichment_modules.run_modules_dag("wf", "obj", "/tmp/f", ["yara", "pe", "lnk"])
+
+    assert pool.acquire_count == 1
+    rows_per_table = [len(rows) for _, rows in pool.conn.executemany_calls]
+    assert rows_per_table == [2, 2, 5]  # enrichments, transforms, findings
+    _, finding_rows = pool.conn.executemany_calls[2]
+    assert all(row[6] == '{"value": "ab"}' for row in finding_rows)  # raw_data sanitized for JSONB
+    assert results == [
+        ("yara", {"status": "success", "module": "yara"}),
+        ("pe", {"status": "success", "module": "pe"}),
+        ("lnk", None),
+    ]
+    assert success_list == ["yara", "pe", "lnk"]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_marks_modules_with_results_as_failed(scheduler):
+    scheduler(FakeModule("yara", result=make_result("yara", 1)), FakeModule("lnk"))
+    enrichment_modules.global_vars.asyncpg_pool = FakePool(fail=True)
+
+    results, success_list, failure_list = await enrichment_modules.run_modules_dag(
+        "wf", "obj", "/tmp/f", ["yara", "lnk"]
+    )
+
+    assert results == [("yara", None), ("lnk", None)]
+    assert success_list == ["lnk"]
+    assert failure_list == ["yara:failed to store results: db down"]
+
+
+@pytest.mark.asyncio
+async def test_bad_row_only_fails_its_own_module(scheduler):
+    bad_result = make_result("pe", 1)
+    bad_result.findings[0].raw_data = {"value": "bad"}
+    scheduler(FakeModule("yara", result=make_result("yara", 2)), FakeModule("pe", result=bad_result))
+    pool = FakePool(bad_value="bad")
+    enrichment_modules.global_vars.asyncpg_pool = pool
+
+    results, success_list, failure_list = await enrichment_modules.run_modules_dag(
+        "wf", "obj", "/tmp/f", ["yara", "pe"]
+    )
+
+    assert results == [("yara", {"status": "success", "module": "yara"}), ("pe", None)]
+    assert success_list == ["yara"]
+    assert failure_list == ["pe:failed to store results: invalid input syntax"]
+    # only yara's rows were written, each table in its own per-module transaction
+    assert [len(rows) for _, rows in pool.conn.executemany_calls] == [1, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_reused_results_are_stored_without_running_the_module(scheduler):
+    events = scheduler(FakeModule("pdf"), FakeModule("lnk"), FakeModule("yara"))
+    pool = enrichment_modules.global_vars.asyncpg_pool
+
+    results, success_list, failure_list = await enrichment_modules.run_modules_dag(
+        "wf", "obj", "/tmp/f", ["pdf", "lnk", "yara"], reused={"pdf": make_result("pdf", 1), "lnk": None}
+    )
+
+    assert events == [("start", "yara"), ("end", "yara")]
+    assert results == [("pdf", {"status": "success", "module": "pdf"}), ("lnk", None), ("yara", None)]
+    assert success_list == ["pdf", "lnk", "yara"]
+    assert failure_list == []
+    rows_per_table = [len(rows) for _, rows in pool.conn.executemany_calls]
+    assert rows_per_table == [1, 1, 1]  # enrichments, transforms, findings
+
+
+class SyncModule:
+    name = "sync"
+
+    def __init__(self):
+        self.thread_name = None
+
+    def analyze(self, file_path, file_enriched):
+        self.thread_name = threading.current_thread().name
+        return EnrichmentResult(module_name=self.name, results={"path": file_path, "file": file_enriched})
+
+
+@pytest.mark.asyncio
+async def test_synchronous_analyze_runs_on_the_module_executor(monkeypatch):
+    global_vars = enrichment_modules.global_vars
+    module = SyncModule()
+    global_vars.global_module_map = {"sync": module}
+    global_vars.module_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="enrichment-module")
+    monkeypatch.setattr(enrichment_modules, "get_file_enriched_async", AsyncMock(return_value="file_enriched"))
+
+    try:
+        result = await enrichment_modules.execute_enrichment_module("obj", "/tmp/f", "sync")
+    finally:
+        global_vars.module_executor.shutdown()
+
+    assert result.results == {"path": "/tmp/f", "file": "file_enriched"}
+    assert module.thread_name.startswith("enrichment-module")
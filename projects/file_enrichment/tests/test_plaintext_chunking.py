@@ -0,0 +1,82 @@
+"""Tests for streaming plaintext chunking used by plaintext indexing."""
+
+import io
+import sys
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock the global_vars module to avoid Dapr initialization during import
+sys.modules["file_enrichment.global_vars"] = MagicMock()
+
+import file_enrichment.activities.plaintext_handler as plaintext_handler  # noqa: E402
+from file_enrichment.activities.plaintext_handler import iter_plaintext_chunks  # noqa: E402
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    # force many reads so chunk boundaries straddle read boundaries
+    monkeypatch.setattr(plaintext_handler, "PLAINTEXT_READ_CHARS", 7)
+
+
+def chunks_of(text: str, max_chunk_bytes: int) -> list[str]:
+    return list(iter_plaintext_chunks(io.StringIO(text), max_chunk_bytes))
+
+
+class TestIterPlaintextChunks:
+    def test_ascii_chunks_are_exactly_max_bytes(self, small_reads):
+        chunks = chunks_of("abcdefghij" * 5, 16)
+
+        assert [len(c) for c in chunks] == [16, 16, 16, 2]
+        assert "".join(chunks) == "abcdefghij" * 5
+
+    def test_multibyte_characters_are_never_split(self, small_reads):
+        text = "aé€😀" * 20  # 1, 2, 3 and 4 byte UTF-8 sequences
+
+        chunks = chunks_of(text, 9)
+
+        assert "".join(chunks) == text
+        assert all(0 < len(c.encode("utf-8")) <= 9 for c in chunks)
+
+    def test_null_bytes_are_removed(self, small_reads):
+        assert chunks_of("a\x00b\x00\x00c", 100) == ["abc"]
+
+    def test_empty_input(self, small_reads):
+        assert chunks_of("", 100) == []
+        assert chunks_of("\x00\x00", 100) == []
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.copied = []
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+    async def copy_records_to_table(self, table_name, *, records, columns):
+        async for record in records:
+            self.copied.append((table_name, columns, record))
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_index_plaintext_content_streams_chunks_with_copy(small_reads):
+    conn = FakeConnection()
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    plaintext_handler.global_vars.asyncpg_pool = MagicMock(acquire=acquire)
+
+    count = await plaintext_handler.index_plaintext_content("obj", io.StringIO("x" * 25), max_chunk_bytes=10)
+
+    assert count == 3
+    assert conn.executed == [("DELETE FROM plaintext_content WHERE object_id = $1", ("obj",))]
+    assert [record for _, _, record in conn.copied] == [("obj", 0, "x" * 10), ("obj", 1, "x" * 10), ("obj", 2, "x" * 5)]
+    assert conn.copied[0][:2] == ("plaintext_content", ["object_id", "chunk_number", "content"])
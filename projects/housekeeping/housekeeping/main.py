@@ -6,10 +6,12 @@ from datetime import datetime
 import asyncpg
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from common.db import get_postgres_connection_str
 from common.logger import get_logger
 from common.storage import StorageS3
 from fastapi import FastAPI
+from housekeeping.purge import PurgeProgress, purge_expired_objects
 from pydantic import BaseModel
 
 logger = get_logger(__name__)
@@ -20,6 +22,8 @@ is_initialized = False
 storage = StorageS3()
 background_tasks = set()
 db_pool = None
+# Progress of the current (or last) cleanup job's purge of expired objects
+purge_progress: PurgeProgress | None = None
 
 
 async def get_db_pool():
@@ -30,124 +34,6 @@ async def get_db_pool():
     return db_pool
 
 
-async def get_expired_object_ids(expiration_date: datetime | None = None) -> list[str]:
-    """
-    Get a list of all object_ids from files, files_enriched, and files_enriched_dataset tables
-    that have passed their expiration date.
-
-    Args:
-        expiration_date: Optional date to use for comparison instead of current datetime.
-                         If None, current datetime is used.
-                         If datetime.max, all objects will be considered expired.
-    """
-    try:
-        pool = await get_db_pool()
-        comparison_date = expiration_date if expiration_date is not None else datetime.now()
-
-        async with pool.acquire() as conn:
-            records = await conn.fetch(
-                """
-                SELECT DISTINCT object_id
-                FROM (
-                    SELECT object_id FROM files WHERE expiration < $1
-                    UNION
-                    SELECT object_id FROM files_enriched WHERE expiration < $2
-                    UNION
-                    SELECT object_id FROM files_enriched_dataset WHERE expiration < $3
-                ) AS expired
-                """,
-                comparison_date,
-                comparison_date,
-                comparison_date,
-            )
-            return [str(record["object_id"]) for record in records]
-
-    except Exception:
-        logger.exception(message="Error getting expired object IDs from database")
-        return []
-
-
-async def get_transform_object_ids(object_ids: list[str]) -> list[str]:
-    """
-    Get all transform_object_ids that relate to the given object_ids.
-    """
-    if not object_ids:
-        return []
-
-    try:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            # Get all transform_object_ids related to the expired object_ids
-            transform_records = await conn.fetch(
-                """
-                SELECT transform_object_id
-                FROM transforms
-                WHERE object_id = ANY($1::uuid[])
-                """,
-                object_ids,
-            )
-
-            # Extract and return the transform_object_ids
-            transform_object_ids = [str(record["transform_object_id"]) for record in transform_records]
-            return transform_object_ids
-    except Exception:
-        logger.exception(message="Error getting transform object IDs from database")
-        return []
-
-
-async def delete_database_entries(object_ids: list[str]) -> bool:
-    """
-    Delete expired entries from database tables.
-    Return True if successful, False otherwise.
-    """
-    if not object_ids:
-        return True
-
-    try:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            # Start a transaction
-            async with conn.transaction():
-                # The CASCADE delete should handle related records in other tables due to the foreign key constraints
-                # defined in the schema
-
-                # Delete from files_enriched_dataset
-                await conn.execute(
-                    """
-                    DELETE FROM files_enriched_dataset
-                    WHERE object_id = ANY($1::uuid[])
-                    """,
-                    object_ids,
-                )
-
-                # Delete from files_enriched (will cascade to transforms, enrichments, etc.)
-                await conn.execute(
-                    """
-                    DELETE FROM files_enriched
-                    WHERE object_id = ANY($1::uuid[])
-                    """,
-                    object_ids,
-                )
-
-                # Delete from files
-                await conn.execute(
-                    """
-                    DELETE FROM files
-                    WHERE object_id = ANY($1::uuid[])
-                    """,
-                    object_ids,
-                )
-
-            logger.info(
-                "Successfully deleted database entries",
-                object_count=len(object_ids),
-            )
-            return True
-    except Exception:
-        logger.exception(message="Error deleting database entries")
-        return False
-
-
 async def delete_expired_chromium_data(expiration_date: datetime | None = None) -> bool:
     """
     Delete chromium data only when expiration_date is datetime.max (delete all mode).
@@ -408,6 +294,16 @@ async def delete_expired_containers(expiration_date: datetime | None = None) ->
         return False
 
 
+async def fold_report_rollups() -> None:
+    """Fold the report rollup deltas queued by ingest into report_rollups, so they don't pile up between reports."""
+    try:
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            await conn.execute("SELECT report_rollup_fold()")
+    except Exception:
+        logger.exception(message="Error folding report rollups")
+
+
 def _log_cleanup_result(result, success_msg: str, error_msg: str, round_num: int):
     """Helper function to log cleanup operation results."""
     if isinstance(result, Exception):
@@ -431,7 +327,7 @@ async def run_cleanup_job(expiration_date: datetime | None = None):
                          If None, current datetime is used.
                          If datetime.max, all objects will be considered expired.
     """
-    global storage, is_initialized
+    global storage, is_initialized, purge_progress
 
     logger.info("Starting cleanup job", custom_expiration=expiration_date is not None, expiration_date=expiration_date)
 
@@ -439,28 +335,27 @@ async def run_cleanup_job(expiration_date: datetime | None = None):
         logger.error("Cleanup job aborted - service not initialized")
         return
 
+    progress = PurgeProgress()
+    purge_progress = progress
+
     try:
+        pool = await get_db_pool()
+
         # Run cleanup three times over a minute to catch processing edge cases
         for round_num in range(0, _CLEANUP_RETRY_COUNT):
-            # Get expired object IDs from database
-            expired_object_ids = await get_expired_object_ids(expiration_date)
-            logger.info("Found expired objects", count=len(expired_object_ids), round=round_num)
-
-            # Process file objects if any were found
-            if expired_object_ids:
-                transform_object_ids = await get_transform_object_ids(expired_object_ids)
-                logger.info("Found related transform objects", count=len(transform_object_ids), round=round_num)
-
-                all_object_ids = list(set(expired_object_ids + transform_object_ids))
-                deleted_count = storage.delete_objects(all_object_ids)
-                logger.info(
-                    "Deleted objects from data lake", count=deleted_count, total=len(all_object_ids), round=round_num
-                )
+            progress.round = round_num
+            comparison_date = expiration_date if expiration_date is not None else datetime.now()
 
-            # Run database deletions in parallel
+            # Purge expired file objects from the data lake and database, a batch at a time
+            logger.info("Starting purge of expired objects", round=round_num)
+            try:
+                purge_result = await purge_expired_objects(pool, storage, comparison_date, progress)
+            except Exception as e:
+                purge_result = e
+
+            # Run remaining database deletions in parallel
             logger.info("Starting parallel database cleanup operations", round=round_num)
-            # db_result, container_result, dpapi_result, chromium_result, file_listings_result, file_linkings_result = await asyncio.gather(
-            #     delete_database_entries(expired_object_ids),
+            # container_result, dpapi_result, chromium_result, file_listings_result, file_linkings_result = await asyncio.gather(
             #     delete_expired_containers(expiration_date),
             #     delete_expired_dpapi_data(expiration_date),
             #     delete_expired_chromium_data(expiration_date),
@@ -469,15 +364,14 @@ async def run_cleanup_job(expiration_date: datetime | None = None):
             #     return_exceptions=True,
             # )
 
-            db_result, container_result = await asyncio.gather(
-                delete_database_entries(expired_object_ids),
+            (container_result,) = await asyncio.gather(
                 delete_expired_containers(expiration_date),
                 return_exceptions=True,
             )
 
             # Log results
             _log_cleanup_result(
-                db_result, "Successfully deleted database entries", "Failed to delete database entries", round_num
+                purge_result, "Successfully purged expired objects", "Failed to purge expired objects", round_num
             )
             _log_cleanup_result(
                 container_result,
@@ -496,10 +390,12 @@ async def run_cleanup_job(expiration_date: datetime | None = None):
                 logger.info(f"Waiting {_CLEANUP_RETRY_DELAY} seconds before next cleanup round")
                 await asyncio.sleep(_CLEANUP_RETRY_DELAY)
 
-        logger.info("Cleanup completed!")
+        logger.info("Cleanup completed!", **progress.to_dict())
 
     except Exception:
         logger.exception(message="Error running cleanup job")
+    finally:
+        progress.finish()
 
 
 @asynccontextmanager
@@ -530,11 +426,20 @@ async def lifespan(app: FastAPI):
             replace_existing=True,
         )
 
+        fold_interval = int(os.getenv("REPORT_ROLLUP_FOLD_INTERVAL", 60))
+        scheduler.add_job(
+            fold_report_rollups,
+            IntervalTrigger(seconds=fold_interval),
+            id="report_rollup_fold_job",
+            replace_existing=True,
+        )
+
         # Start the scheduler
         scheduler.start()
         logger.info(
             "Scheduler started",
             cleanup_schedule=cron_schedule,
+            report_rollup_fold_interval=fold_interval,
         )
 
         # Set initialization flag
@@ -596,6 +501,16 @@ async def root():
     }
 
 
+@app.get("/cleanup-status")
+async def cleanup_status():
+    """
+    Progress and throughput of the current, or most recent, cleanup job's purge of expired objects.
+    """
+    if purge_progress is None:
+        return {"status": "idle"}
+    return purge_progress.to_dict()
+
+
 @app.post("/trigger-cleanup")
 async def trigger_cleanup(request: CleanupRequest):
     """
@@ -0,0 +1,212 @@
+"""Batched purge of expired file objects.
+
+Expired object_ids are walked in keyset-paginated batches instead of being loaded all at once. For
+each batch the related transform objects are resolved, the objects are removed from the data lake
+with multi-object delete requests and the database rows are deleted in a short transaction of their
+own, so a large purge never holds locks on the file tables for longer than one batch.
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+import asyncpg
+from common.logger import get_logger
+from common.storage import StorageS3
+
+logger = get_logger(__name__)
+
+# Expired objects deleted per batch (storage delete request + database transaction)
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", 1000))
+
+# Keyset pagination starts below every real (random) object_id
+_FIRST_OBJECT_ID = UUID(int=0)
+
+
+@dataclass
+class PurgeProgress:
+    """Progress and throughput of the current (or last) purge."""
+
+    started_at: datetime = field(default_factory=datetime.now)
+    finished_at: datetime | None = None
+    round: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    objects_deleted: int = 0
+    transform_objects_deleted: int = 0
+    storage_objects_deleted: int = 0
+    storage_objects_requested: int = 0
+    _started: float = field(default_factory=time.monotonic, repr=False)
+    _elapsed: float | None = field(default=None, repr=False)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._elapsed if self._elapsed is not None else time.monotonic() - self._started
+
+    def finish(self) -> None:
+        self.finished_at = datetime.now()
+        self._elapsed = time.monotonic() - self._started
+
+    def to_dict(self) -> dict:
+        elapsed = self.elapsed_seconds
+        return {
+            "status": "completed" if self.finished_at else "running",
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "round": self.round,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "objects_deleted": self.objects_deleted,
+            "transform_objects_deleted": self.transform_objects_deleted,
+            "storage_objects_deleted": self.storage_objects_deleted,
+            "storage_objects_requested": self.storage_objects_requested,
+            "elapsed_seconds": round(elapsed, 2),
+            "objects_per_second": round(self.objects_deleted / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+async def iter_expired_object_id_batches(
+    pool: asyncpg.Pool, comparison_date: datetime, batch_size: int = PURGE_BATCH_SIZE
+) -> AsyncIterator[list[str]]:
+    """
+    Yield batches of object_ids from files, files_enriched and files_enriched_dataset that have
+    passed their expiration date, in object_id order.
+
+    Each table is walked along its primary key from the last object_id seen, so a page costs the
+    same however far into the purge it is and batches that fail to delete are not returned again.
+    """
+    last_object_id = _FIRST_OBJECT_ID
+    while True:
+        async with pool.acquire() as conn:
+            records = await conn.fetch(
+                """
+                SELECT object_id
+                FROM (
+                    (SELECT object_id FROM files
+                     WHERE object_id > $2 AND expiration < $1 ORDER BY object_id LIMIT $3)
+                    UNION
+                    (SELECT object_id FROM files_enriched
+                     WHERE object_id > $2 AND expiration < $1 ORDER BY object_id LIMIT $3)
+                    UNION
+                    (SELECT object_id FROM files_enriched_dataset
+                     WHERE object_id > $2 AND expiration < $1 ORDER BY object_id LIMIT $3)
+                ) AS expired
+                ORDER BY object_id
+                LIMIT $3
+                """,
+                comparison_date,
+                last_object_id,
+                batch_size,
+            )
+
+        if not records:
+            return
+
+        last_object_id = records[-1]["object_id"]
+        yield [str(record["object_id"]) for record in records]
+
+        if len(records) < batch_size:
+            return
+
+
+async def get_transform_object_ids(conn: asyncpg.Connection, object_ids: list[str]) -> list[str]:
+    """
+    Get all transform_object_ids that relate to the given object_ids.
+
+    Transform objects can be shared with files that have identical content (see the file_contents
+    index), so ones still referenced by any other object are left out.
+    """
+    if not object_ids:
+        return []
+
+    transform_records = await conn.fetch(
+        """
+        SELECT DISTINCT t.transform_object_id
+        FROM transforms t
+        WHERE t.object_id = ANY($1::uuid[])
+        AND NOT EXISTS (
+            SELECT 1
+            FROM transforms other
+            WHERE other.transform_object_id = t.transform_object_id
+            AND NOT (other.object_id = ANY($1::uuid[]))
+        )
+        """,
+        object_ids,
+    )
+    return [str(record["transform_object_id"]) for record in transform_records]
+
+
+async def delete_database_entries(pool: asyncpg.Pool, object_ids: list[str]) -> None:
+    """Delete the rows for a batch of expired objects in one short transaction."""
+    if not object_ids:
+        return
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # The CASCADE delete should handle related records in other tables due to the foreign key constraints
+            # defined in the schema
+            await conn.execute("DELETE FROM files_enriched_dataset WHERE object_id = ANY($1::uuid[])", object_ids)
+            # Will cascade to transforms, enrichments, etc.
+            await conn.execute("DELETE FROM files_enriched WHERE object_id = ANY($1::uuid[])", object_ids)
+            await conn.execute("DELETE FROM files WHERE object_id = ANY($1::uuid[])", object_ids)
+
+
+async def purge_batch(pool: asyncpg.Pool, storage: StorageS3, object_ids: list[str], progress: PurgeProgress) -> None:
+    """Delete one batch of expired objects, and their transforms, from the data lake and the database."""
+    async with pool.acquire() as conn:
+        transform_object_ids = await get_transform_object_ids(conn, object_ids)
+
+    # Transforms have to be resolved before the database delete cascades them away; after that the
+    # data lake and database deletes are independent
+    storage_object_ids = list(set(object_ids + transform_object_ids))
+    storage_deleted, _ = await asyncio.gather(
+        asyncio.to_thread(storage.delete_objects, storage_object_ids),
+        delete_database_entries(pool, object_ids),
+    )
+
+    progress.batches += 1
+    progress.objects_deleted += len(object_ids)
+    progress.transform_objects_deleted += len(transform_object_ids)
+    progress.storage_objects_requested += len(storage_object_ids)
+    progress.storage_objects_deleted += storage_deleted
+
+
+async def purge_expired_objects(
+    pool: asyncpg.Pool,
+    storage: StorageS3,
+    comparison_date: datetime,
+    progress: PurgeProgress,
+    batch_size: int = PURGE_BATCH_SIZE,
+) -> bool:
+    """
+    Purge every object that expired before `comparison_date`, a batch at a time.
+
+    A batch that fails is logged and skipped; the purge carries on with the next one.
+
+    Returns:
+        bool: True if every batch was purged, False otherwise.
+    """
+    success = True
+    async for object_ids in iter_expired_object_id_batches(pool, comparison_date, batch_size):
+        try:
+            await purge_batch(pool, storage, object_ids, progress)
+        except Exception:
+            logger.exception(message="Error purging batch of expired objects", count=len(object_ids))
+            progress.failed_batches += 1
+            success = False
+            continue
+
+        logger.info(
+            "Purged batch of expired objects",
+            round=progress.round,
+            batch=progress.batches,
+            objects_deleted=progress.objects_deleted,
+            storage_objects_deleted=progress.storage_objects_deleted,
+            objects_per_second=progress.to_dict()["objects_per_second"],
+        )
+
+    return success
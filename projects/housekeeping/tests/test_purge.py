@@ -0,0 +1,95 @@
+"""Tests for the batched purge of expired objects."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from housekeeping.purge import PurgeProgress, purge_expired_objects
+
+NOW = datetime(2026, 1, 1)
+
+
+class FakeConnection:
+    """Serves the purge's queries from an in-memory set of object_ids."""
+
+    def __init__(self, db: "FakePool"):
+        self.db = db
+
+    async def fetch(self, query: str, *args):
+        if "FROM files_enriched_dataset" in query:
+            _, last_object_id, limit = args
+            self.db.pages += 1
+            return [{"object_id": oid} for oid in sorted(self.db.expired) if oid > last_object_id][:limit]
+        # transform lookup
+        object_ids = set(args[0])
+        return [{"transform_object_id": t} for oid, t in self.db.transforms if oid in object_ids]
+
+    async def execute(self, query: str, object_ids):
+        if self.db.fail_delete and "FROM files " in query:
+            raise ConnectionError("db down")
+        if "FROM files " in query:
+            self.db.expired -= {UUID(oid) for oid in object_ids}
+            self.db.deleted_batches.append(len(object_ids))
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.db.transactions += 1
+        yield
+
+
+class FakePool:
+    def __init__(self, count: int, fail_delete: bool = False):
+        self.expired = {UUID(int=i + 1) for i in range(count)}
+        self.transforms = [(str(UUID(int=1)), "transform-1")]
+        self.fail_delete = fail_delete
+        self.pages = 0
+        self.transactions = 0
+        self.deleted_batches: list[int] = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+class FakeStorage:
+    def __init__(self):
+        self.requests: list[list[str]] = []
+
+    def delete_objects(self, object_ids: list[str]) -> int:
+        self.requests.append(object_ids)
+        return len(object_ids)
+
+
+@pytest.mark.asyncio
+async def test_expired_objects_are_purged_in_batches():
+    pool = FakePool(25)
+    storage = FakeStorage()
+    progress = PurgeProgress()
+
+    assert await purge_expired_objects(pool, storage, NOW, progress, batch_size=10)
+
+    assert pool.expired == set()
+    assert pool.deleted_batches == [10, 10, 5]
+    assert pool.transactions == 3  # one short transaction per batch
+    assert [len(ids) for ids in storage.requests] == [11, 10, 5]  # first batch includes its transform
+    assert "transform-1" in storage.requests[0]
+
+    stats = progress.to_dict()
+    assert stats["batches"] == 3
+    assert stats["objects_deleted"] == 25
+    assert stats["transform_objects_deleted"] == 1
+    assert stats["storage_objects_deleted"] == 26
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_skipped_without_refetching():
+    pool = FakePool(25, fail_delete=True)
+    progress = PurgeProgress()
+
+    assert not await purge_expired_objects(pool, FakeStorage(), NOW, progress, batch_size=10)
+
+    # keyset pagination moves past failed batches instead of retrying them forever
+    assert pool.pages == 3
+    assert progress.failed_batches == 3
+    assert progress.objects_deleted == 0
@@ -1,5 +1,19 @@
 """Regression tests for AI synthesis policy-context and override contracts."""
 
+from contextlib import asynccontextmanager
+
+
+@asynccontextmanager
+async def _no_connection():
+    yield object()
+
+
+def _returns(value):
+    async def _fetch(*args, **kwargs):  # noqa: ARG001
+        return value
+
+    return _fetch
+
 
 class _DummyReport:
     def __init__(self, payload: dict):
@@ -22,9 +36,9 @@ class _DummyResponse:
 def test_source_synthesis_returns_policy_context_and_legacy_keys(client, monkeypatch):
     monkeypatch.setattr(
         "web_api.reporting_routes.get_source_report_data",
-        lambda *args, **kwargs: _DummyReport({"summary": {"finding_count": 2}}),
+        _returns(_DummyReport({"summary": {"finding_count": 2}})),
     )
-    monkeypatch.setattr("web_api.main.get_db_pool", lambda: object())
+    monkeypatch.setattr("web_api.main.db.connection", _no_connection)
 
     captured = {}
 
@@ -82,9 +96,9 @@ def test_source_synthesis_returns_policy_context_and_legacy_keys(client, monkeyp
 def test_system_synthesis_builds_default_policy_context_when_upstream_missing(client, monkeypatch):
     monkeypatch.setattr(
         "web_api.reporting_routes.get_system_report_data",
-        lambda *args, **kwargs: _DummyReport({"summary": {"total_sources": 1}}),
+        _returns(_DummyReport({"summary": {"total_sources": 1}})),
     )
-    monkeypatch.setattr("web_api.main.get_db_pool", lambda: object())
+    monkeypatch.setattr("web_api.main.db.connection", _no_connection)
 
     monkeypatch.setattr(
         "web_api.main.requests.post",
@@ -114,9 +128,9 @@ def test_system_synthesis_builds_default_policy_context_when_upstream_missing(cl
 def test_synthesis_failure_returns_fail_safe_policy_context(client, monkeypatch):
     monkeypatch.setattr(
         "web_api.reporting_routes.get_source_report_data",
-        lambda *args, **kwargs: _DummyReport({"summary": {}}),
+        _returns(_DummyReport({"summary": {}})),
     )
-    monkeypatch.setattr("web_api.main.get_db_pool", lambda: object())
+    monkeypatch.setattr("web_api.main.db.connection", _no_connection)
     monkeypatch.setattr(
         "web_api.main.requests.post",
         lambda *args, **kwargs: _DummyResponse(
@@ -30,7 +30,7 @@ def test_upload_lifecycle_download_smoke_contract(client, mock_storage, monkeypa
         captured["file_data"] = file_data
         return UUID(submission_id)
 
-    def _mock_lifecycle_payload(_object_id: str):
+    async def _mock_lifecycle_payload(_object_id: str):
         assert _object_id == object_id
         return {
             "object_id": object_id,
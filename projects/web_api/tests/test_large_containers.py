@@ -0,0 +1,128 @@
+"""Tests for parallel, single-pass extraction of large containers."""
+
+import threading
+import time
+import zipfile
+from unittest.mock import MagicMock
+
+from web_api.container_engine import ByteBudget, ContainerMember, process_members
+from web_api.large_containers import ContainerProgress, ZipContainerExtractor
+
+
+class TestByteBudget:
+    def test_blocks_until_bytes_are_released(self):
+        budget = ByteBudget(100)
+        budget.acquire(60)
+        admitted = threading.Event()
+
+        thread = threading.Thread(target=lambda: (budget.acquire(60), admitted.set()))
+        thread.start()
+        assert not admitted.wait(0.05)
+
+        budget.release(60)
+        assert admitted.wait(1)
+        thread.join()
+        assert budget.in_flight == 60
+
+    def test_oversized_member_is_admitted_when_nothing_is_in_flight(self):
+        budget = ByteBudget(10)
+        budget.acquire(1000)
+        assert budget.in_flight == 1000
+
+
+def test_process_members_runs_concurrently_within_budget():
+    lock = threading.Lock()
+    state = {"active": 0, "max_active": 0, "bytes": 0, "max_bytes": 0}
+    processed = []
+
+    def process(member: ContainerMember):
+        with lock:
+            state["active"] += 1
+            state["bytes"] += member.size
+            state["max_active"] = max(state["max_active"], state["active"])
+            state["max_bytes"] = max(state["max_bytes"], state["bytes"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+            state["bytes"] -= member.size
+            processed.append(member.path)
+        if member.path == "bad":
+            raise RuntimeError("boom")
+
+    members = [ContainerMember(f"f{i}", 40) for i in range(12)] + [ContainerMember("bad", 40)]
+    process_members(iter(members), process, workers=4, max_in_flight_bytes=100)
+
+    assert sorted(processed) == sorted(member.path for member in members)
+    assert state["max_active"] > 1
+    assert state["max_bytes"] <= 100
+
+
+def make_extractor(tmp_path, workers: int = 4):
+    uploads = {}
+    upload_lock = threading.Lock()
+
+    def upload_stream(data, length):
+        content = data.read()
+        assert len(content) == length
+        with upload_lock:
+            object_id = f"obj-{len(uploads)}"
+            uploads[object_id] = content
+        return object_id
+
+    storage = MagicMock()
+    storage.upload_stream.side_effect = upload_stream
+    dapr_client = MagicMock()
+    progress = ContainerProgress()
+    progress.initialize("container-1", 0, 0)
+
+    extractor = ZipContainerExtractor(storage, dapr_client, progress, workers=workers, max_in_flight_bytes=1024)
+    extractor.set_container_info(
+        "container-1",
+        {
+            "agent_id": "agent",
+            "project": "project",
+            "source": "host",
+            "path": str(tmp_path / "archive.zip"),
+            "file_filters": {"exclude": ["*.log"], "pattern_type": "glob"},
+        },
+    )
+    return extractor, uploads, dapr_client, progress
+
+
+def test_zip_members_are_extracted_in_one_pass(tmp_path):
+    archive = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for i in range(20):
+            zf.writestr(f"docs/file{i}.txt", f"content {i}" * (i + 1))
+        zf.writestr("docs/skip.log", "filtered")
+        zf.writestr("../escape.txt", "unsafe")
+        zf.writestr("docs/empty/", "")
+
+    extractor, uploads, dapr_client, progress = make_extractor(tmp_path)
+
+    processed = extractor.extract_and_process(archive)
+
+    assert processed == 20
+    assert sorted(uploads.values()) == sorted((f"content {i}" * (i + 1)).encode() for i in range(20))
+    assert dapr_client.publish_event.call_count == 20
+    assert extractor.filter_stats == {"files_processed": 20, "files_skipped_by_filter": 1, "files_skipped_by_error": 1}
+
+    state = progress.get_progress("container-1")
+    assert state["total_files"] == state["processed_files"] == 20
+    assert state["total_bytes"] == state["processed_bytes"] == sum(len(v) for v in uploads.values())
+    # every per-thread ZipFile handle is closed once extraction finishes
+    assert extractor._sources == []
+
+
+def test_zip_member_errors_are_counted_and_do_not_stop_extraction(tmp_path):
+    archive = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for i in range(5):
+            zf.writestr(f"file{i}.bin", b"x" * 10)
+
+    extractor, _, dapr_client, _ = make_extractor(tmp_path, workers=2)
+    extractor.storage.upload_stream.side_effect = [RuntimeError("s3 down")] + ["obj"] * 4
+
+    assert extractor.extract_and_process(archive) == 4
+    assert dapr_client.publish_event.call_count == 4
+    assert extractor.filter_stats["files_skipped_by_error"] == 1
@@ -91,34 +91,8 @@ def test_llm_auth_status_request_exception_returns_fallback(client, monkeypatch)
     assert payload["message"] == "Failed retrieving LLM auth status from agents service"
 
 
-class _DummyCursor:
-    def execute(self, _query):
-        return None
-
-    def fetchone(self):
-        return (1,)
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, _exc_type, _exc, _tb):
-        return False
-
-
-class _DummyConnection:
-    def cursor(self):
-        return _DummyCursor()
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, _exc_type, _exc, _tb):
-        return False
-
-
-class _DummyPool:
-    def connection(self):
-        return _DummyConnection()
+async def _ping_ok():
+    return None
 
 
 async def _healthy_llm_auth():
@@ -130,7 +104,7 @@ async def _unhealthy_llm_auth():
 
 
 def test_system_health_reports_degraded_when_llm_auth_unavailable(client, monkeypatch):
-    monkeypatch.setattr("web_api.main.get_db_pool", lambda: _DummyPool())
+    monkeypatch.setattr("web_api.main.db.ping", _ping_ok)
     monkeypatch.setattr("web_api.main.get_llm_auth_status", _unhealthy_llm_auth)
 
     response = client.get("/system/health")
@@ -144,10 +118,10 @@ def test_system_health_reports_degraded_when_llm_auth_unavailable(client, monkey
 
 
 def test_system_health_reports_unhealthy_when_postgres_is_down(client, monkeypatch):
-    def _raise_pool():
+    async def _raise_ping():
         raise RuntimeError("connection refused")
 
-    monkeypatch.setattr("web_api.main.get_db_pool", _raise_pool)
+    monkeypatch.setattr("web_api.main.db.ping", _raise_ping)
     monkeypatch.setattr("web_api.main.get_llm_auth_status", _healthy_llm_auth)
 
     response = client.get("/system/health")
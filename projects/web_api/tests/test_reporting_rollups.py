@@ -0,0 +1,140 @@
+"""Tests for building source and system reports from the report_rollups table."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from web_api import reporting_routes
+from web_api.reporting_routes import get_source_report_data, get_system_report_data
+
+FIRST_SEEN = datetime(2026, 2, 1, 8, 0, tzinfo=UTC)
+LAST_SEEN = datetime(2026, 2, 3, 17, 30, tzinfo=UTC)
+
+
+def _rollup(metric: str, key: str, count: int, total_size: int = 0, first_seen=None, last_seen=None) -> dict:
+    return {
+        "metric": metric,
+        "key": key,
+        "count": count,
+        "total_size": total_size,
+        "first_seen": first_seen,
+        "last_seen": last_seen,
+    }
+
+
+ROLLUP_TOTALS = [
+    _rollup("files", "", 6, 6000, FIRST_SEEN, LAST_SEEN),
+    _rollup("extension", ".txt", 3),
+    _rollup("extension", ".exe", 2),
+    _rollup("extension", "", 1),
+    _rollup("findings", "", 5),
+    _rollup("finding_severity", "high", 2),
+    _rollup("finding_severity", "low", 3),
+    _rollup("finding_category", "credential", 4),
+    _rollup("finding_category", "pii", 1),
+    _rollup("finding_origin", "titus", 3),
+    _rollup("finding_origin", "yara_scanner", 2),
+    _rollup("triage", "true_positive", 2),
+    _rollup("triage", "needs_review", 1),
+    _rollup("triage", "untriaged", 2),
+]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.queries: list[tuple[str, tuple]] = []
+
+    async def execute(self, query: str, *args):
+        self.queries.append((query, args))
+
+    async def fetch(self, query: str, *args):
+        self.queries.append((query, args))
+        if query == reporting_routes.ROLLUP_TOTALS_QUERY:
+            return ROLLUP_TOTALS
+        if query == reporting_routes.DAILY_ACTIVITY_QUERY:
+            today = datetime.now(UTC).date()
+            return [{"day": today, "files_submitted": 4, "findings_created": 1}]
+        if query == reporting_routes.SOURCES_QUERY:
+            return [
+                {
+                    "source": "HOST1",
+                    "file_count": 6,
+                    "finding_count": 5,
+                    "verified_findings": 2,
+                    "last_activity": LAST_SEEN,
+                }
+            ]
+        return []
+
+    async def fetchrow(self, query: str, *args):
+        self.queries.append((query, args))
+        if query == reporting_routes.SOURCE_CREDENTIALS_QUERY:
+            return {
+                "chromium_logins": 4,
+                "chromium_logins_decrypted": 1,
+                "chromium_cookies": 0,
+                "chromium_cookies_decrypted": 0,
+                "dpapi_masterkeys": 2,
+                "dpapi_masterkeys_decrypted": 2,
+            }
+        if query == reporting_routes.SYSTEM_CREDENTIALS_QUERY:
+            return {"total_chromium_logins": 4, "decrypted_logins": 1}
+        return {
+            "total_workflows": 6,
+            "completed": 5,
+            "failed": 1,
+            "avg_processing_time": 2.5,
+            "max_processing_time": None,
+        }
+
+
+@pytest.mark.asyncio
+async def test_source_report_is_built_from_rollups():
+    conn = FakeConnection()
+
+    report = await get_source_report_data(conn, "host1", start_date=datetime(2026, 2, 2, 23, 0, tzinfo=UTC))
+
+    assert report.source == "HOST1"
+    # Queued rollup deltas are folded in before anything is read
+    assert conn.queries[0] == (reporting_routes.FOLD_ROLLUPS_QUERY, ())
+    summary = report.summary
+    assert summary["total_files"] == 6
+    assert summary["total_size_bytes"] == 6000
+    assert summary["unique_extensions"] == 2
+    assert summary["file_types"] == {".txt": 3, ".exe": 2, "unknown": 1}
+    assert summary["first_seen"] == FIRST_SEEN.isoformat()
+    assert summary["total_findings"] == 5
+    assert summary["verified_true_positives"] == 2
+    assert summary["untriaged_findings"] == 2
+    assert report.findings_detail["by_severity"] == {"low": 3, "high": 2}
+    assert report.risk_indicators.credentials["titus_findings"] == 3
+    assert report.risk_indicators.sensitive_data["yara_matches"] == 2
+    assert report.enrichment_performance["max_processing_time"] == 0.0
+
+    # Rollups are filtered by the uppercase source and the UTC day of the date filters
+    totals_args = next(args for query, args in conn.queries if query == reporting_routes.ROLLUP_TOTALS_QUERY)
+    assert totals_args == ("HOST1", None, datetime(2026, 2, 2).date(), None)
+
+    timeline = report.timeline["daily_activity"]
+    assert len(timeline) == reporting_routes.TIMELINE_DAYS
+    assert timeline[-1] == {"date": datetime.now(UTC).date().isoformat(), "files_submitted": 4, "findings_created": 1}
+    assert timeline[0]["files_submitted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_system_report_is_built_from_rollups():
+    conn = FakeConnection()
+    end_date = datetime.now(UTC) - timedelta(days=1)
+
+    report = await get_system_report_data(conn, end_date=end_date, project="proj")
+
+    assert [query for query, _ in conn.queries].count(reporting_routes.FOLD_ROLLUPS_QUERY) == 1
+    assert conn.queries[0] == (reporting_routes.FOLD_ROLLUPS_QUERY, ())
+    assert report.summary["total_sources"] == 1
+    assert report.summary["total_files"] == 6
+    assert report.summary["verified_true_positives"] == 2
+    assert report.sources[0].source == "HOST1"
+    assert report.findings_by_category == {"credential": 4, "pii": 1}
+    # The timeline window is narrowed to the date filters
+    daily_args = next(args for query, args in conn.queries if query == reporting_routes.DAILY_ACTIVITY_QUERY)
+    assert daily_args[:2] == (None, "proj")
+    assert daily_args[3] == end_date.date()
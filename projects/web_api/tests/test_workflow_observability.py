@@ -1,8 +1,13 @@
 """Regression tests for workflow observability lifecycle, summary, and alert gates."""
 
+import json
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
 
+import pytest
 import web_api.main as web_main
+from common.workflows.metrics import METRICS_ROW as WORKFLOW_METRICS_ROW
+from common.workflows.metrics import LatencySketch
 
 
 def _summary_payload(queue_severity: str, workflow_severity: str = "normal", health_severity: str = "normal") -> dict:
@@ -34,7 +39,7 @@ def _summary_payload(queue_severity: str, workflow_severity: str = "normal", hea
 
 
 def test_workflow_lifecycle_route_returns_correlated_payload(client, monkeypatch):
-    def _mock_fetch(_object_id: str):
+    async def _mock_fetch(_object_id: str):
         return {
             "object_id": "abc-123",
             "ingestion": {
@@ -89,7 +94,10 @@ def test_workflow_lifecycle_route_returns_correlated_payload(client, monkeypatch
 
 
 def test_workflow_lifecycle_route_returns_404_for_missing_object(client, monkeypatch):
-    monkeypatch.setattr("web_api.main._fetch_object_lifecycle_payload", lambda _object_id: None)
+    async def _mock_fetch(_object_id: str):
+        return None
+
+    monkeypatch.setattr("web_api.main._fetch_object_lifecycle_payload", _mock_fetch)
 
     response = client.get("/workflows/lifecycle/missing-id")
     assert response.status_code == 404
@@ -302,3 +310,52 @@ def test_throughput_policy_status_endpoint_returns_class_and_queue_state(client,
     assert payload["queue_pressure_level"] in {"warning", "critical"}
     assert any(state["queue"] == "new_file" for state in payload["queue_states"])
     assert any(state["class_name"] == "expensive" for state in payload["class_states"])
+
+
+def test_workflow_status_reads_metrics_row_and_running_workflows(client, monkeypatch):
+    sketch = LatencySketch()
+    for runtime in (1.0, 2.0, 3.0, 4.0, 5.0):
+        sketch.add(runtime)
+    started = datetime(2026, 2, 25, 0, 0, tzinfo=UTC)
+
+    class _FakeConnection:
+        async def fetchrow(self, query, *args):
+            assert args == (WORKFLOW_METRICS_ROW,)
+            # asyncpg returns jsonb columns as text
+            return {
+                "status_counts": json.dumps({"COMPLETED": 5, "FAILED": 1, "RUNNING": 1, "ERROR": 0}),
+                "runtime_sketch": json.dumps(sketch.to_dict()),
+            }
+
+        async def fetch(self, query, *args):
+            return [
+                {
+                    "wf_id": "wf-1",
+                    "object_id": "abc-123",
+                    "status": "RUNNING",
+                    "runtime_seconds": 12.5,
+                    "start_time": started,
+                    "enrichments_success": ["yara"],
+                    "enrichments_failure": None,
+                    "filename": "example.txt",
+                }
+            ]
+
+    @asynccontextmanager
+    async def _connection():
+        yield _FakeConnection()
+
+    monkeypatch.setattr("web_api.main.db.connection", _connection)
+
+    response = client.get("/workflows/status")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["status_counts"] == {"COMPLETED": 5, "FAILED": 1, "RUNNING": 1}
+    assert payload["active_workflows"] == 1
+    assert payload["active_details"][0]["success_modules"] == ["yara"]
+    metrics = payload["metrics"]
+    assert metrics["success_rate"] == 83.33
+    assert metrics["processing_times"]["samples_count"] == 5
+    assert metrics["processing_times"]["max_seconds"] == 5.0
+    assert metrics["processing_times"]["p50_seconds"] == pytest.approx(3.0, rel=0.02)
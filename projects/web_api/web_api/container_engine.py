@@ -0,0 +1,83 @@
+"""Worker pool used to read, upload and publish container members concurrently.
+
+Members are discovered by a single producer (the walk over the ZIP central directory or the
+filesystem inside a disk image) and handed to a thread pool. A byte budget bounds how much member
+data can be read but not yet uploaded at any time, so a slow object store applies backpressure to
+the walk instead of letting spooled members pile up.
+"""
+
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ContainerMember:
+    """A regular file inside a container, queued for extraction."""
+
+    path: str
+    size: int
+    # Extractor-specific handle used to read the member (ZipInfo, filesystem inode address)
+    ref: Any = None
+
+
+class ByteBudget:
+    """Limits the total size of members in flight across worker threads."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> None:
+        """Block until `size` bytes fit in the budget.
+
+        A member larger than the whole budget is admitted once nothing else is in flight, so it is
+        processed on its own rather than blocking forever.
+        """
+        with self._condition:
+            while self.in_flight and self.in_flight + size > self.limit:
+                self._condition.wait()
+            self.in_flight += size
+
+    def release(self, size: int) -> None:
+        with self._condition:
+            self.in_flight -= size
+            self._condition.notify_all()
+
+
+def process_members(
+    members: Iterable[ContainerMember],
+    process: Callable[[ContainerMember], None],
+    workers: int,
+    max_in_flight_bytes: int,
+) -> None:
+    """Run `process` for every member on `workers` threads, within a byte budget.
+
+    `process` is expected to handle its own per-member errors; anything it raises is logged and
+    does not stop the remaining members. Returns once every submitted member has been processed.
+    """
+    budget = ByteBudget(max_in_flight_bytes)
+    # Also bound the number of queued members, so zero-byte members can't queue without limit
+    slots = threading.BoundedSemaphore(max(workers, 1) * 4)
+
+    def run(member: ContainerMember) -> None:
+        try:
+            process(member)
+        except Exception:
+            logger.exception("Unhandled error processing container member", path=member.path)
+        finally:
+            budget.release(member.size)
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="container-member") as executor:
+        for member in members:
+            slots.acquire()
+            budget.acquire(member.size)
+            executor.submit(run, member)
@@ -0,0 +1,131 @@
+"""Async Postgres access for the web API's hot endpoints.
+
+Uses the same asyncpg pool, acquire-time histogram and pool gauges (`common.db`) as the other services.
+Queries are module-level constants so every connection reuses asyncpg's cached prepared statement for
+them instead of re-parsing and re-planning the SQL on each request.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import asyncpg
+from common.db import acquire_with_timing, create_connection_pool, pool_stats_logger
+from common.logger import get_logger
+from dapr.aio.clients import DaprClient
+
+logger = get_logger(__name__)
+
+POOL_STATS_INTERVAL = 30
+
+_pool: asyncpg.Pool | None = None
+_pool_lock = asyncio.Lock()
+_pool_stats_task: asyncio.Task | None = None
+
+WORKFLOW_METRICS_QUERY = "SELECT status_counts, runtime_sketch FROM workflow_metrics WHERE name = $1"
+
+RUNNING_WORKFLOWS_QUERY = """
+    SELECT
+        wf_id,
+        object_id,
+        status,
+        EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - start_time))::float8 AS runtime_seconds,
+        start_time,
+        enrichments_success,
+        enrichments_failure,
+        filename
+    FROM workflows
+    WHERE status = 'RUNNING'
+"""
+
+FAILED_WORKFLOWS_QUERY = """
+    SELECT
+        wf_id AS id,
+        object_id,
+        status,
+        runtime_seconds,
+        start_time,
+        enrichments_failure,
+        filename
+    FROM workflows
+    WHERE status IN ('FAILED', 'ERROR', 'TIMEOUT')
+    ORDER BY start_time DESC
+    LIMIT $1
+"""
+
+ENRICHED_FILE_QUERY = """
+    SELECT object_id, agent_id, source, project, path, file_name, timestamp, created_at
+    FROM files_enriched
+    WHERE object_id = $1
+"""
+
+FILE_QUERY = """
+    SELECT object_id, agent_id, source, project, path, NULL::text AS file_name, timestamp, created_at
+    FROM files
+    WHERE object_id = $1
+"""
+
+OBJECT_WORKFLOWS_QUERY = """
+    SELECT
+        wf_id,
+        status,
+        start_time,
+        runtime_seconds,
+        filename,
+        enrichments_success,
+        enrichments_failure
+    FROM workflows
+    WHERE object_id = $1
+    ORDER BY start_time DESC
+"""
+
+OBJECT_PUBLICATION_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM enrichments WHERE object_id = $1) AS enrichments_count,
+        (SELECT MAX(created_at) FROM enrichments WHERE object_id = $1) AS last_enrichment_at,
+        (SELECT COUNT(*) FROM transforms WHERE object_id = $1) AS transforms_count,
+        (SELECT MAX(created_at) FROM transforms WHERE object_id = $1) AS last_transform_at,
+        (SELECT COUNT(*) FROM findings WHERE object_id = $1) AS findings_count,
+        (SELECT MAX(created_at) FROM findings WHERE object_id = $1) AS last_finding_at
+"""
+
+ENRICHED_OBJECT_IDS_QUERY = "SELECT object_id FROM files_enriched ORDER BY created_at"
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the process-wide asyncpg pool, creating it (and its stats reporting) on first use."""
+    global _pool, _pool_stats_task
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                async with DaprClient() as dapr_client:
+                    _pool = await create_connection_pool(dapr_client)
+                _pool_stats_task = asyncio.create_task(pool_stats_logger(_pool, logger, interval=POOL_STATS_INTERVAL))
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool, _pool_stats_task
+    if _pool_stats_task is not None:
+        _pool_stats_task.cancel()
+        try:
+            await _pool_stats_task
+        except asyncio.CancelledError:
+            pass
+        _pool_stats_task = None
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+@asynccontextmanager
+async def connection() -> AsyncIterator[asyncpg.Connection]:
+    """Acquire a pooled connection, recording the wait in the pool acquire histogram."""
+    pool = await get_pool()
+    async with acquire_with_timing(pool, logger) as conn:
+        yield conn
+
+
+async def ping() -> None:
+    async with connection() as conn:
+        await conn.fetchval("SELECT 1")
@@ -1,11 +1,14 @@
 import json
 import os
 import re
+import shutil
 import tempfile
+import threading
 import zipfile
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 import psycopg
 import pytsk3
@@ -17,6 +20,7 @@ from common.queues import FILES_NEW_FILE_TOPIC, FILES_PUBSUB
 from common.storage import StorageS3
 from dapr.clients import DaprClient
 from fastapi import HTTPException
+from web_api.container_engine import ContainerMember, process_members
 
 logger = get_logger(__name__)
 
@@ -26,6 +30,14 @@ DAPR_STORE_NAME = "container_processing"
 MOUNTED_CONTAINER_PATH = os.getenv("MOUNTED_CONTAINER_PATH", "/mounted-containers/")
 DEFAULT_EXPIRATION_DAYS = int(os.getenv("DEFAULT_EXPIRATION_DAYS", 100))
 
+# Worker threads reading, uploading and publishing container members
+CONTAINER_EXTRACTION_WORKERS = int(os.getenv("CONTAINER_EXTRACTION_WORKERS", 8))
+# Member bytes that may be read but not yet uploaded at any one time
+CONTAINER_MAX_IN_FLIGHT_BYTES = int(os.getenv("CONTAINER_MAX_IN_FLIGHT_MB", 512)) * 1024 * 1024
+# Members larger than this are spooled to a temporary file instead of memory
+MEMBER_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+MEMBER_READ_CHUNK_SIZE = 1024 * 1024
+
 
 class ContainerStatus:
     """Container processing status enumeration"""
@@ -50,6 +62,8 @@ class ContainerProgress:
 
     def __init__(self):
         self._progress: dict[str, dict[str, Any]] = {}
+        # Extraction workers update progress concurrently
+        self._lock = threading.Lock()
 
     def initialize(self, container_id: str, total_files: int, total_bytes: int):
         """Initialize progress tracking for a container"""
@@ -62,13 +76,22 @@ class ContainerProgress:
             "started_at": datetime.now(),
         }
 
+    def add_discovered_file(self, container_id: str, file_size: int):
+        """Grow the totals as files are discovered during single-pass extraction"""
+        with self._lock:
+            if container_id in self._progress:
+                progress = self._progress[container_id]
+                progress["total_files"] += 1
+                progress["total_bytes"] += file_size
+
     def update_file_progress(self, container_id: str, filename: str, file_size: int):
         """Update progress for a processed file"""
-        if container_id in self._progress:
-            progress = self._progress[container_id]
-            progress["processed_files"] += 1
-            progress["processed_bytes"] += file_size
-            progress["current_file"] = filename
+        with self._lock:
+            if container_id in self._progress:
+                progress = self._progress[container_id]
+                progress["processed_files"] += 1
+                progress["processed_bytes"] += file_size
+                progress["current_file"] = filename
 
     def get_progress(self, container_id: str) -> dict[str, Any] | None:
         """Get current progress for a container"""
@@ -91,14 +114,29 @@ class ContainerProgress:
 class BaseContainerExtractor:
     """Base class for container extractors"""
 
-    def __init__(self, storage: StorageS3, dapr_client: DaprClient, progress_tracker: ContainerProgress):
+    def __init__(
+        self,
+        storage: StorageS3,
+        dapr_client: DaprClient,
+        progress_tracker: ContainerProgress,
+        workers: int = CONTAINER_EXTRACTION_WORKERS,
+        max_in_flight_bytes: int = CONTAINER_MAX_IN_FLIGHT_BYTES,
+    ):
         self.storage = storage
         self.dapr_client = dapr_client
         self.progress_tracker = progress_tracker
+        self.workers = workers
+        self.max_in_flight_bytes = max_in_flight_bytes
         self.container_id: str | None = None
         self.file_metadata: dict[str, Any] | None = None
         self.file_filter = FilePathFilter()
         self.filter_stats = {"files_processed": 0, "files_skipped_by_filter": 0, "files_skipped_by_error": 0}
+        self._stats_lock = threading.Lock()
+
+        # Each worker thread reads members through its own handle on the container
+        self.container_file_path: Path | None = None
+        self._local = threading.local()
+        self._sources: list[Any] = []
 
     def set_container_info(self, container_id: str, file_metadata: dict[str, Any]):
         """Set container processing information"""
@@ -135,7 +173,7 @@ class BaseContainerExtractor:
         should_include = self.file_filter.should_include_file(file_path)
 
         if not should_include:
-            self.filter_stats["files_skipped_by_filter"] += 1
+            self.count_stat("files_skipped_by_filter")
         #     logger.debug(
         #         "File skipped by filter",
         #         container_id=self.container_id,
@@ -150,7 +188,26 @@ class BaseContainerExtractor:
 
         return should_include
 
-    def publish_file_message(self, temp_file_path: str, object_id: str, real_path: str):
+    def count_stat(self, name: str):
+        """Increment a processing statistic (safe to call from worker threads)"""
+        with self._stats_lock:
+            self.filter_stats[name] += 1
+
+    def is_safe_member(self, file_path: str) -> bool:
+        """Security checks applied to every member path before extraction"""
+        if file_path.startswith("/") or ".." in file_path:
+            logger.warning(f"Skipping unsafe path: {file_path}")
+            self.count_stat("files_skipped_by_error")
+            return False
+
+        if len(os.path.basename(file_path)) > 255:
+            logger.warning(f"Skipping filename too long: {file_path}")
+            self.count_stat("files_skipped_by_error")
+            return False
+
+        return True
+
+    def publish_file_message(self, object_id: str, real_path: str, file_size: int):
         """Publish file message to the message bus"""
         if self.file_metadata is None or self.container_id is None:
             raise RuntimeError("container_id and file_metadata must be set via set_container_info before publishing")
@@ -176,9 +233,8 @@ class BaseContainerExtractor:
         )
 
         # Update progress and stats
-        file_size = os.path.getsize(temp_file_path)
         self.progress_tracker.update_file_progress(self.container_id, os.path.basename(real_path), file_size)
-        self.filter_stats["files_processed"] += 1
+        self.count_stat("files_processed")
 
         logger.info(
             "Published file message for extracted file",
@@ -195,12 +251,104 @@ class BaseContainerExtractor:
         }
 
     def extract_and_process(self, container_file_path: Path) -> int:
-        """Extract container and process files sequentially. Returns number of files processed."""
-        raise NotImplementedError("Subclasses must implement extract_and_process")
+        """Extract the container in a single pass, reading, uploading and publishing members on a
+        pool of worker threads. Returns number of files processed."""
+        if self.file_metadata is None:
+            raise RuntimeError("file_metadata must be set via set_container_info before extraction")
+
+        self.container_file_path = container_file_path
+        try:
+            process_members(
+                self.discover_members(container_file_path),
+                self.process_member,
+                self.workers,
+                self.max_in_flight_bytes,
+            )
+        except Exception as e:
+            logger.exception(f"Error extracting container: {e}")
+            raise
+        finally:
+            self.close_sources()
+
+        # Log final statistics
+        stats = self.get_processing_stats()
+        logger.info("Container extraction completed", container_id=self.container_id, stats=stats)
+
+        return self.filter_stats["files_processed"]
+
+    def discover_members(self, container_file_path: Path) -> Iterator[ContainerMember]:
+        """Yield the members to extract, counting each towards the progress totals as it is found"""
+        for member in self.iter_members(container_file_path):
+            if not self.is_safe_member(member.path):
+                continue
+
+            # Apply file filters
+            if not self.should_process_file(member.path):
+                continue
+
+            if self.container_id is not None:
+                self.progress_tracker.add_discovered_file(self.container_id, member.size)
+            yield member
+
+    def process_member(self, member: ContainerMember):
+        """Read a member into a spooled temporary file, upload it and publish its file message"""
+        if self.file_metadata is None:
+            raise RuntimeError("file_metadata must be set via set_container_info before processing")
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_MAX_MEMORY) as spool:
+                file_size = self.read_member(member, spool)
+                spool.seek(0)
+                object_id = self.storage.upload_stream(spool, file_size)
 
-    def estimate_container_contents(self, container_file_path: Path) -> tuple[int, int]:
-        """Estimate number of files and total size. Returns (file_count, total_size)."""
-        raise NotImplementedError("Subclasses must implement estimate_container_contents")
+            # Calculate real path
+            base_dir = os.path.dirname(self.file_metadata["path"])
+            real_path = os.path.join(base_dir, member.path).removeprefix(MOUNTED_CONTAINER_PATH)
+
+            self.publish_file_message(str(object_id), real_path, file_size)
+
+        except Exception as e:
+            logger.warning(f"Error processing file {member.path}: {e}")
+            self.count_stat("files_skipped_by_error")
+
+    def get_source(self) -> Any:
+        """Return the calling thread's handle on the container, opening it on first use"""
+        source = getattr(self._local, "source", None)
+        if source is None:
+            if self.container_file_path is None:
+                raise RuntimeError("container_file_path must be set before reading members")
+            source = self.open_source(self.container_file_path)
+            self._local.source = source
+            with self._stats_lock:
+                self._sources.append(source)
+        return source
+
+    def close_sources(self):
+        """Close every per-thread handle opened during extraction"""
+        with self._stats_lock:
+            sources, self._sources = self._sources, []
+        self._local = threading.local()
+
+        for source in sources:
+            try:
+                self.close_source(source)
+            except Exception as e:
+                logger.debug(f"Error closing container handle: {e}")
+
+    def iter_members(self, container_file_path: Path) -> Iterator[ContainerMember]:
+        """Yield the regular files in the container, before security checks and filters."""
+        raise NotImplementedError("Subclasses must implement iter_members")
+
+    def open_source(self, container_file_path: Path) -> Any:
+        """Open a handle on the container for reading members from one thread."""
+        raise NotImplementedError("Subclasses must implement open_source")
+
+    def close_source(self, source: Any):
+        """Close a handle returned by open_source."""
+        raise NotImplementedError("Subclasses must implement close_source")
+
+    def read_member(self, member: ContainerMember, out: BinaryIO) -> int:
+        """Copy a member's content to `out`. Returns the number of bytes written."""
+        raise NotImplementedError("Subclasses must implement read_member")
 
 
 class FilePathFilter:
@@ -336,315 +484,113 @@ class FilePathFilter:
 
 
 class ZipContainerExtractor(BaseContainerExtractor):
-    """ZIP file extractor that processes files sequentially with filtering"""
-
-    def estimate_container_contents(self, container_file_path: Path) -> tuple[int, int]:
-        """Estimate ZIP contents with filtering"""
-        try:
-            with zipfile.ZipFile(container_file_path, "r") as zip_ref:
-                file_count = 0
-                total_size = 0
-
-                for info in zip_ref.infolist():
-                    if info.is_dir():
-                        continue
-
-                    # Security checks (same as extraction)
-                    if info.filename.startswith("/") or ".." in info.filename:
-                        continue
-
-                    if len(os.path.basename(info.filename)) > 255:
-                        continue
-
-                    # Apply file filters
-                    if not self.should_process_file(info.filename):
-                        continue
-
-                    file_count += 1
-                    total_size += info.file_size
-
-                return file_count, total_size
-        except Exception as e:
-            logger.warning(f"Error estimating ZIP contents: {e}")
-            return 0, 0
-
-    def extract_and_process(self, container_file_path: Path) -> int:
-        """Extract ZIP file and process each file individually with filtering"""
-        if self.file_metadata is None:
-            raise RuntimeError("file_metadata must be set via set_container_info before extraction")
-        processed_count = 0
-
-        try:
-            with zipfile.ZipFile(container_file_path, "r") as zip_ref:
-                for info in zip_ref.infolist():
-                    if info.is_dir():
-                        continue
-
-                    # Security checks
-                    if info.filename.startswith("/") or ".." in info.filename:
-                        logger.warning(f"Skipping unsafe path: {info.filename}")
-                        self.filter_stats["files_skipped_by_error"] += 1
-                        continue
-
-                    if len(os.path.basename(info.filename)) > 255:
-                        logger.warning(f"Skipping filename too long: {info.filename}")
-                        self.filter_stats["files_skipped_by_error"] += 1
-                        continue
-
-                    # Apply file filters
-                    if not self.should_process_file(info.filename):
-                        continue  # Skip this file due to filter
-
-                    try:
-                        # Extract single file to temporary location
-                        with tempfile.NamedTemporaryFile(delete=False) as temp_extracted:
-                            temp_extracted.write(zip_ref.read(info))
-                            temp_extracted.flush()
-
-                            # Upload to storage
-                            object_id = self.storage.upload_file(temp_extracted.name)
-
-                            # Calculate real path
-                            base_dir = os.path.dirname(self.file_metadata["path"])
-                            real_path = os.path.join(base_dir, info.filename).removeprefix(MOUNTED_CONTAINER_PATH)
+    """ZIP file extractor that processes members concurrently with filtering"""
 
-                            # Publish file message
-                            self.publish_file_message(temp_extracted.name, str(object_id), real_path)
-                            processed_count += 1
+    def iter_members(self, container_file_path: Path) -> Iterator[ContainerMember]:
+        """Yield ZIP members from the central directory"""
+        with zipfile.ZipFile(container_file_path, "r") as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    continue
+                yield ContainerMember(info.filename, info.file_size, info)
 
-                    except Exception as e:
-                        logger.warning(f"Error processing file {info.filename}: {e}")
-                        self.filter_stats["files_skipped_by_error"] += 1
-                    finally:
-                        # Clean up temporary file
-                        if "temp_extracted" in locals() and os.path.exists(temp_extracted.name):
-                            os.unlink(temp_extracted.name)
+    def open_source(self, container_file_path: Path) -> zipfile.ZipFile:
+        return zipfile.ZipFile(container_file_path, "r")
 
-        except Exception as e:
-            logger.exception(f"Error extracting ZIP file: {e}")
-            raise
-
-        # Log final statistics
-        stats = self.get_processing_stats()
-        logger.info("Container extraction completed", container_id=self.container_id, stats=stats)
+    def close_source(self, source: zipfile.ZipFile):
+        source.close()
 
-        return processed_count
+    def read_member(self, member: ContainerMember, out: BinaryIO) -> int:
+        with self.get_source().open(member.ref) as member_file:
+            shutil.copyfileobj(member_file, out, MEMBER_READ_CHUNK_SIZE)
+        return out.tell()
 
 
 class DDImageContainerExtractor(BaseContainerExtractor):
     """DD disk image extractor that processes files from filesystem structures"""
 
-    def estimate_container_contents(self, container_file_path: Path) -> tuple[int, int]:
-        """Estimate DD image contents by parsing filesystem with filtering"""
-        try:
-            # Open the image file directly
-            img_info = pytsk3.Img_Info(str(container_file_path))
+    def iter_members(self, container_file_path: Path) -> Iterator[ContainerMember]:
+        """Walk the image's filesystem, yielding non-empty regular files as they are found"""
+        # Open the image file directly
+        img_info = pytsk3.Img_Info(str(container_file_path))
 
+        try:
             # Try to open the filesystem
-            try:
-                fs_info = pytsk3.FS_Info(img_info)
-
-                # Walk the filesystem to count files and calculate size
-                file_count = 0
-                total_size = 0
-
-                def walk_directory(directory, path="", stack=None):
-                    """Recursively walk directory to count files with filtering"""
-                    nonlocal file_count, total_size
-
-                    if stack is None:
-                        stack = []
-
-                    for entry in directory:
-                        # Skip . and .. entries
-                        if entry.info.name.name in [b".", b".."]:
-                            continue
-
-                        # Skip if entry doesn't have metadata
-                        if not hasattr(entry.info.meta, "type"):
-                            continue
-
-                        try:
-                            # Get the file name
-                            filename = entry.info.name.name.decode("utf-8", errors="replace")
-                            file_path = os.path.join(path, filename)
-
-                            # If it's a directory, recurse
-                            if entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_DIR:
-                                try:
-                                    sub_directory = entry.as_directory()
-                                    # Prevent infinite loops
-                                    inode = entry.info.meta.addr
-                                    if inode not in stack:
-                                        walk_directory(sub_directory, file_path, stack + [inode])
-                                except Exception:
-                                    # Some directories might not be accessible
-                                    pass
-                            # If it's a regular file, count it with filtering
-                            elif entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_REG:
-                                # Security checks (same as extraction)
-                                if file_path.startswith("/") or ".." in file_path:
-                                    continue
-
-                                if len(os.path.basename(filename)) > 255:
-                                    continue
-
-                                # Apply file filters
-                                if not self.should_process_file(file_path):
-                                    continue
-
-                                # Skip empty files (same as extraction)
-                                if entry.info.meta.size == 0:
-                                    continue
-
-                                # logger.debug(f"file_path: {file_path}")
-                                file_count += 1
-                                if hasattr(entry.info.meta, "size"):
-                                    total_size += entry.info.meta.size
-
-                        except Exception:
-                            # Skip entries that can't be processed
-                            continue
-
-                # Start walking from root
-                root_dir = fs_info.open_dir(path="/")
-                walk_directory(root_dir)
-
-            except Exception as e:
-                logger.warning(f"Could not parse filesystem, will return 0 estimates: {e}")
-                file_count = 0
-                total_size = 0
-
-            return file_count, total_size
-
+            fs_info = pytsk3.FS_Info(img_info)
+            root_dir = fs_info.open_dir(path="/")
         except Exception as e:
-            logger.warning(f"Error estimating DD image contents: {e}")
-            return 0, 0
-
-    def extract_and_process(self, container_file_path: Path) -> int:
-        """Extract DD image and process each file individually with filtering"""
-        if self.file_metadata is None:
-            raise RuntimeError("file_metadata must be set via set_container_info before extraction")
-        processed_count = 0
+            logger.exception(f"Could not parse filesystem: {e}")
+            img_info.close()
+            return
 
         try:
-            # Open the image file directly
-            img_info = pytsk3.Img_Info(str(container_file_path))
-
+            yield from self._walk_directory(root_dir, "", [])
+        finally:
+            img_info.close()
+
+    def _walk_directory(self, directory, path: str, stack: list[int]) -> Iterator[ContainerMember]:
+        """Recursively walk a directory, skipping directories already on the current path"""
+        for entry in directory:
+            # Skip . and .. entries
+            if entry.info.name.name in [b".", b".."]:
+                continue
+
+            # Skip if entry doesn't have metadata
+            if not hasattr(entry.info.meta, "type"):
+                continue
+
+            member = None
             try:
-                # Try to open the filesystem
-                fs_info = pytsk3.FS_Info(img_info)
+                # Get the file name
+                filename = entry.info.name.name.decode("utf-8", errors="replace")
+                file_path = os.path.join(path, filename)
+
+                # If it's a directory, recurse
+                if entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_DIR:
+                    inode = entry.info.meta.addr
+                    if inode in stack:
+                        continue
+                    try:
+                        sub_directory = entry.as_directory()
+                    except Exception as e:
+                        logger.debug(f"Could not access directory {file_path}: {e}")
+                        continue
+                    yield from self._walk_directory(sub_directory, file_path, stack + [inode])
 
-                # Process files from the filesystem
-                processed_count = self._process_filesystem(fs_info, img_info)
+                # If it's a regular file, queue it for processing
+                elif entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_REG:
+                    # Skip empty files
+                    if entry.info.meta.size == 0:
+                        logger.debug(f"Skipping empty file: {file_path}")
+                        continue
+                    member = ContainerMember(file_path, entry.info.meta.size, entry.info.meta.addr)
 
             except Exception as e:
-                logger.exception(f"Could not parse filesystem: {e}")
-
-        except Exception as e:
-            logger.exception(f"Error extracting DD image: {e}")
-            raise
-
-        # Log final statistics
-        stats = self.get_processing_stats()
-        logger.info("Container extraction completed", container_id=self.container_id, stats=stats)
-
-        return processed_count
-
-    def _process_filesystem(self, fs_info: pytsk3.FS_Info, img_info: pytsk3.Img_Info) -> int:
-        """Process files from a parsed filesystem"""
-        if self.file_metadata is None:
-            raise RuntimeError("file_metadata must be set via set_container_info before processing")
-        file_metadata = self.file_metadata
-        processed_count = 0
+                logger.warning(f"Error processing entry: {e}")
+                self.count_stat("files_skipped_by_error")
 
-        def process_directory(directory, path=""):
-            """Recursively process files in directory"""
-            nonlocal processed_count
+            if member is not None:
+                yield member
 
-            for entry in directory:
-                # Skip . and .. entries
-                if entry.info.name.name in [b".", b".."]:
-                    continue
+    def open_source(self, container_file_path: Path) -> tuple[pytsk3.Img_Info, pytsk3.FS_Info]:
+        img_info = pytsk3.Img_Info(str(container_file_path))
+        return img_info, pytsk3.FS_Info(img_info)
 
-                # Skip if entry doesn't have metadata
-                if not hasattr(entry.info.meta, "type"):
-                    continue
+    def close_source(self, source: tuple[pytsk3.Img_Info, pytsk3.FS_Info]):
+        source[0].close()
 
-                try:
-                    # Get the file name
-                    filename = entry.info.name.name.decode("utf-8", errors="replace")
-                    file_path = os.path.join(path, filename)
-
-                    # If it's a directory, recurse
-                    if entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_DIR:
-                        try:
-                            sub_directory = entry.as_directory()
-                            process_directory(sub_directory, file_path)
-                        except Exception as e:
-                            logger.debug(f"Could not access directory {file_path}: {e}")
-
-                    # If it's a regular file, process it
-                    elif entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_REG:
-                        # Security checks
-                        if file_path.startswith("/") or ".." in file_path:
-                            logger.warning(f"Skipping unsafe path: {file_path}")
-                            self.filter_stats["files_skipped_by_error"] += 1
-                            continue
-
-                        if len(os.path.basename(filename)) > 255:
-                            logger.warning(f"Skipping filename too long: {file_path}")
-                            self.filter_stats["files_skipped_by_error"] += 1
-                            continue
-
-                        # Apply file filters
-                        if not self.should_process_file(file_path):
-                            continue
-
-                        # Skip empty files
-                        if entry.info.meta.size == 0:
-                            logger.debug(f"Skipping empty file: {file_path}")
-                            continue
-
-                        try:
-                            # Read file content
-                            file_content = entry.read_random(0, entry.info.meta.size)
-
-                            # Save to temporary file and upload
-                            with tempfile.NamedTemporaryFile(delete=False) as temp_extracted:
-                                temp_extracted.write(file_content)
-                                temp_extracted.flush()
-
-                                # Upload to storage
-                                object_id = self.storage.upload_file(temp_extracted.name)
-
-                                # Calculate real path
-                                base_dir = os.path.dirname(file_metadata["path"])
-                                real_path = os.path.join(base_dir, file_path).removeprefix(MOUNTED_CONTAINER_PATH)
-
-                                # Publish file message
-                                self.publish_file_message(temp_extracted.name, str(object_id), real_path)
-                                processed_count += 1
-
-                                # Clean up temporary file
-                                os.unlink(temp_extracted.name)
-
-                        except Exception as e:
-                            logger.warning(f"Error processing file {file_path}: {e}")
-                            self.filter_stats["files_skipped_by_error"] += 1
-
-                except Exception as e:
-                    logger.warning(f"Error processing entry: {e}")
-                    self.filter_stats["files_skipped_by_error"] += 1
-
-        # Start processing from root
-        try:
-            root_dir = fs_info.open_dir(path="/")
-            process_directory(root_dir)
-        except Exception as e:
-            logger.error(f"Error opening root directory: {e}")
+    def read_member(self, member: ContainerMember, out: BinaryIO) -> int:
+        _, fs_info = self.get_source()
+        file_obj = fs_info.open_meta(inode=member.ref)
 
-        return processed_count
+        offset = 0
+        while offset < member.size:
+            data = file_obj.read_random(offset, min(MEMBER_READ_CHUNK_SIZE, member.size - offset))
+            if not data:
+                break
+            out.write(data)
+            offset += len(data)
+        return offset
 
 
 class LargeContainerProcessor:
@@ -733,6 +679,9 @@ class LargeContainerProcessor:
     ) -> None:
         """Update container extraction completion in database (called when extraction is done)
 
+        Members are discovered while they are extracted, so this is also where the final number of
+        files to expect workflows for is recorded.
+
         Args:
             container_id: Container UUID
             total_files_extracted: Final number of files extracted
@@ -754,10 +703,17 @@ class LargeContainerProcessor:
                         UPDATE container_processing
                         SET total_files_extracted = %s,
                             total_bytes_extracted = %s,
+                            workflows_total = %s,
                             status = %s
                         WHERE container_id = %s
                     """,
-                        (total_files_extracted, total_bytes_extracted, ContainerStatus.EXTRACTED, container_id),
+                        (
+                            total_files_extracted,
+                            total_bytes_extracted,
+                            total_files_extracted,
+                            ContainerStatus.EXTRACTED,
+                            container_id,
+                        ),
                     )
                     rows_affected = cur.rowcount
                     conn.commit()
@@ -809,7 +765,11 @@ class LargeContainerProcessor:
     def update_container_workflow_progress(
         self, container_id: str, file_size: int = 0, increment_completed: bool = False, increment_failed: bool = False
     ) -> bool:
-        """Update workflow completion progress and return True if all workflows are complete"""
+        """Update workflow completion progress and return True if all workflows are complete
+
+        Workflows can complete while the container is still being extracted, before workflows_total
+        is final, so the container is only marked complete once extraction has finished.
+        """
         try:
             with psycopg.connect(self.postgres_connection_string) as conn:
                 with conn.cursor() as cur:
@@ -837,7 +797,7 @@ class LargeContainerProcessor:
                     # Check if all workflows are complete
                     cur.execute(
                         """
-                        SELECT workflows_completed, workflows_failed, workflows_total
+                        SELECT workflows_completed, workflows_failed, workflows_total, status
                         FROM container_processing
                         WHERE container_id = %s
                     """,
@@ -846,8 +806,8 @@ class LargeContainerProcessor:
 
                     row = cur.fetchone()
                     if row:
-                        completed, failed, total = row
-                        all_complete = (completed + failed) >= total
+                        completed, failed, total, status = row
+                        all_complete = status == ContainerStatus.EXTRACTED and (completed + failed) >= total
 
                         if all_complete:
                             cur.execute(
@@ -968,15 +928,11 @@ class LargeContainerProcessor:
                 extractor = extractor_class(self.storage, dapr_client, self.progress_tracker)
                 extractor.set_container_info(container_id, metadata)
 
-                # Estimate contents for progress tracking and create database record
-                file_count, total_size = extractor.estimate_container_contents(file_path)
-
-                logger.debug(f"Estimated container contents: {file_count} files, {total_size} bytes")
-
-                self.create_container_record(container_id, container_type, metadata, file_count, total_size)
+                # Contents are counted while they are extracted, so the totals start at zero
+                self.create_container_record(container_id, container_type, metadata, 0, 0)
 
                 # Initialize in-memory progress tracking
-                self.progress_tracker.initialize(container_id, file_count, total_size)
+                self.progress_tracker.initialize(container_id, 0, 0)
 
                 # Store container info for tracking
                 self.progress_tracker.set_container_info(container_id, {"container_id": container_id})
@@ -1015,12 +971,16 @@ class LargeContainerProcessor:
                     # Still try to update status to extracted even if we don't have byte counts
                     self.update_container_status(container_id, ContainerStatus.EXTRACTED)
 
+                # Workflows for the extracted files may all have finished before extraction did
+                if self.update_container_workflow_progress(container_id):
+                    self.progress_tracker.cleanup(container_id)
+
                 return {
                     "container_id": container_id,
                     "container_type": container_type,
                     "processed_files": processed_files,
-                    "estimated_files": file_count,
-                    "estimated_size": total_size,
+                    "estimated_files": progress["total_files"] if progress else processed_files,
+                    "estimated_size": progress["total_bytes"] if progress else 0,
                     "status": ContainerStatus.EXTRACTED,
                 }
 
@@ -46,14 +46,14 @@ from common.queues import (
     WORKFLOW_MONITOR_PUBSUB,
 )
 from common.storage import StorageS3
+from common.workflows.metrics import METRICS_ROW as WORKFLOW_METRICS_ROW
+from common.workflows.metrics import LatencySketch
 from dapr.aio.clients import DaprClient
 from dapr.ext.fastapi import DaprApp
 from fastapi import Body, FastAPI, File, Form, HTTPException, Path, Query, Request, UploadFile
 from fastapi.responses import Response, StreamingResponse
-from psycopg import Connection
-from psycopg.rows import TupleRow
-from psycopg_pool import ConnectionPool
 from pydantic import ValidationError
+from web_api import db
 from web_api.container_monitor import get_monitor, start_monitor, stop_monitor
 from web_api.large_containers import LargeContainerProcessor
 from web_api.models.requests import ChatbotRequest, CleanupRequest, EnrichmentRequest
@@ -117,9 +117,20 @@ async def lifespan(app: FastAPI):
             lock_file.close()
             lock_file = None
 
+    try:
+        await db.get_pool()
+    except Exception as e:
+        # The pool is created on first use instead
+        logger.exception("Error opening database connection pool", error=sanitize_exception_message(e))
+
     yield
 
     # Shutdown
+    try:
+        await db.close_pool()
+    except Exception as e:
+        logger.exception("Error closing database connection pool", error=sanitize_exception_message(e))
+
     try:
         if monitor_started:
             await stop_monitor()
@@ -180,17 +191,6 @@ container_processor = LargeContainerProcessor()
 # Initialize Dapr app for pub/sub
 dapr_app = DaprApp(app)
 
-# Initialize database connection pool for workflow status queries
-_db_pool: ConnectionPool[Connection[TupleRow]] | None = None
-
-
-def get_db_pool() -> ConnectionPool[Connection[TupleRow]]:
-    global _db_pool
-    if _db_pool is None:
-        _db_pool = ConnectionPool(get_postgres_connection_str(), min_size=1, max_size=5)
-    return _db_pool
-
-
 _OBSERVABILITY_CONDITIONS = ("queue_backlog", "workflow_failures", "service_health")
 _observability_signal_state: dict[str, dict[str, datetime | None]] = {
     name: {"active_since": None, "last_alert_at": None} for name in _OBSERVABILITY_CONDITIONS
@@ -963,122 +963,69 @@ async def get_container_status(
 async def get_status():
     """Gets the current enrichment pipeline status with metrics."""
     try:
-        # Get metrics and workflow information from database
-        def get_db_metrics():
-            pool = get_db_pool()
-            with pool.connection() as conn:
-                with conn.cursor() as cur:
-                    # Get metrics: counts and processing times
-                    cur.execute("""
-                        SELECT
-                            COUNT(*) FILTER (WHERE status = 'COMPLETED') as completed_count,
-                            COUNT(*) FILTER (WHERE status IN ('FAILED', 'ERROR', 'TIMEOUT')) as failed_count,
-                            COUNT(*) FILTER (WHERE status = 'RUNNING') as running_count,
-                            AVG(runtime_seconds) FILTER (WHERE runtime_seconds IS NOT NULL) as avg_time,
-                            MIN(runtime_seconds) FILTER (WHERE runtime_seconds IS NOT NULL) as min_time,
-                            MAX(runtime_seconds) FILTER (WHERE runtime_seconds IS NOT NULL) as max_time,
-                            COUNT(runtime_seconds) FILTER (WHERE runtime_seconds IS NOT NULL) as samples_count
-                        FROM workflows
-                    """)
-                    metrics_row = cur.fetchone()
-                    if metrics_row is None:
-                        # No workflows found, return default values
-                        completed_count = failed_count = running_count = samples_count = 0
-                        avg_time = min_time = max_time = None
-                    else:
-                        completed_count, failed_count, running_count, avg_time, min_time, max_time, samples_count = (
-                            metrics_row
-                        )
-
-                    # Get active workflow details from database
-                    cur.execute("""
-                        SELECT
-                            wf_id,
-                            object_id,
-                            status,
-                            EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - start_time)) as runtime_seconds,
-                            start_time,
-                            enrichments_success,
-                            enrichments_failure,
-                            filename
-                        FROM workflows
-                        WHERE status = 'RUNNING'
-                    """)
-                    active_workflows_db = []
-                    for row in cur.fetchall():
-                        wf_id, object_id, status, runtime_seconds, start_time, success_modules, failure_modules, filename = row
-                        active_workflows_db.append(
-                            {
-                                "id": wf_id,
-                                "workflow_id": wf_id,
-                                "status": status,
-                                "runtime_seconds": runtime_seconds,
-                                "started_at": start_time,
-                                "timestamp": start_time,
-                                "filename": filename,
-                                "object_id": str(object_id) if object_id else None,
-                                "success_modules": success_modules or [],
-                                "failure_modules": failure_modules or [],
-                                "error": (failure_modules[-1] if failure_modules else None),
-                            }
-                        )
-
-                    # Get status counts
-                    cur.execute("""
-                        SELECT status, COUNT(*) FROM workflows GROUP BY status
-                    """)
-                    status_counts = {row[0]: row[1] for row in cur.fetchall()}
-
-                    # Calculate percentiles
-                    percentiles = {}
-                    if samples_count >= 5:
-                        cur.execute("""
-                            SELECT
-                                percentile_cont(0.5) WITHIN GROUP (ORDER BY runtime_seconds) as p50,
-                                percentile_cont(0.9) WITHIN GROUP (ORDER BY runtime_seconds) as p90,
-                                percentile_cont(0.95) WITHIN GROUP (ORDER BY runtime_seconds) as p95,
-                                percentile_cont(0.99) WITHIN GROUP (ORDER BY runtime_seconds) as p99
-                            FROM workflows
-                            WHERE runtime_seconds IS NOT NULL
-                        """)
-                        result = cur.fetchone()
-                        if result:
-                            p50, p90, p95, p99 = result
-                            percentiles = {
-                                "p50_seconds": round(float(p50), 2) if p50 is not None else None,
-                                "p90_seconds": round(float(p90), 2) if p90 is not None else None,
-                                "p95_seconds": round(float(p95), 2) if p95 is not None else None,
-                                "p99_seconds": round(float(p99), 2) if p99 is not None else None,
-                            }
-
-                    return {
-                        "metrics": {
-                            "completed_count": completed_count or 0,
-                            "failed_count": failed_count or 0,
-                            "running_count": running_count or 0,
-                            "total_processed": (completed_count or 0) + (failed_count or 0),
-                            "success_rate": round(
-                                (completed_count or 0) / ((completed_count or 0) + (failed_count or 0)) * 100, 2
-                            )
-                            if ((completed_count or 0) + (failed_count or 0)) > 0
-                            else None,
-                            "processing_times": {
-                                "avg_seconds": round(avg_time, 2) if avg_time else None,
-                                "min_seconds": round(min_time, 2) if min_time else None,
-                                "max_seconds": round(max_time, 2) if max_time else None,
-                                "samples_count": samples_count or 0,
-                                **percentiles,
-                            },
-                        },
-                        "status_counts": status_counts,
-                        "active_workflows_db": active_workflows_db,
-                    }
-
-        # Get database metrics and status information
-        db_info = await asyncio.to_thread(get_db_metrics)
-        metrics = db_info["metrics"]
-        status_counts = db_info["status_counts"]
-        db_active_workflows = db_info["active_workflows_db"]
+        # Counts and the runtime sketch are maintained incrementally by the workflow services
+        async with db.connection() as conn:
+            metrics_row = await conn.fetchrow(db.WORKFLOW_METRICS_QUERY, WORKFLOW_METRICS_ROW)
+            running_rows = await conn.fetch(db.RUNNING_WORKFLOWS_QUERY)
+
+        if metrics_row is None:
+            # Nothing flushed yet
+            status_counts, runtimes = {}, LatencySketch()
+        else:
+            status_counts = {
+                status: count for status, count in json.loads(metrics_row["status_counts"]).items() if count > 0
+            }
+            runtimes = LatencySketch.from_dict(json.loads(metrics_row["runtime_sketch"]))
+
+        completed_count = status_counts.get("COMPLETED", 0)
+        failed_count = sum(status_counts.get(status, 0) for status in ("FAILED", "ERROR", "TIMEOUT"))
+        samples_count = runtimes.count
+        avg_time, min_time, max_time = runtimes.mean, runtimes.min, runtimes.max
+
+        db_active_workflows = []
+        for row in running_rows:
+            failure_modules = row["enrichments_failure"]
+            db_active_workflows.append(
+                {
+                    "id": row["wf_id"],
+                    "workflow_id": row["wf_id"],
+                    "status": row["status"],
+                    "runtime_seconds": row["runtime_seconds"],
+                    "started_at": row["start_time"],
+                    "timestamp": row["start_time"],
+                    "filename": row["filename"],
+                    "object_id": str(row["object_id"]) if row["object_id"] else None,
+                    "success_modules": row["enrichments_success"] or [],
+                    "failure_modules": failure_modules or [],
+                    "error": (failure_modules[-1] if failure_modules else None),
+                }
+            )
+
+        running_count = len(db_active_workflows)
+
+        # Calculate percentiles
+        percentiles = {}
+        if samples_count >= 5:
+            for name, q in (("p50", 0.5), ("p90", 0.9), ("p95", 0.95), ("p99", 0.99)):
+                value = runtimes.quantile(q)
+                percentiles[f"{name}_seconds"] = round(value, 2) if value is not None else None
+
+        metrics = {
+            "completed_count": completed_count or 0,
+            "failed_count": failed_count or 0,
+            "running_count": running_count or 0,
+            "total_processed": (completed_count or 0) + (failed_count or 0),
+            "success_rate": round((completed_count or 0) / ((completed_count or 0) + (failed_count or 0)) * 100, 2)
+            if ((completed_count or 0) + (failed_count or 0)) > 0
+            else None,
+            "processing_times": {
+                "avg_seconds": round(avg_time, 2) if avg_time else None,
+                "min_seconds": round(min_time, 2) if min_time else None,
+                "max_seconds": round(max_time, 2) if max_time else None,
+                "samples_count": samples_count or 0,
+                **percentiles,
+            },
+        }
 
         # Use database count for active workflows
         db_active_count = metrics.get("running_count", 0)
@@ -1109,56 +1056,34 @@ async def get_status():
 async def get_failed():
     """Gets the set of failed enrichment workflows."""
     try:
-        # Query failed workflows from database
-        def get_failed_workflows_from_db():
-            pool = get_db_pool()
-            with pool.connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT
-                            wf_id as id,
-                            object_id,
-                            status,
-                            runtime_seconds,
-                            start_time,
-                            enrichments_failure,
-                            filename
-                        FROM workflows
-                        WHERE status IN ('FAILED', 'ERROR', 'TIMEOUT')
-                        ORDER BY start_time DESC
-                        LIMIT 100
-                    """)
-                    columns = [desc[0] for desc in cur.description] if cur.description else []
-                    failed_workflows = []
-
-                    for row in cur.fetchall():
-                        workflow_dict = dict(zip(columns, row, strict=True))
-
-                        # Convert UUID to string if present
-                        if workflow_dict.get("object_id"):
-                            workflow_dict["object_id"] = str(workflow_dict["object_id"])
-
-                        # Convert datetime to string
-                        if "start_time" in workflow_dict:
-                            workflow_dict["timestamp"] = workflow_dict["start_time"].isoformat()
-                            workflow_dict["started_at"] = workflow_dict["start_time"].isoformat()
-                            del workflow_dict["start_time"]
-
-                        workflow_dict["workflow_id"] = workflow_dict.get("id")
-                        workflow_dict["success_modules"] = []
-
-                        # Add error from failure list if available
-                        if workflow_dict.get("enrichments_failure") and len(workflow_dict["enrichments_failure"]) > 0:
-                            workflow_dict["error"] = workflow_dict["enrichments_failure"][-1]  # Most recent failure
-                            workflow_dict["failure_modules"] = workflow_dict["enrichments_failure"]
-                        else:
-                            workflow_dict["failure_modules"] = []
-
-                        failed_workflows.append(workflow_dict)
-
-                    return failed_workflows
-
-        failed_workflows = await asyncio.to_thread(get_failed_workflows_from_db)
+        async with db.connection() as conn:
+            rows = await conn.fetch(db.FAILED_WORKFLOWS_QUERY, 100)
+
+        failed_workflows = []
+        for row in rows:
+            workflow_dict = dict(row)
+
+            # Convert UUID to string if present
+            if workflow_dict.get("object_id"):
+                workflow_dict["object_id"] = str(workflow_dict["object_id"])
+
+            # Convert datetime to string
+            if "start_time" in workflow_dict:
+                workflow_dict["timestamp"] = workflow_dict["start_time"].isoformat()
+                workflow_dict["started_at"] = workflow_dict["start_time"].isoformat()
+                del workflow_dict["start_time"]
+
+            workflow_dict["workflow_id"] = workflow_dict.get("id")
+            workflow_dict["success_modules"] = []
+
+            # Add error from failure list if available
+            if workflow_dict.get("enrichments_failure") and len(workflow_dict["enrichments_failure"]) > 0:
+                workflow_dict["error"] = workflow_dict["enrichments_failure"][-1]  # Most recent failure
+                workflow_dict["failure_modules"] = workflow_dict["enrichments_failure"]
+            else:
+                workflow_dict["failure_modules"] = []
+
+            failed_workflows.append(workflow_dict)
 
         return {
             "failed_count": len(failed_workflows),
@@ -1170,121 +1095,67 @@ async def get_failed():
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-def _fetch_object_lifecycle_payload(object_id: str) -> dict | None:
-    pool = get_db_pool()
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT object_id, agent_id, source, project, path, file_name, timestamp, created_at
-                FROM files_enriched
-                WHERE object_id = %s
-                """,
-                [object_id],
-            )
-            enriched_row = cur.fetchone()
-
-            if enriched_row:
-                (
-                    row_object_id,
-                    agent_id,
-                    source,
-                    project,
-                    path,
-                    file_name,
-                    ingested_at,
-                    observed_at,
-                ) = enriched_row
-            else:
-                cur.execute(
-                    """
-                    SELECT object_id, agent_id, source, project, path, timestamp, created_at
-                    FROM files
-                    WHERE object_id = %s
-                    """,
-                    [object_id],
-                )
-                file_row = cur.fetchone()
-                if not file_row:
-                    return None
-                row_object_id, agent_id, source, project, path, ingested_at, observed_at = file_row
-                file_name = None
-
-            row_object_id = str(row_object_id)
-
-            cur.execute(
-                """
-                SELECT
-                    wf_id,
-                    status,
-                    start_time,
-                    runtime_seconds,
-                    filename,
-                    enrichments_success,
-                    enrichments_failure
-                FROM workflows
-                WHERE object_id = %s
-                ORDER BY start_time DESC
-                """,
-                [object_id],
-            )
-            workflow_rows = cur.fetchall()
-
-            workflow_records = []
-            running_count = 0
-            completed_count = 0
-            failed_count = 0
-
-            for wf_id, status, start_time, runtime_seconds, filename, success_modules, failure_modules in workflow_rows:
-                if status == "RUNNING":
-                    running_count += 1
-                elif status == "COMPLETED":
-                    completed_count += 1
-                elif status in {"FAILED", "ERROR", "TIMEOUT"}:
-                    failed_count += 1
-
-                workflow_records.append(
-                    {
-                        "workflow_id": wf_id,
-                        "status": status,
-                        "started_at": start_time,
-                        "runtime_seconds": runtime_seconds,
-                        "filename": filename,
-                        "success_modules": success_modules or [],
-                        "failure_modules": failure_modules or [],
-                        "error": (failure_modules[-1] if failure_modules else None),
-                    }
-                )
+async def _fetch_object_lifecycle_payload(object_id: str) -> dict | None:
+    async with db.connection() as conn:
+        file_row = await conn.fetchrow(db.ENRICHED_FILE_QUERY, object_id)
+        if file_row is None:
+            file_row = await conn.fetchrow(db.FILE_QUERY, object_id)
+            if file_row is None:
+                return None
+
+        workflow_rows = await conn.fetch(db.OBJECT_WORKFLOWS_QUERY, object_id)
+        publication = await conn.fetchrow(db.OBJECT_PUBLICATION_QUERY, object_id)
+
+    row_object_id = str(file_row["object_id"])
 
-            cur.execute("SELECT COUNT(*), MAX(created_at) FROM enrichments WHERE object_id = %s", [object_id])
-            enrichments_count, last_enrichment_at = cur.fetchone() or (0, None)
+    workflow_records = []
+    running_count = 0
+    completed_count = 0
+    failed_count = 0
 
-            cur.execute("SELECT COUNT(*), MAX(created_at) FROM transforms WHERE object_id = %s", [object_id])
-            transforms_count, last_transform_at = cur.fetchone() or (0, None)
+    for row in workflow_rows:
+        status = row["status"]
+        failure_modules = row["enrichments_failure"]
+        if status == "RUNNING":
+            running_count += 1
+        elif status == "COMPLETED":
+            completed_count += 1
+        elif status in {"FAILED", "ERROR", "TIMEOUT"}:
+            failed_count += 1
 
-            cur.execute("SELECT COUNT(*), MAX(created_at) FROM findings WHERE object_id = %s", [object_id])
-            findings_count, last_finding_at = cur.fetchone() or (0, None)
+        workflow_records.append(
+            {
+                "workflow_id": row["wf_id"],
+                "status": status,
+                "started_at": row["start_time"],
+                "runtime_seconds": row["runtime_seconds"],
+                "filename": row["filename"],
+                "success_modules": row["enrichments_success"] or [],
+                "failure_modules": failure_modules or [],
+                "error": (failure_modules[-1] if failure_modules else None),
+            }
+        )
 
     return {
         "object_id": row_object_id,
         "ingestion": {
             "object_id": row_object_id,
-            "agent_id": agent_id,
-            "source": source,
-            "project": project,
-            "path": path,
-            "file_name": file_name,
-            "ingested_at": ingested_at,
-            "observed_at": observed_at,
+            "agent_id": file_row["agent_id"],
+            "source": file_row["source"],
+            "project": file_row["project"],
+            "path": file_row["path"],
+            "file_name": file_row["file_name"],
+            "ingested_at": file_row["timestamp"],
+            "observed_at": file_row["created_at"],
         },
         "workflows": workflow_records,
         "publication": {
-            "enrichments_count": enrichments_count or 0,
-            "transforms_count": transforms_count or 0,
-            "findings_count": findings_count or 0,
-            "last_enrichment_at": last_enrichment_at,
-            "last_transform_at": last_transform_at,
-            "last_finding_at": last_finding_at,
+            "enrichments_count": publication["enrichments_count"] or 0,
+            "transforms_count": publication["transforms_count"] or 0,
+            "findings_count": publication["findings_count"] or 0,
+            "last_enrichment_at": publication["last_enrichment_at"],
+            "last_transform_at": publication["last_transform_at"],
+            "last_finding_at": publication["last_finding_at"],
         },
         "summary": {
             "latest_status": workflow_records[0]["status"] if workflow_records else None,
@@ -1542,7 +1413,7 @@ async def get_workflow_lifecycle(
     object_id: str = Path(..., description="Object ID to correlate across ingestion and workflow lifecycle"),
 ):
     try:
-        payload = await asyncio.to_thread(_fetch_object_lifecycle_payload, object_id)
+        payload = await _fetch_object_lifecycle_payload(object_id)
         if payload is None:
             raise HTTPException(status_code=404, detail=f"Object {object_id} not found")
         return payload
@@ -1768,14 +1639,8 @@ async def run_bulk_enrichment(
             raise HTTPException(status_code=404, detail=f"Enrichment module '{enrichment_name}' not found")
 
         # Get all object_ids from files_enriched table
-        def get_all_object_ids():
-            pool = get_db_pool()
-            with pool.connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT object_id FROM files_enriched ORDER BY created_at")
-                    return [row[0] for row in cur.fetchall()]
-
-        object_ids = await asyncio.to_thread(get_all_object_ids)
+        async with db.connection() as conn:
+            object_ids = [row["object_id"] for row in await conn.fetch(db.ENRICHED_OBJECT_IDS_QUERY)]
 
         if not object_ids:
             return {
@@ -2075,11 +1940,7 @@ async def healthcheck():
     dependencies = []
 
     try:
-        pool = get_db_pool()
-        with pool.connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
-                cur.fetchone()
+        await db.ping()
         dependencies.append(dependency_ok("postgres"))
     except Exception as e:
         dependencies.append(
@@ -2696,7 +2557,8 @@ async def list_sources(
     try:
         from web_api.reporting_routes import get_sources_list
 
-        sources = await asyncio.to_thread(get_sources_list, get_db_pool(), project, start_date, end_date)
+        async with db.connection() as conn:
+            sources = await get_sources_list(conn, project, start_date, end_date)
         return sources
 
     except Exception as e:
@@ -2727,7 +2589,8 @@ async def get_source_report(
     try:
         from web_api.reporting_routes import get_source_report_data
 
-        report = await asyncio.to_thread(get_source_report_data, get_db_pool(), source, start_date, end_date)
+        async with db.connection() as conn:
+            report = await get_source_report_data(conn, source, start_date, end_date)
         return report
 
     except Exception as e:
@@ -2751,7 +2614,8 @@ async def get_system_report(
     try:
         from web_api.reporting_routes import get_system_report_data
 
-        report = await asyncio.to_thread(get_system_report_data, get_db_pool(), start_date, end_date, project)
+        async with db.connection() as conn:
+            report = await get_system_report_data(conn, start_date, end_date, project)
         return report
 
     except Exception as e:
@@ -2783,7 +2647,8 @@ async def synthesize_source_report(
         # First get the source report data
         from web_api.reporting_routes import get_source_report_data
 
-        report = await asyncio.to_thread(get_source_report_data, get_db_pool(), source)
+        async with db.connection() as conn:
+            report = await get_source_report_data(conn, source)
 
         # Convert report to dict for passing to agent (mode='json' handles datetime serialization)
         report_data = report.model_dump(mode="json")
@@ -2882,7 +2747,8 @@ async def synthesize_system_report(
         # First get the system report data
         from web_api.reporting_routes import get_system_report_data
 
-        report = await asyncio.to_thread(get_system_report_data, get_db_pool(), start_date, end_date, project)
+        async with db.connection() as conn:
+            report = await get_system_report_data(conn, start_date, end_date, project)
 
         # Convert report to dict for passing to agent (mode='json' handles datetime serialization)
         report_data = report.model_dump(mode="json")
@@ -2985,7 +2851,8 @@ async def download_source_report_pdf(
         # Get the source report data
         from web_api.reporting_routes import get_source_report_data
 
-        report = await asyncio.to_thread(get_source_report_data, get_db_pool(), source, start_date, end_date)
+        async with db.connection() as conn:
+            report = await get_source_report_data(conn, source, start_date, end_date)
 
         # Convert report to dict for PDF generation
         report_data = report.model_dump()
@@ -3054,7 +2921,8 @@ async def download_system_report_pdf(
         # Get the system report data
         from web_api.reporting_routes import get_system_report_data
 
-        report = await asyncio.to_thread(get_system_report_data, get_db_pool(), start_date, end_date, project)
+        async with db.connection() as conn:
+            report = await get_system_report_data(conn, start_date, end_date, project)
 
         # Convert report to dict for PDF generation
         report_data = report.model_dump()
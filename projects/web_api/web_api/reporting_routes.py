@@ -2,15 +2,19 @@
 Reporting routes for Nemesis web API.
 
 These routes provide comprehensive reporting and analytics for files, findings, and sources.
+
+File, finding and triage statistics are read from the report_rollups table, which Postgres triggers keep
+up to date as files, findings and triage entries are written (see the REPORT ROLLUPS section of the
+schema). The triggers queue deltas that are folded into the table before each report is built. Date
+filters apply at day (UTC) granularity. Only the top findings, credential counts
+and workflow statistics are queried from the base tables.
 """
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
+import asyncpg
 from common.logger import get_logger
-from psycopg import Connection
-from psycopg.rows import TupleRow
-from psycopg_pool import ConnectionPool
 from web_api.models.responses import (
     RiskIndicators,
     SourceReport,
@@ -21,688 +25,370 @@ from web_api.models.responses import (
 
 logger = get_logger(__name__)
 
+TIMELINE_DAYS = 14
+TOP_FINDINGS_LIMIT = 20
+FILE_TYPES_LIMIT = 20
+SYSTEM_SOURCES_LIMIT = 50
+
+FOLD_ROLLUPS_QUERY = "SELECT report_rollup_fold()"
+
+# $1 source (UPPER), $2 project, $3 first day, $4 last day; NULL matches everything
+_ROLLUP_FILTER = """
+    ($1::text IS NULL OR source = $1)
+    AND ($2::text IS NULL OR project = $2)
+    AND day >= COALESCE($3::date, '-infinity')
+    AND day <= COALESCE($4::date, 'infinity')
+"""
+
+SOURCES_QUERY = f"""
+    SELECT
+        source,
+        SUM(count) FILTER (WHERE metric = 'files')::bigint AS file_count,
+        COALESCE(SUM(count) FILTER (WHERE metric = 'findings'), 0)::bigint AS finding_count,
+        COALESCE(SUM(count) FILTER (WHERE metric = 'triage' AND key = 'true_positive'), 0)::bigint AS verified_findings,
+        MAX(last_seen) AS last_activity
+    FROM report_rollups
+    WHERE metric IN ('files', 'findings', 'triage') AND source <> '' AND {_ROLLUP_FILTER}
+    GROUP BY source
+    HAVING SUM(count) FILTER (WHERE metric = 'files') > 0
+    ORDER BY last_activity DESC NULLS LAST
+"""
+
+ROLLUP_TOTALS_QUERY = f"""
+    SELECT
+        metric,
+        key,
+        SUM(count)::bigint AS count,
+        SUM(total_size)::bigint AS total_size,
+        MIN(first_seen) AS first_seen,
+        MAX(last_seen) AS last_seen
+    FROM report_rollups
+    WHERE {_ROLLUP_FILTER}
+    GROUP BY metric, key
+"""
+
+DAILY_ACTIVITY_QUERY = f"""
+    SELECT
+        day,
+        COALESCE(SUM(count) FILTER (WHERE metric = 'files'), 0)::bigint AS files_submitted,
+        COALESCE(SUM(count) FILTER (WHERE metric = 'findings'), 0)::bigint AS findings_created
+    FROM report_rollups
+    WHERE metric IN ('files', 'findings') AND {_ROLLUP_FILTER}
+    GROUP BY day
+"""
+
+# findings.triage_id points at each finding's latest triage entry
+TOP_FINDINGS_QUERY = """
+    SELECT
+        f.finding_id,
+        f.finding_name,
+        f.category,
+        f.severity,
+        fth.value AS triage_state,
+        fe.path,
+        f.created_at
+    FROM files_enriched fe
+    JOIN findings f ON f.object_id = fe.object_id
+    LEFT JOIN findings_triage_history fth ON fth.id = f.triage_id
+    WHERE UPPER(fe.source) = $1
+    AND fe.created_at >= COALESCE($2::timestamptz, '-infinity')
+    AND fe.created_at <= COALESCE($3::timestamptz, 'infinity')
+    ORDER BY
+        CASE WHEN fth.value = 'true_positive' THEN 0 ELSE 1 END,
+        f.severity DESC,
+        f.created_at DESC
+    LIMIT $4
+"""
+
+SOURCE_CREDENTIALS_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM chromium.logins WHERE UPPER(source) = $1) AS chromium_logins,
+        (SELECT COUNT(*) FROM chromium.logins WHERE UPPER(source) = $1 AND is_decrypted) AS chromium_logins_decrypted,
+        (SELECT COUNT(*) FROM chromium.cookies WHERE UPPER(source) = $1) AS chromium_cookies,
+        (SELECT COUNT(*) FROM chromium.cookies WHERE UPPER(source) = $1 AND is_decrypted) AS chromium_cookies_decrypted,
+        -- DPAPI masterkeys are not source-specific in the current schema
+        (SELECT COUNT(*) FROM dpapi.masterkeys) AS dpapi_masterkeys,
+        (SELECT COUNT(*) FROM dpapi.masterkeys WHERE plaintext_key IS NOT NULL) AS dpapi_masterkeys_decrypted
+"""
+
+SYSTEM_CREDENTIALS_QUERY = """
+    SELECT COUNT(*) AS total_chromium_logins, COUNT(*) FILTER (WHERE is_decrypted) AS decrypted_logins
+    FROM chromium.logins
+"""
+
+_WORKFLOW_STATS_COLUMNS = """
+    COUNT(*) AS total_workflows,
+    COUNT(*) FILTER (WHERE w.status IN ('COMPLETED', 'completed')) AS completed,
+    COUNT(*) FILTER (WHERE w.status IN ('FAILED', 'failed', 'ERROR', 'error', 'TIMEOUT', 'timeout')) AS failed,
+    AVG(w.runtime_seconds)::float8 AS avg_processing_time,
+    MAX(w.runtime_seconds)::float8 AS max_processing_time
+"""
+
+SOURCE_WORKFLOW_STATS_QUERY = f"""
+    SELECT {_WORKFLOW_STATS_COLUMNS}
+    FROM files_enriched fe
+    JOIN workflows w ON w.object_id = fe.object_id
+    WHERE UPPER(fe.source) = $1
+"""
+
+SYSTEM_WORKFLOW_STATS_QUERY = f"""
+    SELECT {_WORKFLOW_STATS_COLUMNS}
+    FROM files_enriched fe
+    JOIN workflows w ON w.object_id = fe.object_id
+    WHERE ($1::text IS NULL OR fe.project = $1)
+    AND fe.created_at >= COALESCE($2::timestamptz, '-infinity')
+    AND fe.created_at <= COALESCE($3::timestamptz, 'infinity')
+"""
+
+
+def _to_day(value: datetime | None) -> date | None:
+    """The UTC day a date filter falls on, matching how rollups are bucketed."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC)
+    return value.date()
+
+
+class RollupTotals:
+    """Rollup rows summed over the selected days, indexed by metric and key."""
+
+    def __init__(self, rows: list[asyncpg.Record]):
+        self.counts: dict[str, dict[str, int]] = {}
+        self.total_size = 0
+        self.first_seen: datetime | None = None
+        self.last_seen: datetime | None = None
+
+        for row in rows:
+            self.counts.setdefault(row["metric"], {})[row["key"]] = row["count"]
+            if row["metric"] == "files":
+                self.total_size = row["total_size"] or 0
+                self.first_seen = row["first_seen"]
+                self.last_seen = row["last_seen"]
+
+    def by_key(self, metric: str) -> dict[str, int]:
+        """Counts for a metric, largest first."""
+        return dict(sorted(self.counts.get(metric, {}).items(), key=lambda item: item[1], reverse=True))
+
+    def total(self, metric: str) -> int:
+        return sum(self.counts.get(metric, {}).values())
+
+    def count(self, metric: str, key: str) -> int:
+        return self.counts.get(metric, {}).get(key, 0)
+
+
+async def _fold_rollups(conn: asyncpg.Connection) -> None:
+    """Apply the rollup deltas queued by writes committed so far."""
+    await conn.execute(FOLD_ROLLUPS_QUERY)
 
-def get_sources_list(
-    pool: ConnectionPool[Connection[TupleRow]],
+
+async def _get_rollup_totals(
+    conn: asyncpg.Connection,
+    source: str | None,
+    project: str | None,
+    start_date: datetime | None,
+    end_date: datetime | None,
+) -> RollupTotals:
+    rows = await conn.fetch(ROLLUP_TOTALS_QUERY, source, project, _to_day(start_date), _to_day(end_date))
+    return RollupTotals(rows)
+
+
+async def _get_daily_activity(
+    conn: asyncpg.Connection,
+    source: str | None,
+    project: str | None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Files submitted and findings created on each of the last TIMELINE_DAYS days (within the date filters)."""
+    today = datetime.now(UTC).date()
+    first_day = today - timedelta(days=TIMELINE_DAYS - 1)
+    start_day = max(first_day, _to_day(start_date) or first_day)
+    end_day = min(today, _to_day(end_date) or today)
+
+    rows = await conn.fetch(DAILY_ACTIVITY_QUERY, source, project, start_day, end_day)
+    by_day = {row["day"]: row for row in rows}
+
+    activity = []
+    for offset in range(TIMELINE_DAYS):
+        day = first_day + timedelta(days=offset)
+        row = by_day.get(day)
+        activity.append(
+            {
+                "date": day.isoformat(),
+                "files_submitted": row["files_submitted"] if row else 0,
+                "findings_created": row["findings_created"] if row else 0,
+            }
+        )
+    return activity
+
+
+async def get_sources_list(
+    conn: asyncpg.Connection,
     project: str | None = None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
 ) -> list[SourceSummary]:
     """Get list of all sources with summary statistics."""
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            # Build WHERE clause conditions
-            conditions = []
-            params = []
-
-            if project:
-                conditions.append("fe.project = %s")
-                params.append(project)
-
-            if start_date:
-                conditions.append("fe.created_at >= %s")
-                params.append(start_date)
-
-            if end_date:
-                conditions.append("fe.created_at <= %s")
-                params.append(end_date)
-
-            where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-            # Query to get source summaries
-            # Normalize source to uppercase for consistency
-            # Use LEFT JOINs to include sources even if they have no findings or triage data
-            query = f"""
-                SELECT
-                    UPPER(fe.source) as source,
-                    COUNT(DISTINCT fe.object_id) as file_count,
-                    COUNT(DISTINCT f.finding_id) as finding_count,
-                    COUNT(DISTINCT CASE
-                        WHEN EXISTS (
-                            SELECT 1 FROM findings_triage_history fth
-                            WHERE fth.finding_id = f.finding_id
-                            AND fth.value = 'true_positive'
-                            AND fth.timestamp = (
-                                SELECT MAX(timestamp) FROM findings_triage_history
-                                WHERE finding_id = f.finding_id
-                            )
-                        ) THEN f.finding_id
-                    END) as verified_findings,
-                    MAX(fe.created_at) as last_activity
-                FROM files_enriched fe
-                LEFT JOIN findings f ON fe.object_id = f.object_id
-                WHERE {where_clause} AND fe.source IS NOT NULL
-                GROUP BY UPPER(fe.source)
-                ORDER BY last_activity DESC NULLS LAST
-            """
-
-            cur.execute(query, params)
-            results = cur.fetchall()
-
-            sources = []
-            for row in results:
-                sources.append(
-                    SourceSummary(
-                        source=row[0],
-                        file_count=row[1],
-                        finding_count=row[2],
-                        verified_findings=row[3],
-                        last_activity=row[4],
-                    )
-                )
-
-            return sources
-
-
-def get_source_report_data(
-    pool: ConnectionPool[Connection[TupleRow]],
+    await _fold_rollups(conn)
+    return await _get_sources(conn, project, start_date, end_date)
+
+
+async def _get_sources(
+    conn: asyncpg.Connection,
+    project: str | None,
+    start_date: datetime | None,
+    end_date: datetime | None,
+) -> list[SourceSummary]:
+    rows = await conn.fetch(SOURCES_QUERY, None, project, _to_day(start_date), _to_day(end_date))
+
+    return [
+        SourceSummary(
+            source=row["source"],
+            file_count=row["file_count"],
+            finding_count=row["finding_count"],
+            verified_findings=row["verified_findings"],
+            last_activity=row["last_activity"],
+        )
+        for row in rows
+    ]
+
+
+async def get_source_report_data(
+    conn: asyncpg.Connection,
     source_name: str,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
 ) -> SourceReport:
     """Get detailed report for a specific source."""
-    # Normalize source name to uppercase for matching
+    # Sources are rolled up by their uppercase name
     source_name_upper = source_name.upper()
 
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            # Build WHERE clause for date filtering
-            date_conditions = []
-            date_params: list[Any] = [source_name_upper]
-
-            if start_date:
-                date_conditions.append("fe.created_at >= %s")
-                date_params.append(start_date)
-
-            if end_date:
-                date_conditions.append("fe.created_at <= %s")
-                date_params.append(end_date)
-
-            date_where = " AND ".join(date_conditions) if date_conditions else "1=1"
-
-            # Summary statistics
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(DISTINCT object_id) as total_files,
-                    COUNT(DISTINCT CASE WHEN extension IS NOT NULL THEN extension END) as unique_extensions,
-                    SUM(size) as total_size,
-                    MIN(created_at) as first_seen,
-                    MAX(created_at) as last_seen
-                FROM files_enriched
-                WHERE UPPER(source) = %s AND {date_where}
-            """,
-                date_params,
-            )
-            summary_row = cur.fetchone()
-            if not summary_row:
-                summary_row = (0, 0, 0, None, None)
-
-            # File type breakdown
-            cur.execute(
-                f"""
-                SELECT extension, COUNT(*) as count
-                FROM files_enriched
-                WHERE UPPER(source) = %s AND {date_where}
-                GROUP BY extension
-                ORDER BY count DESC
-                LIMIT 20
-            """,
-                date_params,
-            )
-            file_types = {row[0] or "unknown": row[1] for row in cur.fetchall()}
-
-            # Findings statistics with triage breakdown
-            # Use LEFT JOIN and subquery to get latest triage value per finding
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(DISTINCT f.finding_id) as total_findings,
-                    COUNT(DISTINCT CASE
-                        WHEN EXISTS (
-                            SELECT 1 FROM findings_triage_history fth
-                            WHERE fth.finding_id = f.finding_id
-                            AND fth.value = 'true_positive'
-                            AND fth.timestamp = (SELECT MAX(timestamp) FROM findings_triage_history WHERE finding_id = f.finding_id)
-                        ) THEN f.finding_id
-                    END) as true_positives,
-                    COUNT(DISTINCT CASE
-                        WHEN EXISTS (
-                            SELECT 1 FROM findings_triage_history fth
-                            WHERE fth.finding_id = f.finding_id
-                            AND fth.value = 'false_positive'
-                            AND fth.timestamp = (SELECT MAX(timestamp) FROM findings_triage_history WHERE finding_id = f.finding_id)
-                        ) THEN f.finding_id
-                    END) as false_positives,
-                    COUNT(DISTINCT CASE
-                        WHEN EXISTS (
-                            SELECT 1 FROM findings_triage_history fth
-                            WHERE fth.finding_id = f.finding_id
-                            AND fth.value = 'needs_review'
-                            AND fth.timestamp = (SELECT MAX(timestamp) FROM findings_triage_history WHERE finding_id = f.finding_id)
-                        ) THEN f.finding_id
-                    END) as needs_review,
-                    COUNT(DISTINCT CASE
-                        WHEN NOT EXISTS (
-                            SELECT 1 FROM findings_triage_history fth
-                            WHERE fth.finding_id = f.finding_id
-                        ) THEN f.finding_id
-                    END) as untriaged
-                FROM files_enriched fe
-                LEFT JOIN findings f ON fe.object_id = f.object_id
-                WHERE UPPER(fe.source) = %s AND {date_where} AND f.finding_id IS NOT NULL
-            """,
-                date_params,
-            )
-            findings_row = cur.fetchone()
-
-            # Handle case where there are no findings at all
-            if not findings_row or findings_row[0] is None:
-                findings_row = (0, 0, 0, 0, 0)
-
-            # Findings by category
-            cur.execute(
-                f"""
-                SELECT f.category, COUNT(*) as count
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE UPPER(fe.source) = %s AND {date_where}
-                GROUP BY f.category
-                ORDER BY count DESC
-            """,
-                date_params,
-            )
-            findings_by_category = {row[0]: row[1] for row in cur.fetchall()}
-
-            # Findings by severity
-            cur.execute(
-                f"""
-                SELECT
-                    CASE
-                        WHEN f.severity >= 9 THEN 'critical'
-                        WHEN f.severity >= 7 THEN 'high'
-                        WHEN f.severity >= 4 THEN 'medium'
-                        WHEN f.severity >= 2 THEN 'low'
-                        ELSE 'informational'
-                    END as severity_level,
-                    COUNT(*) as count
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE UPPER(fe.source) = %s AND {date_where}
-                GROUP BY severity_level
-                ORDER BY count DESC
-            """,
-                date_params,
-            )
-            findings_by_severity = {row[0]: row[1] for row in cur.fetchall()}
-
-            # Findings by origin
-            cur.execute(
-                f"""
-                SELECT f.origin_name, COUNT(*) as count
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE UPPER(fe.source) = %s AND {date_where}
-                GROUP BY f.origin_name
-                ORDER BY count DESC
-            """,
-                date_params,
-            )
-            findings_by_origin = {row[0]: row[1] for row in cur.fetchall()}
-
-            # Credential risk indicators
-            # Chromium logins
-            cur.execute(
-                """
-                SELECT
-                    COUNT(*) as total_logins,
-                    COUNT(CASE WHEN is_decrypted = true THEN 1 END) as decrypted_logins
-                FROM chromium.logins
-                WHERE UPPER(source) = %s
-            """,
-                [source_name_upper],
-            )
-            chromium_row = cur.fetchone()
-            if not chromium_row:
-                chromium_row = (0, 0)
-
-            # Chromium cookies
-            cur.execute(
-                """
-                SELECT
-                    COUNT(*) as total_cookies,
-                    COUNT(CASE WHEN is_decrypted = true THEN 1 END) as decrypted_cookies
-                FROM chromium.cookies
-                WHERE UPPER(source) = %s
-            """,
-                [source_name_upper],
-            )
-            cookies_row = cur.fetchone()
-            if not cookies_row:
-                cookies_row = (0, 0)
-
-            # DPAPI masterkeys (not source-specific in current schema)
-            cur.execute(
-                """
-                SELECT
-                    COUNT(*) as total_keys,
-                    COUNT(CASE WHEN plaintext_key IS NOT NULL THEN 1 END) as decrypted_keys
-                FROM dpapi.masterkeys
-            """,
-            )
-            dpapi_row = cur.fetchone()
-            if not dpapi_row:
-                dpapi_row = (0, 0)
-
-            # Titus findings
-            cur.execute(
-                f"""
-                SELECT COUNT(*)
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE UPPER(fe.source) = %s AND f.origin_name = 'titus' AND {date_where}
-            """,
-                date_params,
+    await _fold_rollups(conn)
+    totals = await _get_rollup_totals(conn, source_name_upper, None, start_date, end_date)
+    file_types = {key or "unknown": count for key, count in list(totals.by_key("extension").items())[:FILE_TYPES_LIMIT]}
+
+    true_positives = totals.count("triage", "true_positive")
+    false_positives = totals.count("triage", "false_positive")
+    needs_review = totals.count("triage", "needs_review")
+    untriaged = totals.count("triage", "untriaged")
+    findings_by_origin = totals.by_key("finding_origin")
+
+    credentials = await conn.fetchrow(SOURCE_CREDENTIALS_QUERY, source_name_upper)
+    top_findings = await conn.fetch(TOP_FINDINGS_QUERY, source_name_upper, start_date, end_date, TOP_FINDINGS_LIMIT)
+    daily_activity = await _get_daily_activity(conn, source_name_upper, None)
+    workflow_row = await conn.fetchrow(SOURCE_WORKFLOW_STATS_QUERY, source_name_upper)
+
+    return SourceReport(
+        report_type="source",
+        source=source_name_upper,
+        generated_at=datetime.now(UTC),
+        summary={
+            "total_files": totals.total("files"),
+            "unique_extensions": sum(1 for key in totals.counts.get("extension", {}) if key),
+            "total_size_bytes": totals.total_size,
+            "first_seen": totals.first_seen.isoformat() if totals.first_seen else None,
+            "last_seen": totals.last_seen.isoformat() if totals.last_seen else None,
+            "file_types": file_types,
+            "total_findings": totals.total("findings"),
+            "verified_true_positives": true_positives,
+            "verified_false_positives": false_positives,
+            "needs_review_findings": needs_review,
+            "untriaged_findings": untriaged,
+        },
+        risk_indicators=RiskIndicators(
+            credentials={
+                "chromium_logins": credentials["chromium_logins"],
+                "chromium_logins_decrypted": credentials["chromium_logins_decrypted"],
+                "chromium_cookies": credentials["chromium_cookies"],
+                "chromium_cookies_decrypted": credentials["chromium_cookies_decrypted"],
+                "dpapi_masterkeys": credentials["dpapi_masterkeys"],
+                "dpapi_masterkeys_decrypted": credentials["dpapi_masterkeys_decrypted"],
+                "titus_findings": findings_by_origin.get("titus", 0),
+            },
+            sensitive_data={
+                "yara_matches": findings_by_origin.get("yara_scanner", 0),
+            },
+        ),
+        findings_detail={
+            "by_category": totals.by_key("finding_category"),
+            "by_severity": totals.by_key("finding_severity"),
+            "by_origin": findings_by_origin,
+            "triage_breakdown": {
+                "true_positive": true_positives,
+                "false_positive": false_positives,
+                "needs_review": needs_review,
+                "untriaged": untriaged,
+            },
+        },
+        timeline={"daily_activity": daily_activity},
+        enrichment_performance={
+            "workflows_total": workflow_row["total_workflows"] or 0,
+            "workflows_completed": workflow_row["completed"] or 0,
+            "workflows_failed": workflow_row["failed"] or 0,
+            "avg_processing_time": workflow_row["avg_processing_time"] or 0.0,
+            "max_processing_time": workflow_row["max_processing_time"] or 0.0,
+        },
+        top_findings=[
+            TopFinding(
+                finding_id=row["finding_id"],
+                finding_name=row["finding_name"],
+                category=row["category"],
+                severity=row["severity"],
+                triage_state=row["triage_state"],
+                file_path=row["path"],
+                created_at=row["created_at"],
             )
-            titus_row = cur.fetchone()
-            titus_count = titus_row[0] if titus_row else 0
-
-            # YARA matches
-            cur.execute(
-                f"""
-                SELECT COUNT(*)
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE UPPER(fe.source) = %s AND f.origin_name = 'yara_scanner' AND {date_where}
-            """,
-                date_params,
-            )
-            yara_row = cur.fetchone()
-            yara_count = yara_row[0] if yara_row else 0
-
-            # Top findings (verified true positives first, then by severity)
-            cur.execute(
-                f"""
-                SELECT
-                    f.finding_id,
-                    f.finding_name,
-                    f.category,
-                    f.severity,
-                    (SELECT fth.value FROM findings_triage_history fth
-                     WHERE fth.finding_id = f.finding_id
-                     ORDER BY fth.timestamp DESC LIMIT 1) as triage_state,
-                    fe.path,
-                    f.created_at
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE UPPER(fe.source) = %s AND {date_where}
-                ORDER BY
-                    CASE WHEN (SELECT fth.value FROM findings_triage_history fth
-                               WHERE fth.finding_id = f.finding_id
-                               ORDER BY fth.timestamp DESC LIMIT 1) = 'true_positive' THEN 0
-                         ELSE 1 END,
-                    f.severity DESC,
-                    f.created_at DESC
-                LIMIT 20
-            """,
-                date_params,
-            )
-            top_findings = cur.fetchall()
-
-            # Timeline data (last 14 days)
-            cur.execute(
-                """
-                WITH date_series AS (
-                    SELECT generate_series(
-                        CURRENT_DATE - INTERVAL '13 days',
-                        CURRENT_DATE,
-                        '1 day'::interval
-                    )::date as date
-                )
-                SELECT
-                    ds.date,
-                    COUNT(DISTINCT fe.object_id) as files_submitted,
-                    COUNT(DISTINCT f.finding_id) as findings_created
-                FROM date_series ds
-                LEFT JOIN files_enriched fe ON DATE(fe.created_at) = ds.date AND UPPER(fe.source) = %s
-                LEFT JOIN findings f ON fe.object_id = f.object_id
-                GROUP BY ds.date
-                ORDER BY ds.date
-            """,
-                [source_name_upper],
-            )
-            timeline_data = cur.fetchall()
-
-            # Enrichment performance
-            cur.execute(
-                """
-                SELECT
-                    COUNT(*) as total_workflows,
-                    COUNT(CASE WHEN status IN ('COMPLETED', 'completed') THEN 1 END) as completed,
-                    COUNT(CASE WHEN status IN ('FAILED', 'failed', 'ERROR', 'error', 'TIMEOUT', 'timeout') THEN 1 END) as failed,
-                    AVG(runtime_seconds) as avg_processing_time,
-                    MAX(runtime_seconds) as max_processing_time
-                FROM workflows w
-                JOIN files_enriched fe ON w.object_id = fe.object_id
-                WHERE UPPER(fe.source) = %s
-            """,
-                [source_name_upper],
-            )
-            workflow_row = cur.fetchone()
-            if not workflow_row:
-                workflow_row = (0, 0, 0, None, None)
-
-            # Build the response
-            report = SourceReport(
-                report_type="source",
-                source=source_name_upper,
-                generated_at=datetime.now(UTC),
-                summary={
-                    "total_files": summary_row[0] or 0,
-                    "unique_extensions": summary_row[1] or 0,
-                    "total_size_bytes": summary_row[2] or 0,
-                    "first_seen": summary_row[3].isoformat() if summary_row[3] else None,
-                    "last_seen": summary_row[4].isoformat() if summary_row[4] else None,
-                    "file_types": file_types,
-                    "total_findings": findings_row[0] or 0,
-                    "verified_true_positives": findings_row[1] or 0,
-                    "verified_false_positives": findings_row[2] or 0,
-                    "needs_review_findings": findings_row[3] or 0,
-                    "untriaged_findings": findings_row[4] or 0,
-                },
-                risk_indicators=RiskIndicators(
-                    credentials={
-                        "chromium_logins": chromium_row[0] or 0,
-                        "chromium_logins_decrypted": chromium_row[1] or 0,
-                        "chromium_cookies": cookies_row[0] or 0,
-                        "chromium_cookies_decrypted": cookies_row[1] or 0,
-                        "dpapi_masterkeys": dpapi_row[0] or 0,
-                        "dpapi_masterkeys_decrypted": dpapi_row[1] or 0,
-                        "titus_findings": titus_count,
-                    },
-                    sensitive_data={
-                        "yara_matches": yara_count,
-                    },
-                ),
-                findings_detail={
-                    "by_category": findings_by_category,
-                    "by_severity": findings_by_severity,
-                    "by_origin": findings_by_origin,
-                    "triage_breakdown": {
-                        "true_positive": findings_row[1] or 0,
-                        "false_positive": findings_row[2] or 0,
-                        "needs_review": findings_row[3] or 0,
-                        "untriaged": findings_row[4] or 0,
-                    },
-                },
-                timeline={
-                    "daily_activity": [
-                        {"date": row[0].isoformat(), "files_submitted": row[1] or 0, "findings_created": row[2] or 0}
-                        for row in timeline_data
-                    ]
-                },
-                enrichment_performance={
-                    "workflows_total": workflow_row[0] or 0,
-                    "workflows_completed": workflow_row[1] or 0,
-                    "workflows_failed": workflow_row[2] or 0,
-                    "avg_processing_time": float(workflow_row[3]) if workflow_row[3] else 0.0,
-                    "max_processing_time": float(workflow_row[4]) if workflow_row[4] else 0.0,
-                },
-                top_findings=[
-                    TopFinding(
-                        finding_id=row[0],
-                        finding_name=row[1],
-                        category=row[2],
-                        severity=row[3],
-                        triage_state=row[4],
-                        file_path=row[5],
-                        created_at=row[6],
-                    )
-                    for row in top_findings
-                ],
-            )
-
-            return report
+            for row in top_findings
+        ],
+    )
 
 
-def get_system_report_data(
-    pool: ConnectionPool[Connection[TupleRow]],
+async def get_system_report_data(
+    conn: asyncpg.Connection,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
     project: str | None = None,
 ) -> SystemReport:
     """Get system-wide statistics and findings."""
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            # Build WHERE clause
-            conditions = []
-            params = []
-
-            if project:
-                conditions.append("project = %s")
-                params.append(project)
-
-            if start_date:
-                conditions.append("created_at >= %s")
-                params.append(start_date)
-
-            if end_date:
-                conditions.append("created_at <= %s")
-                params.append(end_date)
-
-            where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-            # Overall summary
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(DISTINCT UPPER(source)) as total_sources,
-                    COUNT(DISTINCT object_id) as total_files,
-                    SUM(size) as total_size
-                FROM files_enriched
-                WHERE {where_clause}
-            """,
-                params,
-            )
-            summary_row = cur.fetchone()
-            if not summary_row:
-                summary_row = (0, 0, 0)
-
-            # Findings summary
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(DISTINCT f.finding_id) as total_findings,
-                    COUNT(DISTINCT CASE
-                        WHEN EXISTS (
-                            SELECT 1 FROM findings_triage_history fth
-                            WHERE fth.finding_id = f.finding_id
-                            AND fth.value = 'true_positive'
-                            AND fth.timestamp = (SELECT MAX(timestamp) FROM findings_triage_history WHERE finding_id = f.finding_id)
-                        ) THEN f.finding_id
-                    END) as verified_true_positives
-                FROM files_enriched fe
-                LEFT JOIN findings f ON fe.object_id = f.object_id
-                WHERE {where_clause} AND f.finding_id IS NOT NULL
-            """,
-                params,
-            )
-            findings_summary_row = cur.fetchone()
-
-            # Handle case where there are no findings
-            if not findings_summary_row or findings_summary_row[0] is None:
-                findings_summary = (0, 0)
-            else:
-                findings_summary = findings_summary_row
-
-            # Credentials summary
-            cur.execute(
-                """
-                SELECT
-                    COUNT(*) as total_chromium_logins,
-                    COUNT(CASE WHEN is_decrypted = true THEN 1 END) as decrypted_logins
-                FROM chromium.logins
-            """,
-            )
-            creds_row = cur.fetchone()
-            if not creds_row:
-                creds_row = (0, 0)
-
-            # Sources list (top 50 by activity)
-            cur.execute(
-                f"""
-                SELECT
-                    UPPER(fe.source) as source,
-                    COUNT(DISTINCT fe.object_id) as file_count,
-                    COUNT(DISTINCT f.finding_id) as finding_count,
-                    COUNT(DISTINCT CASE
-                        WHEN EXISTS (
-                            SELECT 1 FROM findings_triage_history fth
-                            WHERE fth.finding_id = f.finding_id
-                            AND fth.value = 'true_positive'
-                            AND fth.timestamp = (
-                                SELECT MAX(timestamp) FROM findings_triage_history
-                                WHERE finding_id = f.finding_id
-                            )
-                        ) THEN f.finding_id
-                    END) as verified_findings,
-                    MAX(fe.created_at) as last_activity
-                FROM files_enriched fe
-                LEFT JOIN findings f ON fe.object_id = f.object_id
-                WHERE {where_clause} AND fe.source IS NOT NULL
-                GROUP BY UPPER(fe.source)
-                ORDER BY last_activity DESC NULLS LAST
-                LIMIT 50
-            """,
-                params,
-            )
-            sources_data = cur.fetchall()
-
-            # Findings by category
-            cur.execute(
-                f"""
-                SELECT f.category, COUNT(*) as count
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE {where_clause}
-                GROUP BY f.category
-                ORDER BY count DESC
-            """,
-                params,
-            )
-            findings_by_category = dict(cur.fetchall())
-
-            # Findings by severity
-            cur.execute(
-                f"""
-                SELECT
-                    CASE
-                        WHEN f.severity >= 9 THEN 'critical'
-                        WHEN f.severity >= 7 THEN 'high'
-                        WHEN f.severity >= 4 THEN 'medium'
-                        WHEN f.severity >= 2 THEN 'low'
-                        ELSE 'informational'
-                    END as severity_level,
-                    COUNT(*) as count
-                FROM files_enriched fe
-                JOIN findings f ON fe.object_id = f.object_id
-                WHERE {where_clause}
-                GROUP BY severity_level
-            """,
-                params,
-            )
-            findings_by_severity = dict(cur.fetchall())
-
-            # Timeline data (last 14 days)
-            cur.execute(
-                f"""
-                WITH date_series AS (
-                    SELECT generate_series(
-                        CURRENT_DATE - INTERVAL '13 days',
-                        CURRENT_DATE,
-                        '1 day'::interval
-                    )::date as date
-                )
-                SELECT
-                    ds.date,
-                    COUNT(DISTINCT fe.object_id) as files_submitted,
-                    COUNT(DISTINCT f.finding_id) as findings_created
-                FROM date_series ds
-                LEFT JOIN files_enriched fe ON DATE(fe.created_at) = ds.date
-                LEFT JOIN findings f ON fe.object_id = f.object_id
-                WHERE {where_clause}
-                GROUP BY ds.date
-                ORDER BY ds.date
-            """,
-                params,
-            )
-            timeline_data = cur.fetchall()
-
-            # Enrichment stats
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) as total_workflows,
-                    COUNT(CASE WHEN status IN ('COMPLETED', 'completed') THEN 1 END) as successful,
-                    COUNT(CASE WHEN status IN ('FAILED', 'failed', 'ERROR', 'error', 'TIMEOUT', 'timeout') THEN 1 END) as failed,
-                    AVG(runtime_seconds) as avg_processing_time
-                FROM workflows w
-                JOIN files_enriched fe ON w.object_id = fe.object_id
-                WHERE {where_clause}
-            """,
-                params,
-            )
-            enrichment_row = cur.fetchone()
-            if not enrichment_row:
-                enrichment_row = (0, 0, 0, None)
-
-            # Determine time range
-            if start_date and end_date:
-                time_range = {"start": start_date, "end": end_date}
-            elif start_date:
-                time_range = {"start": start_date, "end": datetime.now(UTC)}
-            elif end_date:
-                time_range = {"start": datetime.min.replace(tzinfo=UTC), "end": end_date}
-            else:
-                time_range = {"start": datetime.min.replace(tzinfo=UTC), "end": datetime.now(UTC)}
-
-            report = SystemReport(
-                report_type="system",
-                generated_at=datetime.now(UTC),
-                time_range=time_range,
-                summary={
-                    "total_sources": summary_row[0] or 0,
-                    "total_files": summary_row[1] or 0,
-                    "total_size_bytes": summary_row[2] or 0,
-                    "total_findings": findings_summary[0] or 0,
-                    "verified_true_positives": findings_summary[1] or 0,
-                    "total_credentials": creds_row[0] or 0,
-                    "decrypted_credentials": creds_row[1] or 0,
-                },
-                sources=[
-                    SourceSummary(
-                        source=row[0],
-                        file_count=row[1],
-                        finding_count=row[2],
-                        verified_findings=row[3],
-                        last_activity=row[4],
-                    )
-                    for row in sources_data
-                ],
-                findings_by_category=findings_by_category,
-                findings_by_severity=findings_by_severity,
-                timeline={
-                    "daily_activity": [
-                        {"date": row[0].isoformat(), "files_submitted": row[1] or 0, "findings_created": row[2] or 0}
-                        for row in timeline_data
-                    ]
-                },
-                enrichment_stats={
-                    "total_workflows": enrichment_row[0] or 0,
-                    "successful": enrichment_row[1] or 0,
-                    "failed": enrichment_row[2] or 0,
-                    "avg_processing_time": float(enrichment_row[3]) if enrichment_row[3] else 0.0,
-                },
-            )
-
-            return report
+    await _fold_rollups(conn)
+    totals = await _get_rollup_totals(conn, None, project, start_date, end_date)
+    sources = await _get_sources(conn, project, start_date, end_date)
+    creds_row = await conn.fetchrow(SYSTEM_CREDENTIALS_QUERY)
+    daily_activity = await _get_daily_activity(conn, None, project, start_date, end_date)
+    enrichment_row = await conn.fetchrow(SYSTEM_WORKFLOW_STATS_QUERY, project, start_date, end_date)
+
+    # Determine time range
+    if start_date and end_date:
+        time_range = {"start": start_date, "end": end_date}
+    elif start_date:
+        time_range = {"start": start_date, "end": datetime.now(UTC)}
+    elif end_date:
+        time_range = {"start": datetime.min.replace(tzinfo=UTC), "end": end_date}
+    else:
+        time_range = {"start": datetime.min.replace(tzinfo=UTC), "end": datetime.now(UTC)}
+
+    return SystemReport(
+        report_type="system",
+        generated_at=datetime.now(UTC),
+        time_range=time_range,
+        summary={
+            "total_sources": len(sources),
+            "total_files": totals.total("files"),
+            "total_size_bytes": totals.total_size,
+            "total_findings": totals.total("findings"),
+            "verified_true_positives": totals.count("triage", "true_positive"),
+            "total_credentials": creds_row["total_chromium_logins"],
+            "decrypted_credentials": creds_row["decrypted_logins"],
+        },
+        sources=sources[:SYSTEM_SOURCES_LIMIT],
+        findings_by_category=totals.by_key("finding_category"),
+        findings_by_severity=totals.by_key("finding_severity"),
+        timeline={"daily_activity": daily_activity},
+        enrichment_stats={
+            "total_workflows": enrichment_row["total_workflows"] or 0,
+            "successful": enrichment_row["completed"] or 0,
+            "failed": enrichment_row["failed"] or 0,
+            "avg_processing_time": enrichment_row["avg_processing_time"] or 0.0,
+        },
+    )